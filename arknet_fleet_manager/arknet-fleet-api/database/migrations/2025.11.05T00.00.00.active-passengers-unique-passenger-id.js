@@ -0,0 +1,28 @@
+'use strict';
+
+/**
+ * Unique index on active_passengers.passenger_id
+ *
+ * The content-type's `unique: true` is only enforced by Strapi's entity
+ * service; bulk inserts through knex need the database to reject duplicates.
+ * Existing duplicates (keeping the oldest row) are removed first.
+ */
+module.exports = {
+  async up(knex) {
+    if (!(await knex.schema.hasTable('active_passengers'))) {
+      // Fresh database: the table is created by the schema sync after migrations
+      return;
+    }
+
+    await knex.raw(`
+      DELETE FROM active_passengers a
+      USING active_passengers b
+      WHERE a.passenger_id = b.passenger_id
+        AND a.id > b.id
+    `);
+    await knex.raw(`
+      CREATE UNIQUE INDEX IF NOT EXISTS active_passengers_passenger_id_unique
+      ON active_passengers (passenger_id)
+    `);
+  },
+};
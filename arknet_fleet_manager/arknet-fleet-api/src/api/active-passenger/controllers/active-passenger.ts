@@ -3,11 +3,142 @@
  * Handles passenger lifecycle and spatial queries
  */
 
+import { randomBytes } from 'crypto';
 import { factories } from '@strapi/strapi';
 
+const BULK_MAX_ROWS = 5000;
+const REQUIRED_FIELDS = [
+  'passenger_id',
+  'route_id',
+  'latitude',
+  'longitude',
+  'destination_lat',
+  'destination_lon',
+  'spawned_at',
+  'expires_at',
+];
+
 export default factories.createCoreController(
   'api::active-passenger.active-passenger' as any,
   ({ strapi }: any) => ({
+    /**
+     * Insert many passengers with a single multi-row INSERT ... RETURNING.
+     * Body: { data: [ {passenger_id, route_id, ...}, ... ] }
+     *
+     * Rows that fail validation or collide on passenger_id are reported back
+     * in `failed`; the remaining rows are still written.
+     */
+    async bulkCreate(ctx: any) {
+      try {
+        const rows = ctx.request.body?.data;
+
+        if (!Array.isArray(rows)) {
+          ctx.status = 400;
+          return { error: 'Request body must be { data: [...] }' };
+        }
+
+        if (rows.length > BULK_MAX_ROWS) {
+          ctx.status = 413;
+          return { error: `At most ${BULK_MAX_ROWS} passengers per request` };
+        }
+
+        const knex = strapi.db?.connection;
+        if (!knex) {
+          ctx.status = 500;
+          return { error: 'Database connection not available' };
+        }
+
+        const failed: Array<{ passenger_id: string | null; error: string }> = [];
+        const now = new Date();
+        const records: any[] = [];
+        const batchIds = new Set<string>();
+
+        for (const row of rows) {
+          const missing = REQUIRED_FIELDS.filter(
+            (field) => row?.[field] === undefined || row?.[field] === null
+          );
+          if (missing.length > 0) {
+            failed.push({
+              passenger_id: row?.passenger_id ?? null,
+              error: `Missing required fields: ${missing.join(', ')}`,
+            });
+            continue;
+          }
+          if (batchIds.has(row.passenger_id)) {
+            failed.push({ passenger_id: row.passenger_id, error: 'Duplicate passenger_id' });
+            continue;
+          }
+          batchIds.add(row.passenger_id);
+
+          records.push({
+            document_id: randomBytes(12).toString('hex'),
+            passenger_id: row.passenger_id,
+            route_id: row.route_id,
+            depot_id: row.depot_id ?? null,
+            direction: row.direction ?? null,
+            latitude: row.latitude,
+            longitude: row.longitude,
+            destination_name: row.destination_name ?? 'Destination',
+            destination_lat: row.destination_lat,
+            destination_lon: row.destination_lon,
+            spawned_at: new Date(row.spawned_at),
+            expires_at: new Date(row.expires_at),
+            status: row.status ?? 'WAITING',
+            priority: row.priority ?? 3,
+            // Fields the entity service would fill in (no draft & publish: published on create)
+            published_at: now,
+            created_at: now,
+            updated_at: now,
+          });
+        }
+
+        let inserted: any[] = [];
+        if (records.length > 0) {
+          // Duplicate passenger_ids are skipped rather than aborting the whole batch.
+          // Checked explicitly instead of ON CONFLICT, which needs the unique index
+          // to exist; the index still rejects a concurrent insert of the same id.
+          inserted = await knex.transaction(async (trx: any) => {
+            const existing = await trx('active_passengers')
+              .whereIn('passenger_id', records.map((record) => record.passenger_id))
+              .pluck('passenger_id');
+            const existingIds = new Set(existing);
+            const fresh = records.filter((record) => {
+              if (!existingIds.has(record.passenger_id)) {
+                return true;
+              }
+              failed.push({ passenger_id: record.passenger_id, error: 'Duplicate passenger_id' });
+              return false;
+            });
+            if (fresh.length === 0) {
+              return [];
+            }
+            return trx('active_passengers')
+              .insert(fresh)
+              .returning(['id', 'document_id', 'passenger_id']);
+          });
+        }
+
+        ctx.status = failed.length > 0 && inserted.length === 0 ? 422 : 201;
+        ctx.body = {
+          success: failed.length === 0,
+          inserted_count: inserted.length,
+          failed_count: failed.length,
+          inserted: inserted.map((r: any) => ({
+            id: r.id,
+            documentId: r.document_id,
+            passenger_id: r.passenger_id,
+          })),
+          failed,
+        };
+      } catch (error) {
+        ctx.status = 500;
+        ctx.body = {
+          success: false,
+          error: error instanceof Error ? error.message : String(error),
+        };
+      }
+    },
+
     /**
      * Mark a passenger as boarded (status = ONBOARD)
      */
@@ -53,6 +53,15 @@ export default {
     },
 
     // Custom routes for passenger operations
+    {
+      method: 'POST',
+      path: '/active-passengers/bulk',
+      handler: 'active-passenger.bulkCreate',
+      config: {
+        policies: [],
+        middlewares: [],
+      },
+    },
     {
       method: 'POST',
       path: '/active-passengers/mark-boarded/:passengerId',
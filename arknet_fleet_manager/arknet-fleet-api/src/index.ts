@@ -72,6 +72,26 @@ async function setPublicPermissions(strapi: Core.Strapi) {
   }
 }
 
+/**
+ * Make sure active_passengers.passenger_id has a unique index.
+ *
+ * The bulk-create route relies on the database to reject duplicate passenger
+ * ids (Strapi's `unique: true` is not a database constraint). The migration in
+ * database/migrations also removes pre-existing duplicates; this covers fresh
+ * databases, where the table only exists after the schema sync.
+ */
+async function ensureActivePassengerIndex(strapi: Core.Strapi) {
+  try {
+    await strapi.db.connection.raw(`
+      CREATE UNIQUE INDEX IF NOT EXISTS active_passengers_passenger_id_unique
+      ON active_passengers (passenger_id)
+    `);
+    console.log('[Bootstrap] ✅ active_passengers.passenger_id unique index present');
+  } catch (error) {
+    console.error('[Bootstrap] ❌ Could not create unique index on active_passengers.passenger_id:', error);
+  }
+}
+
 export default {
   /**
    * An asynchronous register function that runs before
@@ -113,6 +133,7 @@ export default {
     // Configure API permissions for authenticated and public access
     console.log('[Bootstrap] Configuring API permissions...');
     await setPublicPermissions(strapi);
+    await ensureActivePassengerIndex(strapi);
     
     // Configure GeoJSON file upload support
     console.log('[Bootstrap] Configuring GeoJSON file support...');
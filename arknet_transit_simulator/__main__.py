@@ -12,6 +12,7 @@ import logging
 import sys
 
 from .simulator import CleanVehicleSimulator
+from .core.startup_pipeline import DEFAULT_STARTUP_FANOUT
 
 log = logging.getLogger("vehicle_simulator.entry")
 
@@ -20,7 +21,7 @@ def parse_args(argv=None):
     p = argparse.ArgumentParser(prog="python -m world.arknet_transit_simulator",
                                 description="Vehicle Simulator - Modern GTFS-compliant transit system (uses Strapi API by default)")
     p.add_argument('--mode', choices=['display', 'depot', 'status'], default='display', help='Mode to run')
-    p.add_argument('--duration', type=float, default=None, help='Duration in seconds (depot mode)')
+    p.add_argument('--duration', type=float, default=None, help='Duration in simulated seconds (depot mode)')
     p.add_argument('--api-url', type=str, default=None, help='API base URL (default: auto-loads from config.ini)')
     p.add_argument('--debug', action='store_true', help='Enable debug logging')
     p.add_argument('--enable-boarding-after', type=float, default=None, 
@@ -31,6 +32,10 @@ def parse_args(argv=None):
                    help='Set simulation time (ISO format: 2025-11-05T14:30:00Z or HH:MM for today)')
     p.add_argument('--sim-date', type=str, default=None,
                    help='Set simulation date (YYYY-MM-DD, combines with --sim-time or uses current time)')
+    p.add_argument('--time-warp', type=float, default=1.0, metavar='FACTOR',
+                   help='Run simulation time FACTOR times faster than the wall clock (e.g. 60; default: 1)')
+    p.add_argument('--as-fast-as-possible', action='store_true',
+                   help='Discrete-event clock: jump straight to the next scheduled tick (capacity testing)')
     
     # Fleet Management API control
     p.add_argument('--no-api', action='store_true',
@@ -38,6 +43,22 @@ def parse_args(argv=None):
     p.add_argument('--api-port', type=int, default=5001,
                    help='Port for Fleet Management API (default: 5001)')
     
+    # Cold-start profiling
+    p.add_argument('--profile-startup', nargs='?', const='startup_profile.json', default=None, metavar='PATH',
+                   help='Write the startup timeline (per-phase and per-vehicle durations) as JSON (default: startup_profile.json)')
+    p.add_argument('--startup-fanout', type=int, default=DEFAULT_STARTUP_FANOUT,
+                   help=f'Vehicles initialized concurrently at startup (default: {DEFAULT_STARTUP_FANOUT})')
+    
+    # Multi-process fleet
+    p.add_argument('--workers', type=int, default=1, metavar='N',
+                   help='Run the fleet in N worker processes, sharded by route; this process serves the API (default: 1)')
+    
+    # Logging pipeline
+    p.add_argument('--log-rate', type=float, default=None, metavar='LINES_PER_SEC',
+                   help='Max log lines per second per message and vehicle; 0 = unlimited (default: 1.0, unlimited with --debug)')
+    p.add_argument('--sync-logging', action='store_true',
+                   help='Write log lines on the calling thread instead of a background writer thread')
+    
     return p.parse_args(argv)
 
 
@@ -330,6 +351,8 @@ class StatusOnlyFilter(logging.Filter):
             'stopping engine',
             '🔧 Engine created for',
             'ready for telemetry testing',
+            # Startup profiling
+            'Startup timeline',
             # System status
             'Shutting down',
             'Shutdown complete'
@@ -394,6 +417,16 @@ async def main_async(argv=None):
         status_filter = StatusOnlyFilter()
         for handler in root_logger.handlers:
             handler.addFilter(status_filter)
+    
+    # Keep formatting and console I/O off the tick loops; throttle per-vehicle repeats
+    from arknet_transit_simulator.utils.logging_system import RateLimitFilter, start_queue_logging
+    log_rate = args.log_rate if args.log_rate is not None else (0.0 if args.debug else 1.0)
+    rate_limit = RateLimitFilter(rate=log_rate)
+    if not args.sync_logging:
+        start_queue_logging(logging.getLogger(), rate_limit)
+    else:
+        for handler in logging.getLogger().handlers:
+            handler.addFilter(rate_limit)
 
     # Status mode doesn't need full simulator initialization
     if args.mode == 'status':
@@ -437,6 +470,20 @@ async def main_async(argv=None):
         if sim_time:
             print(f"🕒 Simulation time set to: {sim_time.isoformat()}")
     
+    if args.workers < 1:
+        print(f"Error: --workers must be at least 1, got {args.workers}")
+        return 1
+    
+    # One clock for every component's now() and sleeps (exported to child services)
+    if args.time_warp <= 0:
+        print(f"Error: --time-warp must be positive, got {args.time_warp}")
+        return 1
+    if sim_time or args.time_warp != 1.0 or args.as_fast_as_possible:
+        from common.sim_clock import DISCRETE_RESOLUTION, configure_sim_clock
+        clock = configure_sim_clock(start=sim_time, warp=args.time_warp, discrete=args.as_fast_as_possible,
+                                    resolution=DISCRETE_RESOLUTION, export_env=True)
+        print(f"🕒 Simulation clock: {clock.describe()}")
+    
     # Load GPS configuration from environment
     from arknet_transit_simulator.config.config_loader import ConfigLoader
     config_loader = ConfigLoader()
@@ -450,7 +497,11 @@ async def main_async(argv=None):
             gps_config=gps_config,
             sim_time=sim_time,
             enable_api=not args.no_api,
-            api_port=args.api_port
+            api_port=args.api_port,
+            profile_startup=args.profile_startup,
+            startup_fanout=args.startup_fanout,
+            workers=args.workers,
+            log_rate=log_rate
         )
         if not await sim.initialize():
             print("[ERROR] Initialization failed: sim.initialize() returned False")
@@ -462,6 +513,8 @@ async def main_async(argv=None):
         return 1
 
     if args.mode == 'display':
+        # No vehicles are started in display mode; the timeline covers initialization only
+        sim.finish_startup_profile()
         await run_display(sim)
         await sim.shutdown()
         return 0
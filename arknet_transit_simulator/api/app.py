@@ -9,7 +9,7 @@ from .models import HealthResponse
 from .events import get_event_bus
 
 # Import routers
-from .routes import vehicles, conductors, control, websockets, simulator
+from .routes import vehicles, conductors, control, websockets, simulator, metrics
 
 
 def create_app() -> FastAPI:
@@ -35,6 +35,7 @@ def create_app() -> FastAPI:
     app.include_router(control.router)
     app.include_router(simulator.router)
     app.include_router(websockets.router)
+    app.include_router(metrics.router)
     
     @app.get("/health", response_model=HealthResponse)
     async def health_check():
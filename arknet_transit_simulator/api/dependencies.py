@@ -2,7 +2,8 @@
 
 from typing import TYPE_CHECKING
 
-from .events.event_bus import EventBus
+from .events.event_bus import EventBus, get_event_bus as _global_event_bus
+from .events.fleet_stream import FleetStatePublisher
 
 if TYPE_CHECKING:
     from arknet_transit_simulator.simulator import CleanVehicleSimulator
@@ -11,8 +12,8 @@ if TYPE_CHECKING:
 # Global reference to the simulator instance
 _simulator: 'CleanVehicleSimulator | None' = None
 
-# Global event bus instance
-_event_bus: EventBus = EventBus()
+# Global fleet state publisher (feeds fleet snapshots/deltas to /ws/events)
+_fleet_publisher: FleetStatePublisher | None = None
 
 
 def set_simulator(sim: 'CleanVehicleSimulator'):
@@ -29,5 +30,16 @@ def get_simulator() -> 'CleanVehicleSimulator':
 
 
 def get_event_bus() -> EventBus:
-    """Dependency to get the event bus instance."""
-    return _event_bus
+    """Dependency to get the event bus instance (the same bus /health reports on)."""
+    return _global_event_bus()
+
+
+def set_fleet_publisher(publisher: FleetStatePublisher | None):
+    """Set the global fleet state publisher."""
+    global _fleet_publisher
+    _fleet_publisher = publisher
+
+
+def get_fleet_publisher() -> FleetStatePublisher | None:
+    """Dependency to get the fleet state publisher (None until the API server starts)."""
+    return _fleet_publisher
@@ -1,6 +1,10 @@
 ﻿"""Event system for fleet management."""
 
 from .event_types import EventType
-from .event_bus import EventBus, Event, get_event_bus
+from .event_bus import EventBus, Event, Subscription, get_event_bus
+from .fleet_stream import FleetStatePublisher, FleetSubscription, vehicle_state
 
-__all__ = ["EventType", "EventBus", "Event", "get_event_bus"]
+__all__ = [
+    "EventType", "EventBus", "Event", "Subscription", "get_event_bus",
+    "FleetStatePublisher", "FleetSubscription", "vehicle_state",
+]
@@ -1,16 +1,27 @@
-﻿"""Non-blocking event bus using asyncio.Queue for pub/sub pattern."""
+﻿"""Non-blocking event bus with per-subscriber filters, coalescing and backpressure."""
 
 import asyncio
+import itertools
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set
 from dataclasses import dataclass, field
 
+from common.metrics import MetricFamily, get_metrics_registry
+
 from .event_types import EventType
 
 
 logger = logging.getLogger(__name__)
 
+# High-frequency event types where only the latest event per vehicle matters
+DEFAULT_COALESCE_TYPES = frozenset({EventType.POSITION_UPDATE})
+
+# Minimum seconds between "subscriber is dropping events" warnings (per subscriber)
+DROP_LOG_INTERVAL = 10.0
+
 
 @dataclass
 class Event:
@@ -29,114 +40,268 @@ class Event:
         }
 
 
+class Subscription:
+    """
+    One subscriber's filtered, bounded, coalescing event queue.
+    
+    Queue-like for consumers (get / get_nowait / qsize / empty) plus get_batch()
+    to drain several events at once. Coalesced event types keep only the latest
+    event per vehicle; when the queue is full the oldest pending event is dropped.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        max_queue_size: int,
+        event_types: Optional[Iterable[EventType]] = None,
+        vehicle_ids: Optional[Iterable[str]] = None,
+        routes: Optional[Iterable[str]] = None,
+        route_resolver: Optional[Callable[[str], Optional[str]]] = None,
+        coalesce_types: Iterable[EventType] = DEFAULT_COALESCE_TYPES
+    ):
+        """
+        Args:
+            name: Subscriber name (stats and logs)
+            max_queue_size: Maximum pending events
+            event_types: Only these event types (None: all)
+            vehicle_ids: Only events for these vehicles (events without a vehicle_id always pass)
+            routes: Only events for these routes (events without a vehicle/route always pass)
+            route_resolver: Route id of a vehicle, for events that carry a vehicle_id but no route_id
+            coalesce_types: Event types coalesced per vehicle (latest wins)
+        """
+        self.name = name
+        self.max_queue_size = max(1, max_queue_size)
+        self.event_types: Optional[Set[EventType]] = set(event_types) if event_types else None
+        self.vehicle_ids: Optional[Set[str]] = set(vehicle_ids) if vehicle_ids else None
+        self.routes: Optional[Set[str]] = {str(route) for route in routes} if routes else None
+        self.route_resolver = route_resolver
+        self.coalesce_types = frozenset(coalesce_types)
+        
+        self._pending: "OrderedDict[Hashable, Event]" = OrderedDict()
+        self._sequence = itertools.count()
+        self._ready = asyncio.Event()
+        
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self._dropped_reported = 0
+        self._last_drop_log = float('-inf')
+    
+    def matches(self, event_type: EventType, data: Dict[str, Any]) -> bool:
+        """Server-side filter: event type, vehicle and route"""
+        if self.event_types is not None and event_type not in self.event_types:
+            return False
+        vehicle_id = data.get("vehicle_id")
+        if self.vehicle_ids is not None and vehicle_id is not None and vehicle_id not in self.vehicle_ids:
+            return False
+        if self.routes is not None and vehicle_id is not None:
+            route_id = data.get("route_id")
+            if route_id is None and self.route_resolver is not None:
+                route_id = self.route_resolver(vehicle_id)
+            if str(route_id) not in self.routes:
+                return False
+        return True
+    
+    def offer(self, event: Event) -> bool:
+        """
+        Queue an event (never blocks).
+        
+        Returns:
+            False if an older pending event had to be dropped to make room
+        """
+        vehicle_id = event.data.get("vehicle_id")
+        if event.event_type in self.coalesce_types and vehicle_id is not None:
+            key: Hashable = (event.event_type, vehicle_id)
+            if key in self._pending:
+                self._pending[key] = event
+                self.coalesced += 1
+                return True
+        else:
+            key = next(self._sequence)
+        
+        accepted = True
+        if len(self._pending) >= self.max_queue_size:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+            accepted = False
+        self._pending[key] = event
+        self._ready.set()
+        return accepted
+    
+    def qsize(self) -> int:
+        return len(self._pending)
+    
+    def empty(self) -> bool:
+        return not self._pending
+    
+    def get_nowait(self) -> Event:
+        """Oldest pending event; raises asyncio.QueueEmpty when there is none"""
+        if not self._pending:
+            raise asyncio.QueueEmpty()
+        _, event = self._pending.popitem(last=False)
+        if not self._pending:
+            self._ready.clear()
+        self.delivered += 1
+        return event
+    
+    async def get(self) -> Event:
+        """Wait for and return the oldest pending event"""
+        while not self._pending:
+            await self._ready.wait()
+        return self.get_nowait()
+    
+    async def get_batch(self, max_events: int = 100) -> List[Event]:
+        """Wait until at least one event is pending, then return up to max_events of them (cancel-safe)"""
+        while not self._pending:
+            await self._ready.wait()
+        return [self.get_nowait() for _ in range(min(max_events, len(self._pending)))]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "pending": len(self._pending),
+            "delivered": self.delivered,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "filters": {
+                "event_types": sorted(t.value for t in self.event_types) if self.event_types else None,
+                "vehicle_ids": sorted(self.vehicle_ids) if self.vehicle_ids else None,
+                "routes": sorted(self.routes) if self.routes else None,
+            },
+        }
+
+
 class EventBus:
     """
-    Non-blocking event bus using asyncio.Queue.
+    Non-blocking event bus with per-subscriber queues.
     
-    Subscribers receive events asynchronously without blocking the emitter.
+    Subscribers receive events asynchronously without blocking the emitter. A slow
+    subscriber only loses its own oldest events (counted, and logged at most every
+    DROP_LOG_INTERVAL seconds); high-frequency event types are coalesced per vehicle.
     """
     
-    def __init__(self, max_queue_size: int = 1000):
+    def __init__(self, max_queue_size: int = 1000, coalesce_types: Iterable[EventType] = DEFAULT_COALESCE_TYPES):
         """
         Initialize event bus.
         
         Args:
             max_queue_size: Maximum events to queue per subscriber
+            coalesce_types: Event types where only the latest event per vehicle is kept
         """
-        self._subscribers: Dict[EventType, List[asyncio.Queue]] = {}
-        self._all_subscribers: List[asyncio.Queue] = []
+        self._subscribers: List[Subscription] = []
         self._max_queue_size = max_queue_size
+        self._coalesce_types = frozenset(coalesce_types)
+        self._names = itertools.count(1)
+        self.emitted = 0
         logger.info("EventBus initialized with max_queue_size=%d", max_queue_size)
     
-    def subscribe(self, event_type: EventType | None = None) -> asyncio.Queue:
+    def subscribe(
+        self,
+        event_type: EventType | None = None,
+        *,
+        event_types: Optional[Iterable[EventType]] = None,
+        vehicle_ids: Optional[Iterable[str]] = None,
+        routes: Optional[Iterable[str]] = None,
+        route_resolver: Optional[Callable[[str], Optional[str]]] = None,
+        max_queue_size: Optional[int] = None,
+        name: Optional[str] = None
+    ) -> Subscription:
         """
         Subscribe to events.
         
         Args:
             event_type: Specific event type to subscribe to, or None for all events
-            
+            event_types: Several event types (combined with event_type)
+            vehicle_ids: Only events for these vehicles
+            routes: Only events for vehicles on these routes
+            route_resolver: Maps a vehicle_id to its route for events without a route_id
+            max_queue_size: Override the bus-wide per-subscriber queue size
+            name: Subscriber name for stats
+        
         Returns:
-            Queue that will receive Event objects
+            Subscription that will receive Event objects
         """
-        queue = asyncio.Queue(maxsize=self._max_queue_size)
-        
-        if event_type is None:
-            # Subscribe to all events
-            self._all_subscribers.append(queue)
-            logger.info("New subscriber for ALL events (total all-subscribers: %d)", 
-                       len(self._all_subscribers))
-        else:
-            # Subscribe to specific event type
-            if event_type not in self._subscribers:
-                self._subscribers[event_type] = []
-            self._subscribers[event_type].append(queue)
-            logger.info("New subscriber for %s (total subscribers: %d)", 
-                       event_type.value, len(self._subscribers[event_type]))
-        
-        return queue
+        types = set(event_types or ())
+        if event_type is not None:
+            types.add(event_type)
+        subscription = Subscription(
+            name=name or f"subscriber-{next(self._names)}",
+            max_queue_size=max_queue_size or self._max_queue_size,
+            event_types=types or None,
+            vehicle_ids=vehicle_ids,
+            routes=routes,
+            route_resolver=route_resolver,
+            coalesce_types=self._coalesce_types,
+        )
+        self._subscribers.append(subscription)
+        logger.info("New subscriber %s (total subscribers: %d)", subscription.name, len(self._subscribers))
+        return subscription
     
-    def unsubscribe(self, queue: asyncio.Queue):
+    def unsubscribe(self, subscription: Subscription):
         """
-        Unsubscribe a queue from all events.
+        Unsubscribe from all events.
         
         Args:
-            queue: The queue to unsubscribe
+            subscription: The subscription returned by subscribe()
         """
-        # Remove from all-subscribers
-        if queue in self._all_subscribers:
-            self._all_subscribers.remove(queue)
-            logger.info("Unsubscribed from ALL events")
-        
-        # Remove from specific event subscribers
-        for event_type, queues in self._subscribers.items():
-            if queue in queues:
-                queues.remove(queue)
-                logger.info("Unsubscribed from %s", event_type.value)
+        if subscription in self._subscribers:
+            self._subscribers.remove(subscription)
+            logger.info("Unsubscribed %s (delivered=%d, coalesced=%d, dropped=%d)",
+                        subscription.name, subscription.delivered, subscription.coalesced, subscription.dropped)
     
     async def emit(self, event_type: EventType, data: Dict[str, Any]):
         """
-        Emit an event to all subscribers (non-blocking).
+        Emit an event to all matching subscribers (non-blocking).
         
         Args:
             event_type: Type of event
             data: Event data payload
         """
-        event = Event(event_type=event_type, data=data)
-        
-        # Collect all queues that should receive this event
-        target_queues = []
-        
-        # Add specific subscribers
-        if event_type in self._subscribers:
-            target_queues.extend(self._subscribers[event_type])
-        
-        # Add all-event subscribers
-        target_queues.extend(self._all_subscribers)
-        
-        if not target_queues:
-            # No subscribers, nothing to do
+        targets = [subscription for subscription in self._subscribers if subscription.matches(event_type, data)]
+        if not targets:
+            # No interested subscribers: don't even build the event
             return
         
-        logger.debug("Emitting %s to %d subscribers", event_type.value, len(target_queues))
-        
-        # Put event in all queues (non-blocking)
-        for queue in target_queues:
-            try:
-                # Use put_nowait to avoid blocking
-                queue.put_nowait(event)
-            except asyncio.QueueFull:
-                logger.warning("Queue full for %s, dropping event", event_type.value)
+        event = Event(event_type=event_type, data=data)
+        self.emitted += 1
+        for subscription in targets:
+            if not subscription.offer(event):
+                self._report_drops(subscription)
+    
+    def _report_drops(self, subscription: Subscription):
+        now = time.monotonic()
+        if now - subscription._last_drop_log < DROP_LOG_INTERVAL:
+            return
+        logger.warning("Subscriber %s is falling behind: %d events dropped (%d total)",
+                       subscription.name, subscription.dropped - subscription._dropped_reported, subscription.dropped)
+        subscription._last_drop_log = now
+        subscription._dropped_reported = subscription.dropped
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the event bus."""
         return {
-            "all_subscribers": len(self._all_subscribers),
-            "type_subscribers": {
-                event_type.value: len(queues) 
-                for event_type, queues in self._subscribers.items()
-            },
-            "max_queue_size": self._max_queue_size
+            "subscribers": len(self._subscribers),
+            "emitted": self.emitted,
+            "coalesce_types": sorted(t.value for t in self._coalesce_types),
+            "max_queue_size": self._max_queue_size,
+            "per_subscriber": [subscription.get_stats() for subscription in self._subscribers],
         }
+    
+    def collect_metrics(self) -> List[MetricFamily]:
+        """Queue depth and drop/coalesce counters per subscriber (scrape-time collector for common.metrics)."""
+        emitted = MetricFamily("event_bus_events_emitted_total", "counter", "Events emitted to at least one subscriber")
+        emitted.add(self.emitted)
+        subscribers = MetricFamily("event_bus_subscribers", "gauge", "Current event bus subscribers")
+        subscribers.add(len(self._subscribers))
+        depth = MetricFamily("event_bus_queue_depth", "gauge", "Events pending in a subscriber queue")
+        dropped = MetricFamily("event_bus_dropped_total", "counter", "Events dropped because a subscriber queue was full")
+        coalesced = MetricFamily("event_bus_coalesced_total", "counter", "Events replaced by a newer event for the same vehicle")
+        for subscription in list(self._subscribers):
+            labels = {"subscriber": subscription.name}
+            depth.add(subscription.qsize(), labels)
+            dropped.add(subscription.dropped, labels)
+            coalesced.add(subscription.coalesced, labels)
+        return [emitted, subscribers, depth, dropped, coalesced]
 
 
 # Global event bus instance
@@ -148,4 +313,5 @@ def get_event_bus() -> EventBus:
     global _event_bus
     if _event_bus is None:
         _event_bus = EventBus()
+        get_metrics_registry().register_collector(_event_bus.collect_metrics)
     return _event_bus
@@ -26,6 +26,10 @@ class EventType(str, Enum):
     DEPOT_BOARDING_STARTED = "depot_boarding_started"
     DEPOT_BOARDING_ENDED = "depot_boarding_ended"
     
+    # Fleet state stream (snapshot on connect, then per-tick deltas)
+    FLEET_SNAPSHOT = "fleet_snapshot"
+    FLEET_DELTA = "fleet_delta"
+    
     # System events
     SIMULATOR_STARTED = "simulator_started"
     SIMULATOR_STOPPED = "simulator_stopped"
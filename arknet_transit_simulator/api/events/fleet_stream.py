@@ -0,0 +1,262 @@
+"""Fleet state stream: one server-side snapshot plus per-tick deltas over the event bus.
+
+Instead of every client polling GET /api/vehicles, a single FleetStatePublisher
+samples the active drivers once per tick, diffs the result against the previous
+tick and emits a FLEET_DELTA event containing only the changed fields of the
+vehicles that changed. /ws/events sends each client a FLEET_SNAPSHOT on connect
+and then the deltas, filtered and rate-limited per client by a FleetSubscription
+(other event types are filtered by the event bus subscription itself).
+
+Delta payload:
+    {"seq": 42, "changed": {"ZR102": {"current_lat": 13.1, ...}}, "removed": ["ZR7"]}
+
+A vehicle that is new to the receiver arrives with all of its fields in "changed".
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+from common.metrics import TickTimer
+
+from .event_bus import EventBus
+from .event_types import EventType
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds between fleet samples
+FLEET_TICK_SECONDS = 0.5
+
+
+def vehicle_state(driver) -> Dict[str, Any]:
+    """
+    Flat, JSON-ready state of one active driver/vehicle.
+    
+    Same fields as VehicleResponse (GET /api/vehicles).
+    """
+    conductor = getattr(driver, 'conductor', None)
+    engine = getattr(driver, 'engine', None)
+    current_lat = current_lon = None
+    position = getattr(conductor, 'current_vehicle_position', None) if conductor else None
+    if position:
+        current_lat, current_lon = position
+    state = getattr(driver, 'current_state', None)
+    
+    return {
+        'vehicle_id': driver.vehicle_id,
+        'driver_id': getattr(driver, 'component_id', driver.vehicle_id),
+        'driver_name': driver.person_name,
+        'route_id': getattr(driver, 'assigned_route_id', None),
+        'current_lat': current_lat,
+        'current_lon': current_lon,
+        'driver_state': state.value if state is not None else 'UNKNOWN',
+        'engine_running': bool(getattr(engine, 'running', False)) if engine else False,
+        'gps_running': bool(getattr(driver, 'gps_device', None)),
+        'passenger_count': getattr(conductor, 'passengers_on_board', 0) if conductor else 0,
+        'capacity': getattr(conductor, 'capacity', 0) if conductor else 0,
+        'boarding_active': getattr(conductor, 'boarding_active', False) if conductor else False,
+    }
+
+
+def diff_fleet(previous: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Changed fields per vehicle between two fleet states.
+    
+    Returns:
+        {"changed": {vehicle_id: {field: value}}, "removed": [vehicle_id]}
+    """
+    changed = {}
+    for vehicle_id, state in current.items():
+        before = previous.get(vehicle_id)
+        if before is None:
+            changed[vehicle_id] = dict(state)
+            continue
+        fields = {key: value for key, value in state.items() if before.get(key) != value}
+        if fields:
+            changed[vehicle_id] = fields
+    removed = [vehicle_id for vehicle_id in previous if vehicle_id not in current]
+    return {'changed': changed, 'removed': removed}
+
+
+class FleetStatePublisher:
+    """Samples the simulator's active drivers every tick and emits FLEET_DELTA events"""
+    
+    def __init__(self, simulator, event_bus: EventBus, tick_seconds: float = FLEET_TICK_SECONDS):
+        """
+        Args:
+            simulator: Object with an `active_drivers` list
+            event_bus: Bus the deltas are emitted on
+            tick_seconds: Sampling interval
+        """
+        self.simulator = simulator
+        self.event_bus = event_bus
+        self.tick_seconds = tick_seconds
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self.seq = 0
+        self.deltas_emitted = 0
+        self._task: Optional[asyncio.Task] = None
+    
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """Current state of every active vehicle"""
+        fleet = {}
+        for driver in list(self.simulator.active_drivers):
+            try:
+                fleet[driver.vehicle_id] = vehicle_state(driver)
+            except Exception as e:
+                logger.debug("Skipping vehicle state for %s: %s", getattr(driver, 'vehicle_id', '?'), e)
+        return fleet
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Full fleet state at the current sequence number"""
+        return {
+            'seq': self.seq,
+            'vehicles': {vehicle_id: dict(state) for vehicle_id, state in self.state.items()},
+        }
+    
+    async def tick(self) -> Optional[Dict[str, Any]]:
+        """Sample the fleet; emit and return the delta (None when nothing changed)"""
+        current = self.collect()
+        delta = diff_fleet(self.state, current)
+        self.state = current
+        if not delta['changed'] and not delta['removed']:
+            return None
+        self.seq += 1
+        delta['seq'] = self.seq
+        self.deltas_emitted += 1
+        await self.event_bus.emit(EventType.FLEET_DELTA, delta)
+        return delta
+    
+    def start(self) -> None:
+        """Start ticking in the background (idempotent)"""
+        if self._task is None or self._task.done():
+            self.state = self.collect()
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self) -> None:
+        tick_timer = TickTimer("fleet_state", self.tick_seconds)
+        while True:
+            await asyncio.sleep(self.tick_seconds)
+            try:
+                with tick_timer:
+                    await self.tick()
+            except Exception as e:
+                logger.warning("Fleet state tick failed: %s", e)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'vehicles': len(self.state),
+            'seq': self.seq,
+            'deltas_emitted': self.deltas_emitted,
+            'tick_seconds': self.tick_seconds,
+        }
+
+
+class FleetSubscription:
+    """
+    Per-client view of the fleet stream: a route/vehicle subset and a maximum update rate.
+    
+    Deltas arriving faster than max_rate are merged (latest value per field wins)
+    and sent as one message when the client is due.
+    """
+    
+    def __init__(self, routes: Optional[Iterable[str]] = None, max_rate: Optional[float] = None,
+                 vehicle_ids: Optional[Iterable[str]] = None):
+        """
+        Args:
+            routes: Route ids to receive (None: all routes)
+            max_rate: Maximum fleet messages per second (None: every tick)
+            vehicle_ids: Vehicle ids to receive (None: all vehicles)
+        """
+        self.routes: Optional[Set[str]] = {str(route) for route in routes} if routes else None
+        self.vehicle_ids: Optional[Set[str]] = set(vehicle_ids) if vehicle_ids else None
+        self.min_interval = 1.0 / max_rate if max_rate else 0.0
+        self.seq = 0
+        self._visible: Set[str] = set()
+        self._changed: Dict[str, Dict[str, Any]] = {}
+        self._removed: Set[str] = set()
+        self._last_sent = float('-inf')
+    
+    def _wanted(self, state: Optional[Dict[str, Any]]) -> bool:
+        if state is None:
+            return False
+        if self.vehicle_ids is not None and state.get('vehicle_id') not in self.vehicle_ids:
+            return False
+        return self.routes is None or str(state.get('route_id')) in self.routes
+    
+    def snapshot(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Filter a publisher snapshot and (re)start the delta sequence from it"""
+        vehicles = {
+            vehicle_id: state for vehicle_id, state in snapshot['vehicles'].items() if self._wanted(state)
+        }
+        self.seq = snapshot['seq']
+        self._visible = set(vehicles)
+        self._changed.clear()
+        self._removed.clear()
+        self._last_sent = time.monotonic()
+        return {'seq': self.seq, 'vehicles': vehicles}
+    
+    def add_delta(self, delta: Dict[str, Any], fleet: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Merge a publisher delta into the pending message.
+        
+        Args:
+            delta: FLEET_DELTA payload
+            fleet: Publisher's current state (full fields for vehicles entering the view)
+        
+        Returns:
+            False when deltas were missed (sequence gap) and a new snapshot is needed
+        """
+        if delta['seq'] <= self.seq:
+            return True
+        if delta['seq'] != self.seq + 1:
+            return False
+        self.seq = delta['seq']
+        
+        for vehicle_id, fields in delta['changed'].items():
+            if self._wanted(fleet.get(vehicle_id)):
+                if vehicle_id not in self._visible:
+                    self._visible.add(vehicle_id)
+                    self._removed.discard(vehicle_id)
+                    fields = fleet[vehicle_id]
+                self._changed.setdefault(vehicle_id, {}).update(fields)
+            elif vehicle_id in self._visible:
+                self._hide(vehicle_id)
+        for vehicle_id in delta['removed']:
+            if vehicle_id in self._visible:
+                self._hide(vehicle_id)
+        return True
+    
+    def _hide(self, vehicle_id: str) -> None:
+        self._visible.discard(vehicle_id)
+        self._changed.pop(vehicle_id, None)
+        self._removed.add(vehicle_id)
+    
+    def seconds_until_due(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the pending delta may be sent (None: nothing pending)"""
+        if not self._changed and not self._removed:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(0.0, self._last_sent + self.min_interval - now)
+    
+    def flush(self, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """The merged delta if one is pending and the rate limit allows it"""
+        now = time.monotonic() if now is None else now
+        wait = self.seconds_until_due(now)
+        if wait is None or wait > 0:
+            return None
+        message = {'seq': self.seq, 'changed': self._changed, 'removed': sorted(self._removed)}
+        self._changed = {}
+        self._removed = set()
+        self._last_sent = now
+        return message
@@ -1,5 +1,5 @@
 """Route modules for the fleet management API."""
 
-from . import vehicles, conductors, control, websockets, simulator
+from . import vehicles, conductors, control, websockets, simulator, metrics
 
-__all__ = ["vehicles", "conductors", "control", "websockets", "simulator"]
+__all__ = ["vehicles", "conductors", "control", "websockets", "simulator", "metrics"]
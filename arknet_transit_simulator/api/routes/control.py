@@ -68,7 +68,7 @@ async def enable_boarding(vehicle_id: str, sim=Depends(get_simulator)):
     for driver in sim.active_drivers:
         if driver.vehicle_id == vehicle_id:
             if hasattr(driver, 'conductor') and driver.conductor:
-                driver.conductor.boarding_active = True
+                driver.conductor.start_boarding()
                 return CommandResponse(
                     success=True,
                     message=f"Boarding enabled for vehicle {vehicle_id}"
@@ -88,7 +88,7 @@ async def disable_boarding(vehicle_id: str, sim=Depends(get_simulator)):
     for driver in sim.active_drivers:
         if driver.vehicle_id == vehicle_id:
             if hasattr(driver, 'conductor') and driver.conductor:
-                driver.conductor.boarding_active = False
+                driver.conductor.stop_boarding()
                 return CommandResponse(
                     success=True,
                     message=f"Boarding disabled for vehicle {vehicle_id}"
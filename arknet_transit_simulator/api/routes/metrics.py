@@ -0,0 +1,23 @@
+"""Prometheus-style metrics endpoint."""
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from common.metrics import CONTENT_TYPE, get_metrics_registry
+
+from ..events import get_event_bus
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+async def metrics():
+    """
+    Simulator hot-path metrics in the Prometheus text exposition format.
+    
+    Tick duration/lag per loop, telemetry packets, conductor poll latency,
+    HTTP latency per upstream and event-bus queue depth.
+    """
+    # Make sure the event bus collector is registered even before the first subscriber
+    get_event_bus()
+    return Response(content=get_metrics_registry().render(), media_type=CONTENT_TYPE)
@@ -1,60 +1,151 @@
 """WebSocket endpoints for real-time event streaming."""
 
+import asyncio
 import json
+from datetime import datetime
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from typing import Dict, Set
+from typing import Any, Dict, List, Optional, Set
 
-from ..dependencies import get_event_bus
-from ..events.event_bus import EventBus
+from ..dependencies import get_event_bus, get_fleet_publisher
+from ..events.event_bus import EventBus, Event
+from ..events.event_types import EventType
+from ..events.fleet_stream import FleetSubscription
 
 router = APIRouter(tags=["websockets"])
 
 # Track active websocket connections
 active_connections: Set[WebSocket] = set()
 
+# Most events drained from the bus into one frame
+MAX_BATCH_EVENTS = 200
+
+
+def _message(event_type: EventType, data: Dict[str, Any], timestamp: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "event_type": event_type.value,
+        "vehicle_id": data.get("vehicle_id"),
+        "timestamp": timestamp or datetime.utcnow().isoformat(),
+        "data": data
+    }
+
+
+def _event_message(event: Event) -> Dict[str, Any]:
+    return _message(event.event_type, event.data, event.timestamp.isoformat() if event.timestamp else None)
+
+
+def _split(value: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated query parameter -> list (None when empty)"""
+    items = [item.strip() for item in value.split(",") if item.strip()] if value else []
+    return items or None
+
+
+async def _send(websocket: WebSocket, messages: List[Dict[str, Any]], batch: bool) -> None:
+    """Send messages as one JSON array frame (batch) or one frame each"""
+    if not messages:
+        return
+    if batch and len(messages) > 1:
+        await websocket.send_json(messages)
+    else:
+        for message in messages:
+            await websocket.send_json(message)
+
 
 @router.websocket("/ws/events")
-async def events_websocket(websocket: WebSocket, event_bus: EventBus = Depends(get_event_bus)):
-    """Stream real-time events to connected clients."""
+async def events_websocket(
+    websocket: WebSocket,
+    routes: Optional[str] = None,
+    vehicles: Optional[str] = None,
+    event_types: Optional[str] = None,
+    max_rate: Optional[float] = None,
+    batch: bool = True,
+    event_bus: EventBus = Depends(get_event_bus)
+):
+    """
+    Stream real-time events to connected clients.
+    
+    On connect the client receives a fleet_snapshot, then fleet_delta messages
+    with only the changed fields of changed vehicles, plus the other events.
+    Filters are applied server-side; position updates are coalesced per vehicle
+    when the client falls behind.
+    
+    Query parameters:
+        routes: Comma-separated route ids to receive (default: all)
+        vehicles: Comma-separated vehicle ids to receive (default: all)
+        event_types: Comma-separated event types to receive (default: all)
+        max_rate: Maximum fleet_delta messages per second (default: every tick)
+        batch: Send all messages that are ready as one JSON array frame (default: true)
+    """
+    route_filter = _split(routes)
+    vehicle_filter = _split(vehicles)
+    try:
+        type_filter = [EventType(value) for value in _split(event_types) or ()]
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+    
     await websocket.accept()
     active_connections.add(websocket)
     
-    # Subscribe to all events
-    subscription_id = "websocket_" + str(id(websocket))
-    event_queue = event_bus.subscribe(subscription_id)
+    publisher = get_fleet_publisher()
+    fleet = FleetSubscription(routes=route_filter, max_rate=max_rate, vehicle_ids=vehicle_filter)
+    stream_fleet = publisher is not None and (not type_filter or EventType.FLEET_DELTA in type_filter)
+    
+    def route_of(vehicle_id: str) -> Optional[str]:
+        state = publisher.state.get(vehicle_id) if publisher is not None else None
+        return state.get("route_id") if state else None
+    
+    # Subscribe before taking the snapshot so no delta falls in between
+    subscription = event_bus.subscribe(
+        event_types=type_filter or None,
+        vehicle_ids=vehicle_filter,
+        routes=route_filter,
+        route_resolver=route_of,
+        name=f"ws-{id(websocket):x}"
+    )
     
     try:
-        # Background task to send events from queue to websocket
+        if stream_fleet:
+            await websocket.send_json(_message(EventType.FLEET_SNAPSHOT, fleet.snapshot(publisher.snapshot())))
+        
         while True:
-            # Get next event from queue
-            event = await event_queue.get()
+            # Wake up for the next events, or when a rate-limited delta is due
+            try:
+                events = await asyncio.wait_for(subscription.get_batch(MAX_BATCH_EVENTS), timeout=fleet.seconds_until_due())
+            except asyncio.TimeoutError:
+                events = []
             
-            # Serialize event to JSON
-            event_data = {
-                "event_type": event.event_type.value,
-                "vehicle_id": event.vehicle_id,
-                "timestamp": event.timestamp.isoformat() if event.timestamp else None,
-                "data": event.data
-            }
+            messages = []
+            for event in events:
+                if event.event_type == EventType.FLEET_DELTA:
+                    if stream_fleet and not fleet.add_delta(event.data, publisher.state):
+                        # Missed deltas (slow client, queue overflow): resynchronize
+                        messages.append(_message(EventType.FLEET_SNAPSHOT, fleet.snapshot(publisher.snapshot())))
+                else:
+                    messages.append(_event_message(event))
             
-            # Send to websocket
-            await websocket.send_json(event_data)
+            delta = fleet.flush()
+            if delta is not None:
+                messages.append(_message(EventType.FLEET_DELTA, delta))
+            await _send(websocket, messages, batch)
             
     except WebSocketDisconnect:
         # Client disconnected
-        active_connections.remove(websocket)
-        event_bus.unsubscribe(subscription_id)
+        pass
     except Exception as e:
         # Error occurred
         print(f"WebSocket error: {e}")
-        active_connections.remove(websocket)
-        event_bus.unsubscribe(subscription_id)
+    finally:
+        active_connections.discard(websocket)
+        event_bus.unsubscribe(subscription)
 
 
 @router.get("/ws/status")
 async def websocket_status():
     """Get current WebSocket connection status."""
+    publisher = get_fleet_publisher()
     return {
         "active_connections": len(active_connections),
-        "endpoints": ["/ws/events"]
+        "endpoints": ["/ws/events"],
+        "fleet_stream": publisher.get_stats() if publisher is not None else None,
+        "subscribers": get_event_bus().get_stats()["per_subscriber"]
     }
@@ -11,11 +11,26 @@ from arknet_transit_simulator.core.states import (
 from arknet_transit_simulator.core.interfaces import (
     IDispatcher, IDepotManager, VehicleAssignment, RouteInfo
 )
-from arknet_transit_simulator.core.dispatcher import Dispatcher
-from arknet_transit_simulator.core.depot_manager import DepotManager
 
 __all__ = [
     'DepotState', 'PersonState', 'DriverState', 'DeviceState', 'StateMachine',
     'IDispatcher', 'IDepotManager', 'VehicleAssignment', 'RouteInfo',
     'Dispatcher', 'DepotManager'
 ]
+
+
+# Dispatcher and DepotManager pull in aiohttp; load them on first access so that
+# importing core.states (every vehicle component does) stays lightweight.
+_LAZY_EXPORTS = {
+    'Dispatcher': 'arknet_transit_simulator.core.dispatcher',
+    'DepotManager': 'arknet_transit_simulator.core.depot_manager',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
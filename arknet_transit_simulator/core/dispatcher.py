@@ -1,11 +1,12 @@
 import logging
 import aiohttp
 import asyncio
-import math
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Set, Callable, Awaitable
 from .states import StateMachine, PersonState
 from .interfaces import IDispatcher, VehicleAssignment, DriverAssignment, RouteInfo
+from .route_snapshot import RouteSnapshot, route_fingerprint
+from common.route_proximity import BoardingPoint, RouteProximityIndex, geojson_lines
 
 try:
     from common.config_provider import get_config
@@ -13,6 +14,9 @@ try:
 except ImportError:
     _config_available = False
 
+# Concurrent /api/shapes requests per StrapiStrategy (route 1 alone has 27 shapes)
+SHAPE_FETCH_CONCURRENCY = 8
+
 
 class ApiStrategy(ABC):
     """Abstract base class for API strategies (FastAPI, Strapi, etc.)"""
@@ -53,7 +57,7 @@ class RouteBuffer:
     def __init__(self):
         self._routes: Dict[str, RouteInfo] = {}
         self._lock = asyncio.Lock()
-        self._gps_index: Dict[Tuple[float, float], List[str]] = {}  # GPS coordinate -> route_ids
+        self._proximity = RouteProximityIndex()  # Route segments for proximity searches
         self._initialized = False
     
     async def add_route(self, route_info: RouteInfo) -> bool:
@@ -62,20 +66,8 @@ class RouteBuffer:
             try:
                 self._routes[route_info.route_id] = route_info
                 
-                # Index GPS coordinates for proximity searches
-                if route_info.geometry and route_info.geometry.get('coordinates'):
-                    coords = route_info.geometry['coordinates']
-                    for coord in coords:
-                        if len(coord) >= 2:
-                            # Round to reasonable precision for indexing
-                            lat_key = round(coord[1], 4)  # ~11m precision
-                            lon_key = round(coord[0], 4)  # ~11m precision
-                            coord_key = (lat_key, lon_key)
-                            
-                            if coord_key not in self._gps_index:
-                                self._gps_index[coord_key] = []
-                            if route_info.route_id not in self._gps_index[coord_key]:
-                                self._gps_index[coord_key].append(route_info.route_id)
+                # Index route segments for proximity searches
+                self._proximity.add_route(route_info.route_id, geojson_lines(route_info.geometry))
                 
                 logging.debug(f"RouteBuffer: Added route {route_info.route_id} with {route_info.coordinate_count} GPS points")
                 return True
@@ -90,51 +82,37 @@ class RouteBuffer:
             return self._routes.get(route_id)
     
     async def get_routes_by_gps(self, lat: float, lon: float, walking_distance_km: float = 0.5) -> List[RouteInfo]:
-        """Get all routes within walking distance of GPS coordinates."""
-        async with self._lock:
-            nearby_routes = set()
-            
-            # Calculate search radius in coordinate degrees (approximate)
-            lat_radius = walking_distance_km / 111.0  # ~111km per degree latitude
-            lon_radius = walking_distance_km / (111.0 * math.cos(math.radians(lat)))  # Adjust for longitude
-            
-            # Search GPS index within radius
-            for coord_key, route_ids in self._gps_index.items():
-                key_lat, key_lon = coord_key
-                
-                # Quick distance check using coordinate differences
-                lat_diff = abs(lat - key_lat)
-                lon_diff = abs(lon - key_lon)
-                
-                if lat_diff <= lat_radius and lon_diff <= lon_radius:
-                    # More precise distance calculation
-                    distance_km = self._calculate_distance(lat, lon, key_lat, key_lon)
-                    if distance_km <= walking_distance_km:
-                        nearby_routes.update(route_ids)
-            
-            # Return RouteInfo objects for nearby routes
-            result = []
-            for route_id in nearby_routes:
-                if route_id in self._routes:
-                    result.append(self._routes[route_id])
-            
-            return result
-    
-    def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calculate distance between two GPS coordinates using Haversine formula."""
-        R = 6371  # Earth's radius in kilometers
-        
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
+        """Get all routes within walking distance of GPS coordinates (nearest first)."""
+        points = await self.get_boarding_points(lat, lon, k=len(self._routes), walking_distance_km=walking_distance_km)
+        return [self._routes[point.route_id] for point in points if point.route_id in self._routes]
+    
+    async def get_boarding_points(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 3,
+        walking_distance_km: float = 0.5
+    ) -> List[BoardingPoint]:
+        """
+        Closest boarding point on each of the k nearest routes.
         
-        a = (math.sin(delta_lat / 2) * math.sin(delta_lat / 2) +
-             math.cos(lat1_rad) * math.cos(lat2_rad) *
-             math.sin(delta_lon / 2) * math.sin(delta_lon / 2))
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        Args:
+            lat: Passenger latitude
+            lon: Passenger longitude
+            k: Number of routes to return
+            walking_distance_km: Maximum walk to the route
         
-        return R * c
+        Returns:
+            BoardingPoints (route_id, boarding lat/lon, walk distance and
+            along-route position), nearest first
+        """
+        async with self._lock:
+            return self._proximity.nearest(lat, lon, k=k, max_distance_meters=walking_distance_km * 1000)
+    
+    async def get_route_intercept(self, route_id: str, lat: float, lon: float) -> Optional[BoardingPoint]:
+        """Closest point of one route to a location, with its along-route position."""
+        async with self._lock:
+            return self._proximity.project(route_id, lat, lon)
     
     async def get_all_routes(self) -> List[RouteInfo]:
         """Get all routes in buffer."""
@@ -145,7 +123,7 @@ class RouteBuffer:
         """Clear all routes from buffer."""
         async with self._lock:
             self._routes.clear()
-            self._gps_index.clear()
+            self._proximity.clear()
             self._initialized = False
     
     async def get_stats(self) -> Dict[str, Any]:
@@ -153,7 +131,7 @@ class RouteBuffer:
         async with self._lock:
             return {
                 'total_routes': len(self._routes),
-                'total_gps_points': len(self._gps_index),
+                'total_gps_points': self._proximity.stats()['vertices'],
                 'routes': list(self._routes.keys()),
                 'initialized': self._initialized
             }
@@ -367,10 +345,28 @@ class FastApiStrategy(ApiStrategy):
 class StrapiStrategy(ApiStrategy):
     """Strapi CMS implementation of ApiStrategy - replaces FastAPI with Strapi REST API"""
     
-    def __init__(self, api_base_url: str):
+    def __init__(
+        self,
+        api_base_url: str,
+        route_snapshot: Optional[RouteSnapshot] = None,
+        shape_concurrency: int = SHAPE_FETCH_CONCURRENCY
+    ):
+        """
+        Args:
+            api_base_url: Strapi base URL
+            route_snapshot: On-disk route cache (default: RouteSnapshot.from_env())
+            shape_concurrency: Maximum /api/shapes requests in flight (across all routes)
+        """
         self.api_base_url = api_base_url
         self.session: Optional[aiohttp.ClientSession] = None
         self.api_connected = False
+        self.route_snapshot = route_snapshot if route_snapshot is not None else RouteSnapshot.from_env()
+        self._shape_semaphore = asyncio.Semaphore(shape_concurrency)
+        self._revalidation_tasks: Dict[str, asyncio.Task] = {}
+        # Routes assembled from Strapi by this process; their snapshot entry is already current
+        self._fetched_routes: Set[str] = set()
+        # Called with a RouteInfo that revalidation found changed (Dispatcher: RouteBuffer.add_route)
+        self.on_route_refreshed: Optional[Callable[[RouteInfo], Awaitable[Any]]] = None
     
     async def initialize(self) -> bool:
         """Initialize HTTP session"""
@@ -527,66 +523,100 @@ class StrapiStrategy(ApiStrategy):
             return []
     
     async def get_route_info(self, route_code: str) -> Optional[RouteInfo]:
-        """Get route information and geometry using GTFS-compliant Strapi structure"""
+        """
+        Get route information and geometry using GTFS-compliant Strapi structure.
+        
+        Served from the on-disk route snapshot when present (revalidated once
+        in the background); otherwise assembled from Strapi and stored. A
+        route that revalidation finds changed is handed to on_route_refreshed;
+        vehicles already holding the old RouteInfo keep it until restarted.
+        """
         if not self.api_connected or not self.session:
             logging.error(f"[StrapiStrategy] Cannot fetch route info - Strapi API not connected")
             return None
         
-        try:
-            # Step 1: Get route details by route code from Strapi routes table
-            async with self.session.get(f"{self.api_base_url}/api/routes?filters[short_name][$eq]={route_code}", timeout=10) as route_response:
-                if route_response.status != 200:
-                    logging.error(f"[StrapiStrategy] Failed to fetch route {route_code}: HTTP {route_response.status}")
+        cached = self.route_snapshot.get(route_code)
+        if cached is not None:
+            route_info, fingerprint = cached
+            logging.info(f"[StrapiStrategy] Route {route_code} served from snapshot ({route_info.coordinate_count} GPS coordinates)")
+            self._revalidate_in_background(route_code, fingerprint)
+            return route_info
+        
+        return await self._fetch_route_info(route_code)
+    
+    async def _fetch_route_metadata(self, route_code: str) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """Route record and its route-shapes (two requests), or None"""
+        # Step 1: Get route details by route code from Strapi routes table
+        async with self.session.get(f"{self.api_base_url}/api/routes?filters[short_name][$eq]={route_code}", timeout=10) as route_response:
+            if route_response.status != 200:
+                logging.error(f"[StrapiStrategy] Failed to fetch route {route_code}: HTTP {route_response.status}")
+                return None
+            
+            route_data = await route_response.json()
+            routes = route_data.get('data', [])
+            
+            if not routes:
+                logging.error(f"[StrapiStrategy] Route {route_code} not found in Strapi")
+                return None
+        
+        # Step 2: Get ALL route-shapes for this route
+        async with self.session.get(f"{self.api_base_url}/api/route-shapes?filters[route_id][$eq]={route_code}", timeout=10) as shape_link_response:
+            if shape_link_response.status != 200:
+                logging.error(f"[StrapiStrategy] Failed to fetch route-shapes for route {route_code}: HTTP {shape_link_response.status}")
+                return None
+            
+            shape_link_data = await shape_link_response.json()
+            route_shapes = shape_link_data.get('data', [])
+            
+            if not route_shapes:
+                logging.error(f"[StrapiStrategy] No route-shapes found for route {route_code}")
+                return None
+        
+        return routes[0], route_shapes
+    
+    async def _fetch_shape_points(self, shape_id: str) -> Optional[List[List[float]]]:
+        """[lon, lat] points of one shape in sequence order (None if the request failed)"""
+        async with self._shape_semaphore:
+            async with self.session.get(f"{self.api_base_url}/api/shapes?filters[shape_id][$eq]={shape_id}&sort=shape_pt_sequence&pagination[pageSize]=1000", timeout=15) as shapes_response:
+                if shapes_response.status != 200:
+                    logging.error(f"[StrapiStrategy] Failed to fetch shapes for shape_id {shape_id}: HTTP {shapes_response.status}")
                     return None
                     
-                route_data = await route_response.json()
-                routes = route_data.get('data', [])
+                shapes_data = await shapes_response.json()
+                shape_points = shapes_data.get('data', [])
                 
-                if not routes:
-                    logging.error(f"[StrapiStrategy] Route {route_code} not found in Strapi")
+        if not shape_points:
+            logging.warning(f"[StrapiStrategy] No shape points found for shape_id {shape_id}")
+        
+        coordinates = []
+        for point in shape_points:
+            lon = point.get('shape_pt_lon')
+            lat = point.get('shape_pt_lat')
+            if lon is not None and lat is not None:
+                coordinates.append([lon, lat])
+        return coordinates
+    
+    async def _fetch_route_info(
+        self,
+        route_code: str,
+        metadata: Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]] = None
+    ) -> Optional[RouteInfo]:
+        """Assemble a RouteInfo from Strapi and store it in the snapshot if every shape loaded"""
+        try:
+            if metadata is None:
+                metadata = await self._fetch_route_metadata(route_code)
+                if metadata is None:
                     return None
+            route, route_shapes = metadata
+            route_name = route.get('long_name', f'Route {route_code}')
+            logging.info(f"[StrapiStrategy] Found route: {route_name} (code: {route_code})")
                 
-                route = routes[0]
-                route_name = route.get('long_name', f'Route {route_code}')
-                
-                logging.info(f"[StrapiStrategy] Found route: {route_name} (code: {route_code})")
-                
-            # Step 2: Get ALL route-shapes for this route
-            async with self.session.get(f"{self.api_base_url}/api/route-shapes?filters[route_id][$eq]={route_code}", timeout=10) as shape_link_response:
-                if shape_link_response.status != 200:
-                    logging.error(f"[StrapiStrategy] Failed to fetch route-shapes for route {route_code}: HTTP {shape_link_response.status}")
-                    return None
-
-                shape_link_data = await shape_link_response.json()
-                route_shapes = shape_link_data.get('data', [])
-
-                if not route_shapes:
-                    logging.error(f"[StrapiStrategy] No route-shapes found for route {route_code}")
-                    return None
-
-            # Step 3: For each shape, get all shape points and concatenate
-            all_coordinates = []
-            all_shape_ids = []
-            for shape in route_shapes:
-                shape_id = shape.get('shape_id')
-                all_shape_ids.append(shape_id)
-                async with self.session.get(f"{self.api_base_url}/api/shapes?filters[shape_id][$eq]={shape_id}&sort=shape_pt_sequence&pagination[pageSize]=1000", timeout=15) as shapes_response:
-                    if shapes_response.status != 200:
-                        logging.error(f"[StrapiStrategy] Failed to fetch shapes for shape_id {shape_id}: HTTP {shapes_response.status}")
-                        continue
-
-                    shapes_data = await shapes_response.json()
-                    shape_points = shapes_data.get('data', [])
-
-                    if not shape_points:
-                        logging.warning(f"[StrapiStrategy] No shape points found for shape_id {shape_id}")
-                        continue
-
-                    for point in shape_points:
-                        lon = point.get('shape_pt_lon')
-                        lat = point.get('shape_pt_lat')
-                        if lon is not None and lat is not None:
-                            all_coordinates.append([lon, lat])
+            # Step 3: Fetch every shape concurrently (bounded), concatenate in route-shape order
+            all_shape_ids = [shape.get('shape_id') for shape in route_shapes]
+            shape_coordinates = await asyncio.gather(
+                *(self._fetch_shape_points(shape_id) for shape_id in all_shape_ids)
+            )
+            all_coordinates = [coord for coords in shape_coordinates if coords for coord in coords]
 
             coordinate_count = len(all_coordinates)
 
@@ -615,6 +645,12 @@ class StrapiStrategy(ApiStrategy):
                 shape_id=','.join(all_shape_ids)  # List all shape_ids used
             )
 
+            # Partial routes (a failed shape request) are not persisted
+            if all(coords is not None for coords in shape_coordinates):
+                self.route_snapshot.put(route_code, route_info, route_fingerprint(route, route_shapes))
+                await asyncio.to_thread(self.route_snapshot.save)
+                self._fetched_routes.add(route_code)
+            
             logging.info(f"[StrapiStrategy] ✅ Successfully loaded Route {route_name} with {coordinate_count} GPS coordinates from ALL GTFS shapes")
             return route_info
                     
@@ -622,8 +658,36 @@ class StrapiStrategy(ApiStrategy):
             logging.error(f"[StrapiStrategy] Error fetching route info for {route_code}: {str(e)}")
             return None
     
+    def _revalidate_in_background(self, route_code: str, fingerprint: str) -> None:
+        """Check a snapshot route against Strapi once per process"""
+        if route_code in self._revalidation_tasks or route_code in self._fetched_routes:
+            return
+        self._revalidation_tasks[route_code] = asyncio.create_task(self._revalidate(route_code, fingerprint))
+    
+    async def _revalidate(self, route_code: str, fingerprint: str) -> None:
+        """Refetch shapes only if the route or its shape set changed since the snapshot"""
+        try:
+            metadata = await self._fetch_route_metadata(route_code)
+            if metadata is None:
+                return
+            if route_fingerprint(*metadata) == fingerprint:
+                logging.debug(f"[StrapiStrategy] Snapshot of route {route_code} is current")
+                return
+            logging.info(f"[StrapiStrategy] Route {route_code} changed in Strapi - refreshing snapshot")
+            route_info = await self._fetch_route_info(route_code, metadata)
+            if route_info is not None and self.on_route_refreshed is not None:
+                await self.on_route_refreshed(route_info)
+        except Exception as e:
+            logging.warning(f"[StrapiStrategy] Revalidation of route {route_code} failed: {str(e)}")
+    
     async def close(self) -> None:
-        """Clean up HTTP session"""
+        """Cancel snapshot revalidation and clean up HTTP session"""
+        for task in self._revalidation_tasks.values():
+            if not task.done():
+                task.cancel()
+        if self._revalidation_tasks:
+            await asyncio.gather(*self._revalidation_tasks.values(), return_exceptions=True)
+        self._revalidation_tasks.clear()
         if self.session:
             await self.session.close()
             self.session = None
@@ -664,6 +728,12 @@ class Dispatcher(StateMachine, IDispatcher):
         self.session: Optional[aiohttp.ClientSession] = None
         self.api_connected = False
         self.route_buffer = RouteBuffer()
+        self._watch_route_refreshes()
+    
+    def _watch_route_refreshes(self) -> None:
+        """Route snapshot revalidation updates the live route buffer (new vehicles pick it up)"""
+        if isinstance(self.api_strategy, StrapiStrategy):
+            self.api_strategy.on_route_refreshed = self.route_buffer.add_route
     
     async def initialize(self) -> bool:
         """Initialize dispatcher with API connection - NO fallback allowed."""
@@ -853,8 +923,10 @@ class Dispatcher(StateMachine, IDispatcher):
             await self.route_buffer.clear()
             populated_count = 0
             
-            for route_id in route_ids:
-                route_info = await self.get_route_info(route_id)
+            # Routes load concurrently; the strategy bounds the shape requests in flight
+            route_infos = await asyncio.gather(*(self.get_route_info(route_id) for route_id in route_ids))
+            
+            for route_id, route_info in zip(route_ids, route_infos):
                 if route_info:
                     success = await self.route_buffer.add_route(route_info)
                     if success:
@@ -891,6 +963,20 @@ class Dispatcher(StateMachine, IDispatcher):
             logging.error(f"[{self.component_name}] Error querying routes by GPS ({lat}, {lon}): {str(e)}")
             return []
     
+    async def query_boarding_points(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 3,
+        walking_distance_km: float = 0.5
+    ) -> List[BoardingPoint]:
+        """Query route buffer for the boarding point on each of the k nearest routes."""
+        try:
+            return await self.route_buffer.get_boarding_points(lat, lon, k, walking_distance_km)
+        except Exception as e:
+            logging.error(f"[{self.component_name}] Error querying boarding points ({lat}, {lon}): {str(e)}")
+            return []
+    
     async def get_route_buffer_stats(self) -> Dict[str, Any]:
         """Get route buffer statistics for monitoring."""
         try:
@@ -940,6 +1026,7 @@ class Dispatcher(StateMachine, IDispatcher):
             # Switch to Strapi strategy
             self.api_strategy = StrapiStrategy(api_url)
             self.api_base_url = api_url
+            self._watch_route_refreshes()
             
             # Initialize new strategy
             await self.api_strategy.initialize()
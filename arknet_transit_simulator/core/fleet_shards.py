@@ -0,0 +1,663 @@
+"""
+Fleet Shards - run the fleet across worker processes behind one coordinator.
+
+With --workers N the vehicle assignments are partitioned by route (every vehicle
+of a route lands on the same worker, so the route cache, depot queue and
+passenger lookups of a route stay in one process) and each worker process runs
+an ordinary CleanVehicleSimulator for its vehicles only: its own event loop,
+event scheduler, engine threads and GPS uplinks, so vehicle work is spread over
+N cores instead of sharing one interpreter lock.
+
+The coordinator (the process serving the Fleet Management API on port 5001)
+keeps no vehicles. Workers connect back over a local authenticated socket
+(multiprocessing.connection), send per-vehicle state diffs every
+FLEET_TICK_SECONDS and execute commands (start/stop engine, boarding,
+passenger checks, sim time changes, shutdown). The coordinator mirrors each
+vehicle as a RemoteDriver, which exposes the attributes and coroutines the API
+routes and the fleet stream already use, so /api/* and /ws/events work
+unchanged on top of the mirrored fleet:
+
+    coordinator = FleetShardCoordinator(workers=4, simulator_options={...})
+    await coordinator.start(pairs)           # spawns and connects the workers
+    simulator.active_drivers = coordinator.drivers
+    ...
+    await coordinator.stop()
+
+Every worker runs its own copy of the simulation clock. Warped clocks stay in
+step (they are started from the coordinator's clock); discrete clocks
+(--as-fast-as-possible) advance independently, each as fast as its own shard
+allows.
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import secrets
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from multiprocessing.connection import Client, Listener
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from arknet_transit_simulator.api.events.fleet_stream import FLEET_TICK_SECONDS, diff_fleet, vehicle_state
+from arknet_transit_simulator.core.states import DriverState
+from common.sim_clock import configure_sim_clock, get_sim_clock
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for every worker to connect after spawning
+CONNECT_TIMEOUT_SECONDS = 60.0
+
+# Seconds to wait for a worker to answer a command
+COMMAND_TIMEOUT_SECONDS = 30.0
+
+# Seconds a worker gets to shut its vehicles down before it is terminated
+SHUTDOWN_TIMEOUT_SECONDS = 30.0
+
+
+class ShardError(RuntimeError):
+    """A worker process is unreachable or failed to execute a command"""
+
+
+def partition_fleet(pairs: Sequence[Tuple[Any, Any]], workers: int) -> List[List[Tuple[Any, Any]]]:
+    """
+    Split (vehicle_assignment, driver_assignment) pairs into route groups per worker.
+
+    Routes are placed largest first on the least loaded worker, so shards differ
+    by at most one route's vehicles. With fewer routes than workers some shards
+    stay empty.
+
+    Args:
+        pairs: Index-aligned vehicle/driver assignments from the dispatcher
+        workers: Number of shards
+
+    Returns:
+        One list of pairs per worker (in assignment order within each shard)
+    """
+    groups: Dict[Any, List[int]] = {}
+    for position, (vehicle, _) in enumerate(pairs):
+        route = getattr(vehicle, 'route_id', None) or f"vehicle:{vehicle.vehicle_id}"
+        groups.setdefault(route, []).append(position)
+
+    shards: List[List[int]] = [[] for _ in range(max(1, workers))]
+    for route, positions in sorted(groups.items(), key=lambda item: (-len(item[1]), str(item[0]))):
+        min(shards, key=len).extend(positions)
+    return [[pairs[position] for position in sorted(shard)] for shard in shards]
+
+
+def shard_vehicle_state(driver) -> Dict[str, Any]:
+    """vehicle_state() plus the conductor fields the coordinator mirrors"""
+    state = vehicle_state(driver)
+    conductor = getattr(driver, 'conductor', None)
+    conductor_state = getattr(conductor, 'conductor_state', None)
+    state.update({
+        'conductor_id': getattr(conductor, 'component_id', None),
+        'conductor_name': getattr(conductor, 'person_name', None),
+        'conductor_state': conductor_state.value if conductor_state is not None else None,
+        'depot_boarding_active': bool(getattr(conductor, 'depot_boarding_active', False)),
+    })
+    return state
+
+
+def _state_enum(enum_type: Type[Enum], value: Any) -> Any:
+    try:
+        return enum_type(value)
+    except ValueError:
+        return SimpleNamespace(value=value)
+
+
+# ============================================================================
+# WORKER SIDE
+# ============================================================================
+
+@dataclass
+class ShardSpec:
+    """Everything a worker process needs to run its part of the fleet"""
+    index: int
+    vehicle_ids: List[str]
+    address: Tuple[str, int]
+    authkey: bytes
+    simulator_options: Dict[str, Any] = field(default_factory=dict)
+    duration: Optional[float] = None  # simulated seconds (None: until told to shut down)
+    clock: Optional[Dict[str, Any]] = None  # coordinator clock settings (None: realtime)
+    log_level: int = logging.INFO
+    log_rate: float = 1.0
+
+
+def run_shard(spec: ShardSpec) -> None:
+    """Worker process entry point (module level so the spawn start method can import it)"""
+    # Ctrl+C reaches the whole process group; the coordinator orchestrates shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from arknet_transit_simulator.utils.logging_system import RateLimitFilter, start_queue_logging
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(f'%(asctime)s | %(levelname)s | shard {spec.index} | %(message)s'))
+    root_logger = logging.getLogger()
+    root_logger.setLevel(spec.log_level)
+    root_logger.handlers.clear()
+    root_logger.addHandler(handler)
+    start_queue_logging(root_logger, RateLimitFilter(rate=spec.log_rate))
+
+    if spec.clock is not None:
+        settings = dict(spec.clock)
+        started_at = settings.pop('wall')
+        if not settings['discrete']:
+            # Catch up on the simulated time that passed while this process started
+            settings['start'] += timedelta(seconds=(time.time() - started_at) * settings['warp'])
+        configure_sim_clock(**settings)
+
+    asyncio.run(_serve_shard(spec))
+
+
+async def _serve_shard(spec: ShardSpec) -> None:
+    from arknet_transit_simulator.simulator import CleanVehicleSimulator
+
+    simulator = CleanVehicleSimulator(enable_api=False, vehicle_ids=spec.vehicle_ids, **spec.simulator_options)
+    link = ShardLink(spec.index, simulator, Client(spec.address, authkey=spec.authkey))
+    await link.start()
+    try:
+        if await simulator.initialize():
+            logger.info(f"🧩 Shard {spec.index}: running {len(spec.vehicle_ids)} vehicles (pid {os.getpid()})")
+            await simulator.run(duration=spec.duration)
+        else:
+            logger.error(f"Shard {spec.index}: simulator initialization failed")
+    finally:
+        await link.stop()
+
+
+class ShardLink:
+    """
+    Worker end of the coordinator connection: state diffs out, commands in.
+    """
+
+    def __init__(self, index: int, simulator, connection, report_seconds: float = FLEET_TICK_SECONDS):
+        """
+        Args:
+            index: Shard number
+            simulator: The worker's CleanVehicleSimulator
+            connection: Connected multiprocessing.connection.Connection
+            report_seconds: Wall seconds between state reports
+        """
+        self.index = index
+        self.simulator = simulator
+        self.connection = connection
+        self.report_seconds = report_seconds
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._idle: Optional[List[str]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._report_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._send({'type': 'hello', 'shard': self.index, 'pid': os.getpid()})
+        threading.Thread(target=self._read_loop, name=f"shard-{self.index}-commands", daemon=True).start()
+        self._report_task = asyncio.create_task(self._report_loop())
+
+    async def stop(self) -> None:
+        if self._report_task:
+            self._report_task.cancel()
+        try:
+            # Explicit goodbye: closing does not interrupt the blocked command reader
+            self._send({'type': 'bye'})
+            self._closed = True
+            self.connection.close()
+        except OSError:
+            self._closed = True
+
+    def report(self) -> None:
+        """Send the state changes since the last report (nothing if nothing changed)"""
+        current = {driver.vehicle_id: shard_vehicle_state(driver) for driver in self.simulator.active_drivers}
+        idle = [getattr(driver, 'vehicle_id', None) for driver in self.simulator.idle_drivers]
+        delta = diff_fleet(self._state, current)
+        if delta['changed'] or delta['removed'] or idle != self._idle:
+            self._send({'type': 'state', 'changed': delta['changed'], 'removed': delta['removed'], 'idle': idle})
+        self._state = current
+        self._idle = idle
+
+    async def _report_loop(self) -> None:
+        # Wall-clock cadence: reports feed the API, they are not simulation events
+        while True:
+            try:
+                self.report()
+            except Exception as e:
+                logger.warning(f"Shard {self.index}: state report failed: {e}")
+            await asyncio.sleep(self.report_seconds)
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        if not self._closed:
+            self.connection.send(message)
+
+    def _read_loop(self) -> None:
+        while True:
+            try:
+                message = self.connection.recv()
+            except (EOFError, OSError):
+                break
+            self._call_soon(self._dispatch, message)
+        if not self._closed:
+            logger.warning(f"Shard {self.index}: coordinator connection lost, stopping")
+            self._call_soon(self.simulator.stop)
+
+    def _call_soon(self, callback, *args) -> None:
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # event loop already closed
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        kind = message.get('type')
+        if kind == 'command':
+            asyncio.create_task(self._run_command(message))
+        elif kind == 'set_time':
+            self.simulator.set_sim_time(message['when'])
+        elif kind == 'shutdown':
+            logger.info(f"Shard {self.index}: shutdown requested by coordinator")
+            self.simulator.stop()
+
+    async def _run_command(self, message: Dict[str, Any]) -> None:
+        result = error = None
+        try:
+            result = await self._execute(message['vehicle_id'], message['action'], message.get('args') or {})
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        if message.get('id') is not None:
+            self._send({'type': 'reply', 'id': message['id'], 'result': result, 'error': error})
+        elif error:
+            logger.warning(f"Shard {self.index}: {message['action']} for {message['vehicle_id']} failed: {error}")
+
+    async def _execute(self, vehicle_id: str, action: str, args: Dict[str, Any]) -> Any:
+        driver = next((d for d in self.simulator.active_drivers if d.vehicle_id == vehicle_id), None)
+        if driver is None:
+            raise ShardError(f"Vehicle {vehicle_id} is not active in shard {self.index}")
+        conductor = getattr(driver, 'conductor', None)
+        if action == 'start_engine':
+            return await driver.start_engine()
+        if action == 'stop_engine':
+            return await driver.stop_engine()
+        if conductor is None:
+            raise ShardError(f"Vehicle {vehicle_id} has no conductor")
+        if action == 'set_boarding':
+            conductor.start_boarding() if args.get('active') else conductor.stop_boarding()
+            return args.get('active')
+        if action == 'check_for_passengers':
+            return await conductor.check_for_passengers(args['lat'], args['lon'], args.get('route_id'))
+        raise ShardError(f"Unknown shard command: {action}")
+
+
+# ============================================================================
+# COORDINATOR SIDE
+# ============================================================================
+
+class RemoteConductor:
+    """Coordinator-side mirror of a worker's conductor"""
+
+    def __init__(self, driver: "RemoteDriver"):
+        self._driver = driver
+        self._boarding_active = False
+        self.component_id = None
+        self.person_name = None
+        self.conductor_state = None
+        self.assigned_route_id = None
+        self.current_vehicle_position = None
+        self.passengers_on_board = 0
+        self.capacity = 0
+        self.depot_boarding_active = False
+
+    @property
+    def boarding_active(self) -> bool:
+        return self._boarding_active
+
+    def start_boarding(self) -> None:
+        self._set_boarding(True)
+
+    def stop_boarding(self) -> None:
+        self._set_boarding(False)
+
+    def _set_boarding(self, active: bool) -> None:
+        self._boarding_active = active
+        self._driver.shard.notify(self._driver.vehicle_id, 'set_boarding', active=active)
+
+    async def check_for_passengers(self, lat: float, lon: float, route_id: Optional[str] = None) -> Any:
+        return await self._driver.shard.request(
+            self._driver.vehicle_id, 'check_for_passengers', lat=lat, lon=lon, route_id=route_id)
+
+
+class RemoteDriver:
+    """
+    Coordinator-side mirror of a worker's VehicleDriver.
+
+    Carries the attributes read by vehicle_state() and the API routes; engine
+    commands are forwarded to the worker that owns the vehicle.
+    """
+
+    def __init__(self, vehicle_id: str, shard: "_WorkerShard"):
+        self.vehicle_id = vehicle_id
+        self.shard = shard
+        self.component_id = vehicle_id
+        self.person_name = None
+        self.assigned_route_id = None
+        self.current_state = None
+        self.engine = SimpleNamespace(running=False)
+        self.gps_device = None
+        self.conductor = RemoteConductor(self)
+
+    def update(self, fields: Dict[str, Any]) -> None:
+        """Apply a state diff (shard_vehicle_state() fields) from the worker"""
+        conductor = self.conductor
+        for key, value in fields.items():
+            if key == 'driver_id':
+                self.component_id = value
+            elif key == 'driver_name':
+                self.person_name = value
+            elif key == 'route_id':
+                self.assigned_route_id = conductor.assigned_route_id = value
+            elif key == 'driver_state':
+                self.current_state = _state_enum(DriverState, value)
+            elif key == 'engine_running':
+                self.engine.running = value
+            elif key == 'gps_running':
+                self.gps_device = True if value else None
+            elif key in ('current_lat', 'current_lon'):
+                continue
+            elif key == 'passenger_count':
+                conductor.passengers_on_board = value
+            elif key == 'capacity':
+                conductor.capacity = value
+            elif key == 'boarding_active':
+                conductor._boarding_active = value
+            elif key == 'conductor_id':
+                conductor.component_id = value
+            elif key == 'conductor_name':
+                conductor.person_name = value
+            elif key == 'conductor_state':
+                from arknet_transit_simulator.vehicle.conductor import ConductorState
+                conductor.conductor_state = _state_enum(ConductorState, value) if value is not None else None
+            elif key == 'depot_boarding_active':
+                conductor.depot_boarding_active = value
+        if 'current_lat' in fields or 'current_lon' in fields:
+            lat, lon = conductor.current_vehicle_position or (None, None)
+            lat = fields.get('current_lat', lat)
+            lon = fields.get('current_lon', lon)
+            conductor.current_vehicle_position = (lat, lon) if lat is not None and lon is not None else None
+
+    async def start_engine(self) -> Any:
+        return await self.shard.request(self.vehicle_id, 'start_engine')
+
+    async def stop_engine(self) -> Any:
+        return await self.shard.request(self.vehicle_id, 'stop_engine')
+
+    async def stop(self) -> None:
+        """Nothing to do: the owning worker stops its vehicles on shutdown"""
+
+
+class _WorkerShard:
+    """Coordinator's handle on one worker: process, connection and mirrored vehicles"""
+
+    def __init__(self, index: int, vehicle_ids: List[str], process):
+        self.index = index
+        self.vehicle_ids = vehicle_ids
+        self.process = process
+        self.connection = None
+        self.drivers: Dict[str, RemoteDriver] = {}
+        self.idle_vehicle_ids: List[str] = []
+        self.connected = asyncio.Event()
+        self.finished = asyncio.Event()
+        self._replies: Dict[int, asyncio.Future] = {}
+        self._request_ids = itertools.count(1)
+        self._send_lock = threading.Lock()
+
+    def send(self, message: Dict[str, Any]) -> bool:
+        if self.connection is None or self.finished.is_set():
+            return False
+        try:
+            with self._send_lock:
+                self.connection.send(message)
+            return True
+        except (OSError, ValueError) as e:
+            logger.warning(f"Shard {self.index}: send failed: {e}")
+            return False
+
+    def notify(self, vehicle_id: str, action: str, **args: Any) -> None:
+        """Send a command without waiting for its result"""
+        self.send({'type': 'command', 'id': None, 'vehicle_id': vehicle_id, 'action': action, 'args': args})
+
+    async def request(self, vehicle_id: str, action: str, **args: Any) -> Any:
+        """Send a command and wait for the worker's result"""
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._replies[request_id] = future
+        try:
+            if not self.send({'type': 'command', 'id': request_id, 'vehicle_id': vehicle_id,
+                              'action': action, 'args': args}):
+                raise ShardError(f"Shard {self.index} is not connected")
+            return await asyncio.wait_for(future, COMMAND_TIMEOUT_SECONDS)
+        finally:
+            self._replies.pop(request_id, None)
+
+    def resolve(self, message: Dict[str, Any]) -> None:
+        future = self._replies.get(message.get('id'))
+        if future is None or future.done():
+            return
+        if message.get('error'):
+            future.set_exception(ShardError(message['error']))
+        else:
+            future.set_result(message.get('result'))
+
+    def fail_pending(self) -> None:
+        for future in self._replies.values():
+            if not future.done():
+                future.set_exception(ShardError(f"Shard {self.index} exited"))
+
+
+class FleetShardCoordinator:
+    """
+    Spawns the worker processes and mirrors their vehicles for the API.
+    """
+
+    def __init__(self, workers: int, simulator_options: Optional[Dict[str, Any]] = None,
+                 duration: Optional[float] = None, log_level: Optional[int] = None, log_rate: float = 1.0):
+        """
+        Args:
+            workers: Number of worker processes
+            simulator_options: CleanVehicleSimulator keyword arguments for every worker
+            duration: Simulated seconds each worker runs (None: until stop())
+            log_level: Worker log level (default: the coordinator's root logger level)
+            log_rate: Worker log rate limit (lines per second per message and vehicle)
+        """
+        self.workers = workers
+        self.simulator_options = dict(simulator_options or {})
+        self.duration = duration
+        self.log_level = log_level if log_level is not None else logging.getLogger().getEffectiveLevel()
+        self.log_rate = log_rate
+        self.shards: List[_WorkerShard] = []
+        # Updated in place, so simulator.active_drivers / idle_drivers can share them
+        self.drivers: List[RemoteDriver] = []
+        self.idle_vehicle_ids: List[str] = []
+        self._listener: Optional[Listener] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        """True while any worker is still running"""
+        return any(not shard.finished.is_set() for shard in self.shards)
+
+    async def start(self, pairs: Sequence[Tuple[Any, Any]]) -> int:
+        """
+        Partition the fleet, spawn one worker per non-empty shard and wait for them to connect.
+
+        A worker that exits or times out before connecting is terminated and
+        marked finished (it never gets a read loop that would do so).
+
+        Args:
+            pairs: Index-aligned (vehicle_assignment, driver_assignment) pairs
+
+        Returns:
+            Number of connected workers
+        """
+        self._loop = asyncio.get_running_loop()
+        authkey = secrets.token_bytes(32)
+        self._listener = Listener(('127.0.0.1', 0), authkey=authkey)
+        context = multiprocessing.get_context('spawn')
+        clock = self._clock_settings()
+
+        groups = [group for group in partition_fleet(pairs, self.workers) if group]
+        for index, group in enumerate(groups):
+            vehicle_ids = [vehicle.vehicle_id for vehicle, _ in group]
+            spec = ShardSpec(
+                index=index,
+                vehicle_ids=vehicle_ids,
+                address=self._listener.address,
+                authkey=authkey,
+                simulator_options=self._worker_options(index),
+                duration=self.duration,
+                clock=clock,
+                log_level=self.log_level,
+                log_rate=self.log_rate,
+            )
+            process = context.Process(target=run_shard, args=(spec,), name=f"fleet-shard-{index}", daemon=True)
+            process.start()
+            self.shards.append(_WorkerShard(index, vehicle_ids, process))
+            routes = sorted({str(vehicle.route_id) for vehicle, _ in group})
+            logger.info(f"🧩 Shard {index} (pid {process.pid}): {len(vehicle_ids)} vehicles on routes {', '.join(routes)}")
+
+        threading.Thread(target=self._accept_loop, name="fleet-shard-accept", daemon=True).start()
+        deadline = time.monotonic() + CONNECT_TIMEOUT_SECONDS
+        await asyncio.gather(*(self._await_connect(shard, deadline) for shard in self.shards))
+        connected = sum(1 for shard in self.shards if shard.connected.is_set())
+        logger.info(f"✅ {connected}/{len(self.shards)} fleet shards connected")
+        return connected
+
+    async def _await_connect(self, shard: _WorkerShard, deadline: float) -> None:
+        """Wait for one worker's hello, giving up early if its process exits"""
+        while not shard.connected.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not shard.process.is_alive():
+                break
+            try:
+                await asyncio.wait_for(shard.connected.wait(), min(remaining, 1.0))
+            except asyncio.TimeoutError:
+                pass
+        if shard.connected.is_set():
+            return
+        if shard.process.is_alive():
+            logger.error(f"Shard {shard.index} did not connect within {CONNECT_TIMEOUT_SECONDS:g}s, terminating it")
+            shard.process.terminate()
+        else:
+            logger.error(f"Shard {shard.index} exited before connecting (exit code {shard.process.exitcode})")
+        shard.finished.set()
+
+    def set_sim_time(self, when: datetime) -> None:
+        for shard in self.shards:
+            shard.send({'type': 'set_time', 'when': when})
+
+    async def stop(self) -> None:
+        """Ask every worker to shut down, wait for them and terminate stragglers"""
+        for shard in self.shards:
+            shard.send({'type': 'shutdown'})
+        pending = [shard.finished.wait() for shard in self.shards if not shard.finished.is_set()]
+        if pending:
+            try:
+                await asyncio.wait_for(asyncio.gather(*pending), SHUTDOWN_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning("Fleet shards did not shut down in time")
+        for shard in self.shards:
+            await asyncio.to_thread(shard.process.join, 5.0)
+            if shard.process.is_alive():
+                logger.warning(f"Terminating shard {shard.index} (pid {shard.process.pid})")
+                shard.process.terminate()
+            if shard.connection is not None:
+                shard.connection.close()
+            shard.fail_pending()
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        self.drivers.clear()
+        self.idle_vehicle_ids.clear()
+
+    def _clock_settings(self) -> Optional[Dict[str, Any]]:
+        clock = get_sim_clock()
+        if clock.is_realtime:
+            return None
+        return {'start': clock.now(timezone.utc), 'warp': clock.warp, 'discrete': clock.discrete,
+                'resolution': clock.resolution, 'wall': time.time()}
+
+    def _worker_options(self, index: int) -> Dict[str, Any]:
+        options = dict(self.simulator_options)
+        profile = options.get('profile_startup')
+        if profile:
+            root, extension = os.path.splitext(profile)
+            options['profile_startup'] = f"{root}.shard{index}{extension or '.json'}"
+        return options
+
+    # -------------------- Connection threads --------------------
+
+    def _accept_loop(self) -> None:
+        listener = self._listener
+        while any(shard.connection is None for shard in self.shards):
+            try:
+                connection = listener.accept()
+                hello = connection.recv()
+            except multiprocessing.AuthenticationError as e:
+                logger.warning(f"Rejected fleet shard connection: {e}")
+                continue
+            except (OSError, EOFError):
+                return  # listener closed
+            shard = self.shards[hello['shard']]
+            shard.connection = connection
+            threading.Thread(target=self._read_loop, args=(shard,), name=f"fleet-shard-{shard.index}",
+                             daemon=True).start()
+            self._call_soon(shard.connected.set)
+
+    def _read_loop(self, shard: _WorkerShard) -> None:
+        while True:
+            try:
+                message = shard.connection.recv()
+            except (EOFError, OSError):
+                break
+            if message.get('type') == 'bye':
+                break
+            self._call_soon(self._on_message, shard, message)
+        self._call_soon(self._on_shard_closed, shard)
+
+    def _call_soon(self, callback, *args) -> None:
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # event loop already closed
+
+    # -------------------- Event loop side --------------------
+
+    def _on_message(self, shard: _WorkerShard, message: Dict[str, Any]) -> None:
+        kind = message.get('type')
+        if kind == 'state':
+            self._apply_state(shard, message)
+        elif kind == 'reply':
+            shard.resolve(message)
+
+    def _apply_state(self, shard: _WorkerShard, message: Dict[str, Any]) -> None:
+        for vehicle_id in message.get('removed', ()):
+            driver = shard.drivers.pop(vehicle_id, None)
+            if driver is not None:
+                self.drivers.remove(driver)
+        for vehicle_id, fields in message.get('changed', {}).items():
+            driver = shard.drivers.get(vehicle_id)
+            if driver is None:
+                driver = shard.drivers[vehicle_id] = RemoteDriver(vehicle_id, shard)
+                self.drivers.append(driver)
+            driver.update(fields)
+        if 'idle' in message:
+            shard.idle_vehicle_ids = list(message['idle'])
+            self.idle_vehicle_ids[:] = [vehicle_id for each in self.shards for vehicle_id in each.idle_vehicle_ids]
+
+    def _on_shard_closed(self, shard: _WorkerShard) -> None:
+        shard.finished.set()
+        shard.fail_pending()
+        self._apply_state(shard, {'removed': list(shard.drivers), 'idle': []})
+        logger.info(f"🧩 Shard {shard.index} disconnected")
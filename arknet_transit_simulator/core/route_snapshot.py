@@ -0,0 +1,118 @@
+"""
+Route Snapshot - persistent on-disk cache of assembled RouteInfo.
+
+Building a RouteInfo from Strapi takes one request for the route, one for its
+route-shapes and one per shape. The snapshot stores the assembled result per
+route code together with a fingerprint of its inputs (route and route-shape
+updatedAt stamps plus the shape set), so a restarted simulator serves every
+route from local disk and only revalidates the fingerprint in the background.
+
+File location: ROUTE_SNAPSHOT_PATH environment variable, defaulting to
+~/.cache/arknet_transit_simulator/route_snapshot.json. Set it to an empty
+string to disable the snapshot.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .interfaces import RouteInfo
+
+ROUTE_SNAPSHOT_VERSION = 1
+DEFAULT_ROUTE_SNAPSHOT_PATH = Path.home() / ".cache" / "arknet_transit_simulator" / "route_snapshot.json"
+
+
+def route_fingerprint(route: Dict[str, Any], route_shapes: List[Dict[str, Any]]) -> str:
+    """Stable hash of everything a RouteInfo is assembled from (shape order included)"""
+    parts = [str(route.get('documentId') or route.get('id')), str(route.get('updatedAt') or '')]
+    parts.extend(f"{shape.get('shape_id')}@{shape.get('updatedAt') or ''}" for shape in route_shapes)
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+class RouteSnapshot:
+    """Route code -> (RouteInfo, fingerprint), persisted as one JSON file"""
+    
+    def __init__(self, path: Optional[Path]):
+        """
+        Args:
+            path: Snapshot file; None keeps the snapshot in memory only
+        """
+        self.path = Path(path) if path else None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+    
+    @classmethod
+    def from_env(cls) -> "RouteSnapshot":
+        """Snapshot at ROUTE_SNAPSHOT_PATH (empty string: in-memory only)"""
+        return cls(os.getenv("ROUTE_SNAPSHOT_PATH", str(DEFAULT_ROUTE_SNAPSHOT_PATH)) or None)
+    
+    def load(self) -> int:
+        """Read the snapshot file (once). Returns the number of routes available."""
+        if self._loaded:
+            return len(self._entries)
+        self._loaded = True
+        if self.path is None or not self.path.exists():
+            return 0
+        try:
+            payload = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logging.warning(f"[RouteSnapshot] Ignoring unreadable snapshot {self.path}: {e}")
+            return 0
+        if payload.get('version') != ROUTE_SNAPSHOT_VERSION:
+            logging.info(f"[RouteSnapshot] Ignoring snapshot {self.path} (version {payload.get('version')})")
+            return 0
+        self._entries = payload.get('routes') or {}
+        logging.info(f"[RouteSnapshot] Loaded {len(self._entries)} routes from {self.path}")
+        return len(self._entries)
+    
+    def get(self, route_code: str) -> Optional[Tuple[RouteInfo, str]]:
+        """(RouteInfo, fingerprint) stored for a route code, if any"""
+        self.load()
+        entry = self._entries.get(route_code)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return RouteInfo(**entry['route_info']), entry['fingerprint']
+    
+    def put(self, route_code: str, route_info: RouteInfo, fingerprint: str) -> None:
+        self.load()
+        self._entries[route_code] = {
+            'fingerprint': fingerprint,
+            'saved_at': time.time(),
+            'route_info': asdict(route_info),
+        }
+    
+    def save(self) -> None:
+        """Write the snapshot atomically (temp file + rename); safe to call from a thread"""
+        if self.path is None:
+            return
+        with self._lock:
+            payload = json.dumps({'version': ROUTE_SNAPSHOT_VERSION, 'routes': dict(self._entries)})
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+                tmp_path.write_text(payload, encoding='utf-8')
+                os.replace(tmp_path, self.path)
+                self.writes += 1
+            except OSError as e:
+                logging.warning(f"[RouteSnapshot] Could not write snapshot {self.path}: {e}")
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'path': str(self.path) if self.path else None,
+            'routes': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+        }
@@ -0,0 +1,227 @@
+"""
+Startup Pipeline - dependency-ordered, concurrent simulator initialization.
+
+Startup work is declared as named steps with dependencies; every step starts
+as soon as the steps it depends on have finished, so independent work (depot
+validation and API app creation, route prefetch and API server start, the
+per-vehicle bring-up of drivers, conductors and GPS transmitters) overlaps
+instead of running back to back:
+
+    pipeline = StartupPipeline(profiler)
+    pipeline.add("depot", depot.initialize)
+    pipeline.add("fleet_api", create_api)
+    pipeline.add("routes", prefetch_routes, depends_on=("depot",))
+    results = await pipeline.run()
+
+A StartupProfiler records every step (and any span opened inside a step, e.g.
+per-vehicle phases) on one timeline, written as JSON with --profile-startup.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Default concurrent per-vehicle initializations
+DEFAULT_STARTUP_FANOUT = 8
+
+
+class StartupError(Exception):
+    """Startup graph is invalid or a critical step failed"""
+
+
+@dataclass
+class StartupStep:
+    """One node of the startup graph"""
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    depends_on: Sequence[str] = ()
+    critical: bool = True
+
+
+class StartupProfiler:
+    """Timeline of startup spans (milliseconds since the profiler was created)"""
+    
+    def __init__(self):
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+    
+    def _now_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000
+    
+    @asynccontextmanager
+    async def span(self, name: str, vehicle_id: Optional[str] = None):
+        """Record the duration of a block; failures are recorded and re-raised"""
+        start_ms = self._now_ms()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            self.record(name, start_ms, self._now_ms(), status, vehicle_id)
+    
+    def record(self, name: str, start_ms: float, end_ms: float, status: str = "ok", vehicle_id: Optional[str] = None):
+        span = {
+            'name': name,
+            'start_ms': round(start_ms, 2),
+            'duration_ms': round(end_ms - start_ms, 2),
+            'status': status,
+        }
+        if vehicle_id is not None:
+            span['vehicle_id'] = vehicle_id
+        self.spans.append(span)
+    
+    def report(self) -> Dict[str, Any]:
+        """Per-phase and per-vehicle durations"""
+        phases = [span for span in self.spans if 'vehicle_id' not in span]
+        vehicles: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans:
+            if 'vehicle_id' in span:
+                entry = vehicles.setdefault(span['vehicle_id'], {'phases': {}, 'start_ms': span['start_ms'], 'end_ms': 0.0})
+                entry['phases'][span['name']] = span['duration_ms']
+                entry['start_ms'] = min(entry['start_ms'], span['start_ms'])
+                entry['end_ms'] = max(entry['end_ms'], span['start_ms'] + span['duration_ms'])
+        for entry in vehicles.values():
+            entry['total_ms'] = round(entry.pop('end_ms') - entry['start_ms'], 2)
+        return {
+            'started_at': self.started_at,
+            'total_ms': round(max((s['start_ms'] + s['duration_ms'] for s in self.spans), default=0.0), 2),
+            'phases': sorted(phases, key=lambda span: span['start_ms']),
+            'vehicles': vehicles,
+        }
+    
+    def write(self, path: str) -> Path:
+        """Write the report as JSON and return the path"""
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(self.report(), indent=2), encoding='utf-8')
+        return out
+    
+    def summary_lines(self) -> List[str]:
+        report = self.report()
+        lines = [f"⏱️  Startup timeline ({report['total_ms']:.0f}ms total):"]
+        for phase in report['phases']:
+            icon = "✅" if phase['status'] == "ok" else "⏭️" if phase['status'] == "skipped" else "❌"
+            lines.append(f"   {icon} {phase['name']:<22} +{phase['start_ms']:>8.1f}ms  {phase['duration_ms']:>8.1f}ms")
+        if report['vehicles']:
+            slowest = max(report['vehicles'].items(), key=lambda item: item[1]['total_ms'])
+            lines.append(f"   🚌 {len(report['vehicles'])} vehicles, slowest {slowest[0]} ({slowest[1]['total_ms']:.0f}ms)")
+        return lines
+
+
+class StartupPipeline:
+    """Runs startup steps in dependency order, independent steps concurrently"""
+    
+    def __init__(self, profiler: Optional[StartupProfiler] = None):
+        self.profiler = profiler or StartupProfiler()
+        self.steps: Dict[str, StartupStep] = {}
+    
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        depends_on: Sequence[str] = (),
+        critical: bool = True
+    ) -> "StartupPipeline":
+        """
+        Declare a step.
+        
+        Args:
+            name: Unique step name (also the timeline phase name)
+            func: Coroutine function taking no arguments
+            depends_on: Steps that must finish successfully first
+            critical: A failed critical step makes run() raise StartupError
+        """
+        if name in self.steps:
+            raise StartupError(f"Duplicate startup step '{name}'")
+        self.steps[name] = StartupStep(name, func, tuple(depends_on), critical)
+        return self
+    
+    def _validate(self) -> None:
+        """Unknown dependencies and cycles are rejected before anything runs"""
+        for step in self.steps.values():
+            for dependency in step.depends_on:
+                if dependency not in self.steps:
+                    raise StartupError(f"Startup step '{step.name}' depends on unknown step '{dependency}'")
+        
+        visiting, done = set(), set()
+        
+        def visit(name: str, path: List[str]):
+            if name in done:
+                return
+            if name in visiting:
+                raise StartupError(f"Startup dependency cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dependency in self.steps[name].depends_on:
+                visit(dependency, path + [name])
+            visiting.discard(name)
+            done.add(name)
+        
+        for name in self.steps:
+            visit(name, [])
+    
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run every step.
+        
+        Returns:
+            Step name -> return value (steps that failed or were skipped are absent)
+        
+        Raises:
+            StartupError: invalid graph, or a critical step failed (its dependents are skipped)
+        """
+        self._validate()
+        results: Dict[str, Any] = {}
+        failures: Dict[str, BaseException] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+        
+        async def run_step(step: StartupStep):
+            await asyncio.gather(*(tasks[dependency] for dependency in step.depends_on))
+            blocked = [d for d in step.depends_on if d not in results]
+            if blocked:
+                now = self.profiler._now_ms()
+                self.profiler.record(step.name, now, now, status="skipped")
+                logger.warning(f"⏭️ Startup step '{step.name}' skipped ({', '.join(blocked)} did not complete)")
+                return
+            try:
+                async with self.profiler.span(step.name):
+                    results[step.name] = await step.func()
+            except Exception as e:
+                failures[step.name] = e
+                logger.error(f"❌ Startup step '{step.name}' failed: {e}")
+        
+        for name, step in self.steps.items():
+            tasks[name] = asyncio.ensure_future(run_step(step))
+        await asyncio.gather(*tasks.values())
+        
+        critical = [name for name in failures if self.steps[name].critical]
+        if critical:
+            raise StartupError(f"Critical startup step(s) failed: {', '.join(critical)}") from failures[critical[0]]
+        return results
+
+
+async def gather_bounded(
+    items: Iterable[T],
+    func: Callable[[T], Awaitable[R]],
+    limit: int = DEFAULT_STARTUP_FANOUT
+) -> List[R]:
+    """Apply an async function to every item with at most `limit` in flight (results in item order)"""
+    semaphore = asyncio.Semaphore(max(1, limit))
+    
+    async def bounded(item: T) -> R:
+        async with semaphore:
+            return await func(item)
+    
+    return await asyncio.gather(*(bounded(item) for item in items))
@@ -9,6 +9,8 @@ import logging
 from typing import List, Dict, Any, Optional
 import httpx
 
+from common.http_pool import get_http_pool
+
 
 class CommuterServiceClient:
     """
@@ -28,7 +30,8 @@ class CommuterServiceClient:
         """
         self.base_url = base_url.rstrip("/")
         self.logger = logger or logging.getLogger(__name__)
-        self.client = httpx.AsyncClient(timeout=10.0)
+        # Latency per upstream is exported on /metrics through the shared pool's stats
+        self.client = httpx.AsyncClient(timeout=10.0, event_hooks=get_http_pool().event_hooks("commuter"))
     
     async def connect(self) -> bool:
         """Test connection to commuter_service."""
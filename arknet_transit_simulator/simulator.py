@@ -82,8 +82,14 @@ user preference for clarity and            #leet Summary
 from __future__ import annotations
 import asyncio
 import logging
-from typing import Optional
-from datetime import datetime
+from typing import Iterable, Optional
+from datetime import datetime, timezone
+
+from arknet_transit_simulator.core.startup_pipeline import (
+    DEFAULT_STARTUP_FANOUT, StartupError, StartupPipeline, StartupProfiler, gather_bounded,
+)
+from common.event_scheduler import get_event_scheduler
+from common.sim_clock import get_sim_clock
 
 logger = logging.getLogger(__name__)
 
@@ -97,7 +103,7 @@ except ImportError:
 class CleanVehicleSimulator:
     """Minimal orchestrator wrapper for depot + dispatcher lifecycle."""
 
-    def __init__(self, api_url: Optional[str] = None, enable_boarding_after: float = None, gps_config: dict = None, sim_time = None, enable_api: bool = True, api_port: int = 5001) -> None:
+    def __init__(self, api_url: Optional[str] = None, enable_boarding_after: float = None, gps_config: dict = None, sim_time = None, enable_api: bool = True, api_port: int = 5001, profile_startup: Optional[str] = None, startup_fanout: int = DEFAULT_STARTUP_FANOUT, workers: int = 1, vehicle_ids: Optional[Iterable[str]] = None, log_rate: float = 1.0) -> None:
         """
         Initialize vehicle simulator.
         
@@ -105,9 +111,15 @@ class CleanVehicleSimulator:
             api_url: Strapi API URL. If None, loads from config.ini via ConfigProvider.
             enable_boarding_after: Delay in seconds before auto-enabling boarding
             gps_config: GPS server configuration dict
-            sim_time: Simulation time (datetime) for testing passenger spawn windows
+            sim_time: Simulation start time (datetime); the shared SimClock runs from there
             enable_api: Whether to start the embedded fleet management API
             api_port: Port for the fleet management API (default: 5001)
+            profile_startup: Write the startup timeline (JSON) to this path once vehicles are up
+            startup_fanout: Maximum vehicles initialized concurrently
+            workers: Run the fleet in this many worker processes (sharded by route);
+                this process then only serves the API and coordinates the workers
+            vehicle_ids: Only run these vehicles (a worker's shard of the fleet)
+            log_rate: Worker log rate limit (lines per second per message and vehicle)
         """
         # Load api_url from config if not provided
         if api_url is None:
@@ -123,7 +135,9 @@ class CleanVehicleSimulator:
         self.api_url = api_url
         self.enable_boarding_after = enable_boarding_after  # Delay in seconds before auto-enabling boarding
         self.gps_config = gps_config or {}  # GPS server configuration
-        self.sim_time = sim_time  # Simulation time for testing
+        self.sim_time = sim_time  # Simulation start time
+        if sim_time is not None and get_sim_clock().is_realtime:
+            get_sim_clock().set_time(sim_time)
         self.enable_api = enable_api  # Whether to start embedded API
         self.api_port = api_port  # Fleet management API port
         self.dispatcher = None
@@ -132,6 +146,14 @@ class CleanVehicleSimulator:
         self.active_drivers = []
         self.idle_drivers = []
         self._api_server = None  # uvicorn server instance
+        self.fleet_publisher = None  # fleet state stream for /ws/events
+        self.profile_startup = profile_startup
+        self.startup_fanout = startup_fanout
+        self.startup_profiler = StartupProfiler()
+        self.workers = max(1, workers)
+        self.vehicle_ids = set(vehicle_ids) if vehicle_ids is not None else None
+        self.log_rate = log_rate
+        self.shards = None  # FleetShardCoordinator when workers > 1
 
     async def initialize(self) -> bool:
         try:
@@ -143,14 +165,16 @@ class CleanVehicleSimulator:
             self.depot = DepotManager("MainDepot")
             self.depot.set_dispatcher(self.dispatcher)
 
-            ok = await self.depot.initialize()
-            if not ok:
-                logger.error("Depot initialization failed")
-                return False
-            
-            # Initialize Fleet Management API if enabled
+            # Depot validation (Strapi round trips) and API app creation are independent
+            pipeline = StartupPipeline(self.startup_profiler)
+            pipeline.add("depot", self._initialize_depot)
             if self.enable_api:
-                await self._initialize_api()
+                pipeline.add("fleet_api", self._initialize_api)
+            try:
+                await pipeline.run()
+            except StartupError as e:
+                logger.error(f"Startup failed: {e}")
+                return False
             
             logger.info("Clean simulator initialized ✔")
             return True
@@ -158,30 +182,41 @@ class CleanVehicleSimulator:
             logger.error(f"Initialization error: {e}")
             return False
 
+    async def _initialize_depot(self) -> None:
+        if not await self.depot.initialize():
+            raise StartupError("Depot initialization failed")
+    
     async def run(self, duration: Optional[float] = None) -> None:
         if not self.depot:
             logger.error("Simulator not initialized")
             return
         self._running = True
         
-        # Start Fleet Management API server if enabled
-        if self.enable_api:
-            await self._start_api_server()
+        # Discrete clocks: time stands still until startup is done (or stalls)
+        clock = get_sim_clock()
+        clock.hold(asyncio.current_task())
+        clock.start()
+        logger.info(f"🕒 Simulation clock: {clock.describe()}, starting at {clock.now(timezone.utc).isoformat()}")
+        
+        if self.workers > 1:
+            await self._run_sharded(duration)
+            await self.shutdown()
+            return
         
-        # Start drivers boarding and GPS initialization
+        # Start drivers boarding and GPS initialization (and the Fleet Management API server)
         await self._start_vehicle_operations()
         
         if duration is None:
             logger.info("Running indefinitely (Ctrl+C to stop)...")
             try:
                 while self._running:
-                    await asyncio.sleep(1.0)
+                    await clock.asleep(1.0)
             except KeyboardInterrupt:
                 logger.info("Interrupt received")
         else:
-            logger.info(f"Running for {duration} seconds...")
+            logger.info(f"Running for {duration} simulated seconds...")
             try:
-                await asyncio.sleep(duration)
+                await clock.asleep(duration)
             except KeyboardInterrupt:
                 logger.info("Interrupted before duration complete")
         await self.shutdown()
@@ -191,40 +226,42 @@ class CleanVehicleSimulator:
         try:
             logger.info("🚚 Starting vehicle operations...")
             
-            # Get vehicle-driver assignments from dispatcher
-            vehicle_assignments = await self.dispatcher.get_vehicle_assignments()
-            driver_assignments = await self.dispatcher.get_driver_assignments()
+            # Vehicle-driver pairs (index-aligned assignments from the dispatcher)
+            pairs = []
+            
+            async def fetch_assignments():
+                vehicle_assignments, driver_assignments = await asyncio.gather(
+                    self.dispatcher.get_vehicle_assignments(),
+                    self.dispatcher.get_driver_assignments()
+                )
+                pairs.extend(zip(vehicle_assignments or [], driver_assignments or []))
+                if self.vehicle_ids is not None:
+                    pairs[:] = [pair for pair in pairs if pair[0].vehicle_id in self.vehicle_ids]
+            
+            async def prefetch_routes():
+                # Each route is loaded once, before the vehicles that share it ask for it
+                route_ids = sorted({v.route_id for v, _ in pairs if v.route_id and self._is_operational(v)})
+                await gather_bounded(route_ids, self.dispatcher.get_route_info, self.startup_fanout)
+            
+            async def start_vehicles():
+                return await gather_bounded(pairs, self._start_vehicle, self.startup_fanout)
+            
+            pipeline = StartupPipeline(self.startup_profiler)
+            if self.enable_api:
+                pipeline.add("api_server", self._start_api_server, critical=False)
+            pipeline.add("assignments", fetch_assignments)
+            pipeline.add("route_prefetch", prefetch_routes, depends_on=("assignments",))
+            pipeline.add("vehicles", start_vehicles, depends_on=("assignments", "route_prefetch"))
+            results = await pipeline.run()
             
-            if not vehicle_assignments or not driver_assignments:
+            if not pairs:
                 logger.warning("No vehicle or driver assignments available")
+                self.finish_startup_profile()
                 return
             
             # Process drivers based on vehicle availability status
-            active_drivers = []
-            idle_drivers = []
-            
-            for i in range(min(len(vehicle_assignments), len(driver_assignments))):
-                vehicle_assignment = vehicle_assignments[i]
-                driver_assignment = driver_assignments[i]
-                
-                # Check vehicle status to determine driver state
-                vehicle_status = getattr(vehicle_assignment, 'vehicle_status', 'available')
-                
-                if vehicle_status in ['available', 'in_service', 'active']:
-                    # Vehicle is operational - driver boards and starts GPS
-                    logger.info(f"👤 Starting driver: {driver_assignment.driver_name} → {vehicle_assignment.vehicle_id} ({vehicle_status}) → {vehicle_assignment.route_id}")
-                    
-                    driver = await self._create_and_start_driver(vehicle_assignment, driver_assignment)
-                    if driver:
-                        active_drivers.append(driver)
-                else:
-                    # Vehicle is not available (maintenance/retired) - driver stays IDLE
-                    logger.info(f"🚶 Driver present but IDLE: {driver_assignment.driver_name} → {vehicle_assignment.vehicle_id} ({vehicle_status}) - vehicle not operational")
-                    
-                    # Create idle driver (present in depot but not boarding vehicle)
-                    idle_driver = await self._create_idle_driver(driver_assignment, vehicle_assignment)
-                    if idle_driver:
-                        idle_drivers.append(idle_driver)
+            active_drivers = [driver for driver, active in results["vehicles"] if driver and active]
+            idle_drivers = [driver for driver, active in results["vehicles"] if driver and not active]
             
             # Organized Component Status Display
             logger.info("")
@@ -340,7 +377,8 @@ class CleanVehicleSimulator:
             # Now distribute routes to operational vehicles (drivers onboard with GPS running)
             if active_drivers:
                 logger.info(f"🗺️ Distributing routes to {len(active_drivers)} operational vehicles...")
-                await self.depot.distribute_routes_to_operational_vehicles(active_drivers)
+                async with self.startup_profiler.span("distribute_routes"):
+                    await self.depot.distribute_routes_to_operational_vehicles(active_drivers)
             else:
                 logger.info("🗺️ No active drivers found for route distribution")
             
@@ -350,11 +388,84 @@ class CleanVehicleSimulator:
             if not active_drivers and not idle_drivers:
                 logger.warning("No drivers started successfully")
                 
+            self.finish_startup_profile()
+        
         except Exception as e:
             logger.error(f"Error starting vehicle operations: {e}")
             import traceback
             traceback.print_exc()
     
+    async def _run_sharded(self, duration: Optional[float]) -> None:
+        """Run the fleet in worker processes; this process serves the API over their mirrored state."""
+        from arknet_transit_simulator.core.fleet_shards import FleetShardCoordinator
+        
+        logger.info(f"🧩 Sharding the fleet across {self.workers} worker processes...")
+        vehicle_assignments, driver_assignments = await asyncio.gather(
+            self.dispatcher.get_vehicle_assignments(),
+            self.dispatcher.get_driver_assignments()
+        )
+        pairs = list(zip(vehicle_assignments or [], driver_assignments or []))
+        if not pairs:
+            logger.warning("No vehicle or driver assignments available")
+            return
+        
+        self.shards = FleetShardCoordinator(
+            self.workers,
+            simulator_options={
+                'api_url': self.api_url,
+                'enable_boarding_after': self.enable_boarding_after,
+                'gps_config': self.gps_config,
+                'profile_startup': self.profile_startup,
+                'startup_fanout': self.startup_fanout,
+            },
+            duration=duration,
+            log_rate=self.log_rate,
+        )
+        # The API and fleet stream read the mirrored vehicles like local drivers
+        self.active_drivers = self.shards.drivers
+        self.idle_drivers = self.shards.idle_vehicle_ids
+        if self.enable_api:
+            await self._start_api_server()
+        connected = await self.shards.start(pairs)
+        if connected < len(self.shards.shards):
+            # The vehicles of a missing shard would silently never run
+            logger.error(f"Only {connected}/{len(self.shards.shards)} fleet shards connected, aborting")
+            return
+        
+        # Wall-clock polling: the workers own the simulation clocks (and stop
+        # on their own after --duration); this loop only notices they are done
+        while self._running and self.shards.running:
+            await asyncio.sleep(1.0)
+    
+    @staticmethod
+    def _is_operational(vehicle_assignment) -> bool:
+        vehicle_status = getattr(vehicle_assignment, 'vehicle_status', 'available')
+        return vehicle_status in ['available', 'in_service', 'active']
+    
+    async def _start_vehicle(self, pair):
+        """Bring up one vehicle-driver pair. Returns (driver or None, is_active)."""
+        vehicle_assignment, driver_assignment = pair
+        vehicle_status = getattr(vehicle_assignment, 'vehicle_status', 'available')
+        
+        async with self.startup_profiler.span("bring_up", vehicle_id=vehicle_assignment.vehicle_id):
+            if self._is_operational(vehicle_assignment):
+                # Vehicle is operational - driver boards and starts GPS
+                logger.info(f"👤 Starting driver: {driver_assignment.driver_name} → {vehicle_assignment.vehicle_id} ({vehicle_status}) → {vehicle_assignment.route_id}")
+                return await self._create_and_start_driver(vehicle_assignment, driver_assignment), True
+            
+            # Vehicle is not available (maintenance/retired) - driver stays IDLE
+            logger.info(f"🚶 Driver present but IDLE: {driver_assignment.driver_name} → {vehicle_assignment.vehicle_id} ({vehicle_status}) - vehicle not operational")
+            
+            # Create idle driver (present in depot but not boarding vehicle)
+            return await self._create_idle_driver(driver_assignment, vehicle_assignment), False
+    
+    def finish_startup_profile(self) -> None:
+        """Log the startup timeline and write it to --profile-startup (if requested)"""
+        if not self.profile_startup:
+            return
+        path = self.startup_profiler.write(self.profile_startup)
+        logger.info("\n".join(self.startup_profiler.summary_lines() + [f"   📄 Startup profile written to {path}"]))
+    
     async def _create_and_start_driver(self, vehicle_assignment, driver_assignment):
         """Create and start a vehicle driver with GPS device."""
         try:
@@ -363,8 +474,11 @@ class CleanVehicleSimulator:
             from arknet_transit_simulator.vehicle.gps_device.radio_module.transmitter import WebSocketTransmitter
             from arknet_transit_simulator.vehicle.gps_device.radio_module.packet import PacketCodec
             
+            vehicle_id = vehicle_assignment.vehicle_id
+            
             # Get route information
-            route_info = await self.dispatcher.get_route_info(vehicle_assignment.route_id)
+            async with self.startup_profiler.span("route_info", vehicle_id=vehicle_id):
+                route_info = await self.dispatcher.get_route_info(vehicle_assignment.route_id)
             if not route_info or not route_info.geometry:
                 logger.error(f"No route geometry available for {vehicle_assignment.route_id}")
                 return None
@@ -407,7 +521,6 @@ class CleanVehicleSimulator:
             engine_buffer = EngineBuffer()
             
             # Check if physics kernel should be used
-            vehicle_id = vehicle_assignment.vehicle_id
             physics_env = os.getenv("PHYSICS_KERNEL", "0")
             use_physics = physics_env == "1" and vehicle_id == "ZR400"
             logger.info(f"🧮 Physics check: PHYSICS_KERNEL='{physics_env}', vehicle_id='{vehicle_id}', use_physics={use_physics}")
@@ -501,7 +614,8 @@ class CleanVehicleSimulator:
                 )
                 
                 # Initialize conductor configuration from Strapi (Phase 2)
-                await conductor.initialize_config()
+                async with self.startup_profiler.span("conductor_config", vehicle_id=vehicle_id):
+                    await conductor.initialize_config()
                 
                 # Attach conductor to driver for future integration
                 driver.conductor = conductor
@@ -514,7 +628,8 @@ class CleanVehicleSimulator:
                 logger.info(f"[CONDUCTOR] Driver ID: {driver.component_id}, Name: {driver.person_name}")
                 
                 # Start conductor's Socket.IO connection
-                await conductor.start()
+                async with self.startup_profiler.span("conductor_connect", vehicle_id=vehicle_id):
+                    await conductor.start()
             except Exception as e:
                 logger.error(f"[CONDUCTOR] Failed to initialize: {e}")
                 import traceback
@@ -530,7 +645,8 @@ class CleanVehicleSimulator:
                 logger.info(f"[Conductor] {driver.conductor.person_name} ready for vehicle {vehicle_assignment.vehicle_id} - Capacity: {driver.conductor.capacity} passengers")
             
             try:
-                await driver.start()
+                async with self.startup_profiler.span("driver_start", vehicle_id=vehicle_id):
+                    await driver.start()
                 logger.info(f"⚡ Driver state after boarding: {driver.current_state.value}")
             except Exception as e:
                 logger.error(f"❌ Exception during driver.start(): {e}")
@@ -560,14 +676,14 @@ class CleanVehicleSimulator:
                 # If --enable-boarding-after N was specified, auto-enable after delay
                 if self.enable_boarding_after is not None:
                     async def enable_boarding_after_delay():
-                        await asyncio.sleep(self.enable_boarding_after)
+                        await get_sim_clock().asleep(self.enable_boarding_after)
                         driver.conductor.start_boarding()
                         logger.info(
                             f"[Simulator] Boarding ENABLED for {vehicle_assignment.vehicle_id} "
                             f"after {self.enable_boarding_after:.1f} second delay"
                         )
                     
-                    asyncio.create_task(enable_boarding_after_delay())
+                    get_sim_clock().hold(asyncio.create_task(enable_boarding_after_delay()))
                     logger.info(
                         f"[Simulator] Boarding will auto-enable in {self.enable_boarding_after:.1f} seconds"
                     )
@@ -663,8 +779,11 @@ class CleanVehicleSimulator:
         return self._running
     
     def get_sim_time(self) -> Optional[datetime]:
-        """Get current simulation time (if set)."""
-        return self.sim_time
+        """Get current simulation time (None when running on the plain wall clock)."""
+        clock = get_sim_clock()
+        if self.sim_time is None and clock.is_realtime:
+            return None
+        return clock.now(timezone.utc)
     
     def set_sim_time(self, new_time: datetime) -> None:
         """
@@ -674,13 +793,17 @@ class CleanVehicleSimulator:
             new_time: New simulation datetime
         """
         self.sim_time = new_time
+        get_sim_clock().set_time(new_time)
+        if self.shards:
+            self.shards.set_sim_time(new_time)
         logger.info(f"🕐 Simulation time set to: {new_time}")
 
     async def _initialize_api(self) -> None:
         """Initialize the Fleet Management API."""
         try:
             from arknet_transit_simulator.api.app import create_app
-            from arknet_transit_simulator.api.dependencies import set_simulator
+            from arknet_transit_simulator.api.dependencies import set_simulator, set_fleet_publisher, get_event_bus
+            from arknet_transit_simulator.api.events.fleet_stream import FleetStatePublisher
             
             logger.info(f"🌐 Initializing Fleet Management API on port {self.api_port}...")
             
@@ -690,6 +813,10 @@ class CleanVehicleSimulator:
             # Create FastAPI app
             self.fastapi_app = create_app()
             
+            # One fleet sampler feeds snapshot + deltas to every /ws/events client
+            self.fleet_publisher = FleetStatePublisher(self, get_event_bus())
+            set_fleet_publisher(self.fleet_publisher)
+            
             logger.info("✅ Fleet Management API initialized")
         except Exception as e:
             logger.error(f"Failed to initialize Fleet Management API: {e}")
@@ -714,6 +841,8 @@ class CleanVehicleSimulator:
         
         # Run server in background task (non-blocking)
         asyncio.create_task(self._api_server.serve())
+        if self.fleet_publisher:
+            self.fleet_publisher.start()
         
         logger.info(f"✅ Fleet Management API running at http://localhost:{self.api_port}")
         logger.info(f"   📖 API docs: http://localhost:{self.api_port}/docs")
@@ -723,6 +852,8 @@ class CleanVehicleSimulator:
         """Stop the uvicorn API server."""
         if self._api_server:
             logger.info("🛑 Stopping Fleet Management API server...")
+            if self.fleet_publisher:
+                await self.fleet_publisher.stop()
             self._api_server.should_exit = True
             await asyncio.sleep(0.5)  # Give server time to cleanup
             logger.info("✅ Fleet Management API stopped")
@@ -736,6 +867,13 @@ class CleanVehicleSimulator:
             if self.enable_api and self._api_server:
                 await self._stop_api_server()
             
+            # Sharded fleet: the workers stop their own drivers
+            if self.shards:
+                logger.info(f"🧩 Stopping {len(self.shards.shards)} fleet shards...")
+                await self.shards.stop()
+                self.active_drivers = []
+                self.idle_drivers = []
+            
             # Stop active drivers first
             if hasattr(self, 'active_drivers') and self.active_drivers:
                 logger.info(f"🛑 Stopping {len(self.active_drivers)} active drivers...")
@@ -761,6 +899,11 @@ class CleanVehicleSimulator:
             if self.dispatcher:
                 await self.dispatcher.shutdown()
         finally:
+            # Drop pending vehicle events and release anything still sleeping on a discrete clock
+            scheduler = get_event_scheduler()
+            logger.info("📅 Event scheduler: %s", scheduler.stats())
+            scheduler.close()
+            get_sim_clock().stop()
             logger.info("Shutdown complete")
 
     async def get_vehicle_assignments(self):
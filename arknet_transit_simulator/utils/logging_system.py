@@ -5,14 +5,29 @@ Vehicle Simulator Logging System
 Centralized logging system with separation of concerns.
 Provides DEBUG, INFO, WARNING, ERROR levels with configurable output.
 Supports console, file, and structured logging for different components.
+
+Handlers run on a background writer thread (QueueHandler -> QueueListener), so
+the simulator's tick loops only pay for creating and enqueuing a LogRecord:
+records are enqueued unformatted and %-style arguments are merged, formatted and
+written on the writer thread. Use lazy formatting on hot paths:
+
+    logger.debug("[%s] position (%.6f, %.6f)", vehicle_id, lat, lon)   # not f-strings
+
+A RateLimitFilter in front of the queue lets at most `rate` INFO/DEBUG lines per
+second through per message key (logger + message template + vehicle) and reports
+how many similar lines were suppressed. Hot-path calls name their vehicle with
+extra={"vehicle_id": ...}.
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import sys
+import time
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Hashable, Tuple
 from enum import Enum
 import json
 
@@ -49,6 +64,163 @@ class LoggingMode(Enum):
     VERBOSE = "verbose"    # Full detailed output
 
 
+class RateLimitFilter(logging.Filter):
+    """
+    At most `rate` records per second per message key; the rest are dropped.
+    
+    The key is (logger name, unformatted message template, vehicle), where the
+    vehicle is the record's `vehicle_id` or `component_id` extra, so hot-path
+    calls like logger.info("[%s] Checking for passengers", vehicle_id,
+    extra={"vehicle_id": vehicle_id}) are limited per vehicle. The next record
+    that passes for a key carries a "[+N similar suppressed]" suffix. WARNING
+    and above are never limited.
+    """
+    
+    def __init__(self,
+                 rate: float = 1.0,
+                 component_rates: Optional[Dict[str, float]] = None,
+                 max_level: int = logging.INFO,
+                 max_keys: int = 10000):
+        """
+        Args:
+            rate: Records per second per key (0 disables limiting)
+            component_rates: Per logger-name prefix overrides, e.g. {"arknet_transit_simulator.vehicle.gps_device": 0.2};
+                the longest matching prefix wins, 0 disables limiting for that component
+            max_level: Highest level that is rate limited
+            max_keys: Forget all keys when more than this many are tracked
+        """
+        super().__init__()
+        self.rate = rate
+        self.component_rates = dict(component_rates or {})
+        self.max_level = max_level
+        self.max_keys = max_keys
+        self._last: Dict[Hashable, float] = {}
+        self._suppressed: Dict[Hashable, int] = {}
+        self.total_suppressed = 0
+    
+    def _rate_for(self, name: str) -> float:
+        best, rate = -1, self.rate
+        for prefix, prefix_rate in self.component_rates.items():
+            if (name == prefix or name.startswith(prefix + ".")) and len(prefix) > best:
+                best, rate = len(prefix), prefix_rate
+        return rate
+    
+    @staticmethod
+    def key_for(record: logging.LogRecord) -> Hashable:
+        vehicle = getattr(record, 'vehicle_id', None)
+        if vehicle is None:
+            vehicle = getattr(record, 'component_id', None)
+        try:
+            hash(vehicle)
+        except TypeError:
+            vehicle = None
+        return (record.name, str(record.msg), vehicle)
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        rate = self._rate_for(record.name)
+        if rate <= 0:
+            return True
+        
+        key = self.key_for(record)
+        now = time.monotonic()
+        last = self._last.get(key)
+        if last is not None and now - last < 1.0 / rate:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            self.total_suppressed += 1
+            return False
+        
+        if len(self._last) >= self.max_keys:
+            self._last.clear()
+            self._suppressed.clear()
+        self._last[key] = now
+        suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            record.msg = f"{record.msg} [+{suppressed} similar suppressed]"
+        return True
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues records without formatting them.
+    
+    The stock QueueHandler merges msg and args on the calling thread so records
+    can be pickled; the listener here is in-process, so that work is left to the
+    writer thread. Arguments are therefore formatted slightly later: don't pass
+    objects that are mutated right after the log call.
+    """
+    
+    def __init__(self, records: "queue.Queue[logging.LogRecord]"):
+        super().__init__(records)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Never block the tick path on a slow disk/console
+            self.dropped += 1
+
+
+_listeners: Dict[int, Tuple[logging.handlers.QueueListener, LazyQueueHandler]] = {}
+
+
+def start_queue_logging(target: Optional[logging.Logger] = None,
+                        rate_limit: Optional[RateLimitFilter] = None,
+                        max_queue_size: int = 10000) -> logging.handlers.QueueListener:
+    """
+    Move a logger's handlers behind a queue served by a writer thread.
+    
+    Args:
+        target: Logger whose handlers are moved (default: root logger)
+        rate_limit: Filter applied before records are enqueued
+        max_queue_size: Records buffered before new ones are dropped
+    
+    Returns:
+        The running QueueListener (stopped and flushed at exit, or by stop_queue_logging)
+    """
+    target = target if target is not None else logging.getLogger()
+    stop_queue_logging(target)
+    
+    handlers = list(target.handlers)
+    records: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=max_queue_size)
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    queue_handler = LazyQueueHandler(records)
+    if rate_limit is not None:
+        queue_handler.addFilter(rate_limit)
+    
+    for handler in handlers:
+        target.removeHandler(handler)
+    target.addHandler(queue_handler)
+    listener.start()
+    _listeners[id(target)] = (listener, queue_handler)
+    return listener
+
+
+def stop_queue_logging(target: Optional[logging.Logger] = None) -> None:
+    """Flush the queue, stop the writer thread and put the handlers back on the logger."""
+    target = target if target is not None else logging.getLogger()
+    entry = _listeners.pop(id(target), None)
+    if entry is None:
+        return
+    listener, queue_handler = entry
+    listener.stop()
+    target.removeHandler(queue_handler)
+    for handler in listener.handlers:
+        target.addHandler(handler)
+
+
+@atexit.register
+def _stop_all_queue_logging() -> None:
+    for listener, _ in list(_listeners.values()):
+        listener.stop()
+    _listeners.clear()
+
+
 class VehicleSimulatorLogger:
     """
     Centralized logging system for vehicle simulator.
@@ -79,6 +251,8 @@ class VehicleSimulatorLogger:
         self.console_enabled = True
         self.file_enabled = True
         self.structured_logging = False
+        self.async_logging = True
+        self.rate_limit = RateLimitFilter(rate=1.0)
         
         # Paths
         self.log_directory = "logs"
@@ -231,7 +405,10 @@ class VehicleSimulatorLogger:
                   console: bool = True,
                   file_logging: bool = True,
                   structured: bool = False,
-                  log_dir: str = "logs"):
+                  log_dir: str = "logs",
+                  async_logging: bool = True,
+                  rate_limit: Optional[float] = 1.0,
+                  component_rates: Optional[Dict[str, float]] = None):
         """
         Configure the logging system.
         
@@ -242,6 +419,9 @@ class VehicleSimulatorLogger:
             file_logging: Enable file output
             structured: Enable JSON structured logging
             log_dir: Directory for log files
+            async_logging: Write through a background thread (QueueHandler/QueueListener)
+            rate_limit: Lines per second per message key and vehicle (None/0: unlimited)
+            component_rates: Per logger-name prefix rate overrides
         """
         self.log_level = LogLevel.DEBUG if verbose else level
         self.verbose_mode = verbose
@@ -249,18 +429,22 @@ class VehicleSimulatorLogger:
         self.file_enabled = file_logging
         self.structured_logging = structured
         self.log_directory = log_dir
+        self.async_logging = async_logging
+        self.rate_limit = RateLimitFilter(rate=rate_limit or 0, component_rates=component_rates)
         
         # Recreate handlers with new configuration
         self._recreate_handlers()
         
         # Log configuration change
         config_logger = self.get_logger(LogComponent.MAIN)
-        config_logger.info(f"Logging system configured: level={level.name}, verbose={verbose}, "
-                          f"console={console}, file={file_logging}, structured={structured}")
+        config_logger.info("Logging system configured: level=%s, verbose=%s, console=%s, file=%s, structured=%s, "
+                           "async=%s, rate_limit=%s/s", level.name, verbose, console, file_logging, structured,
+                           async_logging, rate_limit)
     
     def _recreate_handlers(self):
         """Recreate all handlers with current configuration."""
-        # Clear existing handlers
+        # Stop the writer thread (flushing it) and clear existing handlers
+        stop_queue_logging(self.root_logger)
         self.root_logger.handlers.clear()
         
         # Ensure log directory exists
@@ -305,6 +489,13 @@ class VehicleSimulatorLogger:
             error_handler.setLevel(logging.ERROR)
             error_handler.setFormatter(self.file_formatter)
             self.root_logger.addHandler(error_handler)
+        
+        # Formatting and I/O on the writer thread; rate limiting before the queue
+        if self.async_logging:
+            start_queue_logging(self.root_logger, self.rate_limit)
+        else:
+            for handler in self.root_logger.handlers:
+                handler.addFilter(self.rate_limit)
     
     def get_logger(self, component: LogComponent) -> logging.Logger:
         """
@@ -343,7 +534,9 @@ class VehicleSimulatorLogger:
     def set_level(self, level: LogLevel):
         """Change the logging level dynamically."""
         self.log_level = level
-        for handler in self.root_logger.handlers:
+        entry = _listeners.get(id(self.root_logger))
+        handlers = entry[0].handlers if entry else self.root_logger.handlers
+        for handler in handlers:
             if isinstance(handler, logging.StreamHandler) and handler.stream == sys.stdout:
                 handler.setLevel(level.value)
     
@@ -413,9 +606,13 @@ def configure_logging(level: LogLevel = LogLevel.INFO,
                      console: bool = True,
                      file_logging: bool = True,
                      structured: bool = False,
-                     log_dir: str = "logs"):
+                     log_dir: str = "logs",
+                     async_logging: bool = True,
+                     rate_limit: Optional[float] = 1.0,
+                     component_rates: Optional[Dict[str, float]] = None):
     """Convenience function to configure logging."""
-    return get_logging_system().configure(level, verbose, console, file_logging, structured, log_dir)
+    return get_logging_system().configure(level, verbose, console, file_logging, structured, log_dir,
+                                          async_logging, rate_limit, component_rates)
 
 
 # Example usage for different components
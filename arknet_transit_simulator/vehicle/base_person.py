@@ -14,6 +14,8 @@ from abc import ABC, abstractmethod
 from typing import Optional
 from datetime import datetime
 
+from common.sim_clock import get_sim_clock
+
 from .base_component import BaseComponent
 from ..core.states import PersonState
 
@@ -49,11 +51,10 @@ class BasePerson(BaseComponent):
         
         # Passenger-specific attributes (only used when person_type is "Passenger")
         if person_type == "Passenger" or origin_stop_id or destination_stop_id:
-            from datetime import datetime
             self.origin_stop_id = origin_stop_id
             self.destination_stop_id = destination_stop_id
-            self.depart_time = depart_time or datetime.now()
-            self.created_at = datetime.now()
+            self.depart_time = depart_time or get_sim_clock().now()
+            self.created_at = get_sim_clock().now()
             self.boarding_time = None
             self.arrival_time = None
             self.current_vehicle = None
@@ -161,7 +162,7 @@ class BasePerson(BaseComponent):
         """
         if hasattr(self, 'travel_status'):
             self.current_vehicle = vehicle_id
-            self.boarding_time = datetime.now()
+            self.boarding_time = get_sim_clock().now()
             self.travel_status = "traveling"
             self.logger.info(f"Passenger {self.person_id} boarded vehicle {vehicle_id}")
             return True
@@ -175,7 +176,7 @@ class BasePerson(BaseComponent):
             bool: True if arrival processed successfully
         """
         if hasattr(self, 'travel_status'):
-            self.arrival_time = datetime.now()
+            self.arrival_time = get_sim_clock().now()
             self.travel_status = "arrived"
             
             if hasattr(self, 'boarding_time') and self.boarding_time:
@@ -195,5 +196,5 @@ class BasePerson(BaseComponent):
         """
         if hasattr(self, 'created_at') and hasattr(self, 'travel_status'):
             if self.travel_status == "waiting":
-                return (datetime.now() - self.created_at).total_seconds()
+                return (get_sim_clock().now() - self.created_at).total_seconds()
         return 0.0
\ No newline at end of file
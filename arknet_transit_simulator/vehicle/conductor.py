@@ -22,12 +22,15 @@ import threading
 import time
 import asyncio
 import math
-import socketio
 from typing import Dict, Any, Optional, Callable, List, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 
+from common.event_scheduler import get_event_scheduler
+from common.metrics import get_metrics_registry
+from common.sim_clock import get_sim_clock
+
 try:
     from common.config_provider import get_config
     _config_available = True
@@ -48,6 +51,10 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Latency of the conductor's "eligible passengers near me" query (commuter_service round trip)
+CONDUCTOR_POLL_SECONDS = get_metrics_registry().histogram(
+    "sim_conductor_poll_seconds", "Latency of conductor passenger polls against commuter_service")
+
 
 class ConductorState(Enum):
     """Enhanced conductor operational states."""
@@ -282,6 +289,7 @@ class Conductor(BasePerson):
                 sio_url = "http://localhost:1337"  # Fallback if config not available
         
         self.vehicle_id = vehicle_id
+        self._log_extra = {"vehicle_id": vehicle_id}  # RateLimitFilter key
         self.assigned_route_id = assigned_route_id or "UNKNOWN"
         self.capacity = capacity
         self.tick_time = tick_time
@@ -320,6 +328,7 @@ class Conductor(BasePerson):
         self.sio_url = sio_url
         self.sio_connected = False
         if self.use_socketio:
+            import socketio  # optional transport, loaded only when enabled
             self.sio = socketio.AsyncClient(logger=False, engineio_logger=False)
             self._setup_socketio_handlers()
         else:
@@ -349,7 +358,6 @@ class Conductor(BasePerson):
         # Threading and async tasks
         self._running = False
         self._thread: Optional[threading.Thread] = None
-        self.monitoring_task: Optional[asyncio.Task] = None
         self.stop_operation_task: Optional[asyncio.Task] = None
         
         self.logger.info(
@@ -636,8 +644,9 @@ class Conductor(BasePerson):
             # Start enhanced monitoring
             self.conductor_state = ConductorState.MONITORING
             
-            # Start passenger monitoring task
-            self.monitoring_task = asyncio.create_task(self._monitor_passengers())
+            # First monitoring pass; later passes are scheduled when there is something to
+            # check (boarding enabled, waypoint arrival, stop request) instead of polled
+            self._schedule_monitoring()
                 
             self.logger.info(f"Enhanced Conductor {self.person_name} ready for intelligent passenger management")
             return True
@@ -675,15 +684,10 @@ class Conductor(BasePerson):
             self._running = False
             if self._thread:
                 self._thread.join(timeout=2)
+            for kind in ("monitor", "stop_dwell", "depot"):
+                get_event_scheduler().cancel(kind, owner=self.vehicle_id)
                 
             # Cancel enhanced monitoring tasks
-            if self.monitoring_task and not self.monitoring_task.done():
-                self.monitoring_task.cancel()
-                try:
-                    await self.monitoring_task
-                except asyncio.CancelledError:
-                    pass
-                    
             if self.stop_operation_task and not self.stop_operation_task.done():
                 self.stop_operation_task.cancel()
                 try:
@@ -755,78 +759,112 @@ class Conductor(BasePerson):
                 asyncio.create_task(self._signal_driver_start_no_depot())
                 return  # Don't check for depot boarding on first position
         
-        # Check if at depot and auto-trigger depot boarding mode (SUBSEQUENT updates)
-        if self.depot_coordinates and not self.depot_boarding_active and not is_first_position:
-            at_depot = self.is_at_depot(latitude, longitude)
-            
-            if at_depot and self.assigned_route_id:
-                # Vehicle just arrived at depot - enter depot boarding mode
-                logger.info(
-                    f"🔵 Conductor {self.vehicle_id}: 🏢 AUTO-TRIGGERING DEPOT BOARDING MODE\n"
-                    f"   📍 Position: ({latitude:.6f}, {longitude:.6f})\n"
-                    f"   🏢 Depot: {self.depot_coordinates.get('depot_name', 'Unknown')}"
-                )
-                
-                # Create async task to run depot boarding (don't block position update)
-                asyncio.create_task(
-                    self.depot_boarding_mode(
-                        vehicle_lat=latitude,
-                        vehicle_lon=longitude,
-                        route_id=self.assigned_route_id
-                    )
-                )
+        # Check if at depot and auto-trigger depot boarding mode
+        self._maybe_start_depot_boarding(latitude, longitude)
+        
+        # Waypoint arrival while boarding: check for passengers here (legacy PassengerDatabase)
+        if self.passenger_db and self.boarding_active:
+            self._schedule_monitoring()
 
+    def _maybe_start_depot_boarding(self, latitude: float, longitude: float) -> None:
+        """Enter depot boarding mode if the vehicle is at the depot and not boarding there already."""
+        if not self.depot_coordinates or self.depot_boarding_active or not self.assigned_route_id:
+            return
+        if not self.is_at_depot(latitude, longitude):
+            return
+        
+        # Vehicle just arrived at depot - enter depot boarding mode
+        logger.info(
+            f"🔵 Conductor {self.vehicle_id}: 🏢 AUTO-TRIGGERING DEPOT BOARDING MODE\n"
+            f"   📍 Position: ({latitude:.6f}, {longitude:.6f})\n"
+            f"   🏢 Depot: {self.depot_coordinates.get('depot_name', 'Unknown')}"
+        )
+        
+        # Create async task to run depot boarding (don't block position update)
+        asyncio.create_task(
+            self.depot_boarding_mode(
+                vehicle_lat=latitude,
+                vehicle_lon=longitude,
+                route_id=self.assigned_route_id
+            )
+        )
+
+    def _recheck_depot(self) -> None:
+        """Scheduled event: a depot wait ended without departing - wait again while still parked there."""
+        driver = getattr(self, 'driver', None)
+        if not self._running or not self.current_vehicle_position or self.is_full():
+            return
+        if driver is not None and getattr(driver.current_state, 'value', None) == "ONBOARD":
+            return
+        self._maybe_start_depot_boarding(*self.current_vehicle_position)
+
+    def _schedule_monitoring(self, delay: float = 0.0) -> None:
+        """Schedule a monitoring pass in `delay` sim seconds (an earlier pending pass is kept)."""
+        if not self._running:
+            return
+        scheduler = get_event_scheduler()
+        pending = scheduler.next_time("monitor", owner=self.vehicle_id)
+        if pending is not None and pending <= get_sim_clock().time() + delay:
+            return
+        scheduler.schedule_in(delay, "monitor", self._monitor_passengers, owner=self.vehicle_id)
             
     async def _monitor_passengers(self) -> None:
-        """Background task to monitor passengers and manage operations."""
+        """
+        One monitoring pass (a scheduled event): check for passengers, handle stop
+        requests and pending operations.
+        
+        Only the legacy polling sources (PassengerDatabase while boarding, depot
+        callback) schedule the next pass themselves; otherwise passes happen when
+        boarding is enabled, at waypoint arrivals and when stop requests are queued.
+        """
+        if not self._running or self.conductor_state == ConductorState.WAITING_FOR_DEPARTURE:
+            return
         try:
-            while self._running and self.conductor_state != ConductorState.WAITING_FOR_DEPARTURE:
-                # Only check for passengers when boarding is explicitly active.
-                # This prevents the conductor from immediately boarding all nearby
-                # passengers as soon as the simulator starts and the driver/GPS
-                # reports an initial position.
-                if self.passenger_db and self.current_vehicle_position and self.boarding_active:
-                    try:
-                        lat, lon = self.current_vehicle_position
-                        self.logger.info(
-                            f"[{self.component_id}] Checking for passengers at position "
-                            f"({lat:.6f}, {lon:.6f})"
-                        )
-                        await self.check_for_passengers(
-                            vehicle_lat=lat,
-                            vehicle_lon=lon,
-                            route_id=self.assigned_route_id
-                        )
-                    except Exception as e:
-                        self.logger.warning(f"[{self.component_id}] Error checking for passengers: {e}")
-                elif self.passenger_db and not self.current_vehicle_position:
-                    # Log why we're not checking
-                    self.logger.warning(f"[{self.component_id}] No vehicle position available yet")
-                elif self.passenger_db and self.current_vehicle_position and not self.boarding_active:
-                    # Boarding not yet enabled - skip automatic boarding until explicitly enabled
-                    self.logger.debug(f"[{self.component_id}] Boarding not active yet; skipping passenger checks")
-                
-                # Legacy: Query depot callback if configured
-                elif self.depot_callback:
-                    try:
-                        route_passengers = self.depot_callback(self.assigned_route_id)
-                        await self._evaluate_passengers(route_passengers)
-                    except Exception as e:
-                        self.logger.warning(f"Error querying depot: {e}")
-                        
-                # Check for passengers requesting stops
-                await self._check_stop_requests()
-                
-                # Process any pending operations
-                if self.conductor_state == ConductorState.EVALUATING:
-                    await self._process_passenger_operations()
+            # Only check for passengers when boarding is explicitly active.
+            # This prevents the conductor from immediately boarding all nearby
+            # passengers as soon as the simulator starts and the driver/GPS
+            # reports an initial position.
+            if self.passenger_db and self.current_vehicle_position and self.boarding_active:
+                try:
+                    lat, lon = self.current_vehicle_position
+                    self.logger.info("[%s] Checking for passengers at position (%.6f, %.6f)",
+                                     self.component_id, lat, lon, extra=self._log_extra)
+                    await self.check_for_passengers(
+                        vehicle_lat=lat,
+                        vehicle_lon=lon,
+                        route_id=self.assigned_route_id
+                    )
+                except Exception as e:
+                    self.logger.warning("[%s] Error checking for passengers: %s", self.component_id, e)
+            elif self.passenger_db and not self.current_vehicle_position:
+                # Log why we're not checking
+                self.logger.warning("[%s] No vehicle position available yet", self.component_id)
+            elif self.passenger_db and self.current_vehicle_position and not self.boarding_active:
+                # Boarding not yet enabled - skip automatic boarding until explicitly enabled
+                self.logger.debug("[%s] Boarding not active yet; skipping passenger checks", self.component_id,
+                                  extra=self._log_extra)
+            
+            # Legacy: Query depot callback if configured
+            elif self.depot_callback:
+                try:
+                    route_passengers = self.depot_callback(self.assigned_route_id)
+                    await self._evaluate_passengers(route_passengers)
+                except Exception as e:
+                    self.logger.warning(f"Error querying depot: {e}")
                     
-                await asyncio.sleep(self.config.monitoring_interval_seconds)
+            # Check for passengers requesting stops
+            await self._check_stop_requests()
+            
+            # Process any pending operations
+            if self.conductor_state == ConductorState.EVALUATING:
+                await self._process_passenger_operations()
                 
-        except asyncio.CancelledError:
-            self.logger.debug(f"Conductor {self.component_id} monitoring cancelled")
         except Exception as e:
             self.logger.error(f"Error in passenger monitoring: {e}")
+        
+        # Legacy sources can only be polled
+        if self.depot_callback or (self.passenger_db and self.boarding_active):
+            self._schedule_monitoring(self.config.monitoring_interval_seconds)
             
     async def _evaluate_passengers(self, passengers: List[Any]) -> None:
         """Evaluate passengers for boarding/disembarking eligibility."""
@@ -886,7 +924,7 @@ class Conductor(BasePerson):
             if not hasattr(passenger, 'journey') or not hasattr(passenger.journey, 'pickup_time'):
                 return True  # No specific pickup time
                 
-            now = datetime.now()
+            now = get_sim_clock().now()
             pickup_time = passenger.journey.pickup_time
             time_diff = abs((now - pickup_time).total_seconds() / 60)
             
@@ -917,14 +955,14 @@ class Conductor(BasePerson):
         
         # Create stop operation
         self.current_stop_operation = StopOperation(
-            stop_id=f"STOP_{datetime.now().strftime('%H%M%S')}",
+            stop_id=f"STOP_{get_sim_clock().now().strftime('%H%M%S')}",
             stop_name="Dynamic Stop",
             latitude=self.current_vehicle_position[0] if self.current_vehicle_position else 0.0,
             longitude=self.current_vehicle_position[1] if self.current_vehicle_position else 0.0,
             passengers_boarding=boarding,
             passengers_disembarking=disembarking,
             requested_duration=total_time,
-            start_time=datetime.now()
+            start_time=get_sim_clock().now()
         )
         
         self.conductor_state = ConductorState.SIGNALING_DRIVER
@@ -1005,7 +1043,7 @@ class Conductor(BasePerson):
             
             # Initialize start time if not already set
             if self.current_stop_operation.start_time is None:
-                self.current_stop_operation.start_time = datetime.now()
+                self.current_stop_operation.start_time = get_sim_clock().now()
             
             # Handle disembarking first (faster)
             for passenger_id in self.current_stop_operation.passengers_disembarking:
@@ -1021,12 +1059,15 @@ class Conductor(BasePerson):
                 else:
                     self.logger.warning(f"Could not board passenger {passenger_id} - vehicle full")
                     
-            # Wait for remaining time or until complete
-            elapsed = (datetime.now() - self.current_stop_operation.start_time).total_seconds()
+            # Dwell for the remaining time: the dwell-complete event signals the driver
+            elapsed = (get_sim_clock().now() - self.current_stop_operation.start_time).total_seconds()
             remaining_time = max(0, self.current_stop_operation.requested_duration - elapsed)
             
             if remaining_time > 0:
-                await asyncio.sleep(remaining_time)
+                get_event_scheduler().schedule_in(
+                    remaining_time, "stop_dwell", self._signal_driver_continue, owner=self.vehicle_id
+                )
+                return
                 
             # Signal driver to continue
             await self._signal_driver_continue()
@@ -1038,6 +1079,8 @@ class Conductor(BasePerson):
             
     async def _signal_driver_continue(self) -> None:
         """Signal driver to continue driving (Priority 2: Socket.IO + callback fallback)."""
+        # Departing early (e.g. vehicle full): the dwell-complete event is no longer needed
+        get_event_scheduler().cancel("stop_dwell", owner=self.vehicle_id)
         
         try:
             # Prepare signal data (Socket.IO format)
@@ -1045,13 +1088,13 @@ class Conductor(BasePerson):
                 'vehicle_id': self.vehicle_id,
                 'conductor_id': self.component_id,
                 'passenger_count': self.passengers_on_board,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': get_sim_clock().now().isoformat()
             }
             
             self.logger.info(
                 f"🔵 Conductor {self.component_id} 🚀 SIGNALING DRIVER TO CONTINUE:\n"
                 f"   💺 Passengers on board: {self.passengers_on_board}\n"
-                f"   ⏰ Time: {datetime.now().strftime('%H:%M:%S')}"
+                f"   ⏰ Time: {get_sim_clock().now().strftime('%H:%M:%S')}"
             )
             
             # DEPOT MODE: Skip Socket.IO, use direct driver call
@@ -1084,18 +1127,22 @@ class Conductor(BasePerson):
         self.current_stop_operation = None
         self.preserved_gps_position = None
         self.conductor_state = ConductorState.MONITORING
+        
+        # Stop requests queued during the stop
+        if self.disembarking_queue:
+            self._schedule_monitoring()
     
     async def _signal_driver_start_no_depot(self) -> None:
         """Signal driver to start engine when there's no depot (route starts immediately)."""
         try:
             # Give driver a moment to finish initialization
-            await asyncio.sleep(2)
+            await get_sim_clock().asleep(2)
             
             self.logger.info(
                 f"🔵 Conductor {self.component_id} 🚀 NO DEPOT - SIGNALING DRIVER TO START:\n"
                 f"   📍 Route starts without depot boarding\n"
                 f"   🔄 Boarding enabled for pickup along route\n"
-                f"   ⏰ Time: {datetime.now().strftime('%H:%M:%S')}"
+                f"   ⏰ Time: {get_sim_clock().now().strftime('%H:%M:%S')}"
             )
             
             # Direct driver method call
@@ -1376,46 +1423,52 @@ class Conductor(BasePerson):
             Number of passengers boarded
         """
         if not self.commuter_client:
-            logger.warning(f"Conductor {self.vehicle_id}: No commuter_service client configured")
+            logger.warning("Conductor %s: No commuter_service client configured", self.vehicle_id)
             return 0
         
         if self.is_full():
-            logger.debug(f"Conductor {self.vehicle_id}: Vehicle full, not checking for passengers")
+            logger.debug("Conductor %s: Vehicle full, not checking for passengers", self.vehicle_id, extra=self._log_extra)
             return 0
         
         route = route_id or self.assigned_route_id
         
         try:
-            logger.info(
-                f"🔵 Conductor {self.vehicle_id} 👁️  LOOKING FOR PASSENGERS (via CommuterService API):\n"
-                f"   📍 Position: ({vehicle_lat:.6f}, {vehicle_lon:.6f})\n"
-                f"   🚏 Route: {route}\n"
-                f"   🔍 Pickup radius: {self.config.pickup_radius_km} km\n"
-                f"   💺 Seats available: {self.seats_available}/{self.capacity}"
+            logger.debug(
+                "🔵 Conductor %s 👁️  LOOKING FOR PASSENGERS (via CommuterService API):\n"
+                "   📍 Position: (%.6f, %.6f)\n"
+                "   🚏 Route: %s\n"
+                "   🔍 Pickup radius: %s km\n"
+                "   💺 Seats available: %s/%s",
+                self.vehicle_id, vehicle_lat, vehicle_lon, route, self.config.pickup_radius_km,
+                self.seats_available, self.capacity,
+                extra=self._log_extra
             )
             
             # Query passengers via HTTP API (goes through RouteReservoir)
             # Pass current time for spawn_time filtering (only "arrived" passengers)
-            from datetime import datetime, timezone
-            current_time_iso = datetime.now(timezone.utc).isoformat()
-            
-            eligible = await self.commuter_client.get_eligible_passengers(
-                vehicle_lat=vehicle_lat,
-                vehicle_lon=vehicle_lon,
-                route_id=route,
-                pickup_radius_km=self.config.pickup_radius_km,
-                max_results=self.seats_available,
-                status="WAITING",
-                current_time=current_time_iso  # Filter by spawn_time
-            )
+            from datetime import timezone
+            current_time_iso = get_sim_clock().now(timezone.utc).isoformat()
+            
+            with CONDUCTOR_POLL_SECONDS.time():
+                eligible = await self.commuter_client.get_eligible_passengers(
+                    vehicle_lat=vehicle_lat,
+                    vehicle_lon=vehicle_lon,
+                    route_id=route,
+                    pickup_radius_km=self.config.pickup_radius_km,
+                    max_results=self.seats_available,
+                    status="WAITING",
+                    current_time=current_time_iso  # Filter by spawn_time
+                )
             
             if not eligible:
-                logger.info(f"🔵 Conductor {self.vehicle_id}: ❌ No passengers found at this location")
+                logger.debug("🔵 Conductor %s: ❌ No passengers found at this location", self.vehicle_id,
+                             extra=self._log_extra)
                 return 0
             
             # Extract passenger IDs and log details
             passenger_ids = []
-            logger.info(f"🔵 Conductor {self.vehicle_id}: ✅ Found {len(eligible)} eligible passengers:")
+            logger.info("🔵 Conductor %s: ✅ Found %d eligible passengers:", self.vehicle_id, len(eligible),
+                        extra=self._log_extra)
             
             for idx, p in enumerate(eligible, 1):
                 # CommuterService API returns flat structure
@@ -1433,12 +1486,14 @@ class Conductor(BasePerson):
                     if dest_lat is not None and dest_lon is not None:
                         self.passenger_destinations[pid] = (dest_lat, dest_lon)
                     
-                    logger.info(
-                        f"   {idx}. 🟢 Passenger {pid}\n"
-                        f"      📍 Position: ({p_lat:.6f}, {p_lon:.6f})\n"
-                        f"      📏 Distance: {dist:.1f} meters\n"
-                        f"      🎯 Destination: ({dest_lat:.6f}, {dest_lon:.6f})\n"
-                        f"      ⏰ Spawned at: {spawned_at}"
+                    logger.debug(
+                        "   %d. 🟢 Passenger %s\n"
+                        "      📍 Position: (%.6f, %.6f)\n"
+                        "      📏 Distance: %.1f meters\n"
+                        "      🎯 Destination: (%.6f, %.6f)\n"
+                        "      ⏰ Spawned at: %s",
+                        idx, pid, p_lat, p_lon, dist, dest_lat, dest_lon, spawned_at,
+                        extra=self._log_extra
                     )
             
             if not passenger_ids:
@@ -1577,8 +1632,7 @@ class Conductor(BasePerson):
         Returns:
             Total passengers boarded during depot wait
         """
-        import asyncio
-        from datetime import datetime, timezone, timedelta
+        from datetime import timezone, timedelta
         
         logger.info(
             f"🔵 Conductor {self.vehicle_id}: 🏢 ENTERING DEPOT BOARDING MODE\n"
@@ -1588,14 +1642,14 @@ class Conductor(BasePerson):
         )
         
         self.depot_boarding_active = True
-        start_time = datetime.now(timezone.utc)
+        start_time = get_sim_clock().now(timezone.utc)
         timeout_minutes = self.config.depot_wait_time_minutes
         total_boarded = 0
         
         try:
             while self.depot_boarding_active:
                 # Check timeout
-                elapsed = (datetime.now(timezone.utc) - start_time).total_seconds() / 60.0
+                elapsed = (get_sim_clock().now(timezone.utc) - start_time).total_seconds() / 60.0
                 
                 if elapsed >= timeout_minutes:
                     logger.info(
@@ -1626,20 +1680,23 @@ class Conductor(BasePerson):
                 if boarded_this_round > 0:
                     total_boarded += boarded_this_round
                     logger.info(
-                        f"🔵 Conductor {self.vehicle_id}: ➕ Boarded {boarded_this_round} more passengers\n"
-                        f"   👥 Total at depot: {total_boarded}\n"
-                        f"   💺 Seats remaining: {self.seats_available}/{self.capacity}\n"
-                        f"   ⏱️  Elapsed: {elapsed:.1f}/{timeout_minutes} min"
+                        "🔵 Conductor %s: ➕ Boarded %d more passengers\n"
+                        "   👥 Total at depot: %d\n"
+                        "   💺 Seats remaining: %s/%s\n"
+                        "   ⏱️  Elapsed: %.1f/%s min",
+                        self.vehicle_id, boarded_this_round, total_boarded, self.seats_available, self.capacity,
+                        elapsed, timeout_minutes,
+                        extra=self._log_extra
                     )
                 
                 # Wait before next check
-                await asyncio.sleep(self.config.monitoring_interval_seconds)
+                await get_sim_clock().asleep(self.config.monitoring_interval_seconds)
             
             logger.info(
                 f"🔵 Conductor {self.vehicle_id}: 🚦 EXITING DEPOT BOARDING MODE\n"
                 f"   👥 Total boarded: {total_boarded} passengers\n"
                 f"   💺 Final occupancy: {self.passengers_on_board}/{self.capacity}\n"
-                f"   ⏱️  Total time: {((datetime.now(timezone.utc) - start_time).total_seconds() / 60.0):.1f} min"
+                f"   ⏱️  Total time: {((get_sim_clock().now(timezone.utc) - start_time).total_seconds() / 60.0):.1f} min"
             )
             
             return total_boarded
@@ -1652,6 +1709,11 @@ class Conductor(BasePerson):
         
         finally:
             self.depot_boarding_active = False
+            # Still parked at the depot after the wait: wait again (a scheduled re-check, not a poll)
+            if self._running and not self.is_full():
+                get_event_scheduler().schedule_in(
+                    self.config.monitoring_interval_seconds, "depot", self._recheck_depot, owner=self.vehicle_id
+                )
         
     def has_seats_available(self) -> bool:
         """Check if vehicle has available seats"""
@@ -1672,6 +1734,7 @@ class Conductor(BasePerson):
     def start_boarding(self):
         """Start accepting passengers"""
         self.boarding_active = True
+        self._schedule_monitoring()
         logger.info(
             f"🔵 Conductor {self.vehicle_id}: 🚪 BOARDING ENABLED\n"
             f"   💺 Seats available: {self.seats_available}/{self.capacity}\n"
@@ -15,20 +15,20 @@ VehicleDriver is a pure data consumer - it accepts route coordinates directly
 and does not load from files or databases on its own.
 """
 
-import time
+import bisect
 import threading
-import asyncio
-import socketio
 import logging
 from dataclasses import dataclass
 from typing import List, Tuple, Optional
-from datetime import datetime
 
 from . import math
 from .telemetry_buffer import TelemetryBuffer
 from ...base_person import BasePerson
 from ....core.states import DriverState
 
+from common.event_scheduler import get_event_scheduler
+from common.sim_clock import get_sim_clock
+
 try:
     from common.config_provider import get_config
     _config_available = True
@@ -37,6 +37,12 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Position events: re-estimate the next waypoint arrival at least this often (speed changes)
+MAX_ARRIVAL_LOOKAHEAD_SECONDS = 30.0
+# ...and this often while the engine runs but the vehicle has (almost) no speed yet
+STATIONARY_RECHECK_SECONDS = 2.0
+MIN_MOVING_SPEED_MPS = 0.5
+
 
 @dataclass
 class DriverConfig:
@@ -138,6 +144,7 @@ class VehicleDriver(BasePerson):
             raise ValueError("VehicleDriver requires route coordinates")
         
         self.vehicle_id = vehicle_id
+        self._log_extra = {"vehicle_id": vehicle_id}  # RateLimitFilter key
         self.route_name = route_name
         self.engine_buffer = engine_buffer
         self.telemetry_buffer = TelemetryBuffer()
@@ -154,8 +161,8 @@ class VehicleDriver(BasePerson):
         self.use_socketio = use_socketio
         self.sio_url = sio_url
         self.sio_connected = False
-        self.location_broadcast_task = None
         if self.use_socketio:
+            import socketio  # optional transport, loaded only when enabled
             self.sio = socketio.AsyncClient(logger=False, engineio_logger=False)
             self._setup_socketio_handlers()
         else:
@@ -167,8 +174,9 @@ class VehicleDriver(BasePerson):
         else:
             self.route: List[Tuple[float, float]] = route_coordinates
 
-        # Precompute segment lengths (km)
+        # Precompute segment lengths (km) and the distance along the route of each waypoint
         self.segment_lengths: List[float] = []
+        self.waypoint_distances: List[float] = [0.0]
         self.total_route_length = 0.0
         for i in range(len(self.route) - 1):
             lon1, lat1 = self.route[i]
@@ -176,6 +184,7 @@ class VehicleDriver(BasePerson):
             seg_len = math.haversine(lat1, lon1, lat2, lon2)  # km
             self.segment_lengths.append(seg_len)
             self.total_route_length += seg_len
+            self.waypoint_distances.append(self.total_route_length)
 
         # State
         self.current_segment = 0
@@ -242,12 +251,14 @@ class VehicleDriver(BasePerson):
             if self.current_state == DriverState.ONBOARD:
                 await self.stop_engine()
                 
-                # Wait for specified duration
+                # Dwell for the specified duration (a scheduled event, not a sleeping handler)
                 duration = data.get('duration_seconds', 30)
                 self.logger.info(f"[{self.person_name}] Stopping for {duration}s for passenger operations")
-                await asyncio.sleep(duration)
-                
-                self.logger.info(f"[{self.person_name}] Stop duration complete, waiting for conductor signal")
+                get_event_scheduler().schedule_in(
+                    duration, "dwell", self.logger.info,
+                    "[%s] Stop duration complete, waiting for conductor signal", self.person_name,
+                    owner=self.vehicle_id
+                )
         
         @self.sio.on('conductor:ready:depart')
         async def on_ready_to_depart(data):
@@ -281,84 +292,112 @@ class VehicleDriver(BasePerson):
             except Exception as e:
                 self.logger.error(f"[{self.person_name}] Error disconnecting Socket.IO: {e}")
     
-    async def _broadcast_location_loop(self) -> None:
-        """Background task to broadcast location via Socket.IO (Priority 2)."""
-        self.logger.info(f"[{self.person_name}] _broadcast_location_loop STARTED")
-        
-        while self._running and self.use_socketio:
-            try:
-                self.logger.info(f"[{self.person_name}] Loop iteration: sio_connected={self.sio_connected}, state={self.current_state}, use_socketio={self.use_socketio}")
-                
-                # Broadcast location when ONBOARD (driving) or WAITING (at stop for passengers)
-                if self.sio_connected and self.current_state in (DriverState.ONBOARD, DriverState.WAITING):
-                    # Log state for debugging
-                    if self.current_state == DriverState.WAITING:
-                        self.logger.info(f"[{self.person_name}] Broadcasting in WAITING state - checking for passengers")
-                    
-                    # Get current telemetry
-                    telemetry = self.step()
-                    
-                    if telemetry:
-                        lat = telemetry.get('lat', 0)
-                        lon = telemetry.get('lon', 0)
-                        
-                        # Update conductor position if available
-                        if hasattr(self, 'conductor') and self.conductor:
-                            await self.conductor.update_vehicle_position(lat, lon)
-                            if self.current_state == DriverState.WAITING:
-                                self.logger.info(f"[{self.person_name}] Updated conductor position: ({lat:.6f}, {lon:.6f})")
-                        
-                        location_data = {
-                            'vehicle_id': self.vehicle_id,
-                            'driver_id': self.component_id,
-                            'latitude': lat,
-                            'longitude': lon,
-                            'speed': telemetry.get('speed', 0),
-                            'heading': telemetry.get('bearing', 0),
-                            'timestamp': datetime.now().isoformat()
-                        }
-                        
-                        await self.sio.emit('driver:location:update', location_data)
-                        
-                        # Check if we've arrived at a waypoint (Phase 3.2)
-                        await self._check_waypoint_arrival(lat, lon)
-                
-                # Broadcast every 5 seconds
-                await asyncio.sleep(5.0)
+    async def _broadcast_location(self) -> None:
+        """Scheduled event: broadcast the location via Socket.IO (Priority 2), then re-arm while driving."""
+        if not self._running or not self.use_socketio:
+            return
+        try:
+            self.logger.debug("[%s] Broadcast: sio_connected=%s, state=%s",
+                              self.person_name, self.sio_connected, self.current_state, extra=self._log_extra)
             
-            except Exception as e:
-                self.logger.error(f"Location broadcast error: {e}")
-                await asyncio.sleep(5.0)  # Continue trying
+            # Broadcast location when ONBOARD (driving) or WAITING (at stop for passengers)
+            if self.sio_connected and self.current_state in (DriverState.ONBOARD, DriverState.WAITING):
+                lat, lon, telemetry = self._current_position()
+                location_data = {
+                    'vehicle_id': self.vehicle_id,
+                    'driver_id': self.component_id,
+                    'latitude': lat,
+                    'longitude': lon,
+                    'speed': telemetry.get('speed', 0) if telemetry else 0,
+                    'heading': telemetry.get('bearing', 0) if telemetry else 0,
+                    'timestamp': get_sim_clock().now().isoformat()
+                }
+                await self.sio.emit('driver:location:update', location_data)
+        
+        except Exception as e:
+            self.logger.error("[%s] Location broadcast error: %s", self.person_name, e)
+        
+        # A stationary vehicle was broadcast once when it stopped; only a moving one needs more
+        if self._running and self.current_state == DriverState.ONBOARD:
+            get_event_scheduler().schedule_in(
+                self.config.broadcast_interval_seconds, "broadcast", self._broadcast_location, owner=self.vehicle_id
+            )
 
-    async def _update_conductor_position_loop(self) -> None:
-        """Background task to update conductor position periodically (works without Socket.IO)."""
-        self.logger.info(f"[{self.person_name}] Conductor position update loop STARTED")
+    async def _update_position(self) -> None:
+        """
+        Scheduled event: give the conductor the current position, announce waypoints
+        passed since the last event and schedule the next one for the time the vehicle
+        reaches its next waypoint (from engine distance and speed).
         
-        while self._running:
-            try:
-                if hasattr(self, 'conductor') and self.conductor:
-                    # When WAITING (engine OFF): use static initial position
-                    if self.current_state == DriverState.WAITING:
-                        if self.route and len(self.route) > 0:
-                            initial_coord = self.route[0]  # [longitude, latitude]
-                            lat, lon = initial_coord[1], initial_coord[0]
-                            await self.conductor.update_vehicle_position(lat, lon)
-                            self.logger.debug(f"[{self.person_name}] Conductor position (stationary): ({lat:.6f}, {lon:.6f})")
-                    
-                    # When ONBOARD (engine ON): use real-time telemetry from engine
-                    elif self.current_state == DriverState.ONBOARD:
-                        telemetry = self.step()
-                        if telemetry:
-                            lat = telemetry.get('lat', 0)
-                            lon = telemetry.get('lon', 0)
-                            await self.conductor.update_vehicle_position(lat, lon)
-                            self.logger.debug(f"[{self.person_name}] Conductor position (moving): ({lat:.6f}, {lon:.6f})")
-                
-                await asyncio.sleep(2)  # Update every 2 seconds (matches conductor's polling interval)
-                    
-            except Exception as e:
-                self.logger.error(f"[{self.person_name}] Error updating conductor position: {e}")
-                await asyncio.sleep(2)
+        A stationary vehicle (WAITING) gets one update when it stops and none after that.
+        """
+        if not self._running:
+            return
+        try:
+            lat, lon, telemetry = self._current_position()
+            if hasattr(self, 'conductor') and self.conductor:
+                await self.conductor.update_vehicle_position(lat, lon)
+                self.logger.debug("[%s] Conductor position (%s): (%.6f, %.6f)",
+                                  self.person_name, self.current_state.value, lat, lon, extra=self._log_extra)
+            
+            if self.current_state != DriverState.ONBOARD:
+                return
+            distance_km = telemetry.get('distance', 0.0) / 1000.0 if telemetry else 0.0
+            speed_mps = telemetry.get('speed_mps', 0.0) if telemetry else 0.0
+            await self._announce_waypoints(distance_km)
+            delay = self._seconds_to_next_waypoint(distance_km, speed_mps)
+        except Exception as e:
+            self.logger.error("[%s] Error updating conductor position: %s", self.person_name, e)
+            delay = STATIONARY_RECHECK_SECONDS
+        
+        if delay is not None and self._running and self.current_state == DriverState.ONBOARD:
+            get_event_scheduler().schedule_in(delay, "position", self._update_position, owner=self.vehicle_id)
+
+    def _current_position(self) -> Tuple[float, float, Optional[dict]]:
+        """Latest (lat, lon, telemetry) from the engine, or the route start before the first reading"""
+        telemetry = self.step()
+        if telemetry:
+            return telemetry.get('lat', 0), telemetry.get('lon', 0), telemetry
+        lon, lat = self.route[0]
+        return lat, lon, None
+
+    def _seconds_to_next_waypoint(self, distance_km: float, speed_mps: float) -> Optional[float]:
+        """
+        Sim seconds until the vehicle reaches the next route waypoint at its current speed.
+        
+        Args:
+            distance_km: Distance travelled along the route (engine odometer)
+            speed_mps: Current speed
+            
+        Returns:
+            Delay for the next position event, or None past the end of the route
+        """
+        next_index = bisect.bisect_right(self.waypoint_distances, distance_km + 1e-9)
+        if next_index >= len(self.waypoint_distances):
+            return None
+        if speed_mps < MIN_MOVING_SPEED_MPS:
+            return STATIONARY_RECHECK_SECONDS  # pulling away: re-estimate once there is speed
+        seconds = (self.waypoint_distances[next_index] - distance_km) * 1000.0 / speed_mps
+        # Speed changes between events: re-estimate at least this often
+        return min(max(seconds, get_sim_clock().resolution), MAX_ARRIVAL_LOOKAHEAD_SECONDS)
+
+    async def _announce_waypoints(self, distance_km: float) -> None:
+        """Mark every waypoint passed up to `distance_km` as visited and announce it (Phase 3.2)."""
+        passed = bisect.bisect_right(self.waypoint_distances, distance_km + self.config.waypoint_proximity_threshold_km)
+        for waypoint_index in range(passed):
+            if waypoint_index in self.visited_waypoints:
+                continue
+            self.visited_waypoints.add(waypoint_index)
+            if self.use_socketio and self.sio_connected:
+                wp_lon, wp_lat = self.route[waypoint_index]
+                await self._emit_waypoint_arrival(waypoint_index, wp_lat, wp_lon)
+
+    def _schedule_state_events(self) -> None:
+        """Engine started or stopped: update position and broadcast now (re-armed while driving)."""
+        scheduler = get_event_scheduler()
+        scheduler.schedule_in(0.0, "position", self._update_position, owner=self.vehicle_id)
+        if self.use_socketio:
+            scheduler.schedule_in(0.0, "broadcast", self._broadcast_location, owner=self.vehicle_id)
 
     async def _start_implementation(self) -> bool:
         """Driver boards vehicle and starts GPS device, but NOT the engine (real operations workflow)."""
@@ -375,6 +414,7 @@ class VehicleDriver(BasePerson):
             if not self._running:
                 self._running = True
                 self._thread = threading.Thread(target=self._worker, daemon=True)
+                get_sim_clock().hold(self._thread)
                 self._thread.start()
             
             # NOTE: In real operations, driver does NOT automatically start engine when boarding
@@ -422,14 +462,13 @@ class VehicleDriver(BasePerson):
                 else:
                     self.logger.warning(f"[{self.person_name}] No route coordinates available for conductor")
                 
-                # Start periodic position updates for conductor (without Socket.IO dependency)
-                self.conductor_update_task = asyncio.create_task(self._update_conductor_position_loop())
-                self.logger.info(f"[{self.person_name}] Conductor position update task started")
-            
-            # Start location broadcasting (Priority 2) - requires Socket.IO
+            # Location broadcasting (Priority 2) - requires Socket.IO. Further position and
+            # broadcast events are scheduled when the engine starts (no polling while parked)
             if self.use_socketio:
-                self.location_broadcast_task = asyncio.create_task(self._broadcast_location_loop())
-                self.logger.info(f"[{self.person_name}] Location broadcasting task started")
+                get_event_scheduler().schedule_in(
+                    0.0, "broadcast", self._broadcast_location, owner=self.vehicle_id
+                )
+                self.logger.info(f"[{self.person_name}] Location broadcasting scheduled")
             
             self.logger.info(
                 f"Driver {self.person_name} successfully boarded {self.vehicle_id} - WAITING for engine start "
@@ -456,14 +495,10 @@ class VehicleDriver(BasePerson):
                 except Exception as e:
                     self.logger.warning(f"Error stopping conductor: {e}")
             
-            # Cancel location broadcasting (Priority 2)
-            if self.location_broadcast_task:
-                self.location_broadcast_task.cancel()
-                try:
-                    await self.location_broadcast_task
-                except asyncio.CancelledError:
-                    pass
-                self.logger.info(f"[{self.person_name}] Location broadcasting task stopped")
+            # Cancel scheduled position/broadcast/dwell events
+            for kind in ("position", "broadcast", "dwell"):
+                get_event_scheduler().cancel(kind, owner=self.vehicle_id)
+            self.logger.info(f"[{self.person_name}] Location events cancelled")
             
             # Disconnect Socket.IO (Priority 2)
             if self.use_socketio:
@@ -510,6 +545,7 @@ class VehicleDriver(BasePerson):
                 if engine_started:
                     # Transition from WAITING to ONBOARD
                     self.current_state = DriverState.ONBOARD
+                    self._schedule_state_events()
                     self.logger.info(
                         f"✅ Driver {self.person_name} started engine - now ONBOARD and ready to drive"
                     )
@@ -541,6 +577,7 @@ class VehicleDriver(BasePerson):
                 if engine_stopped:
                     # Transition from ONBOARD to WAITING
                     self.current_state = DriverState.WAITING
+                    self._schedule_state_events()
                     self.logger.info(
                         f"🛑 Driver {self.person_name} stopped engine - now WAITING"
                     )
@@ -589,53 +626,29 @@ class VehicleDriver(BasePerson):
         except RuntimeError:
             return asyncio.run(self.stop())
     
-    async def _check_waypoint_arrival(self, current_lat: float, current_lon: float) -> None:
-        """
-        Check if vehicle has arrived at a route waypoint and emit event for conductor.
-        
-        This enables Phase 3.2: Driver triggers conductor to check for passengers at stops.
-        
-        Args:
-            current_lat: Current vehicle latitude
-            current_lon: Current vehicle longitude
-        """
-        if not self.use_socketio or not self.sio_connected:
-            return
+    async def _emit_waypoint_arrival(self, waypoint_index: int, wp_lat: float, wp_lon: float) -> None:
+        """Emit the waypoint arrival event for the conductor."""
+        arrival_data = {
+            'vehicle_id': self.vehicle_id,
+            'driver_id': self.component_id,
+            'waypoint_index': waypoint_index,
+            'latitude': wp_lat,
+            'longitude': wp_lon,
+            'route_id': self.route_name,
+            'timestamp': get_sim_clock().now().isoformat()
+        }
         
-        # Check each waypoint in the route
-        for waypoint_index, (wp_lon, wp_lat) in enumerate(self.route):
-            # Skip if already visited
-            if waypoint_index in self.visited_waypoints:
-                continue
-            
-            # Calculate distance to waypoint
-            distance_km = math.haversine(current_lat, current_lon, wp_lat, wp_lon)
-            
-            # If within proximity threshold (from dynamic config), mark as arrived
-            if distance_km <= self.config.waypoint_proximity_threshold_km:
-                self.visited_waypoints.add(waypoint_index)
-                
-                # Emit arrival event for conductor
-                arrival_data = {
-                    'vehicle_id': self.vehicle_id,
-                    'driver_id': self.component_id,
-                    'waypoint_index': waypoint_index,
-                    'latitude': wp_lat,
-                    'longitude': wp_lon,
-                    'route_id': self.route_name,
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                try:
-                    await self.sio.emit('driver:arrived:waypoint', arrival_data)
-                    self.logger.info(
-                        f"[{self.person_name}] Arrived at waypoint {waypoint_index} "
-                        f"({wp_lat:.4f}, {wp_lon:.4f})"
-                    )
-                except Exception as e:
-                    self.logger.error(f"Failed to emit waypoint arrival: {e}")
+        try:
+            await self.sio.emit('driver:arrived:waypoint', arrival_data)
+            self.logger.info(
+                f"[{self.person_name}] Arrived at waypoint {waypoint_index} "
+                f"({wp_lat:.4f}, {wp_lon:.4f})"
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to emit waypoint arrival: {e}")
 
     def _worker(self):
+        clock = get_sim_clock()
         while self._running:
             telemetry = self.step()
             if telemetry:
@@ -668,7 +681,7 @@ class VehicleDriver(BasePerson):
                             self.logger.debug(f"VehicleState update failed: {e}")
 
                 # (Diagnostics removed after validation of movement)
-            time.sleep(self.tick_time)
+            clock.sleep(self.tick_time)
 
     # Linear interpolation
     def _step_linear(self) -> Optional[dict]:
@@ -683,7 +696,7 @@ class VehicleDriver(BasePerson):
             
             return {
                 "deviceId": self.component_id,
-                "timestamp": time.time(),
+                "timestamp": get_sim_clock().time(),
                 "lon": lon,
                 "lat": lat,
                 "bearing": 0.0,  # Stationary
@@ -724,7 +737,7 @@ class VehicleDriver(BasePerson):
         speed_mps = entry.get("cruise_speed_mps", entry.get("cruise_speed", 0.0))
         telemetry = {
             "deviceId": self.component_id,  # Use driver's license as device ID
-            "timestamp": entry.get("timestamp", time.time()),
+            "timestamp": entry.get("timestamp", get_sim_clock().time()),
             "lon": lon,
             "lat": lat,
             "bearing": bearing,
@@ -754,7 +767,7 @@ class VehicleDriver(BasePerson):
             
             return {
                 "deviceId": self.component_id,
-                "timestamp": time.time(),
+                "timestamp": get_sim_clock().time(),
                 "lon": lon,
                 "lat": lat,
                 "bearing": 0.0,  # Stationary
@@ -777,7 +790,7 @@ class VehicleDriver(BasePerson):
         speed_mps = entry.get("cruise_speed_mps", entry.get("cruise_speed", 0.0))
         telemetry = {
             "deviceId": self.component_id,  # Use driver's license as device ID
-            "timestamp": entry.get("timestamp", time.time()),
+            "timestamp": entry.get("timestamp", get_sim_clock().time()),
             "lon": lon,
             "lat": lat,
             "bearing": bearing,
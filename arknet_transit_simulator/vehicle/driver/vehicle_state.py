@@ -6,9 +6,11 @@ Contains all vehicle telemetry data including position, speed, heading,
 driver information, and engine status.
 """
 
-from datetime import datetime, timezone
+from datetime import timezone
 from typing import Optional
 
+from common.sim_clock import get_sim_clock
+
 
 class VehicleState:
     """Vehicle state object for GPS plugin system."""
@@ -32,7 +34,7 @@ class VehicleState:
         self.driver_name = driver_name
         self.vehicle_reg = vehicle_id
         self.engine_status = "OFF"
-        self.timestamp = datetime.now(timezone.utc).isoformat()
+        self.timestamp = get_sim_clock().now(timezone.utc).isoformat()
         # Physics (optional)
         self.accel = 0.0              # m/s^2
         self.motion_phase = "STOPPED" # LAUNCH|CRUISE|BRAKE|STOPPED
@@ -53,7 +55,7 @@ class VehicleState:
         self.lng = lon
         self.speed = speed
         self.heading = heading
-        self.timestamp = datetime.now(timezone.utc).isoformat()
+        self.timestamp = get_sim_clock().now(timezone.utc).isoformat()
     
     def set_engine_status(self, status: str):
         """
@@ -63,7 +65,7 @@ class VehicleState:
             status: Engine status ("ON" or "OFF")
         """
         self.engine_status = status
-        self.timestamp = datetime.now(timezone.utc).isoformat()
+        self.timestamp = get_sim_clock().now(timezone.utc).isoformat()
     
     def set_position(self, lat: float, lon: float):
         """
@@ -75,7 +77,7 @@ class VehicleState:
         """
         self.lat = lat
         self.lng = lon
-        self.timestamp = datetime.now(timezone.utc).isoformat()
+        self.timestamp = get_sim_clock().now(timezone.utc).isoformat()
     
     def __repr__(self):
         return (f"VehicleState(driver={self.driver_name}, vehicle={self.vehicle_reg}, "
@@ -96,4 +98,4 @@ class VehicleState:
                 pass
         if segment_index is not None:
             self.segment_index = int(segment_index)
-        self.timestamp = datetime.now(timezone.utc).isoformat()
\ No newline at end of file
+        self.timestamp = get_sim_clock().now(timezone.utc).isoformat()
\ No newline at end of file
@@ -7,15 +7,17 @@ Threaded engine simulation loop with state management.
 
 - Loads a speed model via sim_speed_model.load_speed_model
 - Runs in a background thread
-- Each tick, updates speed, distance, and time
+- Each tick, updates speed, distance, and time (ticks are simulation seconds on
+  the shared SimClock, so time-warp and discrete runs move the engine faster)
 - Writes diagnostics into EngineBuffer
 - Uses DeviceState for proper lifecycle management
 """
 
 import threading
-import time
 from typing import Any, Dict
 
+from common.sim_clock import get_sim_clock
+
 from arknet_transit_simulator.vehicle.engine.engine_buffer import EngineBuffer
 from arknet_transit_simulator.vehicle.base_component import BaseComponent
 from arknet_transit_simulator.core.states import DeviceState
@@ -51,6 +53,7 @@ class Engine(BaseComponent):
             
             self._stop_event.clear()
             self._thread = threading.Thread(target=self._run_loop, daemon=True)
+            get_sim_clock().hold(self._thread)
             self._thread.start()
             self.logger.info(f"Engine for {self.component_id} started successfully")
             return True
@@ -109,6 +112,7 @@ class Engine(BaseComponent):
 
     def _run_loop(self):
         """Main loop: run until stopped."""
+        clock = get_sim_clock()
         while not self._stop_event.is_set():
             result = self.model.update()
 
@@ -125,7 +129,7 @@ class Engine(BaseComponent):
             # write entry to buffer (explicit m/s; keep legacy compatibility key cruise_speed for now but clarify units)
             entry: Dict[str, Any] = {
                 "device_id": self.component_id,
-                "timestamp": time.time(),
+                "timestamp": clock.time(),
                 "cruise_speed_mps": velocity_mps,
                 "cruise_speed": velocity_mps,  # legacy; now m/s
                 "distance": self.total_distance,  # km
@@ -142,4 +146,4 @@ class Engine(BaseComponent):
                 entry["physics"] = physics_block
             self.buffer.write(entry)
 
-            time.sleep(self.tick_time)
+            clock.sleep(self.tick_time)
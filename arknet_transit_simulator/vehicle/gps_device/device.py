@@ -1,22 +1,36 @@
 import os
-import time
 import threading
 import asyncio
 import logging
-import websockets
 from typing import Dict, Any, Optional
-from dotenv import load_dotenv
 
-from .rxtx_buffer import RxTxBuffer
+from common.metrics import get_metrics_registry
+from common.sim_clock import get_sim_clock
+
+from .rxtx_buffer import RxTxBuffer, TELEMETRY_DROPPED
 from .radio_module.transmitter import WebSocketTransmitter
 from .radio_module.packet import TelemetryPacket, PacketCodec, make_packet
 from .plugins.manager import PluginManager
 from ..base_component import BaseComponent
 from ...core.states import DeviceState
 
-load_dotenv()
 logger = logging.getLogger(__name__)
 
+TELEMETRY_SENT = get_metrics_registry().counter(
+    "sim_telemetry_packets_sent_total", "Telemetry packets sent to the GPS server")
+TELEMETRY_SEND_FAILED = TELEMETRY_DROPPED.labels("send_error")
+
+_env_loaded = False
+
+
+def _load_env_once():
+    """Load .env on first device construction rather than at module import"""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
 
 class GPSDevice(BaseComponent):
     """
@@ -48,6 +62,8 @@ class GPSDevice(BaseComponent):
             ws_transmitter: WebSocket transmitter for sending data
             plugin_config: Configuration for telemetry plugin
         """
+        _load_env_once()
+        
         # Initialize BaseComponent with DeviceState
         super().__init__(device_id, "GPSDevice", DeviceState.OFF)
         
@@ -101,6 +117,7 @@ class GPSDevice(BaseComponent):
     def _data_worker(self):
         """Worker thread that collects data from plugin and writes to buffer."""
         logger.info(f"GPS device {self.component_id} data worker started")
+        clock = get_sim_clock()
         
         while not self._stop.is_set():
             try:
@@ -116,12 +133,12 @@ class GPSDevice(BaseComponent):
                 if self.plugin_manager.active_plugin and hasattr(self.plugin_manager.active_plugin, 'update_interval'):
                     interval = getattr(self.plugin_manager.active_plugin, 'update_interval', 1.0)
                 
-                # Sleep according to plugin interval
-                time.sleep(interval)
+                # Sleep according to plugin interval (simulation seconds)
+                clock.sleep(interval)
                 
             except Exception as e:
-                logger.error(f"Error in data worker for {self.component_id}: {e}")
-                time.sleep(1.0)  # Wait longer on error
+                logger.error("Error in data worker for %s: %s", self.component_id, e)
+                clock.sleep(1.0)  # Wait longer on error
         
         logger.info(f"GPS device {self.component_id} data worker stopped")
 
@@ -143,6 +160,8 @@ class GPSDevice(BaseComponent):
         
         Suitable for real-world deployment where network interruptions are expected.
         """
+        import websockets  # transport loaded with the transmitter thread, not at import
+        
         connection_retry_delay = 5.0  # Seconds between reconnection attempts
         max_consecutive_errors = 3    # Max errors before forcing reconnect
         connected = False
@@ -155,19 +174,20 @@ class GPSDevice(BaseComponent):
                 # ===== CONNECTION PHASE =====
                 if not connected:
                     try:
-                        logger.info(f"📡 {self.component_id}: Attempting to connect to GPS server...")
+                        logger.info("📡 %s: Attempting to connect to GPS server...", self.component_id,
+                                    extra={"component_id": self.component_id})
                         await self.transmitter.connect()
                         connected = True
                         consecutive_errors = 0
                         logger.info(f"📡 {self.component_id}: ✅ Connected to GPS server")
                     except Exception as e:
                         # Connection failed - log and retry
-                        import traceback
                         if "refused" in str(e).lower() or "1225" in str(e):
-                            logger.warning(f"📡 {self.component_id}: GPS server not available - will retry in {connection_retry_delay}s")
+                            logger.warning("📡 %s: GPS server not available - will retry in %ss",
+                                           self.component_id, connection_retry_delay)
                         else:
-                            logger.error(f"📡 {self.component_id}: Connection failed: {type(e).__name__}: {e}")
-                            logger.debug(f"   Traceback:\n{traceback.format_exc()}")
+                            logger.error("📡 %s: Connection failed: %s: %s", self.component_id, type(e).__name__, e)
+                            logger.debug("📡 %s: Connection failure traceback", self.component_id, exc_info=True)
                         
                         # Wait before retry, checking stop flag periodically
                         for _ in range(int(connection_retry_delay * 10)):
@@ -177,6 +197,7 @@ class GPSDevice(BaseComponent):
                         continue
                 
                 # ===== TRANSMISSION PHASE =====
+                data = None
                 try:
                     # Read data from buffer with timeout
                     data = await asyncio.to_thread(self.rxtx_buffer.read, timeout=1.0)
@@ -208,6 +229,8 @@ class GPSDevice(BaseComponent):
                             # Assume it's already a TelemetryPacket
                             await self.transmitter.send(data)
                         
+                        TELEMETRY_SENT.inc()
+                        
                         # Reset error counter on successful send
                         consecutive_errors = 0
                         
@@ -217,7 +240,9 @@ class GPSDevice(BaseComponent):
                     
                 except websockets.exceptions.ConnectionClosed as e:
                     # Connection dropped during transmission
-                    logger.warning(f"📡 {self.component_id}: Connection closed by server - will reconnect")
+                    if data:
+                        TELEMETRY_SEND_FAILED.inc()
+                    logger.warning("📡 %s: Connection closed by server - will reconnect", self.component_id)
                     connected = False
                     consecutive_errors = 0
                     # Close and clear the transmitter to force fresh connection
@@ -229,11 +254,14 @@ class GPSDevice(BaseComponent):
                     
                 except (OSError, ConnectionError, websockets.exceptions.WebSocketException) as e:
                     # Network error during transmission
+                    if data:
+                        TELEMETRY_SEND_FAILED.inc()
                     consecutive_errors += 1
-                    logger.warning(f"📡 {self.component_id}: Network error during transmission ({consecutive_errors}/{max_consecutive_errors}): {e}")
+                    logger.warning("📡 %s: Network error during transmission (%d/%d): %s",
+                                   self.component_id, consecutive_errors, max_consecutive_errors, e)
                     
                     if consecutive_errors >= max_consecutive_errors:
-                        logger.warning(f"📡 {self.component_id}: Too many consecutive errors - forcing reconnect")
+                        logger.warning("📡 %s: Too many consecutive errors - forcing reconnect", self.component_id)
                         connected = False
                         consecutive_errors = 0
                         try:
@@ -247,11 +275,13 @@ class GPSDevice(BaseComponent):
                     
                 except Exception as e:
                     # Unexpected error - log but don't crash
-                    logger.error(f"📡 {self.component_id}: Unexpected transmission error: {type(e).__name__}: {e}")
+                    if data:
+                        TELEMETRY_SEND_FAILED.inc()
+                    logger.error("📡 %s: Unexpected transmission error: %s: %s", self.component_id, type(e).__name__, e)
                     consecutive_errors += 1
                     
                     if consecutive_errors >= max_consecutive_errors:
-                        logger.warning(f"📡 {self.component_id}: Too many errors - forcing reconnect")
+                        logger.warning("📡 %s: Too many errors - forcing reconnect", self.component_id)
                         connected = False
                         consecutive_errors = 0
                     
@@ -293,6 +323,7 @@ class GPSDevice(BaseComponent):
             
             # Start data collection worker
             self.data_thread = threading.Thread(target=self._data_worker, daemon=True)
+            get_sim_clock().hold(self.data_thread)
             self.data_thread.start()
             
             # Start transmitter worker
@@ -7,9 +7,10 @@ route-following vehicle simulation.
 """
 
 import logging
-from datetime import datetime, timezone
+from datetime import timezone
 from typing import Dict, Any, Optional
 from .interface import ITelemetryPlugin
+from common.sim_clock import get_sim_clock
 
 logger = logging.getLogger(__name__)
 
@@ -104,7 +105,7 @@ class NavigatorTelemetryPlugin(ITelemetryPlugin):
                 "lon": float(telemetry_entry.get("lon", 0.0)),
                 "speed": float(telemetry_entry.get("speed", 0.0)),
                 "heading": float(telemetry_entry.get("bearing", 0.0)),  # Navigator uses 'bearing'
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": get_sim_clock().now(timezone.utc).isoformat(),
                 "device_id": self.device_id,
                 "route": telemetry_entry.get("route", "NAVIGATOR_ROUTE"),
                 "vehicle_reg": self.device_id,
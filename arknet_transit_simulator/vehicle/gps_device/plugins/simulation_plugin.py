@@ -8,9 +8,10 @@ Used for development, testing, and vehicle simulation scenarios.
 
 import time
 import logging
-from datetime import datetime, timezone
+from datetime import timezone
 from typing import Dict, Any, Optional
 from .interface import ITelemetryPlugin
+from common.sim_clock import get_sim_clock
 
 logger = logging.getLogger(__name__)
 
@@ -143,7 +144,7 @@ class SimulationTelemetryPlugin(ITelemetryPlugin):
                 "lon": float(lon),
                 "speed": float(speed),
                 "heading": float(heading),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": get_sim_clock().now(timezone.utc).isoformat(),
                 "device_id": self.device_id,
                 "route": str(route_id),
                 "vehicle_reg": vehicle_reg,
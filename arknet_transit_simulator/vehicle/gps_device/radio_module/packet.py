@@ -2,9 +2,11 @@ import json
 import os
 import base64
 from dataclasses import dataclass, asdict
-from datetime import datetime, timezone
+from datetime import timezone
 from typing import Optional, Dict
 
+from common.sim_clock import get_sim_clock
+
 
 @dataclass
 class TelemetryPacket:
@@ -42,7 +44,7 @@ def make_packet(device_id: str,
         vehicleReg=vehicle_reg or device_id,
         driverId=driver_id or f"sim-{device_id}",
         driverName=driver_name or {"first": "Sim", "last": device_id},
-        timestamp=ts or datetime.now(timezone.utc).isoformat(),
+        timestamp=ts or get_sim_clock().now(timezone.utc).isoformat(),
         lat=round(lat, 6),
         lon=round(lon, 6),
         speed=round(speed, 2),
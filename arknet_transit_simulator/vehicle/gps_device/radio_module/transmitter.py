@@ -1,12 +1,13 @@
 # world/vehicle/gps_device/radio_module/transmitter.py
 import asyncio
-from typing import Optional
-
-import websockets
+from typing import TYPE_CHECKING, Optional
 
 from .packet import TelemetryPacket, PacketCodec
 from arknet_transit_simulator.utils.common.ws_utils import to_ws_url
 
+if TYPE_CHECKING:
+    import websockets
+
 
 class Transmitter:
     async def connect(self):  # pragma: no cover
@@ -31,7 +32,7 @@ class WebSocketTransmitter(Transmitter):
         self.device_id = device_id
         self.codec = codec
 
-        self._ws: Optional[websockets.WebSocketClientProtocol] = None
+        self._ws: Optional["websockets.WebSocketClientProtocol"] = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._closing: bool = False
 
@@ -39,6 +40,7 @@ class WebSocketTransmitter(Transmitter):
         # Build full WS URL with /device and query parameters.
         url = to_ws_url(self.server_url, self.token, self.device_id)
         self._loop = asyncio.get_running_loop()
+        import websockets  # loaded on first connect
         self._ws = await websockets.connect(url, open_timeout=10)
         return self._ws
 
@@ -1,5 +1,12 @@
 import queue
 
+from common.metrics import get_metrics_registry
+
+TELEMETRY_DROPPED = get_metrics_registry().counter(
+    "sim_telemetry_packets_dropped_total", "Telemetry packets lost before reaching the GPS server", ("reason",))
+_BUFFER_FULL = TELEMETRY_DROPPED.labels("buffer_full")
+
+
 class RxTxBuffer:
     """
     Simple FIFO queue that decouples the simulator (producer)
@@ -13,6 +20,7 @@ class RxTxBuffer:
         try:
             self.queue.put(data, block=False)
         except queue.Full:
+            _BUFFER_FULL.inc()
             print("[WARN] RxTxBuffer full, dropping data")
 
     def read(self, block=True, timeout=None):
@@ -21,9 +21,10 @@ Usage in Real Hardware:
 import asyncio
 import logging
 from typing import Optional, Dict, Any
-from datetime import datetime
 import httpx # type: ignore
 
+from common.sim_clock import get_sim_clock
+
 
 class HardwareEventClient:
     """
@@ -49,7 +50,9 @@ class HardwareEventClient:
     async def connect(self):
         """Initialize HTTP client connection"""
         if not self.client:
-            self.client = httpx.AsyncClient(timeout=10.0)
+            from common.http_pool import get_http_pool
+            # Latency per upstream is exported on /metrics through the shared pool's stats
+            self.client = httpx.AsyncClient(timeout=10.0, event_hooks=get_http_pool().event_hooks("strapi"))
             self.logger.info(f"🔌 Hardware event client connected: vehicle={self.vehicle_id}")
     
     async def disconnect(self):
@@ -86,7 +89,7 @@ class HardwareEventClient:
                     "longitude": longitude,
                     "speed_kmh": speed_kmh,
                     "heading": heading,
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
+                    "timestamp": get_sim_clock().utcnow().isoformat() + "Z"
                 }
             )
             
@@ -126,7 +129,7 @@ class HardwareEventClient:
                     "action": action,
                     "latitude": latitude,
                     "longitude": longitude,
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
+                    "timestamp": get_sim_clock().utcnow().isoformat() + "Z"
                 }
             )
             
@@ -167,7 +170,7 @@ class HardwareEventClient:
                     "tap_type": tap_type,
                     "latitude": latitude,
                     "longitude": longitude,
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
+                    "timestamp": get_sim_clock().utcnow().isoformat() + "Z"
                 }
             )
             
@@ -211,7 +214,7 @@ class HardwareEventClient:
                     "count_in": count_in,
                     "count_out": count_out,
                     "total_onboard": total_onboard,
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
+                    "timestamp": get_sim_clock().utcnow().isoformat() + "Z"
                 }
             )
             
@@ -251,7 +254,7 @@ class HardwareEventClient:
                     "passenger_ids": passenger_ids,
                     "latitude": latitude,
                     "longitude": longitude,
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
+                    "timestamp": get_sim_clock().utcnow().isoformat() + "Z"
                 }
             )
             
@@ -292,7 +295,7 @@ class HardwareEventClient:
                     "passenger_ids": passenger_ids,
                     "latitude": latitude,
                     "longitude": longitude,
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
+                    "timestamp": get_sim_clock().utcnow().isoformat() + "Z"
                 }
             )
             
@@ -332,7 +335,7 @@ class HardwareEventClient:
                     "stop_id": stop_id,
                     "latitude": latitude,
                     "longitude": longitude,
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
+                    "timestamp": get_sim_clock().utcnow().isoformat() + "Z"
                 }
             )
             
@@ -369,7 +372,7 @@ class HardwareEventClient:
                     "vehicle_id": self.vehicle_id,
                     "device_id": self.device_id,
                     "stop_id": stop_id,
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
+                    "timestamp": get_sim_clock().utcnow().isoformat() + "Z"
                 }
             )
             
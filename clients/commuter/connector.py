@@ -162,6 +162,11 @@ class CommuterConnector:
                     elif message_type in ["passenger:spawned", "passenger:boarded", "passenger:alighted"]:
                         await self._trigger_event(message_type, data.get("data", {}))
                     
+                    # Handle batched passenger events (one frame, many events)
+                    elif message_type == "passenger:batch":
+                        for event in data.get("data", {}).get("events", []):
+                            await self._trigger_event(event.get("type"), event.get("data", {}))
+                    
                     # Handle seed progress events
                     elif message_type in ["seed:progress", "seed:hour_complete"]:
                         await self._trigger_event(message_type, data.get("data", {}))
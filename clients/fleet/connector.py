@@ -32,7 +32,10 @@ Usage:
         print(f"Engine started: {data}")
     
     connector.on('engine_started', on_engine_started)
-    await connector.connect_websocket()
+    await connector.connect_websocket(routes=["1"], max_rate=2)
+    
+    # Live fleet mirror kept up to date from the stream (snapshot + deltas)
+    vehicles = connector.get_fleet_vehicles()
 """
 
 import asyncio
@@ -40,6 +43,7 @@ import logging
 from typing import Optional, Callable, Dict, Any, List
 from datetime import datetime
 from enum import Enum
+from urllib.parse import urlencode
 import json
 
 import httpx
@@ -68,6 +72,8 @@ class EventType(str, Enum):
     PASSENGER_ALIGHTED = "passenger_alighted"
     BOARDING_ENABLED = "boarding_enabled"
     BOARDING_DISABLED = "boarding_disabled"
+    FLEET_SNAPSHOT = "fleet_snapshot"
+    FLEET_DELTA = "fleet_delta"
     CONNECT = "connect"
     DISCONNECT = "disconnect"
 
@@ -123,6 +129,12 @@ class FleetConnector:
         # Event handlers (Observable pattern)
         self._event_handlers: Dict[str, List[Callable]] = {}
         
+        # Live fleet state mirrored from fleet_snapshot/fleet_delta messages
+        self.fleet: Dict[str, Dict[str, Any]] = {}
+        self.fleet_seq: Optional[int] = None
+        self._stream_routes: Optional[List[str]] = None
+        self._stream_max_rate: Optional[float] = None
+        
         # Connection state
         self.connected = False
         self.is_websocket_connected = False
@@ -187,13 +199,18 @@ class FleetConnector:
         try:
             async for message in self.ws:
                 try:
-                    data = json.loads(message)
-                    event_type = data.get("event_type")
-                    
-                    logger.debug(f"📨 WebSocket event: {event_type}")
+                    frame = json.loads(message)
                     
-                    # Trigger event handlers
-                    await self._trigger_event(event_type, data)
+                    # Batched frames carry a JSON array of messages
+                    for data in frame if isinstance(frame, list) else [frame]:
+                        event_type = data.get("event_type")
+                        
+                        logger.debug(f"📨 WebSocket event: {event_type}")
+                        
+                        self._apply_fleet_message(event_type, data.get("data") or {})
+                        
+                        # Trigger event handlers
+                        await self._trigger_event(event_type, data)
                     
                 except json.JSONDecodeError as e:
                     logger.error(f"Failed to parse WebSocket message: {e}")
@@ -209,17 +226,66 @@ class FleetConnector:
             if self.auto_reconnect:
                 logger.info("🔄 Attempting to reconnect in 5 seconds...")
                 await asyncio.sleep(5)
-                await self.connect_websocket()
+                await self.connect_websocket(self._stream_routes, self._stream_max_rate)
+    
+    def _apply_fleet_message(self, event_type: Optional[str], payload: Dict[str, Any]):
+        """Update the fleet mirror from a fleet_snapshot or fleet_delta message"""
+        if event_type == EventType.FLEET_SNAPSHOT.value:
+            self.fleet = {vehicle_id: dict(state) for vehicle_id, state in payload.get("vehicles", {}).items()}
+            self.fleet_seq = payload.get("seq")
+        elif event_type == EventType.FLEET_DELTA.value:
+            for vehicle_id, fields in payload.get("changed", {}).items():
+                self.fleet.setdefault(vehicle_id, {"vehicle_id": vehicle_id}).update(fields)
+            for vehicle_id in payload.get("removed", []):
+                self.fleet.pop(vehicle_id, None)
+            self.fleet_seq = payload.get("seq")
+    
+    def get_fleet_vehicles(self) -> List[VehicleState]:
+        """
+        Vehicles from the live fleet stream (no HTTP request)
+        
+        Returns:
+            List of VehicleState objects (empty until connect_websocket() received the snapshot)
+        """
+        return [VehicleState.from_stream(state) for state in self.fleet.values()]
+    
+    def get_fleet_vehicle(self, vehicle_id: str) -> Optional[VehicleState]:
+        """
+        Single vehicle from the live fleet stream
+        
+        Args:
+            vehicle_id: Vehicle registration code
+        
+        Returns:
+            VehicleState, or None if the vehicle is not in the stream
+        """
+        state = self.fleet.get(vehicle_id)
+        return VehicleState.from_stream(state) if state else None
     
-    async def connect_websocket(self):
-        """Connect to WebSocket server for real-time events"""
+    async def connect_websocket(self, routes: Optional[List[str]] = None, max_rate: Optional[float] = None):
+        """
+        Connect to WebSocket server for real-time events
+        
+        Args:
+            routes: Only stream vehicles/events of these route ids (default: all)
+            max_rate: Maximum fleet updates per second (default: every server tick)
+        """
         if self.ws_url is None:
             logger.info("WebSocket URL not provided - real-time events disabled")
             return
         
+        self._stream_routes = list(routes) if routes else None
+        self._stream_max_rate = max_rate
+        params = {}
+        if self._stream_routes:
+            params["routes"] = ",".join(str(route) for route in self._stream_routes)
+        if max_rate:
+            params["max_rate"] = max_rate
+        url = f"{self.ws_url}?{urlencode(params)}" if params else self.ws_url
+        
         try:
-            logger.info(f"🔌 Connecting to WebSocket: {self.ws_url}")
-            self.ws = await websockets.connect(self.ws_url)
+            logger.info(f"🔌 Connecting to WebSocket: {url}")
+            self.ws = await websockets.connect(url)
             self.is_websocket_connected = True
             
             # Start listener task
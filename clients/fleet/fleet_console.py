@@ -30,6 +30,7 @@ Commands:
     disable <id>        - Disable boarding for vehicle
     trigger <id>        - Trigger manual boarding check
     stream              - Start live event streaming
+    dashboard [id]      - Live vehicle dashboard fed by the fleet state stream
     help                - Show this help message
     exit                - Exit console
 """
@@ -58,6 +59,10 @@ from .models import VehicleState, ConductorState
 
 logger = logging.getLogger(__name__)
 
+# Dashboard: fleet stream updates per second, and redraw interval when nothing changes
+DASHBOARD_MAX_RATE = 2.0
+DASHBOARD_IDLE_REDRAW_SECONDS = 5.0
+
 
 class FleetConsole:
     """Interactive console for fleet management"""
@@ -127,7 +132,11 @@ class FleetConsole:
     async def cmd_vehicles(self):
         """List all vehicles"""
         try:
-            vehicles = await self.connector.get_vehicles()
+            if self.connector.is_websocket_connected and self.connector.fleet_seq is not None:
+                # Stream already mirrors the fleet - no need to ask the API
+                vehicles = self.connector.get_fleet_vehicles()
+            else:
+                vehicles = await self.connector.get_vehicles()
             
             if not vehicles:
                 self.print("[yellow]No vehicles found[/yellow]" if self.console else "No vehicles found")
@@ -662,12 +671,28 @@ class FleetConsole:
             self.print(f"[red]❌ Failed to restart service: {e}[/red]" if self.console else f"❌ Error: {e}")
     
     async def cmd_dashboard(self, vehicle_id: str = None):
-        """Live vehicle telemetry dashboard (Ctrl+C to stop)"""
+        """Live vehicle telemetry dashboard (Ctrl+C to stop), driven by the fleet stream"""
+        # Redraw whenever the fleet stream delivers a snapshot or delta (at most DASHBOARD_MAX_RATE/s)
+        updated = asyncio.Event()
+        
+        def on_fleet(data):
+            updated.set()
+        
+        self.connector.on("fleet_snapshot", on_fleet)
+        self.connector.on("fleet_delta", on_fleet)
+        await self.connector.connect_websocket(max_rate=DASHBOARD_MAX_RATE)
+        
+        try:
+            await asyncio.wait_for(updated.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            pass
+        
         if not vehicle_id:
-            # Show all vehicles
-            vehicles = await self.connector.get_vehicles()
+            # Show the first vehicle in the fleet
+            vehicles = self.connector.get_fleet_vehicles()
             if not vehicles:
                 self.print("[yellow]No vehicles to monitor[/yellow]")
+                await self.connector.disconnect_websocket()
                 return
             vehicle_id = vehicles[0].vehicle_id
         
@@ -704,13 +729,16 @@ class FleetConsole:
         self.connector.on("engine_started", on_engine)
         self.connector.on("engine_stopped", on_engine)
         
-        await self.connector.connect_websocket()
-        
         try:
             while True:
-                # Get current vehicle state
+                # Current vehicle state from the stream mirror (no HTTP polling)
                 try:
-                    vehicle = await self.connector.get_vehicle(vehicle_id)
+                    updated.clear()
+                    vehicle = self.connector.get_fleet_vehicle(vehicle_id)
+                    if vehicle is None:
+                        self.print(f"[yellow]Waiting for {vehicle_id} in the fleet stream...[/yellow]" if self.console else f"Waiting for {vehicle_id}...")
+                        await self._wait_for_fleet_update(updated)
+                        continue
                     
                     if self.console:
                         # Rich dashboard
@@ -775,7 +803,7 @@ class FleetConsole:
                         print("\n(Ctrl+C to stop)")
                         print("="*70)
                     
-                    await asyncio.sleep(2)  # Refresh every 2 seconds
+                    await self._wait_for_fleet_update(updated)
                     
                 except Exception as e:
                     self.print(f"[red]Error updating dashboard: {e}[/red]" if self.console else f"Error: {e}")
@@ -785,6 +813,13 @@ class FleetConsole:
             self.print("\n[yellow]📊 Dashboard closed[/yellow]" if self.console else "\n📊 Dashboard closed")
             await self.connector.disconnect_websocket()
     
+    async def _wait_for_fleet_update(self, updated: asyncio.Event):
+        """Block until the next fleet snapshot/delta (redraw at least every few seconds for event log)"""
+        try:
+            await asyncio.wait_for(updated.wait(), timeout=DASHBOARD_IDLE_REDRAW_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+    
     async def cmd_stream(self):
         """Start live event streaming"""
         self.print("[cyan]📡 Starting event stream... (Ctrl+C to stop)[/cyan]" if self.console else "📡 Starting event stream...")
@@ -899,7 +934,8 @@ class FleetConsole:
   STATUS & HEALTH:
   ├─ status                - Show API connection & system health
   ├─ services              - Service status with PID, uptime, error details
-  └─ stream                - LIVE EVENT STREAMING (real-time events)
+  ├─ stream                - LIVE EVENT STREAMING (real-time events)
+  └─ dashboard [id]        - LIVE VEHICLE DASHBOARD (fleet state stream)
 
 ┌─────────────────────────────────────────────────────────────────────────┐
 │ 5. COMMAND EXAMPLES & WORKFLOWS                                         │
@@ -1085,6 +1121,8 @@ Type a command (e.g., 'services' or 'vehicles') and press Enter to begin.
                         await self.cmd_trigger(args)
                 elif cmd == "stream":
                     await self.cmd_stream()
+                elif cmd == "dashboard":
+                    await self.cmd_dashboard(args or None)
                 elif cmd == "help":
                     self.cmd_help()
                 else:
@@ -20,7 +20,7 @@ class VehicleState(BaseModel):
     """Vehicle state response"""
     vehicle_id: str
     driver_name: Optional[str] = None
-    route_id: Optional[int] = None
+    route_id: Optional[str] = None
     current_position: Optional[PositionData] = None
     driver_state: Optional[str] = None
     engine_running: bool = False
@@ -29,6 +29,15 @@ class VehicleState(BaseModel):
     capacity: int = 0
     boarding_active: bool = False
 
+    @classmethod
+    def from_stream(cls, state: Dict[str, Any]) -> "VehicleState":
+        """Build from a flat fleet stream entry (current_lat/current_lon fields)"""
+        position = None
+        if state.get("current_lat") is not None and state.get("current_lon") is not None:
+            position = PositionData(latitude=state["current_lat"], longitude=state["current_lon"])
+        fields = {key: value for key, value in state.items() if key in cls.model_fields and value is not None}
+        return cls(**fields, current_position=position)
+
 
 class VehicleListResponse(BaseModel):
     """List of vehicles response"""
@@ -0,0 +1,282 @@
+"""
+Discrete-event scheduler for per-vehicle behaviour (waypoint arrivals, dwell
+completion, passenger checks, location broadcasts).
+
+Instead of one polling loop per vehicle and behaviour, components schedule the
+next moment they need attention on a single priority queue ordered by simulation
+time. One runner task per event loop sleeps on the simulation clock until the
+earliest event is due, fires every due event and goes back to sleep, so the work
+done is proportional to the number of events, not to vehicles x poll rate.
+Idle vehicles (nothing scheduled) cost nothing.
+
+Events are identified by (owner, kind): scheduling a kind again for the same
+owner replaces the pending one, so a vehicle has at most one pending event per
+behaviour. Callbacks may be plain functions or coroutine functions; coroutines run
+as their own task so a slow HTTP call never delays other vehicles' events.
+
+Usage:
+    from common.event_scheduler import get_event_scheduler
+
+    scheduler = get_event_scheduler()
+    scheduler.schedule_in(12.5, "arrival", driver.on_arrival, owner="ZR101")
+    scheduler.cancel("arrival", owner="ZR101")
+    scheduler.cancel_owner("ZR101")        # vehicle shut down
+
+All methods must be called from the event loop thread.
+"""
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from common.metrics import get_metrics_registry
+from common.sim_clock import SimClock, get_sim_clock
+
+logger = logging.getLogger(__name__)
+
+# Events due within this many sim seconds of "now" fire in the same wake-up
+DUE_TOLERANCE = 1e-6
+
+# Rebuild the heap once more than this many (and over half of its) entries are cancelled
+COMPACT_THRESHOLD = 64
+
+EVENTS_FIRED = get_metrics_registry().counter(
+    "sim_scheduler_events_total", "Scheduled simulation events fired, by kind", ("kind",))
+SCHEDULER_WAKEUPS = get_metrics_registry().counter(
+    "sim_scheduler_wakeups_total", "Times the event scheduler runner woke up")
+EVENT_LAG = get_metrics_registry().histogram(
+    "sim_scheduler_event_lag_seconds", "Simulated seconds an event fired after its due time", ("kind",))
+
+
+class ScheduledEvent:
+    """A pending event: due time (sim epoch seconds), what to call and who it belongs to."""
+
+    __slots__ = ("when", "sequence", "kind", "owner", "callback", "args", "active")
+
+    def __init__(self, when: float, sequence: int, kind: str, owner: Optional[Hashable],
+                 callback: Callable[..., Any], args: Tuple[Any, ...]):
+        self.when = when
+        self.sequence = sequence
+        self.kind = kind
+        self.owner = owner
+        self.callback = callback
+        self.args = args
+        self.active = True
+
+    def __lt__(self, other: "ScheduledEvent") -> bool:
+        return (self.when, self.sequence) < (other.when, other.sequence)
+
+
+class EventScheduler:
+    """
+    Priority queue of simulation events driven by the simulation clock.
+    """
+
+    def __init__(self, clock: Optional[SimClock] = None):
+        """
+        Args:
+            clock: Clock to schedule on (default: the process clock from get_sim_clock())
+        """
+        self._clock = clock
+        self._heap: List[ScheduledEvent] = []
+        self._keyed: Dict[Tuple[Optional[Hashable], str], ScheduledEvent] = {}
+        self._sequence = itertools.count()
+        self._stale = 0  # cancelled events still in the heap
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._run_clock: Optional[SimClock] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Future] = None
+        self.scheduled = 0
+        self.fired = 0
+        self.cancelled = 0
+        self.wakeups = 0
+
+    @property
+    def clock(self) -> SimClock:
+        return self._clock if self._clock is not None else get_sim_clock()
+
+    @property
+    def pending(self) -> int:
+        """Number of scheduled events that have not fired or been cancelled"""
+        return len(self._heap) - self._stale
+
+    # -------------------- Scheduling --------------------
+
+    def schedule_at(self, when: float, kind: str, callback: Callable[..., Any], *args: Any,
+                    owner: Optional[Hashable] = None) -> ScheduledEvent:
+        """
+        Schedule `callback(*args)` at simulation time `when`.
+
+        Args:
+            when: Due time as sim epoch seconds (clock.time() scale); past times fire at once
+            kind: Event kind ("arrival", "dwell", ...), also the metrics label
+            callback: Function or coroutine function to call
+            owner: Vehicle (or other owner) id; replaces the owner's pending event of this
+                kind. Events without an owner cannot be cancelled.
+
+        Returns:
+            The scheduled event
+        """
+        self._ensure_runner()
+        if owner is not None:
+            self.cancel(kind, owner)
+        event = ScheduledEvent(when, next(self._sequence), kind, owner, callback, args)
+        heapq.heappush(self._heap, event)
+        if owner is not None:
+            self._keyed[(owner, kind)] = event
+        self.scheduled += 1
+        if self._heap[0] is event:
+            self._interrupt()  # new earliest event: the runner must sleep less
+        return event
+
+    def schedule_in(self, delay: float, kind: str, callback: Callable[..., Any], *args: Any,
+                    owner: Optional[Hashable] = None) -> ScheduledEvent:
+        """Schedule `callback(*args)` `delay` simulated seconds from now (see schedule_at)"""
+        return self.schedule_at(self.clock.time() + max(0.0, delay), kind, callback, *args, owner=owner)
+
+    def next_time(self, kind: str, owner: Optional[Hashable] = None) -> Optional[float]:
+        """Due time of the owner's pending event of this kind (None if nothing is pending)"""
+        event = self._keyed.get((owner, kind))
+        return event.when if event is not None and event.active else None
+
+    def cancel(self, kind: str, owner: Optional[Hashable] = None) -> bool:
+        """Cancel the owner's pending event of this kind. Returns True if one was pending."""
+        event = self._keyed.pop((owner, kind), None)
+        if event is None or not event.active:
+            return False
+        event.active = False
+        self.cancelled += 1
+        self._stale += 1
+        if self._stale > COMPACT_THRESHOLD and self._stale * 2 > len(self._heap):
+            # Lazy deletion left mostly cancelled entries behind: rebuild the heap
+            self._heap = [queued for queued in self._heap if queued.active]
+            heapq.heapify(self._heap)
+            self._stale = 0
+        return True
+
+    def cancel_owner(self, owner: Hashable) -> int:
+        """Cancel every pending event of an owner. Returns how many were cancelled."""
+        kinds = [kind for event_owner, kind in self._keyed if event_owner == owner]
+        return sum(1 for kind in kinds if self.cancel(kind, owner))
+
+    def close(self) -> None:
+        """Drop every pending event and stop the runner task"""
+        for event in self._heap:
+            event.active = False
+        self._heap.clear()
+        self._keyed.clear()
+        self._stale = 0
+        if self._runner is not None and not self._runner.done():
+            self._runner.cancel()
+        self._runner = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "scheduled": self.scheduled,
+            "fired": self.fired,
+            "cancelled": self.cancelled,
+            "pending": self.pending,
+            "wakeups": self.wakeups,
+        }
+
+    # -------------------- Runner --------------------
+
+    def _ensure_runner(self) -> None:
+        loop = asyncio.get_running_loop()
+        clock = self.clock
+        if self._runner is not None and not self._runner.done() and self._loop is loop \
+                and self._run_clock is clock:
+            return
+        if self._loop is not loop or self._run_clock is not clock:
+            # Events of a finished loop (or a replaced clock) can never fire correctly
+            self.close()
+        self._loop = loop
+        self._run_clock = clock
+        self._wake = None
+        self._runner = loop.create_task(self._run(clock), name="event-scheduler")
+        clock.hold(self._runner, essential=True)
+
+    def _interrupt(self) -> None:
+        if self._wake is not None and not self._wake.done():
+            # Discrete clock: the runner counts as running until it sleeps again
+            self._run_clock.hold(self._runner)
+            self._wake.set_result(None)
+
+    def _on_timer(self) -> None:
+        if self._wake is not None and not self._wake.done():
+            self._wake.set_result(None)
+
+    async def _run(self, clock: SimClock) -> None:
+        runner = asyncio.current_task()
+        try:
+            await self._run_events(clock, runner)
+        finally:
+            clock.release(runner)  # essential: the clock would otherwise wait for it forever
+
+    async def _run_events(self, clock: SimClock, runner: asyncio.Task) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._fire_due(clock)
+            while self._heap and not self._heap[0].active:
+                heapq.heappop(self._heap)
+                self._stale = max(0, self._stale - 1)
+
+            self._wake = loop.create_future()
+            timer = None
+            if self._heap:
+                timer = clock.call_later(self._heap[0].when - clock.time(), self._on_timer, owner=runner)
+            else:
+                clock.release(runner)  # idle: only schedule_at() can wake us
+            try:
+                await self._wake
+            finally:
+                if timer is not None:
+                    timer.cancel()
+            self.wakeups += 1
+            SCHEDULER_WAKEUPS.inc()
+
+    def _fire_due(self, clock: SimClock) -> None:
+        now = clock.time() + DUE_TOLERANCE
+        while self._heap and self._heap[0].when <= now:
+            event = heapq.heappop(self._heap)
+            if not event.active:
+                self._stale = max(0, self._stale - 1)
+                continue
+            event.active = False
+            if event.owner is not None and self._keyed.get((event.owner, event.kind)) is event:
+                del self._keyed[(event.owner, event.kind)]
+            self.fired += 1
+            EVENTS_FIRED.labels(event.kind).inc()
+            EVENT_LAG.labels(event.kind).observe(max(0.0, now - DUE_TOLERANCE - event.when))
+            try:
+                result = event.callback(*event.args)
+                if inspect.isawaitable(result):
+                    task = asyncio.ensure_future(result)
+                    clock.hold(task)
+                    task.add_done_callback(lambda done, event=event: self._on_task_done(done, event, clock))
+            except Exception as e:
+                logger.error("Scheduled %s event for %s failed: %s", event.kind, event.owner, e)
+
+    @staticmethod
+    def _on_task_done(task: asyncio.Future, event: ScheduledEvent, clock: SimClock) -> None:
+        clock.release(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Scheduled %s event for %s failed: %s", event.kind, event.owner, task.exception())
+
+
+# Global scheduler instance
+_event_scheduler: Optional[EventScheduler] = None
+
+
+def get_event_scheduler() -> EventScheduler:
+    """Get the process event scheduler (schedules on get_sim_clock())."""
+    global _event_scheduler
+    if _event_scheduler is None:
+        _event_scheduler = EventScheduler()
+        get_metrics_registry().gauge(
+            "sim_scheduler_pending_events", "Scheduled simulation events not yet fired"
+        ).set_function(lambda: _event_scheduler.pending)
+    return _event_scheduler
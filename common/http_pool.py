@@ -0,0 +1,381 @@
+"""
+Shared keep-alive HTTP client pool for the vehicle simulator services.
+
+Provides one long-lived httpx.AsyncClient per upstream (Strapi, geospatial,
+commuter) per event loop, so repeated calls reuse pooled connections instead of
+paying a TCP (and TLS) handshake per request. A loop's clients are closed once
+that loop has closed; a client is never touched while its loop is alive.
+
+Usage:
+    from common.http_pool import get_http_pool, http_session
+
+    # Drop-in replacement for `async with httpx.AsyncClient(timeout=10.0) as client:`
+    async with http_session("strapi", timeout=10.0) as client:
+        response = await client.get(f"{strapi_url}/api/routes")
+
+    # On application shutdown
+    await get_http_pool().aclose()
+
+    # Per-upstream request counts, latency histograms and pool saturation
+    get_http_pool().stats()
+
+The process pool's per-upstream stats are also exported by the metrics
+registry (common.metrics) as http_client_request_duration_seconds et al.
+
+Pool limits are read from the optional [http_pool] section of config.ini:
+    max_connections = 50
+    max_keepalive_connections = 20
+    keepalive_expiry = 30
+    http2 = true
+    strapi_max_connections = 100     # per-upstream override
+"""
+
+import asyncio
+import bisect
+import configparser
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+import httpx
+
+from common.metrics import MetricFamily, add_histogram_samples, get_metrics_registry
+
+try:
+    import h2  # noqa: F401  (httpx needs the h2 package for HTTP/2)
+    _http2_available = True
+except ImportError:
+    _http2_available = False
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+UPSTREAMS = ("strapi", "geospatial", "commuter")
+
+# Default base URLs, used to route a request to its upstream's pool by host:port
+DEFAULT_BASE_URLS = {
+    "strapi": "http://localhost:1337",
+    "geospatial": "http://localhost:6000",
+    "commuter": "http://localhost:4000",
+}
+
+
+@dataclass
+class PoolLimits:
+    """Connection limits for one upstream."""
+    max_connections: int = 50
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+
+
+@dataclass
+class UpstreamStats:
+    """Request counters and latency histogram for one upstream."""
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    total_latency_ms: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    def observe(self, latency_ms: float, error: bool) -> None:
+        self.requests += 1
+        if error:
+            self.errors += 1
+        self.total_latency_ms += latency_ms
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+
+class UpstreamClient:
+    """
+    Thin proxy around a shared httpx.AsyncClient.
+
+    Applies a default per-request timeout and records request metrics.
+    Requests are routed by host:port, so one proxy may serve call sites that
+    talk to several upstreams; `upstream` is the fallback for unknown hosts.
+    Anything other than the request helpers is forwarded to the client.
+    """
+
+    def __init__(self, pool: "HttpClientPool", upstream: str, timeout: Optional[float] = None):
+        self._pool = pool
+        self._upstream = upstream
+        self._timeout = timeout
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        if self._timeout is not None:
+            kwargs.setdefault("timeout", self._timeout)
+        return await self._pool._send(self._upstream, method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool._client(self._upstream), name)
+
+
+class HttpClientPool:
+    """
+    Per-process registry of keep-alive HTTP clients, one per upstream.
+
+    Clients are created lazily on first use and bound to the running event
+    loop; if the loop changes (e.g. between test runs) a fresh client is built.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, PoolLimits]] = None, default: Optional[PoolLimits] = None):
+        self._default = default or PoolLimits()
+        self._limits: Dict[str, PoolLimits] = dict(limits or {})
+        # upstream -> event loop -> client (connections belong to the loop that opened them)
+        self._clients: Dict[str, Dict[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+        self._retiring: Set[asyncio.Task] = set()
+        self._stats: Dict[str, UpstreamStats] = {}
+        self._hosts: Dict[str, str] = {}
+        for upstream, base_url in DEFAULT_BASE_URLS.items():
+            self.register(upstream, base_url)
+
+    def register(self, upstream: str, base_url: str) -> None:
+        """Map a base URL's host:port to an upstream pool."""
+        self._hosts[urlsplit(base_url).netloc] = upstream
+
+    def resolve(self, url: str, fallback: str) -> str:
+        """Pick the upstream for a URL by host:port, else the caller's label."""
+        return self._hosts.get(urlsplit(url).netloc, fallback)
+
+    @classmethod
+    def from_config(cls, config_path: Optional[Path] = None) -> "HttpClientPool":
+        """Build a pool from the [http_pool] section of config.ini (if present)."""
+        config_path = config_path or Path(__file__).parent.parent / "config.ini"
+        parser = configparser.ConfigParser()
+        parser.read(config_path, encoding='utf-8')
+
+        if not parser.has_section('http_pool'):
+            pool = cls()
+            pool._register_from_config(parser)
+            return pool
+
+        section = parser['http_pool']
+
+        def read_limits(prefix: str, base: PoolLimits) -> PoolLimits:
+            return PoolLimits(
+                max_connections=section.getint(f"{prefix}max_connections", base.max_connections),
+                max_keepalive_connections=section.getint(
+                    f"{prefix}max_keepalive_connections", base.max_keepalive_connections
+                ),
+                keepalive_expiry=section.getfloat(f"{prefix}keepalive_expiry", base.keepalive_expiry),
+                http2=section.getboolean(f"{prefix}http2", base.http2),
+            )
+
+        default = read_limits("", PoolLimits())
+        limits = {upstream: read_limits(f"{upstream}_", default) for upstream in UPSTREAMS}
+        pool = cls(limits=limits, default=default)
+        pool._register_from_config(parser)
+        return pool
+
+    def _register_from_config(self, parser: configparser.ConfigParser) -> None:
+        """Register upstream base URLs from the [infrastructure] section."""
+        if not parser.has_section('infrastructure'):
+            return
+        infra = parser['infrastructure']
+        for upstream, key in (
+            ("strapi", "strapi_url"),
+            ("geospatial", "geospatial_url"),
+            ("commuter", "commuter_service_url"),
+        ):
+            if infra.get(key):
+                self.register(upstream, infra.get(key))
+
+    def limits_for(self, upstream: str) -> PoolLimits:
+        return self._limits.get(upstream, self._default)
+
+    def configure(self, upstream: str, limits: PoolLimits) -> None:
+        """Override limits for an upstream (takes effect on the next client build)."""
+        self._limits[upstream] = limits
+
+    def client(self, upstream: str, timeout: Optional[float] = None) -> UpstreamClient:
+        """Get the shared client for an upstream. Do not close it."""
+        return UpstreamClient(self, upstream, timeout)
+
+    @asynccontextmanager
+    async def session(self, upstream: str, timeout: Optional[float] = None) -> AsyncIterator[UpstreamClient]:
+        """
+        Context manager yielding the shared client for an upstream.
+
+        Exists so `async with httpx.AsyncClient(...) as client:` call sites can
+        switch to the pool without restructuring; leaving the block does not
+        close the underlying connections.
+        """
+        yield self.client(upstream, timeout)
+
+    def _client(self, upstream: str) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        clients = self._clients.setdefault(upstream, {})
+        client = clients.get(loop)
+
+        if client is None or client.is_closed:
+            self._retire_closed_loops(clients)
+            limits = self.limits_for(upstream)
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=limits.max_connections,
+                    max_keepalive_connections=limits.max_keepalive_connections,
+                    keepalive_expiry=limits.keepalive_expiry,
+                ),
+                http2=limits.http2 and _http2_available,
+                timeout=30.0,
+            )
+            clients[loop] = client
+            logger.debug(f"[HttpClientPool] Created client for '{upstream}' ({limits})")
+
+        return client
+
+    def _retire_closed_loops(self, clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient]) -> None:
+        """Close (from the current loop) the clients of event loops that have been closed since."""
+        for owner in [owner for owner in clients if owner.is_closed()]:
+            client = clients.pop(owner)
+            if client.is_closed:
+                continue
+            task = asyncio.get_running_loop().create_task(self._aclose_client(client))
+            self._retiring.add(task)
+            task.add_done_callback(self._retiring.discard)
+
+    @staticmethod
+    async def _aclose_client(client: httpx.AsyncClient) -> None:
+        try:
+            await client.aclose()
+        except RuntimeError:
+            # Client belonged to an event loop that is already gone
+            pass
+
+    async def _send(self, upstream: str, method: str, url: str, **kwargs) -> httpx.Response:
+        upstream = self.resolve(str(url), upstream)
+        client = self._client(upstream)
+        stats = self._stats.setdefault(upstream, UpstreamStats())
+
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        started = time.perf_counter()
+        error = True
+        try:
+            response = await client.request(method, url, **kwargs)
+            error = response.status_code >= 500
+            return response
+        finally:
+            stats.in_flight -= 1
+            stats.observe((time.perf_counter() - started) * 1000, error)
+
+    def event_hooks(self, upstream: str) -> Dict[str, List[Any]]:
+        """
+        httpx event hooks that record an externally created client's requests in this pool's stats.
+
+        For call sites that keep their own httpx.AsyncClient:
+            httpx.AsyncClient(timeout=10.0, event_hooks=get_http_pool().event_hooks("commuter"))
+
+        Requests that fail without a response are not recorded.
+
+        Args:
+            upstream: Fallback upstream name for hosts that are not registered
+        """
+        async def on_request(request: httpx.Request) -> None:
+            request.extensions["http_pool_started"] = time.perf_counter()
+
+        async def on_response(response: httpx.Response) -> None:
+            started = response.request.extensions.get("http_pool_started")
+            if started is None:
+                return
+            stats = self._stats.setdefault(self.resolve(str(response.request.url), upstream), UpstreamStats())
+            stats.observe((time.perf_counter() - started) * 1000, response.status_code >= 500)
+
+        return {"request": [on_request], "response": [on_response]}
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-upstream request counts, latency histogram and pool saturation."""
+        report = {}
+        for upstream, stats in self._stats.items():
+            limits = self.limits_for(upstream)
+            histogram = {
+                f"le_{bound}ms": count
+                for bound, count in zip(LATENCY_BUCKETS_MS, stats.buckets)
+            }
+            histogram["le_inf"] = stats.buckets[-1]
+            report[upstream] = {
+                "requests": stats.requests,
+                "errors": stats.errors,
+                "avg_latency_ms": round(stats.total_latency_ms / stats.requests, 2) if stats.requests else 0.0,
+                "latency_histogram": histogram,
+                "in_flight": stats.in_flight,
+                "peak_in_flight": stats.peak_in_flight,
+                "max_connections": limits.max_connections,
+                "saturation": round(stats.in_flight / limits.max_connections, 3),
+                "peak_saturation": round(stats.peak_in_flight / limits.max_connections, 3),
+                "http2": limits.http2 and _http2_available,
+            }
+        return report
+
+    def collect_metrics(self) -> List[MetricFamily]:
+        """Per-upstream stats as metric families (scrape-time collector for common.metrics)."""
+        latency = MetricFamily("http_client_request_duration_seconds", "histogram",
+                               "Latency of HTTP requests per upstream")
+        errors = MetricFamily("http_client_errors_total", "counter", "HTTP requests that failed or returned 5xx")
+        in_flight = MetricFamily("http_client_in_flight_requests", "gauge", "HTTP requests currently in flight")
+        bounds = [bound / 1000 for bound in LATENCY_BUCKETS_MS]
+        for upstream, stats in list(self._stats.items()):
+            labels = {"upstream": upstream}
+            add_histogram_samples(latency, labels, bounds, list(stats.buckets), stats.total_latency_ms / 1000)
+            errors.add(stats.errors, labels)
+            in_flight.add(stats.in_flight, labels)
+        return [latency, errors, in_flight]
+
+    async def aclose(self) -> None:
+        """
+        Close every upstream client (call on application shutdown).
+
+        Clients of other event loops that are still running are closed on their own loop.
+        """
+        loop = asyncio.get_running_loop()
+        for clients in self._clients.values():
+            for owner, client in clients.items():
+                if client.is_closed:
+                    continue
+                if owner is not loop and owner.is_running():
+                    asyncio.run_coroutine_threadsafe(self._aclose_client(client), owner)
+                else:
+                    await self._aclose_client(client)
+        if self._retiring:
+            await asyncio.gather(*self._retiring, return_exceptions=True)
+        self._clients.clear()
+
+
+_pool: Optional[HttpClientPool] = None
+
+
+def get_http_pool() -> HttpClientPool:
+    """Get the per-process HttpClientPool singleton."""
+    global _pool
+    if _pool is None:
+        _pool = HttpClientPool.from_config()
+        get_metrics_registry().register_collector(_pool.collect_metrics)
+    return _pool
+
+
+def http_session(upstream: str, timeout: Optional[float] = None):
+    """Shortcut for get_http_pool().session(upstream, timeout)."""
+    return get_http_pool().session(upstream, timeout)
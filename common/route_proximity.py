@@ -0,0 +1,332 @@
+"""
+Route proximity index shared by the geospatial service and the simulator.
+
+Indexes every segment of every route polyline in a uniform grid (in a local
+equirectangular projection, metres) together with the along-route distance of
+each vertex, so one call answers "where do I board each nearby route?":
+
+    from common.route_proximity import RouteProximityIndex, geojson_lines
+
+    index = RouteProximityIndex()
+    index.add_route("1A", geojson_lines(route_geojson))
+
+    # k nearest routes, each with its closest boarding point and along-route position
+    for point in index.nearest(13.0975, -59.6139, k=3, max_distance_meters=800):
+        print(point.route_id, point.distance_meters, point.along_route_meters)
+
+    # Walking intercept onto one route (e.g. the route the passenger selected)
+    index.project("1A", 13.0975, -59.6139)
+
+Queries visit only the grid cells around the point, ring by ring (the perimeter
+of each ring, never past the indexed extent), and stop once no unvisited cell
+can hold anything closer than the k-th route found. Routes
+made of several LineString features are treated as consecutive parts; the
+along-route distance runs through the parts in order.
+"""
+
+import math
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+METERS_PER_DEGREE = 111320.0
+
+
+def geojson_lines(geometry: Any) -> List[List[Sequence[float]]]:
+    """
+    [lon, lat] coordinate lists of every line in a GeoJSON object.
+
+    Accepts a LineString, MultiLineString, Feature or FeatureCollection
+    (features in order; non-line geometries are skipped).
+    """
+    if not geometry:
+        return []
+    kind = geometry.get('type')
+    if kind == 'FeatureCollection':
+        return [line for feature in geometry.get('features') or [] for line in geojson_lines(feature)]
+    if kind == 'Feature':
+        return geojson_lines(geometry.get('geometry'))
+    if kind == 'LineString':
+        return [geometry.get('coordinates') or []]
+    if kind == 'MultiLineString':
+        return list(geometry.get('coordinates') or [])
+    return []
+
+
+def ring_cells(col: int, row: int, ring: int) -> Iterator[Tuple[int, int]]:
+    """Grid cells exactly `ring` cells (Chebyshev) from (col, row): the ring's perimeter"""
+    if ring == 0:
+        yield col, row
+        return
+    for c in range(col - ring, col + ring + 1):
+        yield c, row - ring
+        yield c, row + ring
+    for r in range(row - ring + 1, row + ring):
+        yield col - ring, r
+        yield col + ring, r
+
+
+@dataclass(frozen=True)
+class BoardingPoint:
+    """Closest point of a route to a query location"""
+    route_id: str
+    latitude: float
+    longitude: float
+    distance_meters: float
+    along_route_meters: float
+    route_length_meters: float
+    segment_index: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            'distance_meters': round(self.distance_meters, 2),
+            'along_route_meters': round(self.along_route_meters, 2),
+            'route_length_meters': round(self.route_length_meters, 2),
+        }
+
+
+class _RouteGeometry:
+    """Projected vertices and cumulative distances of one route"""
+    __slots__ = ('route_id', 'xs', 'ys', 'along', 'breaks', 'length')
+
+    def __init__(self, route_id: str):
+        self.route_id = route_id
+        self.xs: List[float] = []
+        self.ys: List[float] = []
+        self.along: List[float] = []
+        self.breaks = set()  # segment indices that join two parts (not real segments)
+        self.length = 0.0
+
+
+class RouteProximityIndex:
+    """Grid of route segments for k-nearest-route and along-route queries"""
+
+    def __init__(self, cell_meters: float = 250.0, reference_latitude: Optional[float] = None):
+        """
+        Args:
+            cell_meters: Grid cell size; roughly the typical walking radius
+            reference_latitude: Latitude of the local projection (defaults to
+                the first vertex added)
+        """
+        self.cell_meters = cell_meters
+        self.reference_latitude = reference_latitude
+        self._lon_scale = 1.0
+        self._routes: Dict[str, _RouteGeometry] = {}
+        self._cells: Dict[Tuple[int, int], List[Tuple[Any, ...]]] = {}
+        self._extent: Optional[Tuple[int, int, int, int]] = None  # min/max col, min/max row
+        if reference_latitude is not None:
+            self._lon_scale = math.cos(math.radians(reference_latitude))
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def __contains__(self, route_id: str) -> bool:
+        return route_id in self._routes
+
+    @property
+    def route_ids(self) -> List[str]:
+        return list(self._routes)
+
+    def _project(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        return longitude * METERS_PER_DEGREE * self._lon_scale, latitude * METERS_PER_DEGREE
+
+    def _unproject(self, x: float, y: float) -> Tuple[float, float]:
+        return y / METERS_PER_DEGREE, x / (METERS_PER_DEGREE * self._lon_scale)
+
+    def add_route(self, route_id: str, lines: Sequence[Sequence[Sequence[float]]]) -> int:
+        """
+        Index a route (replacing any previous geometry for the same id).
+
+        Args:
+            route_id: Route identifier returned in results
+            lines: One or more [lon, lat] coordinate lists, in travel order
+
+        Returns:
+            Number of segments indexed
+        """
+        self.remove_route(route_id)
+        route = _RouteGeometry(route_id)
+
+        for line in lines:
+            points = [(coord[1], coord[0]) for coord in line if len(coord) >= 2]
+            if not points:
+                continue
+            if self.reference_latitude is None:
+                self.reference_latitude = points[0][0]
+                self._lon_scale = math.cos(math.radians(self.reference_latitude))
+            if route.xs:
+                route.breaks.add(len(route.xs) - 1)
+            for j, (latitude, longitude) in enumerate(points):
+                x, y = self._project(latitude, longitude)
+                if j:
+                    route.length += math.hypot(x - route.xs[-1], y - route.ys[-1])
+                route.xs.append(x)
+                route.ys.append(y)
+                route.along.append(route.length)
+
+        segments = 0
+        for i in range(len(route.xs) - 1):
+            if i in route.breaks:
+                continue
+            ax, ay = route.xs[i], route.ys[i]
+            dx, dy = route.xs[i + 1] - ax, route.ys[i + 1] - ay
+            length_sq = dx * dx + dy * dy
+            # Precomputed so the query loop is plain arithmetic
+            entry = (route, i, ax, ay, dx, dy, 1.0 / length_sq if length_sq else 0.0)
+            for cell in self._segment_cells(ax, ay, ax + dx, ay + dy):
+                self._cells.setdefault(cell, []).append(entry)
+            segments += 1
+
+        if segments:
+            self._routes[route_id] = route
+            self._extent = None
+        return segments
+
+    def remove_route(self, route_id: str) -> bool:
+        route = self._routes.pop(route_id, None)
+        if route is None:
+            return False
+        for key in list(self._cells):
+            kept = [entry for entry in self._cells[key] if entry[0] is not route]
+            if kept:
+                self._cells[key] = kept
+            else:
+                del self._cells[key]
+        self._extent = None
+        return True
+
+    def clear(self):
+        self._routes.clear()
+        self._cells.clear()
+        self._extent = None
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(x // self.cell_meters), int(y // self.cell_meters)
+
+    def _rings_to_extent(self, col: int, row: int) -> int:
+        """Ring beyond which no indexed cell lies, seen from (col, row)"""
+        if self._extent is None:
+            cols = [c for c, _ in self._cells]
+            rows = [r for _, r in self._cells]
+            self._extent = (min(cols), max(cols), min(rows), max(rows))
+        min_col, max_col, min_row, max_row = self._extent
+        return max(col - min_col, max_col - col, row - min_row, max_row - row, 0)
+
+    def _segment_cells(self, x1: float, y1: float, x2: float, y2: float):
+        """Cells overlapped by a segment's bounding box"""
+        c1, r1 = self._cell(min(x1, x2), min(y1, y2))
+        c2, r2 = self._cell(max(x1, x2), max(y1, y2))
+        for c in range(c1, c2 + 1):
+            for r in range(r1, r2 + 1):
+                yield c, r
+
+    @staticmethod
+    def _closest_on_segment(
+        route: _RouteGeometry, i: int, x: float, y: float
+    ) -> Tuple[float, float, float, float]:
+        """(distance, t, px, py) of the closest point of segment i to (x, y)"""
+        ax, ay = route.xs[i], route.ys[i]
+        dx, dy = route.xs[i + 1] - ax, route.ys[i + 1] - ay
+        length_sq = dx * dx + dy * dy
+        t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((x - ax) * dx + (y - ay) * dy) / length_sq))
+        px, py = ax + t * dx, ay + t * dy
+        return math.hypot(x - px, y - py), t, px, py
+
+    def _boarding_point(self, route: _RouteGeometry, i: int, distance: float, t: float, px: float, py: float):
+        latitude, longitude = self._unproject(px, py)
+        along = route.along[i] + t * (route.along[i + 1] - route.along[i])
+        return BoardingPoint(
+            route_id=route.route_id,
+            latitude=latitude,
+            longitude=longitude,
+            distance_meters=distance,
+            along_route_meters=along,
+            route_length_meters=route.length,
+            segment_index=i,
+        )
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 1,
+        max_distance_meters: float = 500.0
+    ) -> List[BoardingPoint]:
+        """
+        Closest boarding point on each of the k nearest routes.
+
+        Args:
+            latitude: Query latitude
+            longitude: Query longitude
+            k: Number of routes to return
+            max_distance_meters: Ignore routes farther than this
+
+        Returns:
+            BoardingPoints sorted by distance, at most one per route
+        """
+        if not self._cells or k <= 0:
+            return []
+
+        x, y = self._project(latitude, longitude)
+        col, row = self._cell(x, y)
+        max_ring = min(
+            int(max_distance_meters / self.cell_meters) + 1,
+            self._rings_to_extent(col, row),
+        )
+
+        limit_sq = max_distance_meters * max_distance_meters
+        best: Dict[str, Tuple[float, _RouteGeometry, int]] = {}
+
+        for ring in range(max_ring + 1):
+            # Every segment first reached in this ring is at least (ring - 1) cells away
+            if len(best) >= k and ring > 1:
+                kth_sq = sorted(candidate[0] for candidate in best.values())[k - 1]
+                if ((ring - 1) * self.cell_meters) ** 2 > kth_sq:
+                    break
+
+            for cell in ring_cells(col, row, ring):
+                for route, i, ax, ay, dx, dy, inv in self._cells.get(cell, ()):
+                    t = ((x - ax) * dx + (y - ay) * dy) * inv
+                    t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+                    ex, ey = x - ax - t * dx, y - ay - t * dy
+                    distance_sq = ex * ex + ey * ey
+                    if distance_sq > limit_sq:
+                        continue
+                    current = best.get(route.route_id)
+                    if current is None or distance_sq < current[0]:
+                        best[route.route_id] = (distance_sq, route, i)
+
+        ranked = sorted(best.values(), key=lambda candidate: candidate[0])[:k]
+        return [
+            self._boarding_point(route, i, *self._closest_on_segment(route, i, x, y))
+            for _, route, i in ranked
+        ]
+
+    def project(self, route_id: str, latitude: float, longitude: float) -> Optional[BoardingPoint]:
+        """
+        Walking intercept onto one route: its closest point to the location,
+        wherever it is (no distance limit). None for an unknown route.
+        """
+        route = self._routes.get(route_id)
+        if route is None:
+            return None
+        x, y = self._project(latitude, longitude)
+
+        best = None
+        for i in range(len(route.xs) - 1):
+            if i in route.breaks:
+                continue
+            candidate = self._closest_on_segment(route, i, x, y)
+            if best is None or candidate[0] < best[0][0]:
+                best = (candidate, i)
+        (distance, t, px, py), i = best
+        return self._boarding_point(route, i, distance, t, px, py)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'routes': len(self._routes),
+            'vertices': sum(len(route.xs) for route in self._routes.values()),
+            'cells': len(self._cells),
+            'cell_meters': self.cell_meters,
+            'reference_latitude': self.reference_latitude,
+        }
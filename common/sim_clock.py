@@ -0,0 +1,382 @@
+"""
+Simulation clock shared by the simulator components (engine, driver, GPS,
+conductor, passenger spawning).
+
+Components ask the clock for the time and sleep on it instead of calling
+time.time() / datetime.now() / time.sleep() / asyncio.sleep() directly, so a
+whole run can be moved off the wall clock:
+
+    realtime     warp=1, no start time: now() is the wall clock (the default)
+    time-warp    warp=60: sim time runs 60x faster, sleeps are 60x shorter
+    discrete     "as fast as possible": nothing sleeps on the wall clock; the
+                 clock jumps straight to the next scheduled wake-up once every
+                 component woken by the previous jump has gone back to sleep
+                 (or `settle_timeout` wall seconds have passed, e.g. a component
+                 waiting on HTTP or one that has exited). Components held as
+                 essential (the event scheduler runner) are always waited for
+
+Sleeps are in simulation seconds everywhere. Network retry/back-off delays and
+UI streaming intervals are wall-clock concerns and keep using asyncio.sleep.
+
+Usage:
+    from common.sim_clock import configure_sim_clock, get_sim_clock
+
+    clock = configure_sim_clock(start=datetime(2025, 11, 5, 6, 0), warp=60)
+    clock.start()                      # discrete mode: begin advancing
+
+    clock.now(timezone.utc)            # like datetime.now(tz)
+    clock.time()                       # like time.time()
+    clock.sleep(0.1)                   # threads (engine, GPS data worker)
+    await clock.asleep(2.0)            # asyncio tasks
+    clock.call_later(5.0, callback)    # timers (common.event_scheduler)
+
+    worker = threading.Thread(target=engine_loop)
+    clock.hold(worker)                 # new threads/tasks that sleep on the clock
+    worker.start()
+
+Other processes (commuter service) pick up the same start/warp from the
+SIM_CLOCK_START (ISO datetime) and SIM_CLOCK_WARP (factor, or "max" for
+discrete) environment variables, which configure_sim_clock(export_env=True) sets.
+Discrete mode only coordinates components in the same process: a discrete clock
+built from the environment starts advancing immediately, so a separate commuter
+service spawns ahead of the simulator, and conductors only board passengers whose
+spawn time has passed in simulation time.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+import weakref
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional, Set
+
+
+# Wall seconds the discrete clock waits for woken components to go back to sleep
+DEFAULT_SETTLE_TIMEOUT = 0.05
+
+# Wake-up granularity for whole-simulator discrete runs (the engine tick)
+DISCRETE_RESOLUTION = 0.1
+
+
+class _Wakeup:
+    """A pending sleep: sim deadline, the sleeping thread/task and how to wake it."""
+
+    __slots__ = ("deadline", "sequence", "owner", "wake", "active")
+
+    def __init__(self, deadline: float, sequence: int, owner: Any, wake: Callable[[], None]):
+        self.deadline = deadline
+        self.sequence = sequence
+        self.owner = owner
+        self.wake = wake
+        self.active = True
+
+    def cancel(self) -> None:
+        self.active = False
+
+    def __lt__(self, other: "_Wakeup") -> bool:
+        return (self.deadline, self.sequence) < (other.deadline, other.sequence)
+
+
+class SimClock:
+    """
+    Simulation time source with time-warp and discrete-event modes.
+    """
+
+    def __init__(self,
+                 start: Optional[datetime] = None,
+                 warp: float = 1.0,
+                 discrete: bool = False,
+                 resolution: float = 0.0,
+                 settle_timeout: float = DEFAULT_SETTLE_TIMEOUT):
+        """
+        Args:
+            start: Simulation time at construction (default: now)
+            warp: Simulated seconds per wall second (ignored in discrete mode)
+            discrete: Jump between scheduled wake-ups instead of waiting
+            resolution: Discrete mode: round wake-ups up to this many sim seconds, so
+                vehicles ticking at the same rate wake together (0: exact)
+            settle_timeout: Discrete mode: wall seconds to wait for woken components
+        """
+        if warp <= 0 and not discrete:
+            raise ValueError(f"warp must be positive, got {warp}")
+        self.warp = float(warp)
+        self.discrete = discrete
+        self.resolution = resolution
+        self.settle_timeout = settle_timeout
+        # Plain wall clock: keep following time.time() exactly (NTP adjustments included)
+        self._realtime = start is None and warp == 1.0 and not discrete
+
+        self._cond = threading.Condition()
+        self._base_sim = start.timestamp() if start is not None else time.time()
+        self._base_wall = time.monotonic()
+        self._origin = self._base_sim
+        self._discrete_now = self._base_sim
+
+        self._wakeups: List[_Wakeup] = []
+        self._sequence = itertools.count()
+        self._running: Set[Any] = set()  # threads/tasks woken (or held) and not yet asleep again
+        self._essential: "weakref.WeakSet[Any]" = weakref.WeakSet()  # never skipped as stragglers
+        self._started = False
+        self._stopped = False
+        self._advancer: Optional[threading.Thread] = None
+        self.advances = 0
+
+    # -------------------- Reading the time --------------------
+
+    @property
+    def is_realtime(self) -> bool:
+        """True while the clock simply follows the wall clock"""
+        return self._realtime
+
+    def time(self) -> float:
+        """Simulation time as epoch seconds (like time.time())"""
+        if self._realtime:
+            return time.time()
+        if self.discrete:
+            return self._discrete_now
+        return self._base_sim + (time.monotonic() - self._base_wall) * self.warp
+
+    def now(self, tz: Optional[timezone] = None) -> datetime:
+        """Simulation time as a datetime (like datetime.now(tz))"""
+        return datetime.fromtimestamp(self.time(), tz)
+
+    def utcnow(self) -> datetime:
+        """Naive UTC simulation time (like datetime.utcnow())"""
+        return datetime.fromtimestamp(self.time(), timezone.utc).replace(tzinfo=None)
+
+    def elapsed(self) -> float:
+        """Simulated seconds since the clock was created (unaffected by set_time)"""
+        return self.time() - self._origin
+
+    def to_wall(self, seconds: float) -> float:
+        """Wall seconds a sleep of `seconds` simulated seconds takes (0 in discrete mode)"""
+        return 0.0 if self.discrete else seconds / self.warp
+
+    def set_time(self, when: datetime) -> None:
+        """Jump to a new simulation time; the clock keeps running from there"""
+        target = when.timestamp()
+        with self._cond:
+            self._origin += target - self.time()
+            self._realtime = False
+            if self.discrete:
+                self._discrete_now = target
+            else:
+                self._base_sim = target
+                self._base_wall = time.monotonic()
+
+    # -------------------- Sleeping --------------------
+
+    def sleep(self, seconds: float) -> None:
+        """Block the calling thread for `seconds` of simulation time"""
+        if not self.discrete:
+            time.sleep(max(0.0, seconds) / self.warp)
+            return
+        if self._stopped:
+            # Stopped discrete clock: wall-clock sleeps, so shutting-down loops don't spin
+            time.sleep(max(0.0, seconds))
+            return
+        woken = threading.Event()
+        self._schedule(seconds, threading.current_thread(), woken.set)
+        woken.wait()
+
+    async def asleep(self, seconds: float) -> None:
+        """Suspend the calling task for `seconds` of simulation time"""
+        if not self.discrete:
+            await asyncio.sleep(max(0.0, seconds) / self.warp)
+            return
+        if self._stopped:
+            await asyncio.sleep(max(0.0, seconds))
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def resolve() -> None:
+            if not future.done():
+                future.set_result(None)
+
+        def wake() -> None:
+            try:
+                loop.call_soon_threadsafe(resolve)
+            except RuntimeError:
+                pass  # loop already closed
+
+        wakeup = self._schedule(seconds, asyncio.current_task(), wake)
+        try:
+            await future
+        except asyncio.CancelledError:
+            wakeup.active = False
+            raise
+
+    def call_later(self, seconds: float, callback: Callable[[], None], owner: Any = None) -> Any:
+        """
+        Run `callback` on the running event loop after `seconds` of simulation time.
+
+        Discrete mode: `owner` (default: the current task) is treated as asleep until
+        then, like a sleeping task. Returns a handle with cancel().
+        """
+        loop = asyncio.get_running_loop()
+        if not self.discrete or self._stopped:
+            delay = max(0.0, seconds) / (1.0 if self.discrete else self.warp)
+            return loop.call_later(delay, callback)
+
+        def wake() -> None:
+            try:
+                loop.call_soon_threadsafe(callback)
+            except RuntimeError:
+                pass  # loop already closed
+
+        return self._schedule(seconds, owner if owner is not None else asyncio.current_task(), wake)
+
+    def _schedule(self, seconds: float, owner: Any, wake: Callable[[], None]) -> _Wakeup:
+        with self._cond:
+            deadline = self._discrete_now + max(0.0, seconds)
+            if self.resolution > 0:
+                deadline = math.ceil(deadline / self.resolution - 1e-9) * self.resolution
+            wakeup = _Wakeup(deadline, next(self._sequence), owner, wake)
+            if self._stopped:
+                wake()
+                return wakeup
+            heapq.heappush(self._wakeups, wakeup)
+            # The sleeper is done with the previous step
+            self._running.discard(owner)
+            self._cond.notify_all()
+            return wakeup
+
+    # -------------------- Discrete-event advancing --------------------
+
+    def hold(self, owner: Any, essential: bool = False) -> None:
+        """
+        Discrete mode: count a thread (before start()) or task (right after
+        create_task()) as running until its first sleep, so time doesn't jump
+        past its first tick.
+
+        Args:
+            owner: Thread or task
+            essential: Never give up on this owner after `settle_timeout`; for
+                components that always go back to sleep but may be starved of CPU
+                (a busy single core), like the event scheduler runner. Applies to
+                every later wake-up of the owner as well.
+        """
+        if not self.discrete or self._stopped:
+            return
+        with self._cond:
+            self._running.add(owner)
+            if essential:
+                self._essential.add(owner)
+
+    def release(self, owner: Any) -> None:
+        """
+        Discrete mode: stop counting a held thread/task as running (it finished, or
+        now waits on something other than the clock).
+        """
+        if not self.discrete:
+            return
+        with self._cond:
+            if owner in self._running:
+                self._running.discard(owner)
+                self._cond.notify_all()
+
+    def start(self) -> None:
+        """Discrete mode: start advancing time (sleepers wait until then). No-op otherwise."""
+        if not self.discrete or self._started:
+            return
+        self._started = True
+        self._advancer = threading.Thread(target=self._advance_loop, name="sim-clock", daemon=True)
+        self._advancer.start()
+
+    def stop(self) -> None:
+        """Stop advancing and release every pending sleeper (later sleeps use the wall clock)"""
+        with self._cond:
+            self._stopped = True
+            pending, self._wakeups = self._wakeups, []
+            for wakeup in pending:
+                if wakeup.active:
+                    wakeup.wake()
+            self._cond.notify_all()
+        if self._advancer is not None and self._advancer is not threading.current_thread():
+            self._advancer.join(timeout=1.0)
+
+    def _settled(self) -> bool:
+        return self._stopped or (not self._running and bool(self._wakeups))
+
+    def _advance_loop(self) -> None:
+        with self._cond:
+            while not self._stopped:
+                self._cond.wait_for(self._settled, timeout=self.settle_timeout)
+                if self._stopped or not self._wakeups:
+                    continue
+                if any(owner in self._essential for owner in self._running):
+                    continue  # slow, not stuck: keep waiting
+                # Either everyone is asleep again or the stragglers (waiting on I/O,
+                # exited or cancelled) ran out of time
+                self._running.clear()
+                self._discrete_now = max(self._discrete_now, self._wakeups[0].deadline)
+                while self._wakeups and self._wakeups[0].deadline <= self._discrete_now:
+                    wakeup = heapq.heappop(self._wakeups)
+                    if wakeup.active:
+                        self._running.add(wakeup.owner)
+                        wakeup.wake()
+                self.advances += 1
+
+    def describe(self) -> str:
+        if self.discrete:
+            return "discrete (as fast as possible)"
+        if self._realtime:
+            return "realtime"
+        return f"{self.warp:g}x"
+
+
+def clock_from_env() -> SimClock:
+    """Clock configured from SIM_CLOCK_START / SIM_CLOCK_WARP (realtime when unset)"""
+    start_text = os.getenv("SIM_CLOCK_START")
+    warp_text = os.getenv("SIM_CLOCK_WARP", "1").strip().lower()
+    start = datetime.fromisoformat(start_text.replace("Z", "+00:00")) if start_text else None
+    if warp_text in ("max", "discrete"):
+        clock = SimClock(start=start, discrete=True, resolution=DISCRETE_RESOLUTION)
+        clock.start()
+        return clock
+    return SimClock(start=start, warp=float(warp_text))
+
+
+# Global clock instance
+_sim_clock: Optional[SimClock] = None
+
+
+def get_sim_clock() -> SimClock:
+    """Get the process simulation clock (from the environment on first use)."""
+    global _sim_clock
+    if _sim_clock is None:
+        _sim_clock = clock_from_env()
+    return _sim_clock
+
+
+def configure_sim_clock(start: Optional[datetime] = None,
+                        warp: float = 1.0,
+                        discrete: bool = False,
+                        resolution: float = 0.0,
+                        export_env: bool = False) -> SimClock:
+    """
+    Replace the process simulation clock.
+
+    Args:
+        start: Simulation start time (default: now)
+        warp: Simulated seconds per wall second
+        discrete: Run as fast as possible, jumping between scheduled wake-ups
+        resolution: Discrete mode: wake-up granularity in sim seconds (0: exact)
+        export_env: Also set SIM_CLOCK_START / SIM_CLOCK_WARP for child processes
+
+    Returns:
+        The new clock (call start() on it once startup is done in discrete mode)
+    """
+    global _sim_clock
+    if _sim_clock is not None:
+        _sim_clock.stop()
+    _sim_clock = SimClock(start=start, warp=warp, discrete=discrete, resolution=resolution)
+    if export_env:
+        os.environ["SIM_CLOCK_START"] = _sim_clock.now(timezone.utc).isoformat()
+        os.environ["SIM_CLOCK_WARP"] = "max" if discrete else f"{warp:g}"
+    return _sim_clock
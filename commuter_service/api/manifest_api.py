@@ -27,6 +27,7 @@ from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import httpx
+from common.http_pool import http_session
 
 from commuter_service.services.manifest_builder import (
     enrich_manifest_rows,
@@ -113,7 +114,7 @@ async def get_manifest(
         params["filters[status][$eq]"] = status
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_session("strapi", timeout=30.0) as client:
             # Fetch raw passengers from Strapi
             rows = await fetch_passengers(client, strapi_url, token, params)
             
@@ -19,6 +19,8 @@ import logging
 from typing import List, Dict, Any
 from datetime import datetime
 
+from common.sim_clock import get_sim_clock
+
 from commuter_service.domain.services.spawning import SpawnerInterface
 
 
@@ -56,11 +58,11 @@ class SpawnerCoordinator:
         Start spawning process - runs each spawner as independent async task.
         
         Args:
-            current_time: Simulation time (default: datetime.utcnow())
+            current_time: Simulation time (default: the shared SimClock's utcnow())
             time_window_minutes: Time window for spawning (default: 60)
         """
         if current_time is None:
-            current_time = datetime.utcnow()
+            current_time = get_sim_clock().utcnow()
         
         # Filter enabled spawners
         enabled_spawners = self._get_enabled_spawners()
@@ -186,7 +188,7 @@ class SpawnerCoordinator:
         
         try:
             while self._running:
-                current_time = datetime.utcnow()
+                current_time = get_sim_clock().utcnow()
                 
                 # Spawn passengers (count determined by Poisson distribution)
                 result = await spawner.spawn_and_store(current_time, time_window_minutes)
@@ -202,7 +204,7 @@ class SpawnerCoordinator:
                 next_spawn_delay = np.random.exponential(mean_interval_minutes)
                 
                 # Wait until next spawn time
-                await asyncio.sleep(next_spawn_delay * 60)  # Convert minutes to seconds
+                await get_sim_clock().asleep(next_spawn_delay * 60)  # Convert minutes to seconds
                 
         except asyncio.CancelledError:
             self.logger.info(f"⏹️  {spawner_name} stopped")
@@ -220,11 +222,11 @@ class SpawnerCoordinator:
         
         try:
             while self._running:
-                current_time = datetime.utcnow()
+                current_time = get_sim_clock().utcnow()
                 await self._run_single_cycle(enabled_spawners, current_time, time_window_minutes)
                 
                 self.logger.info(f"⏱️  Sleeping for {interval_seconds} seconds...")
-                await asyncio.sleep(interval_seconds)
+                await get_sim_clock().asleep(interval_seconds)
                 
         except KeyboardInterrupt:
             self.logger.info("⏹️  Received shutdown signal")
@@ -4,14 +4,17 @@ Flexible Query Engine for Passenger Data
 
 Provides a unified query interface with dynamic filtering, grouping, and formatting.
 Supports SQL-like operations without reinventing wheels - uses pandas for heavy lifting.
+pandas is imported on first query, so importing this module stays cheap.
 """
 
 from __future__ import annotations
 
-import pandas as pd
-from typing import Dict, List, Any, Optional, Literal
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Literal
 from datetime import datetime
-import httpx
+from common.http_pool import http_session
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 async def execute_flexible_query(
@@ -43,6 +46,8 @@ async def execute_flexible_query(
         Dict with query results in requested format
     """
     
+    import pandas as pd
+    
     # Step 1: Fetch all passengers from Strapi with pagination
     all_passengers = await _fetch_all_passengers(strapi_url)
     
@@ -93,7 +98,7 @@ async def _fetch_all_passengers(strapi_url: str) -> List[Dict[str, Any]]:
     page = 1
     max_pages = 100
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_session("strapi", timeout=30.0) as client:
         while page <= max_pages:
             url = f"{strapi_url}/api/active-passengers?pagination[page]={page}&pagination[pageSize]=100"
             response = await client.get(url)
@@ -129,6 +134,7 @@ async def _fetch_all_passengers(strapi_url: str) -> List[Dict[str, Any]]:
 
 def _apply_filters(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
     """Apply filters to DataFrame"""
+    import pandas as pd
     
     # Route filter
     if 'route' in filters and filters['route']:
@@ -173,7 +179,7 @@ async def _geocode_dataframe(df: pd.DataFrame, geo_url: str) -> pd.DataFrame:
     cache = {}
     sem = asyncio.Semaphore(20)
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_session("geospatial", timeout=30.0) as client:
         async def geocode_row(idx, row):
             async with sem:
                 start_addr = await reverse_geocode(
@@ -201,6 +207,7 @@ async def _geocode_dataframe(df: pd.DataFrame, geo_url: str) -> pd.DataFrame:
 
 def _group_and_aggregate(df: pd.DataFrame, group_by: str, aggregate: Optional[str]) -> List[Dict[str, Any]]:
     """Group and aggregate DataFrame"""
+    import pandas as pd
     
     # Map group_by to actual column
     group_column = group_by
@@ -240,6 +247,7 @@ def _format_output(data: Any, format: str, group_by: Optional[str], aggregate: O
     
     elif format == "csv":
         # Convert to CSV string
+        import pandas as pd
         df = pd.DataFrame(data)
         return df.to_csv(index=False)
     
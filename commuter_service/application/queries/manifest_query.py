@@ -18,6 +18,7 @@ from dataclasses import dataclass, asdict
 from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
+from common.http_pool import http_session
 
 
 @dataclass
@@ -136,7 +137,7 @@ async def enrich_manifest_rows(
     """
     geo_url = os.getenv("GEO_URL", "http://localhost:6000").rstrip("/")
 
-    async with httpx.AsyncClient(timeout=20.0) as client:
+    async with http_session("geospatial", timeout=20.0) as client:
         route_coords = await fetch_route_coords(geo_url, route_id, client)
 
         # Compute positions
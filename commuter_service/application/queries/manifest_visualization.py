@@ -15,7 +15,7 @@ import math
 import asyncio
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-import httpx
+from common.http_pool import http_session
 
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -45,7 +45,7 @@ async def fetch_passengers_from_strapi(
     all_passengers = []
     page = 1
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_session("strapi", timeout=30.0) as client:
         while True:
             # Strapi max pageSize is 100, not 1000
             url = f"{strapi_url}/api/active-passengers?pagination[page]={page}&pagination[pageSize]=100"
@@ -203,7 +203,7 @@ async def enrich_passengers_with_geocoding(
             return depot_cache[route_id]
         
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with http_session("geospatial", timeout=5.0) as client:
                 response = await client.get(f"{geospatial_url}/routes/by-document-id/{route_id}/depot")
                 if response.status_code == 200:
                     depot_info = response.json().get('depot', {})
@@ -217,7 +217,7 @@ async def enrich_passengers_with_geocoding(
     # Fetch all depot coords in parallel
     route_ids = list(set(p.get('route_id') for p in passengers if p.get('route_id')))
     
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_session("strapi", timeout=10.0) as client:
         tasks = [get_depot_coords(rid) for rid in route_ids]
         await asyncio.gather(*tasks)
     
@@ -237,7 +237,7 @@ async def enrich_passengers_with_geocoding(
     # Reverse geocode all unique coordinates in parallel
     address_cache = {}
     
-    async with httpx.AsyncClient(timeout=10.0) as shared_client:
+    async with http_session("geospatial", timeout=10.0) as shared_client:
         async def geocode_coord(lat: float, lon: float, semaphore: asyncio.Semaphore) -> Tuple[Tuple[float, float], str]:
             async with semaphore:
                 try:
@@ -15,6 +15,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 from geopy.distance import geodesic
 
+from common.http_pool import http_session
 from commuter_service.core.domain.spawning_plugin import (
     BaseSpawningPlugin,
     PluginConfig,
@@ -244,10 +245,8 @@ class PoissonGeoJSONPlugin(BaseSpawningPlugin):
     async def _get_route_spawn_config(self, config_loader: Any, route_id: str) -> Optional[Dict]:
         """Load spawn config for route from Strapi"""
         try:
-            import httpx
-            
             # Query spawn-config by route document_id
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("strapi", timeout=10.0) as client:
                 response = await client.get(
                     f"{config_loader.api_base_url}/spawn-configs?populate=*&filters[route][documentId][$eq]={route_id}"
                 )
@@ -265,9 +264,7 @@ class PoissonGeoJSONPlugin(BaseSpawningPlugin):
     async def _get_route_geometry(self, geo_client: Any, route_id: str) -> Optional[Dict]:
         """Get route geometry from geospatial service"""
         try:
-            import httpx
-            
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("geospatial", timeout=10.0) as client:
                 response = await client.get(f"{geo_client.base_url}/spatial/route-geometry/{route_id}")
                 response.raise_for_status()
                 return response.json()
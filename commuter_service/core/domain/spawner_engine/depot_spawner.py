@@ -20,9 +20,11 @@ from datetime import datetime
 import random
 import uuid
 
+from common.http_pool import http_session
 from commuter_service.core.domain.spawner_engine.base_spawner import SpawnerInterface, SpawnRequest, ReservoirInterface
 from commuter_service.infrastructure.spawn.config_loader import SpawnConfigLoader
 from commuter_service.infrastructure.geospatial.client import GeospatialClient
+from commuter_service.infrastructure.geospatial.building_counts import get_building_count_store
 
 
 class DepotSpawner(SpawnerInterface):
@@ -73,6 +75,7 @@ class DepotSpawner(SpawnerInterface):
         self._spawn_config_cache = None
         self._buildings_cache = None
         self._associated_routes_cache = None
+        self._route_document_ids: Dict[str, str] = {}  # route name -> Strapi documentId
     
     async def spawn(self, current_time: datetime, time_window_minutes: int = 60) -> List[SpawnRequest]:
         """
@@ -141,10 +144,9 @@ class DepotSpawner(SpawnerInterface):
         # Try to load config from one of the available routes
         if self.available_routes and len(self.available_routes) > 0:
             try:
-                import httpx
                 route_id = self.available_routes[0]
                 
-                async with httpx.AsyncClient(timeout=10.0) as client:
+                async with http_session("strapi", timeout=10.0) as client:
                     response = await client.get(
                         f"{self.config_loader.api_base_url}/spawn-configs?"
                         f"populate=*&filters[route][documentId][$eq]={route_id}"
@@ -205,11 +207,9 @@ class DepotSpawner(SpawnerInterface):
             return []
         
         try:
-            import httpx
-            
             # Query route-depots where depot matches this depot's documentId
             # MUST populate route relation to get route data
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("strapi", timeout=10.0) as client:
                 url = (
                     f"{self.strapi_url}/api/route-depots?"
                     f"filters[depot][documentId][$eq]={self.depot_document_id}&"
@@ -239,6 +239,8 @@ class DepotSpawner(SpawnerInterface):
                     route_short_name = route.get('route_short_name') or str(route.get('id', ''))
                 if route and route_short_name:
                     route_names.append(route_short_name)
+                    if route.get('documentId'):
+                        self._route_document_ids[route_short_name] = route['documentId']
             
             self._associated_routes_cache = route_names
             self.logger.info(
@@ -255,16 +257,30 @@ class DepotSpawner(SpawnerInterface):
         """
         Query buildings near depot using geospatial service.
         Similar to RouteSpawner's building query but for depot catchment area.
+        
+        Uses the count precomputed on the route-depot associations when one
+        exists for this catchment radius; the result is cached either way.
         """
+        if self._buildings_cache is not None:
+            return self._buildings_cache
+        
         try:
-            if not self.geo_client:
-                self.logger.warning("No geo_client available, using default building count")
-                return 200  # Default fallback
-            
             # Get depot catchment radius from config
             dist_params = spawn_config.get('distribution_params', {})
             catchment_radius = dist_params.get('depot_catchment_radius_meters', 800)
             
+            if self.depot_document_id:
+                store = get_building_count_store(self.strapi_url)
+                await store.ensure_loaded()
+                precomputed = store.depot_building_count(self.depot_document_id, radius_m=catchment_radius)
+                if precomputed is not None:
+                    self._buildings_cache = precomputed
+                    return precomputed
+            
+            if not self.geo_client:
+                self.logger.warning("No geo_client available, using default building count")
+                return 200  # Default fallback
+            
             # Query buildings near depot
             depot_lat, depot_lon = self.depot_location
             result = self.geo_client.depot_catchment_area(
@@ -280,6 +296,8 @@ class DepotSpawner(SpawnerInterface):
                 f"Depot {self.depot_id}: Found {building_count} buildings within {catchment_radius}m"
             )
             
+            if building_count > 0:
+                self._buildings_cache = building_count
             return building_count
             
         except Exception as e:
@@ -351,8 +369,8 @@ class DepotSpawner(SpawnerInterface):
         """
         Calculate attractiveness-weighted distribution of passengers across routes.
         
-        Simplified: Use equal distribution for all routes.
-        (In future, could weight by building density along each route)
+        Weights routes by their precomputed corridor building counts when every
+        route at the depot has one; otherwise uses equal distribution.
         
         Returns:
             Dict mapping route_id -> attractiveness (0.0 - 1.0, sum = 1.0)
@@ -360,6 +378,26 @@ class DepotSpawner(SpawnerInterface):
         if not self.available_routes:
             return {}
         
+        if self.depot_document_id and self._route_document_ids:
+            dist_params = spawn_config.get('distribution_params', {})
+            spawn_radius = dist_params.get('spawn_radius_meters', 500)
+            store = get_building_count_store(self.strapi_url)
+            await store.ensure_loaded()
+            route_counts = store.depot_route_building_counts(self.depot_document_id, buffer_m=spawn_radius)
+            
+            if route_counts:
+                weights = {
+                    route: route_counts.get(self._route_document_ids.get(route), 0)
+                    for route in self.available_routes
+                }
+                total = sum(weights.values())
+                if total > 0:
+                    attractiveness = {route: count / total for route, count in weights.items()}
+                    self.logger.info(
+                        f"Depot {self.depot_id} route attractiveness (building-weighted): {attractiveness}"
+                    )
+                    return attractiveness
+        
         # Equal distribution across all routes
         equal_weight = 1.0 / len(self.available_routes)
         attractiveness = {route: equal_weight for route in self.available_routes}
@@ -380,8 +418,7 @@ class DepotSpawner(SpawnerInterface):
         # Query from API if depot_document_id available
         if self.depot_document_id and self.config_loader:
             try:
-                import httpx
-                async with httpx.AsyncClient(timeout=10.0) as client:
+                async with http_session("strapi", timeout=10.0) as client:
                     url = f"{self.strapi_url}/api/depots/{self.depot_document_id}?populate=*"
                     response = await client.get(url)
                     response.raise_for_status()
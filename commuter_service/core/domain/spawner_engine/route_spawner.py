@@ -20,9 +20,11 @@ from datetime import datetime
 import random
 import asyncio
 
+from common.http_pool import http_session
 from commuter_service.core.domain.spawner_engine.base_spawner import SpawnerInterface, SpawnRequest, ReservoirInterface
 from commuter_service.infrastructure.spawn.config_loader import SpawnConfigLoader
 from commuter_service.infrastructure.geospatial.client import GeospatialClient
+from commuter_service.infrastructure.geospatial.building_counts import get_building_count_store
 
 
 class RouteSpawner(SpawnerInterface):
@@ -96,20 +98,20 @@ class RouteSpawner(SpawnerInterface):
                 self.logger.error(f"No route geometry for {self.route_id}")
                 return []
             
-            # Query buildings
-            buildings = await self._get_buildings_near_route(route_geometry, spawn_config)
+            # Buildings in route corridor (precomputed count, else live query)
+            building_count = await self._get_route_building_count(route_geometry, spawn_config)
             
             # Calculate spawn count
             spawn_count = await self._calculate_spawn_count(
                 spawn_config=spawn_config,
-                building_count=len(buildings),
+                building_count=building_count,
                 current_time=current_time,
                 time_window_minutes=time_window_minutes
             )
             
             self.logger.info(
                 f"Route {self.route_id} at {current_time.strftime('%Y-%m-%d %H:%M')}: "
-                f"spawning {spawn_count} passengers (buildings={len(buildings)})"
+                f"spawning {spawn_count} passengers (buildings={building_count})"
             )
             
             # Generate spawn requests
@@ -133,8 +135,7 @@ class RouteSpawner(SpawnerInterface):
         
         try:
             # Query spawn-config by route document_id
-            import httpx
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("strapi", timeout=10.0) as client:
                 response = await client.get(
                     f"{self.config_loader.api_base_url}/spawn-configs?"
                     f"populate=*&filters[route][documentId][$eq]={self.route_id}"
@@ -163,8 +164,7 @@ class RouteSpawner(SpawnerInterface):
             return self._route_geometry_cache
         
         try:
-            import httpx
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("geospatial", timeout=10.0) as client:
                 response = await client.get(
                     f"{self.geo_client.base_url}/spatial/route-geometry/{self.route_id}"
                 )
@@ -175,6 +175,51 @@ class RouteSpawner(SpawnerInterface):
             self.logger.error(f"Error loading route geometry: {e}")
             return None
     
+    @property
+    def _strapi_url(self) -> str:
+        """Strapi base URL (config_loader.api_base_url without the /api suffix)."""
+        base = self.config_loader.api_base_url
+        return base[:-len('/api')] if base.endswith('/api') else base
+    
+    @staticmethod
+    def _distribution_param(spawn_config: Dict[str, Any], key: str, default: float) -> float:
+        dist_params = spawn_config.get('distribution_params', {})
+        if isinstance(dist_params, list) and len(dist_params) > 0:
+            dist_params = dist_params[0]
+        return dist_params.get(key, default)
+    
+    async def _get_route_building_count(
+        self,
+        route_geometry: Dict[str, Any],
+        spawn_config: Dict[str, Any]
+    ) -> int:
+        """
+        Number of buildings in the route corridor.
+        
+        Reads the count precomputed on the route-depot association (see
+        precompute_route_depot_associations); only falls back to a live
+        buildings query when no count exists for this spawn radius. The
+        result is cached for the life of the spawner either way.
+        """
+        if self._buildings_cache is not None:
+            return self._buildings_cache
+        
+        spawn_radius = self._distribution_param(spawn_config, 'spawn_radius_meters', 500)
+        
+        store = get_building_count_store(self._strapi_url)
+        await store.ensure_loaded()
+        count = store.route_building_count(self.route_id, buffer_m=spawn_radius)
+        
+        if count is None:
+            buildings = await self._get_buildings_near_route(route_geometry, spawn_config)
+            count = len(buildings)
+            if not buildings:
+                # Don't pin an empty result that may come from a transient error
+                return count
+        
+        self._buildings_cache = count
+        return count
+    
     async def _get_buildings_near_route(
         self, 
         route_geometry: Dict[str, Any], 
@@ -213,10 +258,8 @@ class RouteSpawner(SpawnerInterface):
     async def _get_depot_info(self, spawn_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Get depot information from geospatial service."""
         try:
-            import httpx
-            
             # Use geospatial service to query depot by documentId
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("geospatial", timeout=10.0) as client:
                 response = await client.get(
                     f"{self.geo_client.base_url}/routes/by-document-id/{self.route_id}/depot"
                 )
@@ -268,6 +311,14 @@ class RouteSpawner(SpawnerInterface):
             dist_params = dist_params[0]
         catchment_radius = dist_params.get('depot_catchment_radius_meters', 800)
         
+        # Prefer the count precomputed on the route-depot association
+        store = get_building_count_store(self._strapi_url)
+        await store.ensure_loaded()
+        precomputed = store.depot_building_count(depot.get('documentId'), radius_m=catchment_radius)
+        if precomputed is not None:
+            self._depot_catchment_cache = precomputed
+            return precomputed
+        
         # Query depot catchment
         result = self.geo_client.depot_catchment_area(
             depot_latitude=depot_lat,
@@ -310,10 +361,17 @@ class RouteSpawner(SpawnerInterface):
                 self.logger.warning("Depot missing documentId")
                 return 0
             
-            import httpx
+            # Precomputed counts for every route at this depot answer in O(1)
+            spawn_radius = self._distribution_param(spawn_config, 'spawn_radius_meters', 500)
+            store = get_building_count_store(self._strapi_url)
+            await store.ensure_loaded()
+            route_counts = store.depot_route_building_counts(depot_doc_id, buffer_m=spawn_radius)
+            if route_counts is not None:
+                self._total_buildings_all_routes_cache = sum(route_counts.values())
+                return self._total_buildings_all_routes_cache
             
             # Query route-depots junction to get all routes at this depot
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("strapi", timeout=10.0) as client:
                 response = await client.get(
                     f"{self.config_loader.api_base_url}/route-depots",
                     params={
@@ -346,7 +404,7 @@ class RouteSpawner(SpawnerInterface):
                 
                 # Get route geometry
                 try:
-                    async with httpx.AsyncClient(timeout=10.0) as client:
+                    async with http_session("geospatial", timeout=10.0) as client:
                         response = await client.get(
                             f"{self.geo_client.base_url}/spatial/route-geometry/{route_doc_id}"
                         )
@@ -474,8 +532,7 @@ class RouteSpawner(SpawnerInterface):
 
         # Fetch DB-driven distribution policy (end-to-end settings)
         try:
-            import httpx
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("strapi", timeout=10.0) as client:
                 resp = await client.get(
                     f"{self.config_loader.api_base_url}/operational-configurations",
                     params={
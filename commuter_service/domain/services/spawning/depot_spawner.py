@@ -20,6 +20,7 @@ from datetime import datetime
 import random
 import uuid
 
+from common.http_pool import http_session
 from commuter_service.domain.services.spawning.base_spawner import SpawnerInterface, SpawnRequest, ReservoirInterface
 from commuter_service.infrastructure.config.spawn_config_loader import SpawnConfigLoader
 from commuter_service.infrastructure.geospatial.client import GeospatialClient
@@ -158,8 +159,7 @@ class DepotSpawner(SpawnerInterface):
         
         try:
             # Query depot-spawn-config by depot_id
-            import httpx
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("strapi", timeout=10.0) as client:
                 response = await client.get(
                     f"{self.config_loader.api_base_url}/depot-spawn-configs?"
                     f"populate=*&filters[depot_id][$eq]={self.depot_id}"
@@ -196,10 +196,8 @@ class DepotSpawner(SpawnerInterface):
             return []
         
         try:
-            import httpx
-            
             # Query route-depots where depot matches this depot's documentId
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("strapi", timeout=10.0) as client:
                 url = (
                     f"{self.strapi_url}/api/route-depots?"
                     f"filters[depot][documentId][$eq]={self.depot_document_id}&"
@@ -19,6 +19,7 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 import random
 
+from common.http_pool import http_session
 from commuter_service.domain.services.spawning.base_spawner import SpawnerInterface, SpawnRequest, ReservoirInterface
 from commuter_service.infrastructure.config.spawn_config_loader import SpawnConfigLoader
 from commuter_service.infrastructure.geospatial.client import GeospatialClient
@@ -127,8 +128,7 @@ class RouteSpawner(SpawnerInterface):
         
         try:
             # Query spawn-config by route document_id
-            import httpx
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("strapi", timeout=10.0) as client:
                 response = await client.get(
                     f"{self.config_loader.api_base_url}/spawn-configs?"
                     f"populate=*&filters[route][documentId][$eq]={self.route_id}"
@@ -157,8 +157,7 @@ class RouteSpawner(SpawnerInterface):
             return self._route_geometry_cache
         
         try:
-            import httpx
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("geospatial", timeout=10.0) as client:
                 response = await client.get(
                     f"{self.geo_client.base_url}/spatial/route-geometry/{self.route_id}"
                 )
@@ -2,7 +2,7 @@
 Database infrastructure - Single source of truth for data access
 """
 from .strapi_client import StrapiApiClient, DepotData, RouteData, PassengerData
-from .passenger_repository import PassengerRepository
+from .passenger_repository import PassengerRepository, BulkInsertReport
 
-__all__ = ['StrapiApiClient', 'DepotData', 'RouteData', 'PassengerData', 'PassengerRepository']
+__all__ = ['StrapiApiClient', 'DepotData', 'RouteData', 'PassengerData', 'PassengerRepository', 'BulkInsertReport']
 
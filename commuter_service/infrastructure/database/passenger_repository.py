@@ -11,7 +11,10 @@ Clean architecture implementation with DB-driven configuration.
 """
 
 import aiohttp
-from datetime import datetime, timedelta
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict
 import logging
 
@@ -22,6 +25,32 @@ except ImportError:
     _config_available = False
 
 
+def _utc_iso(value: datetime) -> str:
+    """ISO 8601 UTC timestamp with a Z suffix (naive datetimes are taken as UTC)"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat() + "Z"
+
+
+@dataclass
+class BulkInsertReport:
+    """Outcome of a bulk passenger insert."""
+    mode: str  # "bulk", "per-row" or "mixed" (bulk route disappeared mid-run)
+    total: int = 0
+    successful: int = 0
+    failed: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+    failures: List[Dict] = field(default_factory=list)  # [{passenger_id, error}]
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Successful rows written per second of wall time."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.successful / self.elapsed_seconds
+
+
 class PassengerRepository:
     """Repository for Strapi active-passengers API operations."""
     
@@ -29,7 +58,8 @@ class PassengerRepository:
         self,
         strapi_url: Optional[str] = None,
         api_token: Optional[str] = None,
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        bulk_batch_size: int = 500
     ):
         """
         Initialize Strapi API client.
@@ -39,6 +69,7 @@ class PassengerRepository:
                        Defaults to "http://localhost:1337" if config unavailable.
             api_token: Strapi API token for authentication
             logger: Logger instance
+            bulk_batch_size: Passengers per request in bulk_insert_passengers
         """
         # Load strapi_url from config if not provided
         if strapi_url is None:
@@ -56,6 +87,8 @@ class PassengerRepository:
         self.logger.info(f"[PassengerRepository] Initialized with URL: {self.strapi_url}")
         
         self.api_token = api_token
+        self.bulk_batch_size = bulk_batch_size
+        self._bulk_endpoint_available = True
         self.session: Optional[aiohttp.ClientSession] = None
         self.headers = {
             "Content-Type": "application/json"
@@ -169,12 +202,17 @@ class PassengerRepository:
             self.logger.error(f"❌ Error inserting passenger {passenger_id}: {e}")
             return False
     
-    async def bulk_insert_passengers(self, passengers: List[Dict]) -> tuple[int, int]:
+    async def bulk_insert_passengers(
+        self,
+        passengers: List[Dict],
+        batch_size: Optional[int] = None
+    ) -> tuple[int, int]:
         """
-        Insert multiple passengers concurrently via Strapi API.
+        Insert multiple passengers via the Strapi bulk-create route.
         
-        This is much faster than sequential inserts - 30-40 passengers in ~2 seconds
-        vs 30-80 seconds with sequential calls.
+        Passengers are sent in batches to POST /api/active-passengers/bulk, which
+        writes each batch with a single multi-row INSERT. If the Strapi instance
+        does not expose the bulk route, falls back to concurrent per-row POSTs.
         
         Args:
             passengers: List of passenger dicts with keys:
@@ -182,88 +220,212 @@ class PassengerRepository:
                 - destination_lat, destination_lon, destination_name
                 - direction (optional), priority (optional), expires_minutes (optional)
                 - spawned_at (optional), depot_id (optional), route_position (optional)
+            batch_size: Rows per bulk request (defaults to self.bulk_batch_size)
         
         Returns:
             Tuple of (successful_count, failed_count)
         """
+        report = await self.bulk_insert_passengers_report(passengers, batch_size=batch_size)
+        return (report.successful, report.failed)
+    
+    async def bulk_insert_passengers_report(
+        self,
+        passengers: List[Dict],
+        batch_size: Optional[int] = None
+    ) -> BulkInsertReport:
+        """
+        Insert multiple passengers in batches and return a detailed report.
+        
+        Args:
+            passengers: Passenger dicts (see bulk_insert_passengers)
+            batch_size: Rows per bulk request (defaults to self.bulk_batch_size)
+        
+        Returns:
+            BulkInsertReport with per-passenger failures and throughput
+        """
+        report = BulkInsertReport(mode="bulk", total=len(passengers))
+        
         if not self.session:
             self.logger.error("[PassengerRepository] Session not connected")
-            return (0, len(passengers))
+            report.failed = len(passengers)
+            report.failures = [
+                {"passenger_id": p.get("passenger_id"), "error": "Session not connected"}
+                for p in passengers
+            ]
+            return report
         
         if not passengers:
-            return (0, 0)
+            return report
         
-        import asyncio
+        if not self._bulk_endpoint_available:
+            return await self.insert_passengers_individually(passengers)
         
-        async def insert_one(passenger: Dict) -> bool:
-            """Helper to insert a single passenger"""
-            try:
-                spawned_at = passenger.get('spawned_at') or datetime.utcnow()
-                expires_minutes = passenger.get('expires_minutes', 30)
-                expires_at = spawned_at + timedelta(minutes=expires_minutes)
-                
-                data = {
-                    "data": {
-                        "passenger_id": passenger['passenger_id'],
-                        "route_id": passenger['route_id'],
-                        "depot_id": passenger.get('depot_id'),
-                        "direction": passenger.get('direction'),
-                        "latitude": passenger['latitude'],
-                        "longitude": passenger['longitude'],
-                        "destination_name": passenger['destination_name'],
-                        "destination_lat": passenger['destination_lat'],
-                        "destination_lon": passenger['destination_lon'],
-                        "spawned_at": spawned_at.isoformat() + "Z" if isinstance(spawned_at, datetime) else spawned_at,
-                        "expires_at": expires_at.isoformat() + "Z" if isinstance(expires_at, datetime) else expires_at,
-                        "status": "WAITING",
-                        "priority": passenger.get('priority', 3)
-                    }
-                }
+        batch_size = max(1, batch_size or self.bulk_batch_size)
+        started = time.perf_counter()
+        
+        for offset in range(0, len(passengers), batch_size):
+            batch = passengers[offset:offset + batch_size]
+            inserted, failures = await self._post_bulk_batch(batch)
+            
+            if inserted is None:
+                # Bulk route not deployed - insert the rest row by row
+                remaining = passengers[offset:]
+                fallback = await self.insert_passengers_individually(remaining)
+                report.mode = "per-row" if offset == 0 else "mixed"
+                report.successful += fallback.successful
+                report.failed += fallback.failed
+                report.failures.extend(fallback.failures)
+                break
+            
+            report.batches += 1
+            report.successful += inserted
+            report.failed += len(failures)
+            report.failures.extend(failures)
+        
+        report.elapsed_seconds = time.perf_counter() - started
+        
+        self.logger.info(
+            f"✅ Bulk insert complete: {report.successful} successful, {report.failed} failed "
+            f"({report.total} total, {report.batches} batches, "
+            f"{report.rows_per_second:.0f} rows/s, mode={report.mode})"
+        )
+        for failure in report.failures[:10]:
+            self.logger.warning(
+                f"   Failed passenger {failure.get('passenger_id')}: {failure.get('error')}"
+            )
+        
+        return report
+    
+    async def _post_bulk_batch(self, batch: List[Dict]) -> tuple[Optional[int], List[Dict]]:
+        """
+        POST one batch to the bulk-create route.
+        
+        Returns:
+            (inserted_count, failures). inserted_count is None when the bulk
+            route is not available on this Strapi instance or failed server-side
+            (5xx), in which case the caller inserts the rows one by one.
+        """
+        payload = {"data": [self._build_passenger_payload(p) for p in batch]}
+        
+        try:
+            async with self.session.post(
+                f"{self.strapi_url}/api/active-passengers/bulk",
+                json=payload,
+                headers={"Content-Type": "application/json", "Accept": "application/json"}
+            ) as response:
+                if response.status in (404, 405):
+                    self.logger.warning(
+                        "[PassengerRepository] Bulk route unavailable, "
+                        "falling back to per-row inserts"
+                    )
+                    self._bulk_endpoint_available = False
+                    return (None, [])
                 
-                if passenger.get('route_position') is not None:
-                    data["data"]["route_position"] = passenger['route_position']
+                if response.status >= 500:
+                    error_text = await response.text()
+                    self.logger.warning(
+                        f"[PassengerRepository] Bulk insert failed ({response.status} - {error_text[:200]}), "
+                        "falling back to per-row inserts"
+                    )
+                    return (None, [])
                 
-                headers = {
-                    "Content-Type": "application/json",
-                    "Accept": "application/json"
-                }
+                if response.status not in (200, 201, 422):
+                    error_text = await response.text()
+                    error = f"{response.status} - {error_text[:200]}"
+                    return (0, [{"passenger_id": p.get("passenger_id"), "error": error} for p in batch])
                 
+                result = await response.json()
+                return (result.get("inserted_count", 0), result.get("failed", []))
+        except Exception as e:
+            self.logger.error(f"❌ Error in bulk passenger insert: {e}")
+            return (0, [{"passenger_id": p.get("passenger_id"), "error": str(e)} for p in batch])
+    
+    async def insert_passengers_individually(
+        self,
+        passengers: List[Dict],
+        max_concurrency: int = 10
+    ) -> BulkInsertReport:
+        """
+        Insert passengers with one POST per passenger (bounded concurrency).
+        
+        Used as a fallback when the bulk route is not deployed, and as the
+        baseline in scripts/benchmark_bulk_insert.py.
+        """
+        report = BulkInsertReport(mode="per-row", total=len(passengers))
+        if not self.session or not passengers:
+            report.failed = len(passengers)
+            return report
+        
+        started = time.perf_counter()
+        
+        async def insert_one(passenger: Dict) -> Optional[str]:
+            """Insert a single passenger, returning an error message on failure"""
+            try:
                 async with self.session.post(
                     f"{self.strapi_url}/api/active-passengers",
-                    json=data,
-                    headers=headers
+                    json={"data": self._build_passenger_payload(passenger)},
+                    headers={"Content-Type": "application/json", "Accept": "application/json"}
                 ) as response:
-                    if response.status not in (200, 201):
-                        error_text = await response.text()
-                        self.logger.error(
-                            f"Failed to insert passenger {passenger.get('passenger_id')}: "
-                            f"Status {response.status}, Response: {error_text[:200]}"
-                        )
-                    return response.status in (200, 201)
+                    if response.status in (200, 201):
+                        return None
+                    error_text = await response.text()
+                    return f"Status {response.status}, Response: {error_text[:200]}"
             except Exception as e:
-                self.logger.error(f"Error inserting passenger {passenger.get('passenger_id')}: {e}")
-                return False
+                return str(e)
         
-        # Launch inserts with concurrency limit to avoid overwhelming Strapi
-        # Limit to 10 concurrent requests at a time
-        semaphore = asyncio.Semaphore(10)
+        # Limit concurrent requests to avoid overwhelming Strapi
+        semaphore = asyncio.Semaphore(max_concurrency)
         
         async def rate_limited_insert(passenger):
             async with semaphore:
                 return await insert_one(passenger)
         
-        tasks = [rate_limited_insert(p) for p in passengers]
-        results = await asyncio.gather(*tasks, return_exceptions=False)
+        errors = await asyncio.gather(*(rate_limited_insert(p) for p in passengers))
+        
+        for passenger, error in zip(passengers, errors):
+            if error is None:
+                report.successful += 1
+            else:
+                report.failed += 1
+                report.failures.append({"passenger_id": passenger.get("passenger_id"), "error": error})
         
-        successful = sum(1 for r in results if r is True)
-        failed = len(passengers) - successful
+        report.batches = len(passengers)
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+    
+    @staticmethod
+    def _build_passenger_payload(passenger: Dict) -> Dict:
+        """Build the Strapi `data` payload for one passenger dict."""
+        spawned_at = passenger.get('spawned_at') or datetime.utcnow()
+        expires_at = passenger.get('expires_at')
+        
+        if isinstance(spawned_at, str):
+            spawned_at = datetime.fromisoformat(spawned_at.replace("Z", "+00:00"))
+        if expires_at is None:
+            expires_at = spawned_at + timedelta(minutes=passenger.get('expires_minutes', 30))
+        spawned_at = _utc_iso(spawned_at)
+        expires_at = _utc_iso(expires_at) if isinstance(expires_at, datetime) else expires_at
         
-        self.logger.info(
-            f"✅ Bulk insert complete: {successful} successful, {failed} failed "
-            f"({len(passengers)} total passengers)"
-        )
+        data = {
+            "passenger_id": passenger['passenger_id'],
+            "route_id": passenger['route_id'],
+            "depot_id": passenger.get('depot_id'),
+            "direction": passenger.get('direction'),
+            "latitude": passenger['latitude'],
+            "longitude": passenger['longitude'],
+            "destination_name": passenger.get('destination_name', "Destination"),
+            "destination_lat": passenger['destination_lat'],
+            "destination_lon": passenger['destination_lon'],
+            "spawned_at": spawned_at,
+            "expires_at": expires_at,
+            "status": "WAITING",
+            "priority": passenger.get('priority', 3)
+        }
+        
+        if passenger.get('route_position') is not None:
+            data["route_position"] = passenger['route_position']
         
-        return (successful, failed)
+        return data
     
     async def mark_boarded(self, passenger_id: str, vehicle_id: Optional[str] = None) -> bool:
         """
@@ -0,0 +1,200 @@
+"""
+Precomputed Building Counts
+===========================
+
+In-memory view of the building counts stored on route-depot associations by
+`commuter_service.scripts.precompute_route_depot_associations`.
+
+Each association carries:
+- route_building_count: buildings within route_buffer_m of the route corridor
+- depot_catchment_building_count: buildings within depot_catchment_radius_m of the depot
+
+The store loads every association in one paginated Strapi query and answers
+lookups from dictionaries, so spawners no longer query PostGIS each spawn cycle
+for numbers that only change when geometry or building data changes.
+
+Usage:
+    store = get_building_count_store(strapi_url)
+    await store.ensure_loaded()
+    count = store.route_building_count(route_document_id, buffer_m=500)
+    if count is None:
+        ...  # not precomputed (or computed with another radius) - query live
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from common.http_pool import http_session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RouteDepotCounts:
+    """Building counts stored on one route-depot association."""
+    route_document_id: str
+    depot_document_id: str
+    route_building_count: Optional[int]
+    route_buffer_m: Optional[float]
+    depot_catchment_building_count: Optional[int]
+    depot_catchment_radius_m: Optional[float]
+
+
+class BuildingCountStore:
+    """
+    O(1) lookups of precomputed route corridor / depot catchment building counts.
+
+    The whole table is re-read at most once per `ttl_seconds`; call
+    `invalidate()` after re-running the precompute script to pick up new
+    counts immediately.
+    """
+
+    def __init__(
+        self,
+        strapi_url: str = "http://localhost:1337",
+        ttl_seconds: float = 3600.0,
+        retry_seconds: float = 60.0
+    ):
+        self.strapi_url = strapi_url.rstrip('/')
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self._route_counts: Dict[str, RouteDepotCounts] = {}
+        self._depot_counts: Dict[str, RouteDepotCounts] = {}
+        self._depot_routes: Dict[str, List[RouteDepotCounts]] = {}
+        self._loaded_at: Optional[float] = None
+        self._next_attempt_at = 0.0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def invalidate(self) -> None:
+        """Force a reload on the next ensure_loaded()."""
+        self._loaded_at = None
+        self._next_attempt_at = 0.0
+
+    async def ensure_loaded(self) -> None:
+        """Load associations if never loaded or older than the TTL."""
+        now = time.monotonic()
+        if self._loaded_at is not None and (now - self._loaded_at) < self.ttl_seconds:
+            return
+        if now < self._next_attempt_at:
+            return
+        try:
+            await self._load()
+        except Exception as e:
+            # Keep serving the previous snapshot; callers fall back to live queries on misses
+            self._next_attempt_at = now + self.retry_seconds
+            logger.warning(f"Could not load precomputed building counts: {e}")
+
+    async def _load(self) -> None:
+        route_counts: Dict[str, RouteDepotCounts] = {}
+        depot_counts: Dict[str, RouteDepotCounts] = {}
+        depot_routes: Dict[str, List[RouteDepotCounts]] = {}
+
+        page = 1
+        async with http_session("strapi", timeout=10.0) as client:
+            while True:
+                response = await client.get(
+                    f"{self.strapi_url}/api/route-depots",
+                    params={
+                        "populate[route][fields][0]": "documentId",
+                        "populate[depot][fields][0]": "documentId",
+                        "pagination[page]": page,
+                        "pagination[pageSize]": 100,
+                    }
+                )
+                response.raise_for_status()
+                payload = response.json()
+
+                for assoc in payload.get('data', []):
+                    route = assoc.get('route') or {}
+                    depot = assoc.get('depot') or {}
+                    if not route.get('documentId') or not depot.get('documentId'):
+                        continue
+
+                    counts = RouteDepotCounts(
+                        route_document_id=route['documentId'],
+                        depot_document_id=depot['documentId'],
+                        route_building_count=assoc.get('route_building_count'),
+                        route_buffer_m=assoc.get('route_buffer_m'),
+                        depot_catchment_building_count=assoc.get('depot_catchment_building_count'),
+                        depot_catchment_radius_m=assoc.get('depot_catchment_radius_m'),
+                    )
+                    route_counts.setdefault(counts.route_document_id, counts)
+                    depot_counts.setdefault(counts.depot_document_id, counts)
+                    depot_routes.setdefault(counts.depot_document_id, []).append(counts)
+
+                page_count = payload.get('meta', {}).get('pagination', {}).get('pageCount', 1)
+                if page >= page_count:
+                    break
+                page += 1
+
+        self._route_counts = route_counts
+        self._depot_counts = depot_counts
+        self._depot_routes = depot_routes
+        self._loaded_at = time.monotonic()
+
+        logger.info(
+            f"Loaded precomputed building counts: {len(route_counts)} routes, {len(depot_counts)} depots"
+        )
+
+    @staticmethod
+    def _matches(stored_radius: Optional[float], wanted_radius: Optional[float]) -> bool:
+        return wanted_radius is None or (
+            stored_radius is not None and abs(stored_radius - wanted_radius) < 0.5
+        )
+
+    def route_building_count(self, route_document_id: str, buffer_m: Optional[float] = None) -> Optional[int]:
+        """Buildings in the route corridor, or None if not precomputed for this buffer."""
+        counts = self._route_counts.get(route_document_id)
+        if counts is None or counts.route_building_count is None:
+            return None
+        if not self._matches(counts.route_buffer_m, buffer_m):
+            return None
+        return counts.route_building_count
+
+    def depot_building_count(self, depot_document_id: str, radius_m: Optional[float] = None) -> Optional[int]:
+        """Buildings in the depot catchment, or None if not precomputed for this radius."""
+        counts = self._depot_counts.get(depot_document_id)
+        if counts is None or counts.depot_catchment_building_count is None:
+            return None
+        if not self._matches(counts.depot_catchment_radius_m, radius_m):
+            return None
+        return counts.depot_catchment_building_count
+
+    def depot_route_building_counts(
+        self,
+        depot_document_id: str,
+        buffer_m: Optional[float] = None
+    ) -> Optional[Dict[str, int]]:
+        """
+        Route document ID -> corridor building count for every route at a depot.
+
+        Returns None unless every associated route has a usable count, so
+        callers never mix precomputed and live numbers in one ratio.
+        """
+        routes = self._depot_routes.get(depot_document_id)
+        if not routes:
+            return None
+
+        result = {}
+        for counts in routes:
+            count = self.route_building_count(counts.route_document_id, buffer_m)
+            if count is None:
+                return None
+            result[counts.route_document_id] = count
+        return result
+
+
+_store: Optional[BuildingCountStore] = None
+
+
+def get_building_count_store(strapi_url: str = "http://localhost:1337") -> BuildingCountStore:
+    """Get or create the process-wide BuildingCountStore."""
+    global _store
+    if _store is None:
+        _store = BuildingCountStore(strapi_url=strapi_url)
+    return _store
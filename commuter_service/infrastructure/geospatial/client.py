@@ -7,6 +7,7 @@ Replaces direct PostGIS queries with HTTP API calls.
 
 import requests
 import httpx
+from common.http_pool import get_http_pool, http_session
 import asyncio
 from typing import Dict, List, Optional, Tuple
 import logging
@@ -23,6 +24,16 @@ except ImportError:
     _config_available = False
 
 
+def _columns_to_rows(columns: Dict[str, list], indices=None) -> List[Dict]:
+    """Row dicts from a `format=columnar` response, optionally only at the given indices"""
+    if not columns:
+        return []
+    names = list(columns)
+    if indices is None:
+        indices = range(len(columns[names[0]]))
+    return [{name: columns[name][i] for name in names} for i in indices]
+
+
 class GeospatialClient:
     """
     Client for Geospatial Services API.
@@ -80,7 +91,7 @@ class GeospatialClient:
         Returns:
             JSON response as dict
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with http_session("geospatial", timeout=self.timeout) as client:
             url = f"{self.base_url}{endpoint}"
             response = await client.get(url, params=params)
             response.raise_for_status()
@@ -302,8 +313,11 @@ class GeospatialClient:
             if not sampled_points:
                 sampled_points = route_coordinates[:1]
             
-            # Make all queries in parallel using httpx
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            # Make all queries in parallel using httpx. This runs on the sync bridge's own
+            # event loop, so it uses a short-lived client rather than the shared pool's
+            async with httpx.AsyncClient(
+                timeout=self.timeout, event_hooks=get_http_pool().event_hooks("geospatial")
+            ) as client:
                 tasks = []
                 for lon, lat in sampled_points:
                     task = client.get(
@@ -312,7 +326,8 @@ class GeospatialClient:
                             "lat": lat,
                             "lon": lon,
                             "radius_meters": buffer_meters,
-                            "limit": limit
+                            "limit": limit,
+                            "format": "columnar"
                         }
                     )
                     tasks.append(task)
@@ -320,8 +335,10 @@ class GeospatialClient:
                 # Execute all queries in parallel
                 responses = await asyncio.gather(*tasks, return_exceptions=True)
             
-            # Collect unique buildings from all responses
-            unique_buildings = {}
+            # Collect unique buildings from all responses (dedupe on the id
+            # column; only the buildings that are kept become dicts)
+            buildings_list = []
+            seen_ids = set()
             total_latency = 0
             
             for response in responses:
@@ -333,16 +350,16 @@ class GeospatialClient:
                     data = response.json()
                     total_latency += data.get('latency_ms', 0)
                     
-                    for building in data.get('buildings', []):
-                        bid = building.get('building_id')
-                        if bid not in unique_buildings:
-                            unique_buildings[bid] = building
+                    columns = data.get('columns', {})
+                    keep = []
+                    for i, bid in enumerate(columns.get('building_id', [])):
+                        if bid not in seen_ids and len(buildings_list) + len(keep) < limit:
+                            seen_ids.add(bid)
+                            keep.append(i)
+                    buildings_list.extend(_columns_to_rows(columns, keep))
                 except Exception as e:
                     logger.warning(f"Failed to parse building response: {e}")
             
-            # Convert to list and truncate to limit
-            buildings_list = list(unique_buildings.values())[:limit]
-            
             return {
                 "count": len(buildings_list),
                 "buildings": buildings_list,
@@ -387,13 +404,17 @@ class GeospatialClient:
                 params={
                     "lat": depot_latitude,
                     "lon": depot_longitude,
-                    "radius_meters": catchment_radius_meters,
-                    "limit": limit
+                    "radius": catchment_radius_meters,
+                    "limit": limit,
+                    "format": "columnar"
                 },
                 timeout=self.timeout * 2
             )
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            data['buildings'] = _columns_to_rows(data.pop('columns', {}))
+            data.setdefault('pois', [])
+            return data
         except Exception as e:
             logger.error(f"Depot catchment search failed for ({depot_latitude}, {depot_longitude}): {e}")
             return {
@@ -421,7 +442,7 @@ class GeospatialClient:
             Dict with route details including 'depots' field, or None if error
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_session("geospatial", timeout=self.timeout) as client:
                 response = await client.get(
                     f"{self.base_url}/routes/{route_id}",
                     params={
@@ -435,7 +456,7 @@ class GeospatialClient:
                 else:
                     logger.error(f"Route detail query failed: {response.status_code}")
                     return None
-                    
+        
         except Exception as e:
             logger.error(f"Error fetching route detail: {e}")
             return None
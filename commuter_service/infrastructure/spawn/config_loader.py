@@ -31,7 +31,7 @@ Usage:
     day_mult = loader.get_day_multiplier(config, "monday")  # 1.0 for weekdays
 """
 
-import httpx
+from common.http_pool import http_session
 import asyncio
 import logging
 from typing import Dict, List, Optional, Any
@@ -104,7 +104,7 @@ class SpawnConfigLoader:
         # Cache miss or expired - fetch from API
         logger.info(f"Fetching spawn config for country: {country_name}")
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with http_session("strapi", timeout=self.timeout) as client:
             # Query spawn-config filtered by country name with full population
             # API endpoint: GET /api/spawn-configs?filters[country][name][$eq]=Barbados&populate=*
             url = f"{self.api_base_url}/spawn-configs"
@@ -29,6 +29,7 @@ from fastapi import FastAPI, Query, HTTPException, WebSocket, WebSocketDisconnec
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import httpx
+from common.http_pool import get_http_pool, http_session
 import json
 import asyncio
 from typing import Set
@@ -157,7 +158,7 @@ except Exception:
 
 async def get_route_document_id(route_short_name: str) -> Optional[str]:
     """Convert route short name (e.g., '1') to document ID"""
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_session("strapi", timeout=10.0) as client:
         try:
             response = await client.get(f"{STRAPI_URL}/api/routes")
             routes = response.json().get('data', [])
@@ -316,7 +317,7 @@ async def get_manifest(
     }
     
     try:
-        async with httpx.AsyncClient(timeout=300.0) as client:  # 5 minutes for geocoding 300+ passengers
+        async with http_session("strapi", timeout=300.0) as client:  # 5 minutes for geocoding 300+ passengers
             # Fetch ALL passengers from Strapi (no filters - Strapi pagination bug)
             all_rows = await fetch_passengers(client, strapi_url, token, params)
             
@@ -446,7 +447,7 @@ async def get_barchart_visualization(
         # Determine route name
         route_name = None
         if route:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("strapi", timeout=10.0) as client:
                 response = await client.get(f"{STRAPI_URL}/api/routes")
                 routes = response.json().get('data', [])
                 for r in routes:
@@ -516,7 +517,7 @@ async def get_table_visualization(
         # Determine route name
         route_name = None
         if route:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("strapi", timeout=10.0) as client:
                 response = await client.get(f"{STRAPI_URL}/api/routes")
                 routes = response.json().get('data', [])
                 for r in routes:
@@ -612,7 +613,7 @@ async def get_manifest_stats(
         # Determine route name
         route_name = None
         if route:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_session("strapi", timeout=10.0) as client:
                 response = await client.get(f"{STRAPI_URL}/api/routes")
                 routes = response.json().get('data', [])
                 for r in routes:
@@ -799,7 +800,7 @@ async def seed_passengers(request: SeedRequest):
             
             if request.spawn_type in ['depot', 'both']:
                 # Fetch depot info
-                async with httpx.AsyncClient(timeout=10.0) as client:
+                async with http_session("geospatial", timeout=10.0) as client:
                     response = await client.get(f"{GEOSPATIAL_URL}/routes/by-document-id/{route_doc_id}/depot")
                     depot_info = response.json().get('depot')
                     depot_doc_id = depot_info['documentId']
@@ -1006,7 +1007,7 @@ async def delete_passengers(
         deleted_count = 0
         logger.info(f"Starting deletion of {total_to_delete} passengers...")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_session("strapi", timeout=30.0) as client:
             for idx, p in enumerate(filtered_passengers, 1):
                 # Strapi 5 uses document_id, not sequential id
                 document_id = p.get('documentId')  # Note: Strapi returns camelCase
@@ -1098,6 +1099,39 @@ async def emit_passenger_event(event_type: str, passenger_data: dict, route_id:
         await manager.broadcast(message)
 
 
+async def emit_passenger_events(events: List[tuple], route_id: str = None):
+    """
+    Emit several passenger lifecycle events to WebSocket clients in one frame.
+    
+    Called by the passenger monitor, which coalesces changes detected in one
+    poll / notification window into a single `passenger:batch` message.
+    
+    Args:
+        events: List of (event_type, passenger_data) pairs
+        route_id: Route ID for targeted broadcast (optional)
+    """
+    if not events:
+        return
+    
+    timestamp = datetime.utcnow().isoformat() + "Z"
+    message = {
+        "type": "passenger:batch",
+        "data": {
+            "count": len(events),
+            "events": [
+                {"type": f"passenger:{event_type}", "data": data}
+                for event_type, data in events
+            ]
+        },
+        "timestamp": timestamp
+    }
+    
+    if route_id:
+        await manager.broadcast_to_route(route_id, message)
+    else:
+        await manager.broadcast(message)
+
+
 class ConnectionManager:
     """Manages WebSocket connections for real-time streaming"""
     
@@ -1194,6 +1228,7 @@ async def websocket_stream(websocket: WebSocket):
         {"type": "passenger:spawned", "data": {...}}
         {"type": "passenger:boarded", "data": {...}}
         {"type": "passenger:alighted", "data": {...}}
+        {"type": "passenger:batch", "data": {"count": N, "events": [{"type": ..., "data": {...}}]}}
         {"type": "pong"}
         {"type": "error", "message": "..."}
     """
@@ -1300,7 +1335,7 @@ async def flexible_query(
         # Fetch all passengers
         params = {"pagination[pageSize]": 100}
         
-        async with httpx.AsyncClient(timeout=300.0) as client:
+        async with http_session("strapi", timeout=300.0) as client:
             all_rows = await fetch_passengers(client, strapi_url, token, params)
         
         # Apply filters
@@ -1446,6 +1481,17 @@ async def get_monitor_stats():
         return {"error": str(e), "running": False}
 
 
+@app.get("/api/monitor/http-pool")
+async def get_http_pool_stats():
+    """
+    Get shared HTTP client pool statistics.
+    
+    Returns per-upstream (Strapi, geospatial) request counts, latency
+    histograms and connection pool saturation.
+    """
+    return {"upstreams": get_http_pool().stats()}
+
+
 if __name__ == "__main__":
     import uvicorn
     import configparser
@@ -22,7 +22,7 @@ from arknet_transit_simulator.utils.geospatial import haversine
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
-import httpx
+from common.http_pool import http_session
 
 from commuter_service.domain.models.passenger_state import (
     PassengerStatus,
@@ -150,7 +150,7 @@ async def list_passengers(
     if end_time:
         params["filters[spawned_at][$lte]"] = end_time
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_session("strapi", timeout=30.0) as client:
         response = await client.get(f"{strapi_url}/api/active-passengers", params=params)
         response.raise_for_status()
         
@@ -302,7 +302,7 @@ async def get_passenger(passenger_id: str):
     config = get_config()
     strapi_url = config.infrastructure.strapi_url.rstrip("/")
     
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_session("strapi", timeout=10.0) as client:
         # Try as document ID first
         response = await client.get(f"{strapi_url}/api/active-passengers/{passenger_id}")
         
@@ -429,7 +429,7 @@ async def update_passenger(passenger_id: str, updates: PassengerUpdate):
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
     
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_session("strapi", timeout=10.0) as client:
         response = await client.put(
             f"{strapi_url}/api/active-passengers/{current.documentId}",
             json={"data": update_data}
@@ -560,7 +560,7 @@ async def cancel_passenger(passenger_id: str):
         )
     
     # Update
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_session("strapi", timeout=10.0) as client:
         response = await client.put(
             f"{strapi_url}/api/active-passengers/{current.documentId}",
             json={"data": {"status": "CANCELLED"}}
@@ -585,7 +585,7 @@ async def delete_passenger(passenger_id: str):
     # Get passenger to get document ID
     current = await get_passenger(passenger_id)
     
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_session("strapi", timeout=10.0) as client:
         response = await client.delete(
             f"{strapi_url}/api/active-passengers/{current.documentId}"
         )
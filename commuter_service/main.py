@@ -54,6 +54,7 @@ async def startup_event():
     logger.info("   - DELETE /api/passengers/{id}               - Delete passenger")
     logger.info("🔍 Monitoring:")
     logger.info("   - GET  /api/monitor/stats                   - Monitor statistics")
+    logger.info("   - GET  /api/monitor/http-pool               - Upstream HTTP pool statistics")
     logger.info("🖥️  Client Console:")
     logger.info("   python clients/commuter/client_console.py")
     logger.info("=" * 80)
@@ -82,6 +83,14 @@ async def shutdown_event():
     except:
         pass
     
+    # Close pooled upstream HTTP connections
+    try:
+        from common.http_pool import get_http_pool
+        await get_http_pool().aclose()
+        logger.info("✅ HTTP client pool closed")
+    except Exception as e:
+        logger.error(f"⚠️  Failed to close HTTP client pool: {e}")
+    
     logger.info("👋 Goodbye!")
 
 
@@ -16,17 +16,26 @@ Association Logic:
   - is_start_terminus: True if depot is within 500m of route START
   - is_end_terminus: True if depot is within 500m of route END
   - precomputed_at: Timestamp of calculation
+  - route_building_count / depot_catchment_building_count: buildings in the
+    route corridor and depot catchment, read by the spawners instead of
+    querying PostGIS every spawn cycle
 
 Usage:
     python -m commuter_service.scripts.precompute_route_depot_associations
+
+    # Only recompute building counts on existing associations (after a route
+    # geometry edit or a new OSM building import). Associations whose route or
+    # depot has not changed since the last count are skipped unless --all.
+    python -m commuter_service.scripts.precompute_route_depot_associations --refresh-building-counts [--all]
 """
 
+import argparse
 import asyncio
 import logging
 import sys
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from math import radians, cos, sin, asin, sqrt
 import httpx
 
@@ -39,8 +48,13 @@ logger = logging.getLogger(__name__)
 
 # Configuration
 STRAPI_BASE_URL = "http://localhost:1337"
+GEOSPATIAL_BASE_URL = "http://localhost:6000"
 WALKING_DISTANCE_THRESHOLD_M = 500.0  # ~500 meters walking distance
 
+# Radii the spawners use by default (spawn_radius_meters / depot_catchment_radius_meters)
+ROUTE_BUFFER_M = 500
+DEPOT_CATCHMENT_RADIUS_M = 800
+
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -124,7 +138,8 @@ async def fetch_all_routes(client: httpx.AsyncClient) -> List[dict]:
                 "filters[is_active][$eq]": True,
                 "pagination[pageSize]": 100,
                 "fields[0]": "short_name",
-                "fields[1]": "geojson_data"  # Explicitly request geojson_data
+                "fields[1]": "geojson_data",  # Explicitly request geojson_data
+                "fields[2]": "updatedAt"
             }
         )
         response.raise_for_status()
@@ -146,7 +161,8 @@ async def fetch_all_routes(client: httpx.AsyncClient) -> List[dict]:
                 'id': item['id'],
                 'documentId': item.get('documentId'),
                 'short_name': attrs.get('short_name', f"Route {item['id']}"),
-                'geojson_data': geojson
+                'geojson_data': geojson,
+                'updatedAt': attrs.get('updatedAt')
             })
         
         logger.info(f"✓ Fetched {len(routes)} active routes with geometry")
@@ -167,7 +183,8 @@ async def fetch_all_depots(client: httpx.AsyncClient) -> List[dict]:
                 "pagination[pageSize]": 100,
                 "fields[0]": "name",
                 "fields[1]": "latitude",
-                "fields[2]": "longitude"
+                "fields[2]": "longitude",
+                "fields[3]": "updatedAt"
             }
         )
         response.raise_for_status()
@@ -181,7 +198,8 @@ async def fetch_all_depots(client: httpx.AsyncClient) -> List[dict]:
                 'documentId': item.get('documentId'),
                 'name': attrs.get('name', f"Depot {item['id']}"),
                 'latitude': attrs.get('latitude'),
-                'longitude': attrs.get('longitude')
+                'longitude': attrs.get('longitude'),
+                'updatedAt': attrs.get('updatedAt')
             })
         
         logger.info(f"✓ Fetched {len(depots)} active depots")
@@ -223,6 +241,52 @@ async def delete_existing_associations(client: httpx.AsyncClient) -> int:
         return 0
 
 
+async def fetch_route_building_count(client: httpx.AsyncClient, route_doc: str) -> Optional[int]:
+    """Count buildings within ROUTE_BUFFER_M of a route corridor (None if unknown to the geospatial service)"""
+    try:
+        response = await client.post(
+            f"{GEOSPATIAL_BASE_URL}/spatial/route-buildings/count",
+            json={"route_id": route_doc, "buffer_meters": ROUTE_BUFFER_M}
+        )
+        if response.status_code == 404:
+            logger.warning(f"⚠️ Route {route_doc} has no geometry in the geospatial database - count left empty")
+            return None
+        response.raise_for_status()
+        return response.json().get('count')
+    except Exception as e:
+        logger.error(f"✗ Failed to count buildings for route {route_doc}: {e}")
+        return None
+
+
+async def fetch_depot_building_count(client: httpx.AsyncClient, depot: dict) -> Optional[int]:
+    """Count buildings within DEPOT_CATCHMENT_RADIUS_M of a depot"""
+    try:
+        response = await client.post(
+            f"{GEOSPATIAL_BASE_URL}/spatial/depot-catchment/count",
+            json={
+                "latitude": depot['latitude'],
+                "longitude": depot['longitude'],
+                "radius_meters": DEPOT_CATCHMENT_RADIUS_M
+            }
+        )
+        response.raise_for_status()
+        return response.json().get('count')
+    except Exception as e:
+        logger.error(f"✗ Failed to count buildings for depot {depot.get('name')}: {e}")
+        return None
+
+
+def building_count_fields(route_count: Optional[int], depot_count: Optional[int]) -> dict:
+    """Association fields holding precomputed building counts"""
+    return {
+        "route_building_count": route_count,
+        "route_buffer_m": ROUTE_BUFFER_M if route_count is not None else None,
+        "depot_catchment_building_count": depot_count,
+        "depot_catchment_radius_m": DEPOT_CATCHMENT_RADIUS_M if depot_count is not None else None,
+        "building_counts_computed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
 async def create_association(
     client: httpx.AsyncClient,
     route_doc: str,
@@ -231,7 +295,9 @@ async def create_association(
     route_short_name: str,
     distance_m: float,
     is_start: bool,
-    is_end: bool
+    is_end: bool,
+    route_building_count: Optional[int] = None,
+    depot_building_count: Optional[int] = None
 ) -> Optional[dict]:
     """Create a route-depot association record"""
     try:
@@ -245,7 +311,8 @@ async def create_association(
                 "precomputed_at": datetime.now(timezone.utc).isoformat(),
                 "display_name": f"{depot_name} - {round(distance_m)}m",
                 "depot_name": depot_name,
-                "route_short_name": route_short_name
+                "route_short_name": route_short_name,
+                **building_count_fields(route_building_count, depot_building_count)
             }
         }
         
@@ -295,6 +362,9 @@ async def precompute_associations():
         # Step 3: Calculate associations
         logger.info("[STEP 3/4] Calculating spatial associations...")
         associations_created = 0
+        # Each route / depot is counted once even if it has several associations
+        route_building_counts: Dict[str, Optional[int]] = {}
+        depot_building_counts: Dict[str, Optional[int]] = {}
         routes_with_endpoints = 0
         routes_without_endpoints = 0
         
@@ -334,6 +404,15 @@ async def precompute_associations():
                     # Use the minimum distance
                     min_distance = min(dist_to_start, dist_to_end)
                     
+                    if route['documentId'] not in route_building_counts:
+                        route_building_counts[route['documentId']] = await fetch_route_building_count(
+                            client, route['documentId']
+                        )
+                    if depot['documentId'] not in depot_building_counts:
+                        depot_building_counts[depot['documentId']] = await fetch_depot_building_count(
+                            client, depot
+                        )
+                    
                     # Create association
                     result = await create_association(
                         client,
@@ -343,7 +422,9 @@ async def precompute_associations():
                         route['short_name'],
                         min_distance,
                         is_start_terminus,
-                        is_end_terminus
+                        is_end_terminus,
+                        route_building_counts[route['documentId']],
+                        depot_building_counts[depot['documentId']]
                     )
                     
                     if result:
@@ -365,5 +446,122 @@ async def precompute_associations():
         logger.info("✅ Precompute complete!")
 
 
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+async def fetch_route_depot_associations(client: httpx.AsyncClient) -> List[dict]:
+    """Every route-depot association with its route and depot, page by page"""
+    associations = []
+    page = 1
+    while True:
+        response = await client.get(
+            f"{STRAPI_BASE_URL}/api/route-depots",
+            params={
+                "populate[route][fields][0]": "updatedAt",
+                "populate[depot][fields][0]": "name",
+                "populate[depot][fields][1]": "latitude",
+                "populate[depot][fields][2]": "longitude",
+                "populate[depot][fields][3]": "updatedAt",
+                "pagination[page]": page,
+                "pagination[pageSize]": 100
+            }
+        )
+        response.raise_for_status()
+        payload = response.json()
+        associations.extend(payload.get('data', []))
+        
+        page_count = payload.get('meta', {}).get('pagination', {}).get('pageCount', 1)
+        if page >= page_count:
+            return associations
+        page += 1
+
+
+async def refresh_building_counts(refresh_all: bool = False):
+    """
+    Recompute building counts on existing associations without recreating them.
+    
+    An association is refreshed when its route or depot was updated after its
+    counts were computed, when counts are missing or the route count is 0
+    (written by earlier versions that counted against the highways table), or
+    always with refresh_all.
+    """
+    logger.info("=" * 80)
+    logger.info("Route-Depot Building Count Refresh")
+    logger.info("=" * 80)
+    
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        associations = await fetch_route_depot_associations(client)
+        
+        route_building_counts: Dict[str, Optional[int]] = {}
+        depot_building_counts: Dict[str, Optional[int]] = {}
+        refreshed = skipped = 0
+        
+        for assoc in associations:
+            route = assoc.get('route') or {}
+            depot = assoc.get('depot') or {}
+            if not route.get('documentId') or not depot.get('documentId'):
+                continue
+            
+            computed_at = _parse_timestamp(assoc.get('building_counts_computed_at'))
+            changed_at = max(
+                filter(None, [_parse_timestamp(route.get('updatedAt')), _parse_timestamp(depot.get('updatedAt'))]),
+                default=None
+            )
+            is_stale = (
+                computed_at is None
+                or not assoc.get('route_building_count')
+                or assoc.get('depot_catchment_building_count') is None
+                or (changed_at is not None and changed_at > computed_at)
+            )
+            if not (refresh_all or is_stale):
+                skipped += 1
+                continue
+            
+            if route['documentId'] not in route_building_counts:
+                route_building_counts[route['documentId']] = await fetch_route_building_count(
+                    client, route['documentId']
+                )
+            if depot['documentId'] not in depot_building_counts:
+                depot_building_counts[depot['documentId']] = await fetch_depot_building_count(client, depot)
+            
+            try:
+                update = await client.put(
+                    f"{STRAPI_BASE_URL}/api/route-depots/{assoc['documentId']}",
+                    json={"data": building_count_fields(
+                        route_building_counts[route['documentId']],
+                        depot_building_counts[depot['documentId']]
+                    )}
+                )
+                update.raise_for_status()
+                refreshed += 1
+            except Exception as e:
+                logger.error(f"✗ Failed to update association {assoc.get('documentId')}: {e}")
+        
+        logger.info(f"Refreshed {refreshed} associations, {skipped} already up to date")
+        logger.info("✅ Building count refresh complete!")
+
+
 if __name__ == "__main__":
-    asyncio.run(precompute_associations())
+    parser = argparse.ArgumentParser(description="Precompute route-depot associations")
+    parser.add_argument(
+        "--refresh-building-counts",
+        action="store_true",
+        help="Only recompute building counts on existing associations"
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="With --refresh-building-counts, refresh every association, not just stale ones"
+    )
+    args = parser.parse_args()
+    
+    if args.refresh_building_counts:
+        asyncio.run(refresh_building_counts(refresh_all=args.all))
+    else:
+        asyncio.run(precompute_associations())
@@ -6,6 +6,10 @@
 -- Create a trigger to publish NOTIFY events on inserts/updates to active_passengers
 -- Assumes Strapi uses table public.active_passengers with common columns shown below.
 -- Adjust field names if your schema differs.
+--
+-- The payload carries everything PassengerMonitor needs in notify mode
+-- (document_id, boarded_at, alighted_at, updated_at), so it never has to
+-- re-read the row from Strapi.
 
 -- 1) Function to send a JSON payload
 CREATE OR REPLACE FUNCTION public.notify_active_passengers() RETURNS trigger AS $$
@@ -17,6 +21,7 @@ BEGIN
   payload := jsonb_build_object(
     'action', action,
     'id', NEW.id,
+    'document_id', NEW.document_id,
     'passenger_id', NEW.passenger_id,
     'route_id', NEW.route_id,
     'depot_id', NEW.depot_id,
@@ -25,6 +30,9 @@ BEGIN
     'destination_lat', NEW.destination_lat,
     'destination_lon', NEW.destination_lon,
     'spawned_at', to_char(NEW.spawned_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"'),
+    'boarded_at', to_char(NEW.boarded_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"'),
+    'alighted_at', to_char(NEW.alighted_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"'),
+    'updated_at', to_char(NEW.updated_at, 'YYYY-MM-DD"T"HH24:MI:SS.MS"Z"'),
     'status', NEW.status
   );
 
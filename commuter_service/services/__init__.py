@@ -5,5 +5,6 @@ Background services and monitoring components.
 """
 
 from commuter_service.services.passenger_monitor import PassengerMonitor, get_monitor
+from commuter_service.services.passenger_snapshot_store import PassengerSnapshot, PassengerSnapshotStore
 
-__all__ = ['PassengerMonitor', 'get_monitor']
+__all__ = ['PassengerMonitor', 'get_monitor', 'PassengerSnapshot', 'PassengerSnapshotStore']
@@ -6,50 +6,108 @@ Real-time monitoring of passenger state changes.
 Detects changes made by external processes (vehicles, mobile apps, etc.)
 and broadcasts events to WebSocket clients.
 
-Monitoring Strategy:
-1. Poll Strapi API for changes (efficient with updatedAt filter)
-2. Compare states with in-memory cache
-3. Detect state transitions
-4. Broadcast events to subscribed clients
+Monitoring Strategy (selected by `mode`):
+- notify: LISTEN on the Postgres 'active_passengers' channel (see
+  scripts/sql/active_passengers_notify.sql); changes are pushed as they commit
+- cursor: one Strapi query per poll for every monitored route, resuming from
+  an (updatedAt, id) cursor so unchanged data costs a single empty response
+- poll:   legacy per-route `updatedAt >= now - 3*poll_interval` queries
+  (kept for latency comparison)
+- auto:   notify when PG_DSN is set and asyncpg is available, otherwise cursor
+
+Every mode feeds the same pipeline:
+1. Compare states with in-memory cache
+2. Detect state transitions
+3. Coalesce transitions per passenger within a short batch window
+4. Broadcast one `passenger:batch` frame per route to subscribed clients
 
 Production considerations:
 - Configurable poll interval (default: 2 seconds)
-- Efficient queries using updatedAt timestamps
-- Memory-efficient caching (only track active passengers)
-- Automatic cleanup of completed passengers
+- Event latency (row updatedAt -> WebSocket emit) is recorded per mode
+- Bounded snapshot cache with expiry-ordered eviction (see passenger_snapshot_store)
+- Automatic cleanup of completed and idle passengers
 """
 
 import asyncio
+import json
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Set, Optional
-from dataclasses import dataclass, field
+import os
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Set, Optional, Tuple
+from dataclasses import dataclass
 
-import httpx
+from common.http_pool import http_session
 
 from commuter_service.domain.models.passenger_state import (
     PassengerStatus,
     calculate_passenger_state,
     PassengerStateChange
 )
+from commuter_service.services.passenger_snapshot_store import (
+    PassengerSnapshot,
+    PassengerSnapshotStore
+)
 
 
 logger = logging.getLogger(__name__)
 
+NOTIFY_CHANNEL = "active_passengers"
+
+MODE_AUTO = "auto"
+MODE_NOTIFY = "notify"
+MODE_CURSOR = "cursor"
+MODE_POLL = "poll"
+MODES = (MODE_AUTO, MODE_NOTIFY, MODE_CURSOR, MODE_POLL)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp from Strapi or the NOTIFY payload as naive UTC."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
 
 @dataclass
-class PassengerSnapshot:
-    """Cached snapshot of passenger state"""
+class PendingEvent:
+    """State change waiting for the next batched emit (coalesced per passenger)"""
     passenger_id: str
-    document_id: str
-    status: PassengerStatus
-    spawned_at: Optional[datetime]
-    boarded_at: Optional[datetime]
-    alighted_at: Optional[datetime]
-    vehicle_id: Optional[str]
     route_id: Optional[str]
-    updated_at: datetime
-    last_checked: datetime = field(default_factory=datetime.utcnow)
+    previous_state: PassengerStatus
+    new_state: PassengerStatus
+    passenger_data: dict
+    updated_at: Optional[datetime]
+
+
+class LatencyTracker:
+    """Rolling window of event latencies (ms) for one monitoring mode"""
+    
+    def __init__(self, window: int = 1000):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+    
+    def observe(self, latency_ms: float):
+        self.samples.append(latency_ms)
+        self.count += 1
+    
+    def summary(self) -> dict:
+        if not self.samples:
+            return {'count': self.count, 'p50_ms': None, 'p95_ms': None, 'max_ms': None}
+        ordered = sorted(self.samples)
+        
+        def pct(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 1)
+        
+        return {
+            'count': self.count,
+            'p50_ms': pct(0.50),
+            'p95_ms': pct(0.95),
+            'max_ms': round(ordered[-1], 1)
+        }
 
 
 class PassengerMonitor:
@@ -63,26 +121,59 @@ class PassengerMonitor:
         self,
         strapi_url: str,
         poll_interval: float = 2.0,
-        cleanup_after_hours: int = 24
+        cleanup_after_hours: int = 24,
+        idle_after_hours: int = 24,
+        max_cached_passengers: int = 200_000,
+        mode: str = MODE_AUTO,
+        pg_dsn: Optional[str] = None,
+        batch_window: float = 0.1,
+        max_batch_size: int = 200,
+        page_size: int = 100
     ):
         """
         Initialize passenger monitor.
         
         Args:
             strapi_url: Strapi API base URL
-            poll_interval: Seconds between polls (default: 2.0)
-            cleanup_after_hours: Remove alighted passengers after N hours (default: 24)
+            poll_interval: Seconds between polls in cursor/poll mode (default: 2.0)
+            cleanup_after_hours: Remove alighted/cancelled passengers N hours after their last update (default: 24)
+            idle_after_hours: Remove other passengers not updated for N hours (default: 24)
+            max_cached_passengers: Hard cap on cached snapshots (default: 200,000)
+            mode: "auto", "notify", "cursor" or "poll" (default: auto)
+            pg_dsn: Postgres DSN for notify mode (default: PG_DSN env var)
+            batch_window: Seconds to collect NOTIFY events before emitting (default: 0.1)
+            max_batch_size: Emit early once this many events are pending (default: 200)
+            page_size: Rows per Strapi request in cursor/poll mode (default: 100)
         """
+        if mode not in MODES:
+            raise ValueError(f"Unknown monitor mode '{mode}' (expected one of {MODES})")
+        
         self.strapi_url = strapi_url.rstrip("/")
         self.poll_interval = poll_interval
         self.cleanup_after_hours = cleanup_after_hours
+        self.requested_mode = mode
+        self.pg_dsn = pg_dsn if pg_dsn is not None else os.getenv("PG_DSN")
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.page_size = page_size
+        self.mode = self._resolve_mode(mode)
         
         # In-memory cache of passenger states
-        self.passenger_cache: Dict[str, PassengerSnapshot] = {}
+        self.passenger_cache = PassengerSnapshotStore(
+            idle_ttl=idle_after_hours * 3600.0,
+            terminal_ttl=cleanup_after_hours * 3600.0,
+            max_entries=max_cached_passengers
+        )
         
         # Track which routes clients are monitoring
         self.monitored_routes: Set[str] = set()
         
+        # Change feed state
+        self._cursor: Optional[Tuple[datetime, int]] = None  # (updatedAt, id) of last row seen
+        self._notify_queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=10000)
+        self._pending_events: Dict[str, PendingEvent] = {}
+        self._latency: Dict[str, LatencyTracker] = {}
+        
         # Monitoring state
         self.running = False
         self._monitor_task: Optional[asyncio.Task] = None
@@ -93,10 +184,32 @@ class PassengerMonitor:
             'state_transitions': 0,
             'external_updates': 0,
             'last_poll': None,
-            'cached_passengers': 0
+            'cached_passengers': 0,
+            'strapi_queries': 0,
+            'notifications_received': 0,
+            'notifications_dropped': 0,
+            'events_coalesced': 0,
+            'events_emitted': 0,
+            'batches_emitted': 0
         }
         
-        logger.info(f"🔍 PassengerMonitor initialized (poll={poll_interval}s)")
+        logger.info(f"🔍 PassengerMonitor initialized (mode={self.mode}, poll={poll_interval}s)")
+    
+    def _resolve_mode(self, mode: str) -> str:
+        """Pick the concrete change-feed mode for 'auto' (or an unusable 'notify')"""
+        if mode not in (MODE_AUTO, MODE_NOTIFY):
+            return mode
+        
+        if self.pg_dsn:
+            try:
+                import asyncpg  # noqa: F401
+                return MODE_NOTIFY
+            except ImportError:
+                logger.warning("asyncpg not installed - falling back to cursor mode")
+        elif mode == MODE_NOTIFY:
+            logger.warning("PG_DSN not set - falling back to cursor mode")
+        
+        return MODE_CURSOR
     
     async def start(self):
         """Start the monitoring service"""
@@ -105,8 +218,14 @@ class PassengerMonitor:
             return
         
         self.running = True
-        self._monitor_task = asyncio.create_task(self._monitor_loop())
-        logger.info("🚀 PassengerMonitor started")
+        start = datetime.utcnow() - timedelta(seconds=self.poll_interval * 3)
+        self._cursor = (start.replace(microsecond=start.microsecond // 1000 * 1000), 0)  # Strapi keeps ms
+        
+        if self.mode == MODE_NOTIFY:
+            self._monitor_task = asyncio.create_task(self._notify_loop())
+        else:
+            self._monitor_task = asyncio.create_task(self._monitor_loop())
+        logger.info(f"🚀 PassengerMonitor started ({self.mode} mode)")
     
     async def stop(self):
         """Stop the monitoring service"""
@@ -134,26 +253,80 @@ class PassengerMonitor:
         self.monitored_routes.discard(route_id)
         logger.info(f"🔕 Stopped monitoring route: {route_id}")
     
+    # ========================================================================
+    # POLLING MODES (cursor / legacy per-route poll)
+    # ========================================================================
+    
     async def _monitor_loop(self):
         """Main monitoring loop"""
         logger.info("🔄 Monitor loop started")
         
         while self.running:
             try:
-                await self._check_for_changes()
+                if self.mode == MODE_CURSOR:
+                    await self._poll_cursor()
+                else:
+                    await self._check_for_changes()
+                await self._flush_events()
                 self.stats['last_poll'] = datetime.utcnow()
                 
                 # Cleanup old passengers
                 await self._cleanup_old_passengers()
                 
                 await asyncio.sleep(self.poll_interval)
-                
+            
             except Exception as e:
                 logger.error(f"❌ Monitor loop error: {e}", exc_info=True)
                 await asyncio.sleep(self.poll_interval)
     
+    async def _poll_cursor(self):
+        """
+        Fetch every change since the cursor for all monitored routes at once.
+        
+        Rows are ordered by (updatedAt, id) and fetched with a strict keyset
+        filter (updatedAt > T, or updatedAt = T and id > id), so pages advance
+        even when more than a page of rows share one timestamp (bulk inserts).
+        Keeps fetching while full pages come back so bursts are drained in one poll.
+        """
+        if not self.monitored_routes:
+            return  # No routes being monitored, skip
+        
+        async with http_session("strapi", timeout=10.0) as client:
+            while True:
+                cursor_at, cursor_id = self._cursor
+                timestamp = cursor_at.isoformat(timespec="milliseconds") + "Z"
+                params = {
+                    "filters[$or][0][updatedAt][$gt]": timestamp,
+                    "filters[$or][1][updatedAt][$eq]": timestamp,
+                    "filters[$or][1][id][$gt]": cursor_id,
+                    "sort[0]": "updatedAt:asc",
+                    "sort[1]": "id:asc",
+                    "pagination[pageSize]": self.page_size
+                }
+                for i, route_id in enumerate(sorted(self.monitored_routes)):
+                    params[f"filters[route_id][$in][{i}]"] = route_id
+                
+                response = await client.get(f"{self.strapi_url}/api/active-passengers", params=params)
+                response.raise_for_status()
+                self.stats['strapi_queries'] += 1
+                
+                passengers = response.json().get("data", [])
+                advanced = False
+                
+                for p in passengers:
+                    position = (_parse_timestamp(p.get("updatedAt")), p.get("id") or 0)
+                    if position[0] is None or position <= self._cursor:
+                        continue
+                    await self._process_passenger_update(p)
+                    self._cursor = position
+                    advanced = True
+                
+                # Stop when the backlog is drained (or a page made no progress)
+                if len(passengers) < self.page_size or not advanced:
+                    return
+    
     async def _check_for_changes(self):
-        """Check for passenger state changes"""
+        """Check for passenger state changes (legacy per-route polling)"""
         if not self.monitored_routes:
             return  # No routes being monitored, skip
         
@@ -161,13 +334,13 @@ class PassengerMonitor:
         cutoff = datetime.utcnow() - timedelta(seconds=self.poll_interval * 3)
         
         # Query passengers updated since last check
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_session("strapi", timeout=10.0) as client:
             for route_id in self.monitored_routes:
                 try:
                     params = {
                         "filters[route_id][$eq]": route_id,
                         "filters[updatedAt][$gte]": cutoff.isoformat() + "Z",
-                        "pagination[pageSize]": 100
+                        "pagination[pageSize]": self.page_size
                     }
                     
                     response = await client.get(
@@ -175,6 +348,7 @@ class PassengerMonitor:
                         params=params
                     )
                     response.raise_for_status()
+                    self.stats['strapi_queries'] += 1
                     
                     passengers = response.json().get("data", [])
                     
@@ -185,6 +359,110 @@ class PassengerMonitor:
                 except Exception as e:
                     logger.error(f"Error checking route {route_id}: {e}")
     
+    # ========================================================================
+    # NOTIFY MODE
+    # ========================================================================
+    
+    async def _notify_loop(self):
+        """LISTEN for row changes, reconnecting with backoff on failure"""
+        import asyncpg
+        
+        logger.info(f"🔄 Listening on Postgres channel '{NOTIFY_CHANNEL}'")
+        backoff = 1.0
+        
+        while self.running:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self.pg_dsn, timeout=10)
+                await conn.add_listener(NOTIFY_CHANNEL, self._on_notify)
+                backoff = 1.0
+                
+                # Catch up on anything committed while we were not listening
+                await self._poll_cursor()
+                await self._flush_events()
+                
+                last_keepalive = time.monotonic()
+                while self.running:
+                    await self._drain_notifications()
+                    
+                    if time.monotonic() - last_keepalive >= 30:
+                        await conn.execute("SELECT 1")
+                        await self._cleanup_old_passengers()
+                        last_keepalive = time.monotonic()
+            
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ LISTEN connection error: {e} (retrying in {backoff:.0f}s)")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if conn is not None:
+                    try:
+                        await conn.close()
+                    except Exception:
+                        pass
+    
+    def _on_notify(self, connection, pid, channel, payload):
+        """asyncpg listener callback - enqueue only, processing happens in the loop"""
+        self.stats['notifications_received'] += 1
+        try:
+            self._notify_queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.stats['notifications_dropped'] += 1
+    
+    async def _drain_notifications(self):
+        """
+        Wait for the next notification, then collect more for up to
+        `batch_window` seconds (or `max_batch_size` events) and emit once.
+        """
+        try:
+            first = await asyncio.wait_for(self._notify_queue.get(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            return
+        
+        payloads = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(payloads) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                payloads.append(await asyncio.wait_for(self._notify_queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        for payload in payloads:
+            passenger_data = self._from_notification(payload)
+            if passenger_data is None:
+                continue
+            if passenger_data.get("route_id") not in self.monitored_routes:
+                continue
+            await self._process_passenger_update(passenger_data)
+        
+        await self._flush_events()
+        self.stats['last_poll'] = datetime.utcnow()
+    
+    @staticmethod
+    def _from_notification(payload: str) -> Optional[dict]:
+        """Map a trigger payload onto the Strapi REST field names used by the cache"""
+        try:
+            data = json.loads(payload)
+        except (TypeError, ValueError):
+            logger.debug(f"Ignoring non-JSON notification: {payload!r}")
+            return None
+        
+        if not data.get("passenger_id") or not data.get("updated_at"):
+            return None
+        
+        data["documentId"] = data.pop("document_id", None)
+        data["updatedAt"] = data.pop("updated_at")
+        return data
+    
+    # ========================================================================
+    # CHANGE DETECTION
+    # ========================================================================
+    
     async def _process_passenger_update(self, passenger_data: dict):
         """Process a single passenger update and detect changes"""
         passenger_id = passenger_data.get("passenger_id")
@@ -203,7 +481,7 @@ class PassengerMonitor:
         
         if not cached:
             # New passenger - add to cache
-            self.passenger_cache[passenger_id] = PassengerSnapshot(
+            self.passenger_cache.touch(PassengerSnapshot(
                 passenger_id=passenger_id,
                 document_id=document_id,
                 status=current_state,
@@ -212,8 +490,8 @@ class PassengerMonitor:
                 alighted_at=passenger_data.get("alighted_at"),
                 vehicle_id=passenger_data.get("vehicle_id"),
                 route_id=passenger_data.get("route_id"),
-                updated_at=datetime.fromisoformat(passenger_data.get("updatedAt").replace("Z", "+00:00"))
-            )
+                updated_at=_parse_timestamp(passenger_data.get("updatedAt"))
+            ))
             logger.debug(f"📝 Cached new passenger: {passenger_id} ({current_state})")
             return
         
@@ -227,8 +505,8 @@ class PassengerMonitor:
                 f"{cached.status} → {current_state}"
             )
             
-            # Emit state change event
-            await self._emit_state_change(
+            # Queue state change event for the next batched emit
+            self._queue_state_change(
                 passenger_id=passenger_id,
                 previous_state=cached.status,
                 new_state=current_state,
@@ -257,77 +535,127 @@ class PassengerMonitor:
         cached.boarded_at = passenger_data.get("boarded_at")
         cached.alighted_at = passenger_data.get("alighted_at")
         cached.vehicle_id = passenger_data.get("vehicle_id")
-        cached.updated_at = datetime.fromisoformat(passenger_data.get("updatedAt").replace("Z", "+00:00"))
+        cached.updated_at = _parse_timestamp(passenger_data.get("updatedAt"))
         cached.last_checked = datetime.utcnow()
+        self.passenger_cache.touch(cached)
         
         self.stats['total_changes_detected'] += 1
     
-    async def _emit_state_change(
+    def _queue_state_change(
         self,
         passenger_id: str,
         previous_state: PassengerStatus,
         new_state: PassengerStatus,
         passenger_data: dict
     ):
-        """Emit state change event to WebSocket clients"""
-        try:
-            # Import dynamically to avoid circular imports
-            from commuter_service.interfaces.http.commuter_manifest import emit_passenger_event
-            
-            # Map state to event type
-            event_type_map = {
-                PassengerStatus.BOARDED: "boarded",
-                PassengerStatus.ALIGHTED: "alighted",
-                PassengerStatus.CANCELLED: "cancelled"
-            }
-            
-            event_type = event_type_map.get(new_state, "state_changed")
-            
-            event_data = {
-                "passenger_id": passenger_id,
-                "route_id": passenger_data.get("route_id"),
-                "previous_state": previous_state.value,
-                "new_state": new_state.value,
-                "vehicle_id": passenger_data.get("vehicle_id"),
-                "latitude": passenger_data.get("latitude"),
-                "longitude": passenger_data.get("longitude"),
-                "external_trigger": True  # Changed by external process
-            }
-            
-            if new_state == PassengerStatus.BOARDED:
-                event_data["boarded_at"] = passenger_data.get("boarded_at")
-            elif new_state == PassengerStatus.ALIGHTED:
-                event_data["alighted_at"] = passenger_data.get("alighted_at")
-            
-            # Broadcast event
-            await emit_passenger_event(
-                event_type,
-                event_data,
-                route_id=passenger_data.get("route_id")
+        """
+        Add a state change to the pending batch.
+        
+        Several transitions of one passenger within a batch collapse into a
+        single event from the first previous state to the latest state; a
+        round trip back to the original state cancels out.
+        """
+        updated_at = _parse_timestamp(passenger_data.get("updatedAt"))
+        pending = self._pending_events.get(passenger_id)
+        
+        if pending is None:
+            self._pending_events[passenger_id] = PendingEvent(
+                passenger_id=passenger_id,
+                route_id=passenger_data.get("route_id"),
+                previous_state=previous_state,
+                new_state=new_state,
+                passenger_data=passenger_data,
+                updated_at=updated_at
             )
+            return
+        
+        self.stats['events_coalesced'] += 1
+        if new_state == pending.previous_state:
+            del self._pending_events[passenger_id]
+            return
+        
+        pending.new_state = new_state
+        pending.passenger_data = passenger_data
+        pending.updated_at = updated_at
+    
+    async def _flush_events(self):
+        """Emit pending state changes as one batch per route"""
+        if not self._pending_events:
+            return
+        
+        pending = list(self._pending_events.values())
+        self._pending_events.clear()
+        
+        by_route: Dict[Optional[str], List[PendingEvent]] = {}
+        for event in pending:
+            by_route.setdefault(event.route_id, []).append(event)
+        
+        for route_id, events in by_route.items():
+            messages = [self._build_event(event) for event in events]
+            try:
+                await self._deliver(route_id, messages)
+            except Exception as e:
+                logger.error(f"Failed to emit state change events: {e}")
+                continue
             
-        except Exception as e:
-            logger.error(f"Failed to emit state change event: {e}")
+            self.stats['events_emitted'] += len(messages)
+            self.stats['batches_emitted'] += 1
+            self._record_latency(events)
     
-    async def _cleanup_old_passengers(self):
-        """Remove alighted passengers from cache after configured time"""
-        now = datetime.utcnow()
-        cutoff = now - timedelta(hours=self.cleanup_after_hours)
+    def _build_event(self, event: PendingEvent) -> Tuple[str, dict]:
+        """Build the (event_type, data) pair for one state change"""
+        # Map state to event type
+        event_type_map = {
+            PassengerStatus.BOARDED: "boarded",
+            PassengerStatus.ALIGHTED: "alighted",
+            PassengerStatus.CANCELLED: "cancelled"
+        }
+        
+        event_type = event_type_map.get(event.new_state, "state_changed")
+        passenger_data = event.passenger_data
         
-        to_remove = []
+        event_data = {
+            "passenger_id": event.passenger_id,
+            "route_id": event.route_id,
+            "previous_state": event.previous_state.value,
+            "new_state": event.new_state.value,
+            "vehicle_id": passenger_data.get("vehicle_id"),
+            "latitude": passenger_data.get("latitude"),
+            "longitude": passenger_data.get("longitude"),
+            "external_trigger": True  # Changed by external process
+        }
+        
+        if event.new_state == PassengerStatus.BOARDED:
+            event_data["boarded_at"] = passenger_data.get("boarded_at")
+        elif event.new_state == PassengerStatus.ALIGHTED:
+            event_data["alighted_at"] = passenger_data.get("alighted_at")
         
-        for passenger_id, snapshot in self.passenger_cache.items():
-            # Remove if alighted and old
-            if (snapshot.status == PassengerStatus.ALIGHTED and
-                snapshot.alighted_at and
-                snapshot.alighted_at < cutoff):
-                to_remove.append(passenger_id)
+        return event_type, event_data
+    
+    async def _deliver(self, route_id: Optional[str], events: List[Tuple[str, dict]]):
+        """Send a batch of events to WebSocket clients (one frame per route)"""
+        # Import dynamically to avoid circular imports
+        from commuter_service.interfaces.http.commuter_manifest import emit_passenger_events
         
-        for passenger_id in to_remove:
-            del self.passenger_cache[passenger_id]
+        await emit_passenger_events(events, route_id=route_id)
+    
+    def _record_latency(self, events: List[PendingEvent]):
+        """Record row-updated -> emitted latency for the active mode"""
+        tracker = self._latency.setdefault(self.mode, LatencyTracker())
+        now = datetime.utcnow()
+        for event in events:
+            if event.updated_at is not None:
+                tracker.observe(max(0.0, (now - event.updated_at).total_seconds() * 1000))
+    
+    async def _cleanup_old_passengers(self):
+        """Evict expired passengers (alighted past retention, or idle) from the cache"""
+        evicted = self.passenger_cache.evict_expired()
         
-        if to_remove:
-            logger.info(f"🗑️  Cleaned up {len(to_remove)} old passengers")
+        if evicted:
+            logger.info(
+                f"🗑️  Cleaned up {evicted} old passengers "
+                f"({self.passenger_cache.last_eviction_ms:.2f}ms)"
+            )
         
         self.stats['cached_passengers'] = len(self.passenger_cache)
     
@@ -335,8 +663,11 @@ class PassengerMonitor:
         """Get monitoring statistics"""
         return {
             **self.stats,
+            'mode': self.mode,
+            'event_latency': {mode: tracker.summary() for mode, tracker in self._latency.items()},
             'monitored_routes': len(self.monitored_routes),
             'cached_passengers': len(self.passenger_cache),
+            'snapshot_cache': self.passenger_cache.stats(),
             'running': self.running
         }
 
@@ -355,7 +686,8 @@ def get_monitor() -> PassengerMonitor:
         
         _monitor = PassengerMonitor(
             strapi_url=config.infrastructure.strapi_url,
-            poll_interval=2.0  # 2 second polls
+            poll_interval=2.0,  # 2 second polls
+            mode=os.getenv("PASSENGER_MONITOR_MODE", MODE_AUTO)
         )
     
     return _monitor
@@ -0,0 +1,197 @@
+"""
+Passenger Snapshot Store
+
+Bounded, TTL-evicting cache of passenger snapshots for PassengerMonitor.
+
+Design:
+- Snapshots are `__slots__` dataclasses (no per-instance __dict__)
+- A min-heap of (expires_at, seq, passenger_id) orders entries by expiry, so
+  eviction pops only what has expired instead of scanning every passenger
+- Updates push a new heap entry and leave the old one behind; stale entries
+  are skipped when popped and the heap is compacted when they pile up
+- A hard `max_entries` cap evicts the soonest-to-expire passengers first
+
+Expiry:
+- Terminal passengers (ALIGHTED / CANCELLED) expire `terminal_ttl` seconds
+  after their last update
+- Everyone else expires `idle_ttl` seconds after their last update, so
+  passengers abandoned without ever alighting cannot accumulate
+"""
+
+import heapq
+import itertools
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from commuter_service.domain.models.passenger_state import PassengerStatus
+
+
+TERMINAL_STATES = (PassengerStatus.ALIGHTED, PassengerStatus.CANCELLED)
+
+
+@dataclass(slots=True)
+class PassengerSnapshot:
+    """Cached snapshot of passenger state"""
+    passenger_id: str
+    document_id: str
+    status: PassengerStatus
+    spawned_at: Optional[datetime]
+    boarded_at: Optional[datetime]
+    alighted_at: Optional[datetime]
+    vehicle_id: Optional[str]
+    route_id: Optional[str]
+    updated_at: datetime
+    last_checked: datetime = field(default_factory=datetime.utcnow)
+    expires_at: float = 0.0  # time.monotonic() deadline, set by the store
+
+
+class PassengerSnapshotStore:
+    """
+    Passenger ID -> PassengerSnapshot mapping with expiry-ordered eviction.
+    
+    Call `touch()` after creating or mutating a snapshot so its deadline is
+    recomputed, and `evict_expired()` periodically (PassengerMonitor does so
+    once per poll / keepalive).
+    """
+    
+    def __init__(
+        self,
+        idle_ttl: float = 24 * 3600.0,
+        terminal_ttl: float = 24 * 3600.0,
+        max_entries: int = 200_000
+    ):
+        """
+        Initialize snapshot store.
+        
+        Args:
+            idle_ttl: Seconds without updates before a non-terminal passenger is dropped
+            terminal_ttl: Seconds an alighted/cancelled passenger is kept after its last update
+            max_entries: Hard cap on cached passengers (soonest-to-expire evicted first)
+        """
+        self.idle_ttl = idle_ttl
+        self.terminal_ttl = terminal_ttl
+        self.max_entries = max_entries
+        
+        self._snapshots: Dict[str, PassengerSnapshot] = {}
+        self._expiry_heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        
+        # Instrumentation
+        self.evicted_expired = 0
+        self.evicted_capacity = 0
+        self.stale_heap_entries_skipped = 0
+        self.compactions = 0
+        self.last_eviction_ms = 0.0
+        self.total_eviction_ms = 0.0
+        self.peak_entries = 0
+    
+    def __len__(self) -> int:
+        return len(self._snapshots)
+    
+    def __contains__(self, passenger_id: str) -> bool:
+        return passenger_id in self._snapshots
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._snapshots)
+    
+    def get(self, passenger_id: str) -> Optional[PassengerSnapshot]:
+        return self._snapshots.get(passenger_id)
+    
+    def values(self):
+        return self._snapshots.values()
+    
+    def touch(self, snapshot: PassengerSnapshot, now: Optional[float] = None):
+        """Insert or refresh a snapshot and reschedule its expiry."""
+        now = time.monotonic() if now is None else now
+        ttl = self.terminal_ttl if snapshot.status in TERMINAL_STATES else self.idle_ttl
+        snapshot.expires_at = now + ttl
+        
+        self._snapshots[snapshot.passenger_id] = snapshot
+        heapq.heappush(self._expiry_heap, (snapshot.expires_at, next(self._seq), snapshot.passenger_id))
+        
+        if len(self._snapshots) > self.peak_entries:
+            self.peak_entries = len(self._snapshots)
+        if len(self._snapshots) > self.max_entries:
+            self._evict(now=None, limit=len(self._snapshots) - self.max_entries)
+        if len(self._expiry_heap) > 2 * len(self._snapshots) + 1024:
+            self._compact()
+    
+    def discard(self, passenger_id: str):
+        """Drop a snapshot (its heap entry becomes stale)."""
+        self._snapshots.pop(passenger_id, None)
+    
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        """Remove every snapshot whose deadline has passed. Cost is O(expired · log n)."""
+        started = time.perf_counter()
+        evicted = self._evict(now=time.monotonic() if now is None else now, limit=None)
+        self.last_eviction_ms = (time.perf_counter() - started) * 1000
+        self.total_eviction_ms += self.last_eviction_ms
+        return evicted
+    
+    def _evict(self, now: Optional[float], limit: Optional[int]) -> int:
+        """
+        Pop heap entries in deadline order.
+        
+        With `now`, stops at the first live entry not yet expired; with
+        `limit`, stops after that many live evictions (capacity pressure).
+        """
+        heap = self._expiry_heap
+        evicted = 0
+        
+        while heap and (limit is None or evicted < limit):
+            expires_at, _, passenger_id = heap[0]
+            if now is not None and expires_at > now:
+                break
+            heapq.heappop(heap)
+            
+            snapshot = self._snapshots.get(passenger_id)
+            if snapshot is None or snapshot.expires_at != expires_at:
+                self.stale_heap_entries_skipped += 1
+                continue
+            
+            del self._snapshots[passenger_id]
+            evicted += 1
+        
+        if now is not None:
+            self.evicted_expired += evicted
+        else:
+            self.evicted_capacity += evicted
+        return evicted
+    
+    def _compact(self):
+        """Rebuild the heap from live snapshots, dropping stale entries."""
+        self._expiry_heap = [
+            (snapshot.expires_at, next(self._seq), passenger_id)
+            for passenger_id, snapshot in self._snapshots.items()
+        ]
+        heapq.heapify(self._expiry_heap)
+        self.compactions += 1
+    
+    def approx_memory_bytes(self) -> int:
+        """Shallow size of the index structures plus one sampled snapshot per entry."""
+        size = sys.getsizeof(self._snapshots) + sys.getsizeof(self._expiry_heap)
+        if self._snapshots:
+            sample = next(iter(self._snapshots.values()))
+            size += len(self._snapshots) * sys.getsizeof(sample)
+        if self._expiry_heap:
+            size += len(self._expiry_heap) * sys.getsizeof(self._expiry_heap[0])
+        return size
+    
+    def stats(self) -> dict:
+        """Cache size, memory estimate and eviction counters."""
+        return {
+            'entries': len(self._snapshots),
+            'peak_entries': self.peak_entries,
+            'max_entries': self.max_entries,
+            'heap_entries': len(self._expiry_heap),
+            'approx_memory_bytes': self.approx_memory_bytes(),
+            'evicted_expired': self.evicted_expired,
+            'evicted_capacity': self.evicted_capacity,
+            'stale_heap_entries_skipped': self.stale_heap_entries_skipped,
+            'compactions': self.compactions,
+            'last_eviction_ms': round(self.last_eviction_ms, 3),
+            'total_eviction_ms': round(self.total_eviction_ms, 3)
+        }
@@ -19,6 +19,8 @@ import logging
 from typing import List, Dict, Any
 from datetime import datetime
 
+from common.sim_clock import get_sim_clock
+
 from commuter_service.core.domain.spawner_engine import SpawnerInterface
 
 
@@ -56,11 +58,11 @@ class SpawnerCoordinator:
         Start spawning process (single iteration or continuous loop).
         
         Args:
-            current_time: Simulation time (default: datetime.utcnow())
+            current_time: Simulation time (default: the shared SimClock's utcnow())
             time_window_minutes: Time window for spawning (default: 60)
         """
         if current_time is None:
-            current_time = datetime.utcnow()
+            current_time = get_sim_clock().utcnow()
         
         # Filter enabled spawners
         enabled_spawners = self._get_enabled_spawners()
@@ -156,11 +158,11 @@ class SpawnerCoordinator:
         
         try:
             while self._running:
-                current_time = datetime.utcnow()
+                current_time = get_sim_clock().utcnow()
                 await self._run_single_cycle(enabled_spawners, current_time, time_window_minutes)
                 
                 self.logger.info(f"⏱️  Sleeping for {interval_seconds} seconds...")
-                await asyncio.sleep(interval_seconds)
+                await get_sim_clock().asleep(interval_seconds)
                 
         except KeyboardInterrupt:
             self.logger.info("⏹️  Received shutdown signal")
@@ -0,0 +1,49 @@
+"""
+Unit Tests for BuildingCountStore lookups
+=========================================
+
+Populates the store directly, so no Strapi instance is needed.
+"""
+
+from commuter_service.infrastructure.geospatial.building_counts import (
+    BuildingCountStore,
+    RouteDepotCounts,
+)
+
+
+def _store_with(*associations):
+    store = BuildingCountStore()
+    for counts in associations:
+        store._route_counts.setdefault(counts.route_document_id, counts)
+        store._depot_counts.setdefault(counts.depot_document_id, counts)
+        store._depot_routes.setdefault(counts.depot_document_id, []).append(counts)
+    return store
+
+
+def _counts(route, depot, route_count, depot_count=120, buffer_m=500.0, radius_m=800.0):
+    return RouteDepotCounts(
+        route_document_id=route,
+        depot_document_id=depot,
+        route_building_count=route_count,
+        route_buffer_m=buffer_m,
+        depot_catchment_building_count=depot_count,
+        depot_catchment_radius_m=radius_m,
+    )
+
+
+def test_lookups_require_matching_radius():
+    store = _store_with(_counts("r1", "d1", 300))
+
+    assert store.route_building_count("r1", buffer_m=500) == 300
+    assert store.route_building_count("r1", buffer_m=1000) is None
+    assert store.depot_building_count("d1", radius_m=800) == 120
+    assert store.depot_building_count("d1", radius_m=500) is None
+    assert store.route_building_count("unknown") is None
+
+
+def test_depot_route_counts_all_or_nothing():
+    store = _store_with(_counts("r1", "d1", 300), _counts("r2", "d1", 100))
+    assert store.depot_route_building_counts("d1", buffer_m=500) == {"r1": 300, "r2": 100}
+
+    partial = _store_with(_counts("r1", "d1", 300), _counts("r2", "d1", None))
+    assert partial.depot_route_building_counts("d1", buffer_m=500) is None
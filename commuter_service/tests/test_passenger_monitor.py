@@ -0,0 +1,138 @@
+"""
+Unit Tests for PassengerMonitor change-feed batching
+====================================================
+
+Feeds NOTIFY payloads straight into the monitor's queue and captures the
+batches it would send, so no Postgres, Strapi or WebSocket is needed.
+"""
+
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+
+from commuter_service.services import passenger_monitor
+from commuter_service.services.passenger_monitor import PassengerMonitor, MODE_CURSOR
+
+
+class CapturingMonitor(PassengerMonitor):
+    def __init__(self, **kwargs):
+        super().__init__(strapi_url="http://strapi.test", batch_window=0.01, **kwargs)
+        self.batches = []
+
+    async def _deliver(self, route_id, events):
+        self.batches.append((route_id, events))
+
+
+def notification(passenger_id, route_id="1", boarded_at=None, alighted_at=None):
+    return json.dumps({
+        "action": "UPDATE",
+        "id": 1,
+        "document_id": f"doc-{passenger_id}",
+        "passenger_id": passenger_id,
+        "route_id": route_id,
+        "spawned_at": "2025-01-01T08:00:00Z",
+        "boarded_at": boarded_at,
+        "alighted_at": alighted_at,
+        "updated_at": "2025-01-01T08:05:00.000Z",
+        "status": "WAITING",
+    })
+
+
+async def feed(monitor, *payloads):
+    for payload in payloads:
+        monitor._on_notify(None, 0, "active_passengers", payload)
+    await monitor._drain_notifications()
+
+
+def test_auto_mode_without_dsn_uses_cursor():
+    monitor = CapturingMonitor(pg_dsn="")
+    assert monitor.mode == MODE_CURSOR
+
+
+@pytest.mark.asyncio
+async def test_transitions_in_one_window_are_coalesced():
+    monitor = CapturingMonitor(pg_dsn="")
+    monitor.add_monitored_route("1")
+
+    await feed(monitor, notification("P1"), notification("P2"))
+    assert monitor.batches == []  # first sighting only populates the cache
+
+    await feed(
+        monitor,
+        notification("P1", boarded_at="2025-01-01T08:10:00Z"),
+        notification("P1", boarded_at="2025-01-01T08:10:00Z", alighted_at="2025-01-01T08:20:00Z"),
+        notification("P2", boarded_at="2025-01-01T08:11:00Z"),
+    )
+
+    assert len(monitor.batches) == 1
+    route_id, events = monitor.batches[0]
+    assert route_id == "1"
+    by_passenger = {data["passenger_id"]: (event_type, data) for event_type, data in events}
+    assert by_passenger["P1"][0] == "alighted"
+    assert by_passenger["P1"][1]["previous_state"] == "WAITING"
+    assert by_passenger["P2"][0] == "boarded"
+    assert monitor.stats['events_coalesced'] == 1
+    assert monitor.get_stats()['event_latency'][monitor.mode]['count'] == 2
+
+
+@pytest.mark.asyncio
+async def test_unmonitored_routes_are_ignored():
+    monitor = CapturingMonitor(pg_dsn="")
+    monitor.add_monitored_route("1")
+
+    await feed(monitor, notification("P9", route_id="2"))
+
+    assert "P9" not in monitor.passenger_cache
+    assert monitor.stats['notifications_received'] == 1
+
+
+class FakeStrapiPages:
+    """GET /api/active-passengers honouring the cursor's keyset filter and page size"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = 0
+
+    async def get(self, url, params=None):
+        self.requests += 1
+        after = params["filters[$or][0][updatedAt][$gt]"]
+        same = params["filters[$or][1][updatedAt][$eq]"]
+        after_id = params["filters[$or][1][id][$gt]"]
+        assert after == same
+        matching = sorted(
+            (row for row in self.rows
+             if row["updatedAt"] > after or (row["updatedAt"] == same and row["id"] > after_id)),
+            key=lambda row: (row["updatedAt"], row["id"]),
+        )
+        page = matching[:params["pagination[pageSize]"]]
+        return type("Response", (), {"raise_for_status": lambda self: None, "json": lambda self: {"data": page}})()
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_through_rows_sharing_one_timestamp(monkeypatch):
+    # A bulk insert: 25 rows with the same updatedAt, more than one page
+    rows = [{"id": i, "passenger_id": f"P{i}", "route_id": "1", "status": "WAITING",
+             "updatedAt": "2025-01-01T08:05:00.000Z"} for i in range(1, 26)]
+    strapi = FakeStrapiPages(rows)
+
+    @asynccontextmanager
+    async def fake_session(*args, **kwargs):
+        yield strapi
+
+    monkeypatch.setattr(passenger_monitor, "http_session", fake_session)
+    monitor = CapturingMonitor(pg_dsn="", page_size=10)
+    monitor.add_monitored_route("1")
+    monitor._cursor = (datetime(2025, 1, 1, 8, 0), 0)
+    seen = []
+
+    async def record(passenger):
+        seen.append(passenger["id"])
+
+    monitor._process_passenger_update = record
+    await monitor._poll_cursor()
+
+    assert seen == list(range(1, 26))
+    assert monitor._cursor == (datetime(2025, 1, 1, 8, 5), 25)
+    assert strapi.requests == 3
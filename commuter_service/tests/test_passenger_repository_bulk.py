@@ -0,0 +1,128 @@
+"""
+Unit Tests for PassengerRepository bulk inserts
+===============================================
+
+Uses a fake aiohttp session so no Strapi instance is needed.
+"""
+
+import pytest
+from datetime import datetime
+
+from commuter_service.infrastructure.database import PassengerRepository
+
+
+class FakeResponse:
+    def __init__(self, status, body=None):
+        self.status = status
+        self._body = body or {}
+
+    async def json(self):
+        return self._body
+
+    async def text(self):
+        return str(self._body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """Records POSTs; the bulk route is optional."""
+
+    def __init__(self, bulk_available=True, duplicate_ids=(), bulk_status=None):
+        self.bulk_available = bulk_available
+        self.bulk_status = bulk_status
+        self.duplicate_ids = set(duplicate_ids)
+        self.posts = []
+
+    def post(self, url, json=None, headers=None):
+        self.posts.append(url)
+        if url.endswith("/bulk"):
+            if not self.bulk_available:
+                return FakeResponse(404)
+            if self.bulk_status is not None:
+                return FakeResponse(self.bulk_status, {"error": "boom"})
+            rows = json["data"]
+            failed = [
+                {"passenger_id": r["passenger_id"], "error": "Duplicate passenger_id"}
+                for r in rows if r["passenger_id"] in self.duplicate_ids
+            ]
+            return FakeResponse(201, {"inserted_count": len(rows) - len(failed), "failed": failed})
+        return FakeResponse(201)
+
+
+def make_passengers(count):
+    return [
+        {
+            "passenger_id": f"P{i}",
+            "route_id": "1",
+            "latitude": 13.1,
+            "longitude": -59.6,
+            "destination_lat": 13.2,
+            "destination_lon": -59.5,
+            "destination_name": "Dest",
+            "spawned_at": datetime(2024, 10, 28, 8, 0),
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_batches_requests():
+    repo = PassengerRepository(strapi_url="http://strapi", bulk_batch_size=100)
+    repo.session = FakeSession()
+
+    report = await repo.bulk_insert_passengers_report(make_passengers(250))
+
+    assert report.mode == "bulk"
+    assert report.batches == 3
+    assert report.successful == 250
+    assert len(repo.session.posts) == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_reports_partial_failures():
+    repo = PassengerRepository(strapi_url="http://strapi")
+    repo.session = FakeSession(duplicate_ids={"P3", "P7"})
+
+    successful, failed = await repo.bulk_insert_passengers(make_passengers(10))
+
+    assert (successful, failed) == (8, 2)
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_falls_back_to_per_row():
+    repo = PassengerRepository(strapi_url="http://strapi", bulk_batch_size=5)
+    repo.session = FakeSession(bulk_available=False)
+
+    report = await repo.bulk_insert_passengers_report(make_passengers(12))
+
+    assert report.mode == "per-row"
+    assert report.successful == 12
+    # One rejected bulk attempt, then one POST per passenger
+    assert len(repo.session.posts) == 13
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_falls_back_to_per_row_on_server_error():
+    repo = PassengerRepository(strapi_url="http://strapi", bulk_batch_size=5)
+    repo.session = FakeSession(bulk_status=500)
+
+    report = await repo.bulk_insert_passengers_report(make_passengers(7))
+
+    assert report.mode == "per-row"
+    assert (report.successful, report.failed) == (7, 0)
+
+
+def test_payload_expiry_follows_expires_minutes_for_string_spawn_times():
+    passenger = make_passengers(1)[0]
+    passenger.update(spawned_at="2024-10-28T08:00:00Z", expires_minutes=45)
+    payload = PassengerRepository._build_passenger_payload(passenger)
+    assert payload["spawned_at"] == "2024-10-28T08:00:00Z"
+    assert payload["expires_at"] == "2024-10-28T08:45:00Z"
+
+    passenger.update(spawned_at=datetime(2024, 10, 28, 8, 0), expires_at="2024-10-28T09:00:00Z")
+    assert PassengerRepository._build_passenger_payload(passenger)["expires_at"] == "2024-10-28T09:00:00Z"
@@ -0,0 +1,62 @@
+"""
+Unit Tests for PassengerSnapshotStore expiry and capacity eviction
+==================================================================
+"""
+
+from datetime import datetime
+
+from commuter_service.domain.models.passenger_state import PassengerStatus
+from commuter_service.services.passenger_snapshot_store import (
+    PassengerSnapshot,
+    PassengerSnapshotStore,
+)
+
+
+def snapshot(passenger_id, status=PassengerStatus.WAITING):
+    return PassengerSnapshot(
+        passenger_id=passenger_id,
+        document_id=f"doc-{passenger_id}",
+        status=status,
+        spawned_at=None,
+        boarded_at=None,
+        alighted_at=None,
+        vehicle_id=None,
+        route_id="1",
+        updated_at=datetime.utcnow(),
+    )
+
+
+def test_snapshots_have_no_instance_dict():
+    assert not hasattr(snapshot("P1"), "__dict__")
+
+
+def test_terminal_passengers_expire_before_idle_ones():
+    store = PassengerSnapshotStore(idle_ttl=100, terminal_ttl=10)
+    store.touch(snapshot("waiting"), now=0)
+    store.touch(snapshot("alighted", PassengerStatus.ALIGHTED), now=0)
+
+    assert store.evict_expired(now=50) == 1
+    assert "alighted" not in store and "waiting" in store
+    assert store.evict_expired(now=150) == 1
+    assert len(store) == 0
+
+
+def test_touch_reschedules_and_leaves_stale_heap_entry():
+    store = PassengerSnapshotStore(idle_ttl=100, terminal_ttl=100)
+    p1 = snapshot("P1")
+    store.touch(p1, now=0)
+    store.touch(p1, now=80)  # refreshed before its first deadline
+
+    assert store.evict_expired(now=120) == 0
+    assert store.stale_heap_entries_skipped == 1
+    assert store.evict_expired(now=181) == 1
+
+
+def test_capacity_evicts_soonest_to_expire():
+    store = PassengerSnapshotStore(idle_ttl=100, terminal_ttl=100, max_entries=2)
+    for i in range(3):
+        store.touch(snapshot(f"P{i}"), now=i)
+
+    assert len(store) == 2
+    assert "P0" not in store
+    assert store.stats()['evicted_capacity'] == 1
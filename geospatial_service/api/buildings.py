@@ -9,6 +9,7 @@ from typing import List, Dict, Any, Optional
 import time
 
 from ..services.postgis_client import postgis_client
+from ..services.streaming import building_query_response, FORMAT_JSON, FORMAT_PATTERN
 
 router = APIRouter(prefix="/buildings", tags=["Buildings"])
 
@@ -143,12 +144,14 @@ async def get_buildings_along_route(
 @router.post("/in-polygon", summary="Get buildings inside a polygon")
 async def get_buildings_in_polygon(
     polygon_data: Dict[str, Any],
-    limit: int = Query(10000, ge=1, le=50000, description="Maximum buildings to return")
+    limit: int = Query(10000, ge=1, le=50000, description="Maximum buildings to return"),
+    format: str = Query(FORMAT_JSON, pattern=FORMAT_PATTERN, description="json, ndjson, arrow or columnar")
 ) -> Dict[str, Any]:
     """
     Get all buildings inside a polygon boundary.
     
-    Useful for zone-based analysis.
+    Useful for zone-based analysis. `format=ndjson|arrow` streams rows from a
+    server-side cursor; `format=columnar` returns column arrays.
     
     Request body should contain:
     {
@@ -162,32 +165,25 @@ async def get_buildings_in_polygon(
     if not polygon_coords or len(polygon_coords) < 3:
         raise HTTPException(status_code=400, detail="Polygon must have at least 3 coordinates")
     
+    # Build polygon WKT from coordinates
+    # Coordinates should be [[lon, lat], [lon, lat], ...]
+    if not polygon_coords[0] == polygon_coords[-1]:
+        # Close the polygon if not already closed
+        polygon_coords.append(polygon_coords[0])
+    
+    # Build WKT string
+    coords_wkt = ", ".join([f"{coord[0]} {coord[1]}" for coord in polygon_coords])
+    polygon_wkt = f"POLYGON(({coords_wkt}))"
+    
+    if format != FORMAT_JSON:
+        return await building_query_response(
+            format,
+            postgis_client.buildings_in_polygon_query(polygon_wkt, limit),
+            {'polygon_vertices': len(polygon_coords)}
+        )
+    
     try:
-        # Build polygon WKT from coordinates
-        # Coordinates should be [[lon, lat], [lon, lat], ...]
-        if not polygon_coords[0] == polygon_coords[-1]:
-            # Close the polygon if not already closed
-            polygon_coords.append(polygon_coords[0])
-        
-        # Build WKT string
-        coords_wkt = ", ".join([f"{coord[0]} {coord[1]}" for coord in polygon_coords])
-        polygon_wkt = f"POLYGON(({coords_wkt}))"
-        
-        query = """
-            SELECT 
-                b.id as building_id,
-                b.document_id,
-                ST_Y(ST_Centroid(b.geom)) as latitude,
-                ST_X(ST_Centroid(b.geom)) as longitude
-            FROM buildings b
-            WHERE ST_Contains(
-                ST_GeomFromText($1, 4326),
-                b.geom
-            )
-            LIMIT $2
-        """
-        
-        buildings_data = await postgis_client.execute_query(query, polygon_wkt, limit)
+        buildings_data = await postgis_client.get_buildings_in_polygon(polygon_wkt, limit)
         
         latency_ms = (time.time() - start_time) * 1000
         
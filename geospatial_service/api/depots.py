@@ -7,19 +7,36 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 import time
-import configparser
-from pathlib import Path
-import httpx
 
 from ..services.postgis_client import postgis_client
+from ..services.catalog import CatalogSnapshot, require_catalog
 
 router = APIRouter(prefix="/depots", tags=["Depots"])
 
-# Load Strapi URL from config
-config = configparser.ConfigParser()
-config_path = Path(__file__).parent.parent.parent / "config.ini"
-config.read(config_path, encoding='utf-8')
-STRAPI_URL = config.get('infrastructure', 'strapi_url', fallback='http://localhost:1337')
+# Upper bound for /depots/nearest search radius
+MAX_NEAREST_DISTANCE_METERS = 50000
+
+
+def _get_depot(snapshot: CatalogSnapshot, depot_id: int) -> Dict[str, Any]:
+    """Look up a depot by numeric ID in the catalog, 404 if missing"""
+    depot = snapshot.depots_by_id.get(depot_id)
+    if depot is None:
+        raise HTTPException(status_code=404, detail=f"Depot {depot_id} not found")
+    return depot
+
+
+def _route_summaries(snapshot: CatalogSnapshot, depot: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Routes associated with a depot (via route-depot associations)"""
+    return [
+        {
+            'route_id': route['id'],
+            'document_id': route.get('documentId'),
+            'short_name': route.get('short_name'),
+            'long_name': route.get('long_name'),
+            'distance_km': route.get('shape_dist_traveled')
+        }
+        for route in snapshot.routes_for_depot.get(depot.get('documentId'), [])
+    ]
 
 
 class DepotSummary(BaseModel):
@@ -58,40 +75,9 @@ async def list_all_depots(
     """
     start_time = time.time()
     
-    # Get depots from Strapi
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{STRAPI_URL}/api/depots",
-                params={"pagination[pageSize]": 1000}
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=503,
-                    detail=f"Strapi service unavailable. This endpoint requires Strapi CMS to be running."
-                )
-            
-            data = response.json()
-    except httpx.ConnectError:
-        raise HTTPException(
-            status_code=503,
-            detail="Strapi CMS is not running. This endpoint requires Strapi to fetch depot data."
-        )
-    except httpx.TimeoutException:
-        raise HTTPException(
-            status_code=504,
-            detail="Strapi CMS request timed out."
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=503,
-            detail=f"Failed to connect to Strapi CMS: {str(e)}"
-        )
-    
-    depots = data.get('data', [])
+    # Get depots from the in-memory catalog
+    snapshot = await require_catalog()
+    depots = snapshot.depots
     
     # Build depot list
     depot_list = []
@@ -133,30 +119,15 @@ async def list_all_depots(
         
         # Include routes if requested
         if include_routes:
-            try:
-                routes_response = await client.get(
-                    f"{STRAPI_URL}/api/routes",
-                    params={
-                        "filters[depot][id][$eq]": depot_id,
-                        "pagination[pageSize]": 100
-                    }
-                )
-                routes_data = routes_response.json()
-                routes = routes_data.get('data', []) or []
-                
-                # Strapi v5 flat structure
-                depot_info['routes'] = [
-                    {
-                        'route_id': r['id'],
-                        'short_name': r.get('short_name'),
-                        'long_name': r.get('long_name')
-                    }
-                    for r in routes
-                ]
-                depot_info['route_count'] = len(routes)
-            except:
-                depot_info['routes'] = []
-                depot_info['route_count'] = 0
+            depot_info['routes'] = [
+                {
+                    'route_id': r['route_id'],
+                    'short_name': r['short_name'],
+                    'long_name': r['long_name']
+                }
+                for r in _route_summaries(snapshot, depot)
+            ]
+            depot_info['route_count'] = len(depot_info['routes'])
         
         depot_list.append(depot_info)
     
@@ -186,32 +157,15 @@ async def get_depot_catchment(
     """
     start_time = time.time()
     
-    # Get depot location from Strapi
-    # Strapi v5 requires filtering by ID, not direct ID in URL
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(
-            f"{STRAPI_URL}/api/depots",
-            params={"filters[id][$eq]": depot_id}
-        )
-        
-        if response.status_code != 200:
-            raise HTTPException(status_code=503, detail="Strapi service unavailable")
-        
-        data = response.json()
-        depots = data.get('data', [])
-        
-        if not depots:
-            raise HTTPException(status_code=404, detail=f"Depot {depot_id} not found")
-        
-        depot_data = depots[0]
-        
-        # Strapi v5 flat structure
-        latitude = depot_data.get('latitude')
-        longitude = depot_data.get('longitude')
-        depot_name = depot_data.get('name', 'Unknown')
-        
-        if not latitude or not longitude:
-            raise HTTPException(status_code=400, detail="Depot has no location")
+    # Get depot location from the catalog
+    depot_data = _get_depot(await require_catalog(), depot_id)
+    
+    latitude = depot_data.get('latitude')
+    longitude = depot_data.get('longitude')
+    depot_name = depot_data.get('name', 'Unknown')
+    
+    if not latitude or not longitude:
+        raise HTTPException(status_code=400, detail="Depot has no location")
     
     # Query buildings
     try:
@@ -246,65 +200,16 @@ async def get_depot_routes(depot_id: int) -> Dict[str, Any]:
     """
     Get all routes that service this depot.
     
-    Shows which routes start/end at or pass through this depot.
+    Shows which routes start/end at or pass through this depot, based on the
+    route-depot associations.
     """
     start_time = time.time()
     
-    # Get depot info
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        # Strapi v5 requires filtering by ID
-        depot_response = await client.get(
-            f"{STRAPI_URL}/api/depots",
-            params={"filters[id][$eq]": depot_id}
-        )
-        
-        if depot_response.status_code != 200:
-            raise HTTPException(status_code=503, detail="Strapi service unavailable")
-        
-        depot_data = depot_response.json()
-        depots = depot_data.get('data', [])
-        
-        if not depots:
-            raise HTTPException(status_code=404, detail=f"Depot {depot_id} not found")
-        
-        depot_name = depots[0].get('name', 'Unknown')
-        
-        # Try both 'depot' and 'depots' relations
-        routes_response = await client.get(
-            f"{STRAPI_URL}/api/routes",
-            params={
-                "filters[depot][id][$eq]": depot_id,
-                "populate": "*",
-                "pagination[pageSize]": 100
-            }
-        )
-        
-        routes_data = routes_response.json()
-        routes = routes_data.get('data', []) or []
-        
-        # If no routes found, try 'depots' plural
-        if len(routes) == 0:
-            routes_response = await client.get(
-                f"{STRAPI_URL}/api/routes",
-                params={
-                    "filters[depots][id][$eq]": depot_id,
-                    "populate": "*",
-                    "pagination[pageSize]": 100
-                }
-            )
-            routes_data = routes_response.json()
-            routes = routes_data.get('data', []) or []
-    
-    # Build route list (Strapi v5 flat structure)
-    route_list = []
-    for route in routes:
-        route_list.append({
-            'route_id': route['id'],
-            'document_id': route.get('documentId'),
-            'short_name': route.get('short_name'),
-            'long_name': route.get('long_name'),
-            'distance_km': route.get('shape_dist_traveled')
-        })
+    # Routes come from route-depot associations in the catalog
+    snapshot = await require_catalog()
+    depot = _get_depot(snapshot, depot_id)
+    depot_name = depot.get('name', 'Unknown')
+    route_list = _route_summaries(snapshot, depot)
     
     latency_ms = (time.time() - start_time) * 1000
     
@@ -332,31 +237,14 @@ async def get_depot_coverage(
     start_time = time.time()
     
     # Get depot location
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        # Strapi v5 requires filtering by ID
-        response = await client.get(
-            f"{STRAPI_URL}/api/depots",
-            params={"filters[id][$eq]": depot_id}
-        )
-        
-        if response.status_code != 200:
-            raise HTTPException(status_code=503, detail="Strapi service unavailable")
-        
-        data = response.json()
-        depots = data.get('data', [])
-        
-        if not depots:
-            raise HTTPException(status_code=404, detail=f"Depot {depot_id} not found")
-        
-        depot_data = depots[0]
-        
-        # Strapi v5 flat structure
-        latitude = depot_data.get('latitude')
-        longitude = depot_data.get('longitude')
-        depot_name = depot_data.get('name', 'Unknown')
-        
-        if not latitude or not longitude:
-            raise HTTPException(status_code=400, detail="Depot has no location")
+    depot_data = _get_depot(await require_catalog(), depot_id)
+    
+    latitude = depot_data.get('latitude')
+    longitude = depot_data.get('longitude')
+    depot_name = depot_data.get('name', 'Unknown')
+    
+    if not latitude or not longitude:
+        raise HTTPException(status_code=400, detail="Depot has no location")
     
     try:
         # Calculate coverage area using PostGIS
@@ -418,61 +306,19 @@ async def find_nearest_depot(
         raise HTTPException(status_code=400, detail="latitude must be between -90 and 90")
     if not (-180 <= longitude <= 180):
         raise HTTPException(status_code=400, detail="longitude must be between -180 and 180")
-    
-    # Get all depots from Strapi
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{STRAPI_URL}/api/depots",
-                params={"pagination[pageSize]": 1000}
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=503, 
-                    detail=f"Strapi service unavailable or returned {response.status_code}. This endpoint requires Strapi CMS to be running."
-                )
-            
-            data = response.json()
-            depots = data.get('data', [])
-    except httpx.ConnectError:
-        raise HTTPException(
-            status_code=503,
-            detail="Strapi CMS is not running. This endpoint requires Strapi to fetch depot data."
-        )
-    except httpx.TimeoutException:
-        raise HTTPException(
-            status_code=504,
-            detail="Strapi CMS request timed out. Please check if Strapi is running properly."
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
+    if (
+        isinstance(max_distance_meters, bool)
+        or not isinstance(max_distance_meters, (int, float))
+        or not (0 < max_distance_meters <= MAX_NEAREST_DISTANCE_METERS)
+    ):
         raise HTTPException(
-            status_code=503,
-            detail=f"Failed to connect to Strapi CMS: {str(e)}"
+            status_code=400,
+            detail=f"max_distance_meters must be a number between 0 and {MAX_NEAREST_DISTANCE_METERS}"
         )
     
-    # Calculate distances
-    from math import radians, sin, cos, sqrt, atan2
-    
-    def haversine_distance(lat1, lon1, lat2, lon2):
-        """Calculate distance between two points in meters"""
-        R = 6371000  # Earth radius in meters
-        
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
-        
-        return R * c
+    snapshot = await require_catalog()
     
-    nearest_depot = None
-    min_distance = float('inf')
-    
-    if not depots:
+    if not snapshot.depots:
         return {
             'found': False,
             'message': 'No depots available in the system',
@@ -483,26 +329,19 @@ async def find_nearest_depot(
             'latency_ms': round((time.time() - start_time) * 1000, 2)
         }
     
-    for depot in depots:
-        # Strapi v5 flat structure
-        latitude_depot = depot.get('latitude')
-        longitude_depot = depot.get('longitude')
-        
-        if not latitude_depot or not longitude_depot:
-            continue
-        
-        distance = haversine_distance(latitude, longitude, latitude_depot, longitude_depot)
-        
-        if distance < min_distance and distance <= max_distance_meters:
-            min_distance = distance
-            nearest_depot = {
-                'depot_id': depot['id'],
-                'document_id': depot.get('documentId'),
-                'name': depot.get('name'),
-                'latitude': latitude_depot,
-                'longitude': longitude_depot,
-                'distance_meters': round(distance, 2)
-            }
+    # Grid search over depot locations
+    nearest_depot = None
+    match = snapshot.depot_grid.nearest(latitude, longitude, max_distance_meters)
+    if match:
+        depot, distance = match
+        nearest_depot = {
+            'depot_id': depot['id'],
+            'document_id': depot.get('documentId'),
+            'name': depot.get('name'),
+            'latitude': depot['latitude'],
+            'longitude': depot['longitude'],
+            'distance_meters': round(distance, 2)
+        }
     
     latency_ms = (time.time() - start_time) * 1000
     
@@ -542,24 +381,8 @@ async def get_depot_detail(
     """
     start_time = time.time()
     
-    # Get from Strapi
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        # Strapi v5 requires filtering by ID
-        response = await client.get(
-            f"{STRAPI_URL}/api/depots",
-            params={"filters[id][$eq]": depot_id}
-        )
-        
-        if response.status_code != 200:
-            raise HTTPException(status_code=503, detail="Strapi service unavailable")
-        
-        data = response.json()
-        depots = data.get('data', [])
-        
-        if not depots:
-            raise HTTPException(status_code=404, detail=f"Depot {depot_id} not found")
-        
-        depot_data = depots[0]
+    # Get from the catalog
+    depot_data = _get_depot(await require_catalog(), depot_id)
     
     # Strapi v5 flat structure
     depot_detail = {
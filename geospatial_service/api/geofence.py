@@ -9,6 +9,10 @@ from typing import Optional, List
 import time
 
 from ..services.postgis_client import postgis_client
+from ..services.geofence_engine import geofence_engine
+
+# Batches above this size need the in-process engine (PostGIS is queried per point)
+POSTGIS_BATCH_LIMIT = 100
 
 router = APIRouter(prefix="/geofence", tags=["Geofencing"])
 
@@ -28,6 +32,7 @@ class GeofenceCheckResponse(BaseModel):
     inside_landuse: bool
     landuse: Optional[dict] = None
     latency_ms: float
+    source: str = "postgis"
 
 
 @router.post("/check", response_model=GeofenceCheckResponse)
@@ -39,12 +44,26 @@ async def check_geofence(request: GeofenceCheckRequest):
     1. Administrative regions (parish, town, suburb, neighbourhood)
     2. Landuse zones (farmland, residential, industrial, etc.)
     
-    Returns which zones contain the point.
+    Returns which zones contain the point. Answered in-process by the
+    geofence engine once it has loaded; PostGIS until then.
     
     Performance target: <30ms
     """
     start_time = time.time()
-
+    
+    if geofence_engine.is_ready():
+        region, landuse = geofence_engine.check(request.latitude, request.longitude)
+        return GeofenceCheckResponse(
+            latitude=request.latitude,
+            longitude=request.longitude,
+            inside_region=region is not None,
+            region=region,
+            inside_landuse=landuse is not None,
+            landuse=landuse,
+            latency_ms=round((time.time() - start_time) * 1000, 2),
+            source="engine"
+        )
+    
     # In-memory cache for repeated geofence checks (TTL: 5s)
     if not hasattr(check_geofence, "_cache"):
         check_geofence._cache = {}
@@ -54,7 +73,7 @@ async def check_geofence(request: GeofenceCheckRequest):
         resp = cached[1]
         resp.latency_ms = round((time.time() - start_time) * 1000, 2)
         return resp
-
+    
     try:
         # Check both region and landuse in parallel
         region = await postgis_client.check_geofence_region(
@@ -78,12 +97,12 @@ async def check_geofence(request: GeofenceCheckRequest):
             landuse=landuse,
             latency_ms=round(latency_ms, 2)
         )
-
+        
         try:
             check_geofence._cache[cache_key] = (time.time(), response)
         except Exception:
             pass
-
+        
         return response
     
     except Exception as e:
@@ -100,8 +119,8 @@ class BatchGeofenceRequest(BaseModel):
     """Request model for batch geofence checks"""
     coordinates: List[GeofenceCheckRequest] = Field(
         ..., 
-        max_items=100,
-        description="List of coordinates to check (max 100)"
+        max_length=10000,
+        description="List of coordinates to check (max 10000; max 100 while the engine is loading)"
     )
 
 
@@ -110,6 +129,8 @@ class BatchGeofenceResponse(BaseModel):
     results: List[GeofenceCheckResponse]
     total_count: int
     latency_ms: float
+    source: str = "postgis"
+    points_per_second: Optional[float] = None
 
 
 @router.post("/check-batch", response_model=BatchGeofenceResponse)
@@ -117,13 +138,47 @@ async def check_geofence_batch(request: BatchGeofenceRequest):
     """
     Batch geofence checking for multiple coordinates
     
-    Useful for processing multiple vehicle positions efficiently.
-    Maximum 100 coordinates per request.
+    Useful for processing every vehicle position of a simulation tick.
+    All points are resolved in one vectorized lookup by the geofence engine;
+    while it is loading, batches of up to 100 points fall back to PostGIS.
     
-    Performance target: <200ms for 100 coordinates
+    Performance target: <200ms for 10000 coordinates
     """
     start_time = time.time()
     
+    if geofence_engine.is_ready():
+        latitudes = [coord.latitude for coord in request.coordinates]
+        longitudes = [coord.longitude for coord in request.coordinates]
+        regions, landuse_zones = geofence_engine.check_points(latitudes, longitudes)
+        
+        latency_ms = (time.time() - start_time) * 1000
+        results = [
+            GeofenceCheckResponse(
+                latitude=lat,
+                longitude=lon,
+                inside_region=region is not None,
+                region=region,
+                inside_landuse=landuse is not None,
+                landuse=landuse,
+                latency_ms=0.0,
+                source="engine"
+            )
+            for lat, lon, region, landuse in zip(latitudes, longitudes, regions, landuse_zones)
+        ]
+        return BatchGeofenceResponse(
+            results=results,
+            total_count=len(results),
+            latency_ms=round(latency_ms, 2),
+            source="engine",
+            points_per_second=round(len(results) / (latency_ms / 1000)) if latency_ms else None
+        )
+    
+    if len(request.coordinates) > POSTGIS_BATCH_LIMIT:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Geofence engine not loaded; batches over {POSTGIS_BATCH_LIMIT} points need it"
+        )
+    
     try:
         results = []
         
@@ -146,6 +201,24 @@ async def check_geofence_batch(request: BatchGeofenceRequest):
         )
 
 
+@router.get("/engine")
+async def get_geofence_engine_stats():
+    """Geofence engine state: loaded layers, polygon counts and lookup throughput"""
+    return geofence_engine.stats()
+
+
+@router.post("/engine/reload")
+async def reload_geofence_engine():
+    """Reload region and landuse polygons (e.g. after a boundary import)"""
+    if not geofence_engine.available:
+        raise HTTPException(status_code=501, detail="Geofence engine requires shapely>=2.0 and numpy")
+    try:
+        layers = await geofence_engine.load()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Geofence engine reload failed: {str(e)}")
+    return {'status': 'reloaded', 'layers': layers, 'load_ms': geofence_engine.last_load_ms}
+
+
 @router.post("/batch")
 async def batch_geofence_check(request_data: dict):
     """
@@ -153,7 +226,8 @@ async def batch_geofence_check(request_data: dict):
     
     Request body: {"points": [{"lat": 13.1, "lon": -59.6}, ...], "polygon": [[lat, lon], ...]}
     
-    Checks if points are inside the provided polygon.
+    Checks if points are inside the provided polygon (prepared once, all
+    points tested in one vectorized call).
     """
     points = request_data.get('points', [])
     polygon = request_data.get('polygon', [])
@@ -166,11 +240,21 @@ async def batch_geofence_check(request_data: dict):
     start_time = time.time()
     
     try:
-        from shapely.geometry import Point, Polygon
+        import shapely
         
-        poly = Polygon(polygon)
-        results = []
+        # Polygon is given as [lat, lon] pairs; Shapely uses (lon, lat) order
+        poly = shapely.polygons([(lon, lat) for lat, lon in polygon])
+        shapely.prepare(poly)
         
+        valid = [point for point in points if point.get('lat') is not None and point.get('lon') is not None]
+        inside = shapely.contains_xy(
+            poly,
+            [point['lon'] for point in valid],
+            [point['lat'] for point in valid]
+        ).tolist()
+        
+        results = []
+        inside_iter = iter(inside)
         for point in points:
             lat = point.get('lat')
             lon = point.get('lon')
@@ -179,13 +263,10 @@ async def batch_geofence_check(request_data: dict):
                 results.append({'error': 'Missing lat or lon'})
                 continue
             
-            pt = Point(lon, lat)  # Note: Shapely uses (lon, lat) order
-            inside = poly.contains(pt)
-            
             results.append({
                 'latitude': lat,
                 'longitude': lon,
-                'inside': inside
+                'inside': next(inside_iter)
             })
         
         latency_ms = (time.time() - start_time) * 1000
@@ -198,4 +279,3 @@ async def batch_geofence_check(request_data: dict):
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch geofence failed: {str(e)}")
-
@@ -1,6 +1,6 @@
 from fastapi import HTTPException
 from redis import Redis
-import httpx
+from common.http_pool import http_session
 from typing import Any, Dict, List
 from geopy.distance import geodesic
 import configparser
@@ -38,7 +38,7 @@ class GeospatialData:
             return cached_data
         # Fetch from API
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_session("strapi") as client:
                 # Remove any None-valued params to avoid invalid query keys
                 cleaned_params = {k: v for k, v in (params or {}).items() if v is not None}
                 response = await client.get(api_url, params=cleaned_params)
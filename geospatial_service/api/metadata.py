@@ -3,30 +3,36 @@ Metadata API - Service metadata and dataset information
 System information and capabilities (Single Responsibility Principle)
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import Dict, Any
 import time
 
+from common.http_pool import get_http_pool
 from ..services.postgis_client import postgis_client
+from ..services.catalog import catalog, CatalogUnavailableError
+from ..services.feature_stats import feature_stats
 
 router = APIRouter(prefix="/meta", tags=["Metadata"])
 
 
 @router.get("/stats", summary="Get database statistics")
-async def get_database_stats() -> Dict[str, Any]:
+async def get_database_stats(exact: bool = False) -> Dict[str, Any]:
     """
     Get comprehensive database statistics.
     
-    Returns counts for all major feature types.
+    Returns counts for all major feature types. Counts are planner estimates
+    until the background COUNT(*) has finished; pass exact=true to wait for it.
     """
     start_time = time.time()
     
     try:
-        stats = await postgis_client.get_stats()
+        stats = await feature_stats.get(exact=exact)
         latency_ms = (time.time() - start_time) * 1000
         
         return {
             'features': stats,
+            'source': feature_stats.source(),
+            'counts': feature_stats.stats(),
             'latency_ms': round(latency_ms, 2)
         }
     
@@ -56,7 +62,7 @@ async def get_geographic_bounds() -> Dict[str, Any]:
             FROM buildings
         """
         
-        result = await postgis_client.execute_query(query)
+        result = await postgis_client.execute_query(query, label="dataset_bounds")
         
         if not result:
             raise HTTPException(status_code=500, detail="Bounds query failed")
@@ -288,13 +294,15 @@ async def health_check() -> Dict[str, Any]:
     start_time = time.time()
     
     try:
-        # Test database
-        stats = await postgis_client.get_stats()
+        # Live round trip on the pool; feature counts stay estimated / cached (never a blocking COUNT(*))
+        db_latency_ms = await postgis_client.ping()
+        stats = await feature_stats.get()
         db_healthy = True
         db_error = None
     except Exception as e:
         db_healthy = False
         db_error = str(e)
+        db_latency_ms = None
         stats = None
     
     latency_ms = (time.time() - start_time) * 1000
@@ -308,6 +316,7 @@ async def health_check() -> Dict[str, Any]:
             'database': {
                 'status': 'healthy' if db_healthy else 'unhealthy',
                 'error': db_error,
+                'latency_ms': round(db_latency_ms, 2) if db_healthy else None,
                 'features': stats if db_healthy else None
             },
             'api': {
@@ -317,3 +326,83 @@ async def health_check() -> Dict[str, Any]:
         },
         'latency_ms': round(latency_ms, 2)
     }
+
+
+@router.get("/http-pool", summary="Upstream HTTP client pool statistics")
+async def http_pool_stats() -> Dict[str, Any]:
+    """
+    Per-upstream request counts, latency histograms and pool saturation
+    for the shared keep-alive HTTP clients (Strapi, commuter service).
+    """
+    return {
+        'upstreams': get_http_pool().stats(),
+        'timestamp': time.time()
+    }
+
+
+@router.get("/diagnostics/queries", summary="Query latency histograms and sampled plans")
+async def get_query_diagnostics(plans: bool = True) -> Dict[str, Any]:
+    """
+    Get per-query latency histograms, prepared statement counts and the most
+    recent sampled EXPLAIN (ANALYZE, BUFFERS) plans for the named hot queries.
+    """
+    return postgis_client.diagnostics(include_plans=plans)
+
+
+@router.post("/diagnostics/queries/explain", summary="Set EXPLAIN sampling rate")
+async def set_explain_sample_rate(
+    sample_rate: float = Query(..., ge=0.0, le=1.0, description="Fraction of named-query executions to EXPLAIN")
+) -> Dict[str, Any]:
+    """
+    Enable, tune or disable (0) sampled plan capture.
+    
+    Sampled executions are re-run with EXPLAIN ANALYZE off the request path,
+    so keep the rate low under load.
+    """
+    postgis_client.query_stats.explain_sample_rate = sample_rate
+    return {'sample_rate': sample_rate}
+
+
+@router.post("/diagnostics/queries/reset", summary="Reset query histograms")
+async def reset_query_diagnostics() -> Dict[str, Any]:
+    """Clear latency histograms and captured plans."""
+    postgis_client.query_stats.reset()
+    return {'reset': True}
+
+
+@router.get("/startup", summary="Startup timing")
+async def get_startup_metrics(request: Request) -> Dict[str, Any]:
+    """
+    Get how long each startup phase took (PostGIS connect, feature stats,
+    catalog load) and when the API became ready.
+    """
+    return getattr(request.app.state, 'startup_metrics', {'phases': {}, 'ready_at': None})
+
+
+@router.get("/catalog", summary="In-memory depot/route catalog status")
+async def get_catalog_status() -> Dict[str, Any]:
+    """
+    Get catalog size, age and load history.
+    
+    Depot and route lookups are answered from this catalog instead of Strapi.
+    """
+    return catalog.stats()
+
+
+@router.post("/catalog/refresh", summary="Reload the depot/route catalog")
+async def refresh_catalog(wait: bool = False) -> Dict[str, Any]:
+    """
+    Change signal for the catalog (e.g. a Strapi webhook on depot/route edits).
+    
+    Schedules a background reload by default; with ?wait=true the reload runs
+    before responding and errors are reported.
+    """
+    if not wait:
+        catalog.refresh_in_background()
+        return {'scheduled': True, **catalog.stats()}
+    
+    try:
+        await catalog.load()
+    except CatalogUnavailableError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return {'scheduled': False, **catalog.stats()}
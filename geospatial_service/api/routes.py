@@ -9,9 +9,11 @@ from typing import List, Dict, Any, Optional
 import time
 import configparser
 from pathlib import Path
-import httpx
+from common.http_pool import http_session
 
 from ..services.postgis_client import postgis_client
+from ..services.catalog import require_catalog
+from ..services.route_index import route_index
 
 router = APIRouter(prefix="/routes", tags=["Routes"])
 
@@ -21,6 +23,9 @@ config_path = Path(__file__).parent.parent.parent / "config.ini"
 config.read(config_path, encoding='utf-8')
 STRAPI_URL = config.get('infrastructure', 'strapi_url', fallback='http://localhost:1337')
 
+# Upper bound for /routes/nearest search radius (the index scans a ring of cells per 250 m)
+MAX_NEAREST_DISTANCE_METERS = 50000
+
 
 class RouteGeometry(BaseModel):
     """Route geometry with metrics"""
@@ -92,48 +97,9 @@ async def list_all_routes(
     """
     start_time = time.time()
     
-    # Get routes from Strapi
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            url = f"{STRAPI_URL}/api/routes"
-            params = {"pagination[pageSize]": 1000}
-            
-            # Only add populate if we need it (Strapi v5 can be picky about populate values)
-            if include_geometry:
-                params["populate"] = "*"
-            
-            print(f"[DEBUG] Requesting: {url}")
-            print(f"[DEBUG] Params: {params}")
-            response = await client.get(url, params=params)
-            print(f"[DEBUG] Response status: {response.status_code}")
-            
-            if response.status_code != 200:
-                print(f"[DEBUG] Response content: {response.text[:500]}")
-                raise HTTPException(
-                    status_code=503,
-                    detail=f"Strapi service unavailable (status {response.status_code}). This endpoint requires Strapi CMS to be running."
-                )
-            
-            data = response.json()
-    except httpx.ConnectError:
-        raise HTTPException(
-            status_code=503,
-            detail="Strapi CMS is not running. This endpoint requires Strapi to fetch route data."
-        )
-    except httpx.TimeoutException:
-        raise HTTPException(
-            status_code=504,
-            detail="Strapi CMS request timed out."
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=503,
-            detail=f"Failed to connect to Strapi CMS: {str(e)}"
-        )
-    
-    routes = data.get('data', [])
+    # Get routes from the in-memory catalog
+    snapshot = await require_catalog()
+    routes = snapshot.routes
     
     # Build route list
     route_list = []
@@ -240,7 +206,7 @@ async def get_route_buildings(
     
     try:
         # Step 1: Get route to find its short_name (route_id in GTFS)
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_session("strapi", timeout=30.0) as client:
             route_response = await client.get(
                 f"{STRAPI_URL}/api/routes",
                 params={"filters[id][$eq]": route_id}
@@ -419,22 +385,42 @@ async def get_route_coverage(
         raise HTTPException(status_code=500, detail=f"Coverage calculation failed: {str(e)}")
 
 
+def _boarding_route(route: Dict[str, Any], point) -> Dict[str, Any]:
+    """Route summary with its boarding point for a nearest/intercept response"""
+    return {
+        'id': route.get('id'),
+        'document_id': route.get('documentId'),
+        'short_name': route.get('short_name'),
+        'long_name': route.get('long_name'),
+        'distance_meters': round(point.distance_meters, 2),
+        'boarding_point': {
+            'latitude': point.latitude,
+            'longitude': point.longitude
+        },
+        'along_route_meters': round(point.along_route_meters, 2),
+        'route_length_meters': round(point.route_length_meters, 2)
+    }
+
+
 @router.post("/nearest", summary="Find nearest route to point")
 async def find_nearest_route(
     request_data: Dict[str, Any]
 ) -> Dict[str, Any]:
     """
-    Find the nearest route to a given point.
+    Find the nearest routes to a given point.
     
-    Request body: {"latitude": 13.1, "longitude": -59.6, "max_distance_meters": 5000}
+    Request body: {"latitude": 13.1, "longitude": -59.6, "max_distance_meters": 5000, "k": 3}
     
-    Useful for determining which route services a location.
+    Answered from the in-memory route proximity index: for each of the k
+    nearest routes, the closest boarding point and its position along the
+    route. `route` is the nearest one (kept for existing callers).
     """
     start_time = time.time()
     
     latitude = request_data.get('latitude')
     longitude = request_data.get('longitude')
     max_distance_meters = request_data.get('max_distance_meters', 5000)
+    k = request_data.get('k', 1)
     
     if latitude is None or longitude is None:
         raise HTTPException(status_code=400, detail="latitude and longitude are required")
@@ -442,61 +428,81 @@ async def find_nearest_route(
         raise HTTPException(status_code=400, detail="latitude must be between -90 and 90")
     if not (-180 <= longitude <= 180):
         raise HTTPException(status_code=400, detail="longitude must be between -180 and 180")
-    
-    try:
-        # Query nearest highway (route) from PostGIS
-        query = """
-            SELECT 
-                document_id,
-                name,
-                highway_type,
-                ST_Distance(
-                    ST_SetSRID(ST_MakePoint($2, $1), 4326)::geography,
-                    geom::geography
-                ) AS distance_meters
-            FROM highways
-            WHERE ST_DWithin(
-                ST_SetSRID(ST_MakePoint($2, $1), 4326)::geography,
-                geom::geography,
-                $3
-            )
-            ORDER BY distance_meters ASC
-            LIMIT 1
-        """
-        
-        result = await postgis_client.execute_query(
-            query, latitude, longitude, max_distance_meters
+    if not isinstance(k, int) or not (1 <= k <= 50):
+        raise HTTPException(status_code=400, detail="k must be an integer between 1 and 50")
+    if (
+        isinstance(max_distance_meters, bool)
+        or not isinstance(max_distance_meters, (int, float))
+        or not (0 < max_distance_meters <= MAX_NEAREST_DISTANCE_METERS)
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail=f"max_distance_meters must be a number between 0 and {MAX_NEAREST_DISTANCE_METERS}"
         )
-        
-        if not result:
-            return {
-                'found': False,
-                'message': f'No routes within {max_distance_meters}m',
-                'latitude': latitude,
-                'longitude': longitude,
-                'max_distance_meters': max_distance_meters
-            }
-        
-        route = result[0]
-        latency_ms = (time.time() - start_time) * 1000
-        
+    
+    snapshot, index = await route_index.get()
+    points = index.nearest(latitude, longitude, k=k, max_distance_meters=max_distance_meters)
+    
+    if not points:
         return {
-            'found': True,
-            'route': {
-                'document_id': route['document_id'],
-                'name': route['name'],
-                'highway_type': route['highway_type'],
-                'distance_meters': round(route['distance_meters'], 2)
-            },
-            'query_point': {
-                'latitude': latitude,
-                'longitude': longitude
-            },
-            'latency_ms': round(latency_ms, 2)
+            'found': False,
+            'message': f'No routes within {max_distance_meters}m',
+            'latitude': latitude,
+            'longitude': longitude,
+            'max_distance_meters': max_distance_meters
         }
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Nearest route query failed: {str(e)}")
+    routes = [
+        _boarding_route(snapshot.routes_by_document_id[point.route_id], point)
+        for point in points
+    ]
+    latency_ms = (time.time() - start_time) * 1000
+    
+    return {
+        'found': True,
+        'route': routes[0],
+        'routes': routes,
+        'query_point': {
+            'latitude': latitude,
+            'longitude': longitude
+        },
+        'latency_ms': round(latency_ms, 2)
+    }
+
+
+@router.get("/index/stats", summary="Route proximity index stats")
+async def get_route_index_stats() -> Dict[str, Any]:
+    """Routes, vertices and grid cells in the route proximity index"""
+    await route_index.get()
+    return route_index.stats()
+
+
+@router.get("/{route_id}/intercept", summary="Walking intercept onto a route")
+async def get_route_intercept(
+    route_id: str,
+    latitude: float = Query(..., ge=-90, le=90, description="Walker latitude"),
+    longitude: float = Query(..., ge=-180, le=180, description="Walker longitude")
+) -> Dict[str, Any]:
+    """
+    Closest point of one route (by documentId) to a location: where to walk
+    to board it, how far that is, and how far along the route it lies.
+    """
+    start_time = time.time()
+    
+    snapshot, index = await route_index.get()
+    point = index.project(route_id, latitude, longitude)
+    
+    if point is None:
+        raise HTTPException(status_code=404, detail=f"Route {route_id} not found or has no geometry")
+    
+    return {
+        'route': _boarding_route(snapshot.routes_by_document_id[route_id], point),
+        'query_point': {
+            'latitude': latitude,
+            'longitude': longitude
+        },
+        'latency_ms': round((time.time() - start_time) * 1000, 2)
+    }
 
 
 @router.get("/{route_id}", summary="Get detailed route information")
@@ -513,7 +519,7 @@ async def get_route_detail(
     start_time = time.time()
     
     # Get from Strapi
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_session("strapi", timeout=30.0) as client:
         response = await client.get(f"{STRAPI_URL}/api/routes/{route_id}?populate=*")
         
         if response.status_code != 200:
@@ -571,53 +577,25 @@ async def get_route_depot(document_id: str) -> Dict[str, Any]:
     """
     start_time = time.time()
     
-    # Query Strapi with documentId (Strapi v5 format)
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.get(f"{STRAPI_URL}/api/routes/{document_id}?populate=*")
-        
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"Route with documentId '{document_id}' not found"
-            )
-        
-        data = response.json()
-        route_data = data.get('data', {})
-        
-        # Depot is under associated_depots array
-        associated_depots = route_data.get('associated_depots', [])
-        
-        if not associated_depots or len(associated_depots) == 0:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No depot associated with route '{document_id}'. Please create route-depot association in associated_depots."
-            )
-        
-        # Get the first depot (or primary depot)
-        depot_association = associated_depots[0]
-        
-        # Now we need to get the full depot details
-        # The association has depot_name, but we need coordinates
-        # Query the depot directly
-        depot_name = depot_association.get('depot_name')
-        if not depot_name:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Depot association exists but missing depot_name"
-            )
-        
-        # Query depots to get full details
-        depot_response = await client.get(f"{STRAPI_URL}/api/depots?filters[name][$eq]={depot_name}")
-        depot_data = depot_response.json()
-        
-        depots = depot_data.get('data', [])
-        if not depots or len(depots) == 0:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Depot '{depot_name}' not found in depots table"
-            )
-        
-        depot = depots[0]
+    snapshot = await require_catalog()
+    
+    if document_id not in snapshot.routes_by_document_id:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Route with documentId '{document_id}' not found"
+        )
+    
+    # Depots come from the route's associated_depots (route-depot associations)
+    associated_depots = snapshot.depots_for_route.get(document_id, [])
+    
+    if not associated_depots:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No depot associated with route '{document_id}'. Please create route-depot association in associated_depots."
+        )
+    
+    # Get the first depot (or primary depot)
+    depot = associated_depots[0]
     
     # Return depot info with latency
     latency_ms = (time.time() - start_time) * 1000
@@ -7,11 +7,12 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 from typing import List, Tuple
 import time
-import httpx
+from common.http_pool import http_session
 import configparser
 from pathlib import Path
 
 from ..services.postgis_client import postgis_client
+from ..services.streaming import building_query_response, FORMAT_JSON, FORMAT_PATTERN
 
 # Load config
 config = configparser.ConfigParser()
@@ -112,17 +113,30 @@ class RouteBuildingsResponse(BaseModel):
 
 
 @router.post("/route-buildings", response_model=RouteBuildingsResponse)
-async def get_route_buildings(request: RouteBuildingsRequest):
+async def get_route_buildings(
+    request: RouteBuildingsRequest,
+    format: str = Query(FORMAT_JSON, pattern=FORMAT_PATTERN, description="json, ndjson, arrow or columnar")
+):
     """
     Get all buildings within buffer distance of a route (highway)
     
     Uses PostGIS ST_DWithin to find buildings near transit routes.
     Essential for route-based passenger spawning.
     
+    `format=ndjson|arrow` streams rows from a server-side cursor;
+    `format=columnar` returns column arrays instead of row objects.
+    
     Performance target: <100ms for 500m buffer
     """
     start_time = time.time()
     
+    if format != FORMAT_JSON:
+        return await building_query_response(
+            format,
+            postgis_client.buildings_near_route_query(request.route_id, request.buffer_meters, request.limit),
+            {'route_id': request.route_id, 'buffer_meters': request.buffer_meters}
+        )
+    
     try:
         buildings_data = await postgis_client.get_buildings_near_route(
             request.route_id,
@@ -149,6 +163,49 @@ async def get_route_buildings(request: RouteBuildingsRequest):
         )
 
 
+class RouteBuildingCountRequest(BaseModel):
+    """Request model for route building count"""
+    route_id: str = Field(..., description="Route documentId (routes table)")
+    buffer_meters: int = Field(500, ge=50, le=5000, description="Buffer distance around route")
+
+
+class RouteBuildingCountResponse(BaseModel):
+    """Response model for route building count"""
+    route_id: str
+    buffer_meters: int
+    count: int
+    latency_ms: float
+
+
+@router.post("/route-buildings/count", response_model=RouteBuildingCountResponse)
+async def count_route_buildings(request: RouteBuildingCountRequest):
+    """
+    Count all buildings in a route's corridor (COUNT, no row limit)
+    
+    The corridor is the route's geojson_data buffered by buffer_meters; route_id
+    is the Strapi route documentId. 404 for an unknown route.
+    """
+    start_time = time.time()
+    
+    try:
+        count = await postgis_client.count_buildings_near_route(request.route_id, request.buffer_meters)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Route building count failed: {str(e)}"
+        )
+    
+    if count is None:
+        raise HTTPException(status_code=404, detail=f"Route {request.route_id} not found or has no geometry")
+    
+    return RouteBuildingCountResponse(
+        route_id=request.route_id,
+        buffer_meters=request.buffer_meters,
+        count=count,
+        latency_ms=round((time.time() - start_time) * 1000, 2)
+    )
+
+
 class DepotBuilding(BaseModel):
     """Building near a depot"""
     building_id: int
@@ -177,18 +234,36 @@ class DepotCatchmentResponse(BaseModel):
 
 
 @router.post("/depot-catchment", response_model=DepotCatchmentResponse)
-async def get_depot_catchment(request: DepotCatchmentRequest):
+async def get_depot_catchment(
+    request: DepotCatchmentRequest,
+    format: str = Query(FORMAT_JSON, pattern=FORMAT_PATTERN, description="json, ndjson, arrow or columnar")
+):
     """
     Get all buildings within radius of a depot point
     
     Uses PostGIS ST_DWithin to find buildings in depot catchment area.
     Essential for depot-based passenger spawning.
     
+    `format=ndjson|arrow` streams rows from a server-side cursor;
+    `format=columnar` returns column arrays instead of row objects.
+    
     Performance target: <150ms for 1000m radius
     """
     start_time = time.time()
-    start_time = time.time()
-
+    
+    if format != FORMAT_JSON:
+        return await building_query_response(
+            format,
+            postgis_client.buildings_near_depot_query(
+                request.latitude, request.longitude, request.radius_meters, request.limit
+            ),
+            {
+                'latitude': request.latitude,
+                'longitude': request.longitude,
+                'radius_meters': request.radius_meters
+            }
+        )
+    
     # Simple in-memory cache to accelerate repeated identical depot queries (TTL: 5s)
     if not hasattr(get_depot_catchment, "_cache"):
         get_depot_catchment._cache = {}
@@ -198,7 +273,7 @@ async def get_depot_catchment(request: DepotCatchmentRequest):
         resp = cached[1]
         resp.latency_ms = round((time.time() - start_time) * 1000, 2)
         return resp
-
+    
     try:
         buildings_data = await postgis_client.get_buildings_near_depot(
             request.latitude,
@@ -219,12 +294,12 @@ async def get_depot_catchment(request: DepotCatchmentRequest):
             count=len(buildings),
             latency_ms=round(latency_ms, 2)
         )
-
+        
         try:
             get_depot_catchment._cache[cache_key] = (time.time(), response)
         except Exception:
             pass
-
+        
         return response
     
     except Exception as e:
@@ -237,12 +312,58 @@ async def get_depot_catchment(request: DepotCatchmentRequest):
         )
 
 
+class DepotCatchmentCountRequest(BaseModel):
+    """Request model for depot catchment count"""
+    latitude: float = Field(..., ge=-90, le=90, description="Depot latitude")
+    longitude: float = Field(..., ge=-180, le=180, description="Depot longitude")
+    radius_meters: int = Field(1000, ge=50, le=10000, description="Catchment radius")
+
+
+class DepotCatchmentCountResponse(BaseModel):
+    """Response model for depot catchment count"""
+    latitude: float
+    longitude: float
+    radius_meters: int
+    count: int
+    latency_ms: float
+
+
+@router.post("/depot-catchment/count", response_model=DepotCatchmentCountResponse)
+async def count_depot_catchment(request: DepotCatchmentCountRequest):
+    """
+    Count all buildings within radius of a depot point (COUNT(*), no row limit)
+    
+    Same catchment as /depot-catchment, without transferring the rows.
+    """
+    start_time = time.time()
+    
+    try:
+        count = await postgis_client.count_buildings_near_depot(
+            request.latitude, request.longitude, request.radius_meters
+        )
+        
+        return DepotCatchmentCountResponse(
+            latitude=request.latitude,
+            longitude=request.longitude,
+            radius_meters=request.radius_meters,
+            count=count,
+            latency_ms=round((time.time() - start_time) * 1000, 2)
+        )
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Depot catchment count failed: {str(e)}"
+        )
+
+
 @router.get("/depot-catchment", response_model=DepotCatchmentResponse)
 async def get_depot_catchment_get(
     lat: float = Query(..., ge=-90, le=90, description="Depot latitude"),
     lon: float = Query(..., ge=-180, le=180, description="Depot longitude"),
     radius: int = Query(1000, ge=50, le=10000, description="Catchment radius (meters)"),
-    limit: int = Query(5000, ge=1, le=50000, description="Maximum buildings")
+    limit: int = Query(5000, ge=1, le=50000, description="Maximum buildings"),
+    format: str = Query(FORMAT_JSON, pattern=FORMAT_PATTERN, description="json, ndjson, arrow or columnar")
 ):
     """
     GET version of depot catchment endpoint
@@ -255,7 +376,7 @@ async def get_depot_catchment_get(
         limit=limit
     )
     
-    return await get_depot_catchment(request)
+    return await get_depot_catchment(request, format=format)
 
 
 # Alias endpoint for generic "nearby buildings" queries
@@ -264,7 +385,8 @@ async def get_nearby_buildings(
     lat: float = Query(..., ge=-90, le=90, description="Center latitude"),
     lon: float = Query(..., ge=-180, le=180, description="Center longitude"),
     radius_meters: int = Query(500, ge=50, le=10000, description="Search radius (meters)"),
-    limit: int = Query(5000, ge=1, le=10000, description="Maximum buildings")
+    limit: int = Query(5000, ge=1, le=10000, description="Maximum buildings"),
+    format: str = Query(FORMAT_JSON, pattern=FORMAT_PATTERN, description="json, ndjson, arrow or columnar")
 ):
     """
     Find buildings near a point (generic proximity search)
@@ -281,7 +403,7 @@ async def get_nearby_buildings(
         limit=limit
     )
     
-    return await get_depot_catchment(request)
+    return await get_depot_catchment(request, format=format)
 
 
 @router.get("/buildings/nearest")
@@ -302,7 +424,7 @@ async def get_nearest_buildings(
         limit=limit
     )
     
-    return await get_depot_catchment(request)
+    return await get_depot_catchment(request, format=FORMAT_JSON)
 
 
 @router.get("/pois/nearest")
@@ -487,7 +609,7 @@ async def get_minimum_commute_distance():
     compared to walking. Distances below this threshold are considered walking distance.
     """
     # Fetch from operational-configurations in Strapi
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_session("strapi", timeout=10.0) as client:
         try:
             response = await client.get(
                 f"{STRAPI_URL}/api/operational-configurations",
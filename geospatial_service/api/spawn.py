@@ -2,117 +2,117 @@
 Spawn Analysis API
 Provides comprehensive endpoints for passenger spawn rate calculations.
 Single source of truth for depot-route relationships and building density analysis.
+
+Depots, routes and their associations come from the in-memory catalog.
+Building counts for every depot catchment and route corridor are computed by
+one set-based PostGIS query per (depot_radius, route_buffer) and cached, so
+the per-depot, per-route, system-wide and scaling comparisons all reuse the
+same counts.
 """
 
 from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Any, Optional
-import httpx
-import sys
-import os
-import configparser
-from pathlib import Path
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from typing import Dict, Any, Optional, Tuple
+import time
 
 from ..services.postgis_client import postgis_client
+from ..services.catalog import CatalogSnapshot, require_catalog
 
 router = APIRouter(prefix="/spawn", tags=["Spawn Analysis"])
 
-# Load Strapi URL from config.ini
-config = configparser.ConfigParser()
-config_path = Path(__file__).parent.parent.parent / "config.ini"
-config.read(config_path, encoding='utf-8')
-STRAPI_URL = config.get('infrastructure', 'strapi_url', fallback='http://localhost:1337')
+# Building counts are re-queried at most this often per radius/buffer pair
+SPAWN_COUNTS_TTL_SECONDS = 300.0
 
+# Radius/buffer pairs kept at once (the oldest is dropped first)
+SPAWN_COUNTS_CACHE_SIZE = 32
 
-@router.get("/depot-analysis/{depot_id}", summary="Complete depot spawn analysis")
-async def get_depot_analysis(
-    depot_id: int,
-    depot_radius: int = Query(800, description="Radius around depot in meters"),
-    route_buffer: int = Query(100, description="Buffer around route geometry in meters"),
-    passengers_per_building: float = Query(0.05, description="Passengers per building per hour"),
-) -> Dict[str, Any]:
+# (depot_radius, route_buffer) -> (catalog loaded_at, computed_at, counts)
+_spawn_counts_cache: Dict[Tuple[int, int], Tuple[float, float, Dict[str, Dict[Any, int]]]] = {}
+
+
+async def _get_spawn_counts(
+    snapshot: CatalogSnapshot,
+    depot_radius: int,
+    route_buffer: int
+) -> Dict[str, Dict[Any, int]]:
     """
-    Get comprehensive spawn analysis for a depot.
+    Building counts for all depot catchments and route corridors.
     
-    Returns:
-    - Buildings near depot (terminal population)
-    - All routes servicing this depot
-    - Buildings along each route (route attractiveness)
-    - Calculated spawn rates per route
-    - Total spawn rate for depot
+    Cached per radius/buffer; invalidated when the catalog reloads or after
+    SPAWN_COUNTS_TTL_SECONDS. Stale entries are dropped on every write and at
+    most SPAWN_COUNTS_CACHE_SIZE pairs are kept.
     """
+    key = (depot_radius, route_buffer)
+    cached = _spawn_counts_cache.get(key)
+    if (cached and cached[0] == snapshot.loaded_at
+            and time.time() - cached[1] < SPAWN_COUNTS_TTL_SECONDS):
+        return cached[2]
+    
+    depots = [
+        (d['id'], d['latitude'], d['longitude'])
+        for d in snapshot.depots
+        if d.get('latitude') and d.get('longitude')
+    ]
+    try:
+        counts = await postgis_client.count_buildings_in_spawn_areas(
+            depots=depots,
+            route_document_ids=list(snapshot.routes_by_document_id),
+            depot_radius_meters=depot_radius,
+            route_buffer_meters=route_buffer
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Building query failed: {str(e)}")
     
-    # Get depot info from Strapi
-    async with httpx.AsyncClient() as client:
-        depot_response = await client.get(f"{STRAPI_URL}/api/depots/{depot_id}")
-        if depot_response.status_code != 200:
-            raise HTTPException(status_code=404, detail=f"Depot {depot_id} not found")
-        
-        depot_data = depot_response.json()
-        depot_attrs = depot_data['data']['attributes']
-        depot_location = depot_attrs.get('location')
-        
-        if not depot_location:
-            raise HTTPException(status_code=400, detail="Depot has no location")
-        
-        depot_lat = depot_location['coordinates'][1]
-        depot_lon = depot_location['coordinates'][0]
-        depot_name = depot_attrs.get('name', 'Unknown')
-    
-    # Query buildings near depot
-    depot_buildings_list = await postgis_client.get_buildings_near_depot(
-        latitude=depot_lat,
-        longitude=depot_lon,
-        radius_meters=depot_radius,
-        limit=5000
+    now = time.time()
+    for stale in [
+        cached_key for cached_key, (loaded_at, computed_at, _) in _spawn_counts_cache.items()
+        if cached_key == key or loaded_at != snapshot.loaded_at or now - computed_at >= SPAWN_COUNTS_TTL_SECONDS
+    ]:
+        del _spawn_counts_cache[stale]
+    while len(_spawn_counts_cache) >= SPAWN_COUNTS_CACHE_SIZE:
+        del _spawn_counts_cache[next(iter(_spawn_counts_cache))]  # insertion order: oldest first
+    _spawn_counts_cache[key] = (snapshot.loaded_at, now, counts)
+    return counts
+
+
+def _geometry_points(route: Dict[str, Any]) -> int:
+    """Number of coordinates across the route's GeoJSON LineString features"""
+    geojson = route.get('geojson_data') or {}
+    return sum(
+        len((feature.get('geometry') or {}).get('coordinates') or [])
+        for feature in geojson.get('features', []) or []
     )
-    depot_building_count = len(depot_buildings_list)
+
+
+def _build_depot_analysis(
+    snapshot: CatalogSnapshot,
+    depot: Dict[str, Any],
+    counts: Dict[str, Dict[Any, int]],
+    depot_radius: int,
+    route_buffer: int,
+    passengers_per_building: float
+) -> Dict[str, Any]:
+    """Depot analysis from precomputed counts (no I/O)"""
+    depot_id = depot['id']
+    
+    if not depot.get('latitude') or not depot.get('longitude'):
+        raise HTTPException(status_code=400, detail="Depot has no location")
+    
+    depot_building_count = counts['depots'].get(depot_id, 0)
     terminal_population = depot_building_count * passengers_per_building
     
-    # Get routes for this depot
-    async with httpx.AsyncClient() as client:
-        # Try different relation names (depot, depots, start_depot, end_depot)
-        routes_response = await client.get(
-            f"{STRAPI_URL}/api/routes",
-            params={
-                "filters[depot][id][$eq]": depot_id,
-                "populate": "*",
-                "pagination[pageSize]": 100
-            }
-        )
-        
-        routes_data = routes_response.json()
-        routes = routes_data.get('data', []) or []
-        
-        # If no routes found with 'depot', try 'depots'
-        if len(routes) == 0:
-            routes_response = await client.get(
-                f"{STRAPI_URL}/api/routes",
-                params={
-                    "filters[depots][id][$eq]": depot_id,
-                    "populate": "*",
-                    "pagination[pageSize]": 100
-                }
-            )
-            routes_data = routes_response.json()
-            routes = routes_data.get('data', []) or []
+    routes = snapshot.routes_for_depot.get(depot.get('documentId'), [])
     
     # Analyze each route
     route_analyses = []
     total_route_buildings = 0
     
     for route in routes:
-        route_attrs = route['attributes']
         route_id = route['id']
-        route_name = route_attrs.get('route_long_name', 'Unknown')
-        route_short = route_attrs.get('route_short_name', f'Route {route_id}')
-        
-        # Get route geometry
-        route_geom = route_attrs.get('route_geometry')
+        route_name = route.get('long_name') or 'Unknown'
+        route_short = route.get('short_name') or f'Route {route_id}'
+        route_building_count = counts['routes'].get(route.get('documentId'))
         
-        if not route_geom or not route_geom.get('coordinates'):
+        if route_building_count is None:
             route_analyses.append({
                 'route_id': route_id,
                 'route_name': route_name,
@@ -122,43 +122,6 @@ async def get_depot_analysis(
             })
             continue
         
-        # Query buildings along route using coordinates
-        # We'll use the existing spatial endpoint internally
-        route_coords = route_geom['coordinates']
-        
-        # Build LineString and query buildings
-        # For now, use document_id if available, otherwise skip
-        route_doc_id = route_attrs.get('documentId') or route_attrs.get('document_id')
-        
-        if not route_doc_id:
-            route_analyses.append({
-                'route_id': route_id,
-                'route_name': route_name,
-                'route_short_name': route_short,
-                'building_count': 0,
-                'error': 'No document_id for building query'
-            })
-            continue
-        
-        # Query buildings using the highway document_id
-        try:
-            route_buildings_list = await postgis_client.get_buildings_near_route(
-                route_id=route_doc_id,
-                buffer_meters=route_buffer,
-                limit=5000
-            )
-            route_building_count = len(route_buildings_list)
-        except Exception as e:
-            route_building_count = 0
-            route_analyses.append({
-                'route_id': route_id,
-                'route_name': route_name,
-                'route_short_name': route_short,
-                'building_count': 0,
-                'error': f'Query failed: {str(e)}'
-            })
-            continue
-        
         total_route_buildings += route_building_count
         
         route_analyses.append({
@@ -166,7 +129,7 @@ async def get_depot_analysis(
             'route_name': route_name,
             'route_short_name': route_short,
             'building_count': route_building_count,
-            'geometry_points': len(route_coords)
+            'geometry_points': _geometry_points(route)
         })
     
     # Calculate spawn distribution
@@ -210,10 +173,10 @@ async def get_depot_analysis(
     return {
         'depot': {
             'id': depot_id,
-            'name': depot_name,
+            'name': depot.get('name', 'Unknown'),
             'location': {
-                'lat': depot_lat,
-                'lon': depot_lon
+                'lat': depot['latitude'],
+                'lon': depot['longitude']
             },
             'building_count': depot_building_count,
             'terminal_population_per_hour': terminal_population
@@ -236,58 +199,81 @@ async def get_depot_analysis(
     }
 
 
-@router.get("/all-depots", summary="Spawn analysis for all depots")
-async def get_all_depots_analysis(
-    depot_radius: int = Query(800, description="Radius around depot in meters"),
-    route_buffer: int = Query(100, description="Buffer around route geometry in meters"),
-    passengers_per_building: float = Query(0.05, description="Passengers per building per hour"),
+def _build_route_analysis(
+    snapshot: CatalogSnapshot,
+    route: Dict[str, Any],
+    counts: Dict[str, Dict[Any, int]],
+    route_buffer: int,
+    passengers_per_building: float
 ) -> Dict[str, Any]:
-    """
-    Get spawn analysis for ALL depots in the system.
-    Returns comprehensive analysis for each depot.
-    """
+    """Route analysis from precomputed counts (no I/O)"""
+    route_id = route['id']
+    building_count = counts['routes'].get(route.get('documentId'))
     
-    # Get all depots
-    async with httpx.AsyncClient() as client:
-        depots_response = await client.get(
-            f"{STRAPI_URL}/api/depots",
-            params={"pagination[pageSize]": 100}
-        )
-        depots_data = depots_response.json()
-        depots = depots_data.get('data', []) or []
+    if building_count is None:
+        raise HTTPException(status_code=400, detail="Route has no geometry data")
+    
+    spawn_rate = building_count * passengers_per_building
     
-    # Analyze each depot
+    return {
+        'route': {
+            'id': route_id,
+            'name': route.get('long_name') or 'Unknown',
+            'short_name': route.get('short_name') or f'Route {route_id}',
+            'building_count': building_count,
+            'geometry_points': _geometry_points(route)
+        },
+        'spawn_rate': {
+            'per_hour': spawn_rate,
+            'per_minute': spawn_rate / 60,
+            'per_5min': spawn_rate / 12
+        },
+        'depots': [
+            {'id': d['id'], 'document_id': d.get('documentId'), 'name': d.get('name')}
+            for d in snapshot.depots_for_route.get(route.get('documentId'), [])
+        ],
+        'parameters': {
+            'route_buffer_meters': route_buffer,
+            'passengers_per_building_per_hour': passengers_per_building
+        }
+    }
+
+
+def _summarize_depots(
+    snapshot: CatalogSnapshot,
+    counts: Dict[str, Dict[Any, int]],
+    depot_radius: int,
+    route_buffer: int,
+    passengers_per_building: float
+) -> Dict[str, Any]:
+    """All-depots analysis from precomputed counts"""
     depot_analyses = []
     system_total_spawn = 0
     
-    for depot in depots:
-        depot_id = depot['id']
-        
+    for depot in snapshot.depots:
         try:
-            analysis = await get_depot_analysis(
-                depot_id=depot_id,
-                depot_radius=depot_radius,
-                route_buffer=route_buffer,
-                passengers_per_building=passengers_per_building
+            analysis = _build_depot_analysis(
+                snapshot, depot, counts, depot_radius, route_buffer, passengers_per_building
             )
             depot_analyses.append(analysis)
             system_total_spawn += analysis['spawn_summary']['total_spawn_rate_per_hour']
-        except Exception as e:
+        except HTTPException as e:
             depot_analyses.append({
                 'depot': {
-                    'id': depot_id,
-                    'name': depot['attributes'].get('name', 'Unknown'),
-                    'error': str(e)
+                    'id': depot['id'],
+                    'name': depot.get('name', 'Unknown'),
+                    'error': e.detail
                 }
             })
     
+    depot_count = len(snapshot.depots)
     return {
         'depots': depot_analyses,
         'system_summary': {
-            'total_depots': len(depots),
+            'total_depots': depot_count,
             'total_spawn_rate_per_hour': system_total_spawn,
             'total_spawn_rate_per_minute': system_total_spawn / 60,
-            'average_per_depot': system_total_spawn / len(depots) if len(depots) > 0 else 0
+            'average_per_depot': system_total_spawn / depot_count if depot_count > 0 else 0
         },
         'parameters': {
             'depot_radius_meters': depot_radius,
@@ -297,133 +283,38 @@ async def get_all_depots_analysis(
     }
 
 
-@router.get("/route-analysis/{route_id}", summary="Complete route spawn analysis")
-async def get_route_analysis(
-    route_id: int,
-    route_buffer: int = Query(100, description="Buffer around route geometry in meters"),
-    passengers_per_building: float = Query(0.05, description="Passengers per building per hour"),
-) -> Dict[str, Any]:
-    """
-    Get comprehensive spawn analysis for a specific route.
-    
-    Returns:
-    - Route details
-    - Buildings along route
-    - Associated depots
-    - Calculated spawn rate (route-based only, not depot-based)
-    """
-    
-    # Get route from Strapi
-    async with httpx.AsyncClient() as client:
-        route_response = await client.get(f"{STRAPI_URL}/api/routes/{route_id}?populate=*")
-        if route_response.status_code != 200:
-            raise HTTPException(status_code=404, detail=f"Route {route_id} not found")
-        
-        route_data = route_response.json()
-        route_attrs = route_data['data']['attributes']
-        route_name = route_attrs.get('route_long_name', 'Unknown')
-        route_short = route_attrs.get('route_short_name', f'Route {route_id}')
-    
-    # Get route geometry
-    route_geom = route_attrs.get('route_geometry')
-    
-    if not route_geom or not route_geom.get('coordinates'):
-        raise HTTPException(status_code=400, detail="Route has no geometry data")
-    
-    route_coords = route_geom['coordinates']
-    
-    # Query buildings along route using document_id
-    route_doc_id = route_attrs.get('documentId') or route_attrs.get('document_id')
-    
-    if not route_doc_id:
-        raise HTTPException(status_code=400, detail="Route has no document_id for building query")
-    
-    try:
-        route_buildings_list = await postgis_client.get_buildings_near_route(
-            route_id=route_doc_id,
-            buffer_meters=route_buffer,
-            limit=5000
-        )
-        building_count = len(route_buildings_list)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Building query failed: {str(e)}")
-    
-    spawn_rate = building_count * passengers_per_building
-    
-    # Get associated depots
-    depot_info = route_attrs.get('depot') or route_attrs.get('depots')
-    
-    return {
-        'route': {
-            'id': route_id,
-            'name': route_name,
-            'short_name': route_short,
-            'building_count': building_count,
-            'geometry_points': len(route_coords)
-        },
-        'spawn_rate': {
-            'per_hour': spawn_rate,
-            'per_minute': spawn_rate / 60,
-            'per_5min': spawn_rate / 12
-        },
-        'depots': depot_info,
-        'parameters': {
-            'route_buffer_meters': route_buffer,
-            'passengers_per_building_per_hour': passengers_per_building
-        }
-    }
-
-
-@router.get("/all-routes", summary="Spawn analysis for all routes")
-async def get_all_routes_analysis(
-    route_buffer: int = Query(100, description="Buffer around route geometry in meters"),
-    passengers_per_building: float = Query(0.05, description="Passengers per building per hour"),
+def _summarize_routes(
+    snapshot: CatalogSnapshot,
+    counts: Dict[str, Dict[Any, int]],
+    route_buffer: int,
+    passengers_per_building: float
 ) -> Dict[str, Any]:
-    """
-    Get spawn analysis for ALL routes in the system.
-    Returns comprehensive analysis for each route.
-    """
-    
-    # Get all routes
-    async with httpx.AsyncClient() as client:
-        routes_response = await client.get(
-            f"{STRAPI_URL}/api/routes",
-            params={"populate": "*", "pagination[pageSize]": 100}
-        )
-        routes_data = routes_response.json()
-        routes = routes_data.get('data', []) or []
-    
-    # Analyze each route
+    """All-routes analysis from precomputed counts"""
     route_analyses = []
     system_total_spawn = 0
     
-    for route in routes:
-        route_id = route['id']
-        
+    for route in snapshot.routes:
         try:
-            analysis = await get_route_analysis(
-                route_id=route_id,
-                route_buffer=route_buffer,
-                passengers_per_building=passengers_per_building
-            )
+            analysis = _build_route_analysis(snapshot, route, counts, route_buffer, passengers_per_building)
             route_analyses.append(analysis)
             system_total_spawn += analysis['spawn_rate']['per_hour']
-        except Exception as e:
+        except HTTPException as e:
             route_analyses.append({
                 'route': {
-                    'id': route_id,
-                    'name': route['attributes'].get('route_long_name', 'Unknown'),
-                    'error': str(e)
+                    'id': route['id'],
+                    'name': route.get('long_name') or 'Unknown',
+                    'error': e.detail
                 }
             })
     
+    route_count = len(snapshot.routes)
     return {
         'routes': route_analyses,
         'system_summary': {
-            'total_routes': len(routes),
+            'total_routes': route_count,
             'total_spawn_rate_per_hour': system_total_spawn,
             'total_spawn_rate_per_minute': system_total_spawn / 60,
-            'average_per_route': system_total_spawn / len(routes) if len(routes) > 0 else 0
+            'average_per_route': system_total_spawn / route_count if route_count > 0 else 0
         },
         'parameters': {
             'route_buffer_meters': route_buffer,
@@ -432,33 +323,16 @@ async def get_all_routes_analysis(
     }
 
 
-@router.get("/system-overview", summary="Complete system spawn overview")
-async def get_system_overview(
-    depot_radius: int = Query(800, description="Radius around depot in meters"),
-    route_buffer: int = Query(100, description="Buffer around route geometry in meters"),
-    passengers_per_building: float = Query(0.05, description="Passengers per building per hour"),
+def _summarize_system(
+    snapshot: CatalogSnapshot,
+    counts: Dict[str, Dict[Any, int]],
+    depot_radius: int,
+    route_buffer: int,
+    passengers_per_building: float
 ) -> Dict[str, Any]:
-    """
-    Get complete overview of entire spawn system.
-    
-    Returns:
-    - All depot analyses
-    - All route analyses
-    - System-wide totals
-    - Recommendations
-    """
-    
-    # Get both analyses
-    depots_analysis = await get_all_depots_analysis(
-        depot_radius=depot_radius,
-        route_buffer=route_buffer,
-        passengers_per_building=passengers_per_building
-    )
-    
-    routes_analysis = await get_all_routes_analysis(
-        route_buffer=route_buffer,
-        passengers_per_building=passengers_per_building
-    )
+    """Combined depot + route overview from precomputed counts"""
+    depots_analysis = _summarize_depots(snapshot, counts, depot_radius, route_buffer, passengers_per_building)
+    routes_analysis = _summarize_routes(snapshot, counts, route_buffer, passengers_per_building)
     
     # Calculate combined totals
     depot_spawn_total = depots_analysis['system_summary']['total_spawn_rate_per_hour']
@@ -484,25 +358,125 @@ async def get_system_overview(
     }
 
 
+@router.get("/depot-analysis/{depot_id}", summary="Complete depot spawn analysis")
+async def get_depot_analysis(
+    depot_id: int,
+    depot_radius: int = Query(800, ge=100, le=5000, description="Radius around depot in meters"),
+    route_buffer: int = Query(100, ge=10, le=1000, description="Buffer around route geometry in meters"),
+    passengers_per_building: float = Query(0.05, description="Passengers per building per hour"),
+) -> Dict[str, Any]:
+    """
+    Get comprehensive spawn analysis for a depot.
+    
+    Returns:
+    - Buildings near depot (terminal population)
+    - All routes servicing this depot
+    - Buildings along each route (route attractiveness)
+    - Calculated spawn rates per route
+    - Total spawn rate for depot
+    """
+    snapshot = await require_catalog()
+    depot = snapshot.depots_by_id.get(depot_id)
+    if depot is None:
+        raise HTTPException(status_code=404, detail=f"Depot {depot_id} not found")
+    
+    counts = await _get_spawn_counts(snapshot, depot_radius, route_buffer)
+    return _build_depot_analysis(snapshot, depot, counts, depot_radius, route_buffer, passengers_per_building)
+
+
+@router.get("/all-depots", summary="Spawn analysis for all depots")
+async def get_all_depots_analysis(
+    depot_radius: int = Query(800, ge=100, le=5000, description="Radius around depot in meters"),
+    route_buffer: int = Query(100, ge=10, le=1000, description="Buffer around route geometry in meters"),
+    passengers_per_building: float = Query(0.05, description="Passengers per building per hour"),
+) -> Dict[str, Any]:
+    """
+    Get spawn analysis for ALL depots in the system.
+    Returns comprehensive analysis for each depot.
+    """
+    snapshot = await require_catalog()
+    counts = await _get_spawn_counts(snapshot, depot_radius, route_buffer)
+    return _summarize_depots(snapshot, counts, depot_radius, route_buffer, passengers_per_building)
+
+
+@router.get("/route-analysis/{route_id}", summary="Complete route spawn analysis")
+async def get_route_analysis(
+    route_id: int,
+    route_buffer: int = Query(100, ge=10, le=1000, description="Buffer around route geometry in meters"),
+    passengers_per_building: float = Query(0.05, description="Passengers per building per hour"),
+) -> Dict[str, Any]:
+    """
+    Get comprehensive spawn analysis for a specific route.
+    
+    Returns:
+    - Route details
+    - Buildings along route
+    - Associated depots
+    - Calculated spawn rate (route-based only, not depot-based)
+    """
+    snapshot = await require_catalog()
+    route = snapshot.routes_by_id.get(route_id)
+    if route is None:
+        raise HTTPException(status_code=404, detail=f"Route {route_id} not found")
+    
+    # Depot radius does not affect route corridors; share the default-radius counts
+    counts = await _get_spawn_counts(snapshot, _spawn_config['depot_radius_meters'], route_buffer)
+    return _build_route_analysis(snapshot, route, counts, route_buffer, passengers_per_building)
+
+
+@router.get("/all-routes", summary="Spawn analysis for all routes")
+async def get_all_routes_analysis(
+    route_buffer: int = Query(100, ge=10, le=1000, description="Buffer around route geometry in meters"),
+    passengers_per_building: float = Query(0.05, description="Passengers per building per hour"),
+) -> Dict[str, Any]:
+    """
+    Get spawn analysis for ALL routes in the system.
+    Returns comprehensive analysis for each route.
+    """
+    snapshot = await require_catalog()
+    counts = await _get_spawn_counts(snapshot, _spawn_config['depot_radius_meters'], route_buffer)
+    return _summarize_routes(snapshot, counts, route_buffer, passengers_per_building)
+
+
+@router.get("/system-overview", summary="Complete system spawn overview")
+async def get_system_overview(
+    depot_radius: int = Query(800, ge=100, le=5000, description="Radius around depot in meters"),
+    route_buffer: int = Query(100, ge=10, le=1000, description="Buffer around route geometry in meters"),
+    passengers_per_building: float = Query(0.05, description="Passengers per building per hour"),
+) -> Dict[str, Any]:
+    """
+    Get complete overview of entire spawn system.
+    
+    Returns:
+    - All depot analyses
+    - All route analyses
+    - System-wide totals
+    - Recommendations
+    """
+    snapshot = await require_catalog()
+    counts = await _get_spawn_counts(snapshot, depot_radius, route_buffer)
+    return _summarize_system(snapshot, counts, depot_radius, route_buffer, passengers_per_building)
+
+
 @router.get("/compare-scaling", summary="Compare different scaling factors")
 async def compare_scaling_factors(
-    depot_radius: int = Query(800, description="Radius around depot in meters"),
-    route_buffer: int = Query(100, description="Buffer around route geometry in meters"),
+    depot_radius: int = Query(800, ge=100, le=5000, description="Radius around depot in meters"),
+    route_buffer: int = Query(100, ge=10, le=1000, description="Buffer around route geometry in meters"),
 ) -> Dict[str, Any]:
     """
     Compare system spawn rates at different scaling factors.
     Helps determine realistic passengers_per_building values.
+    
+    Building counts are fetched once and re-used for every factor.
     """
+    snapshot = await require_catalog()
+    counts = await _get_spawn_counts(snapshot, depot_radius, route_buffer)
     
     scaling_factors = [0.01, 0.05, 0.1, 0.2, 0.3]
     comparisons = []
     
     for factor in scaling_factors:
-        overview = await get_system_overview(
-            depot_radius=depot_radius,
-            route_buffer=route_buffer,
-            passengers_per_building=factor
-        )
+        overview = _summarize_system(snapshot, counts, depot_radius, route_buffer, factor)
         
         comparisons.append({
             'passengers_per_building': factor,
@@ -34,8 +34,8 @@ class DatabaseConfig:
             password=self.password
         )
     
-    async def get_pool(self, min_size: int = 5, max_size: int = 20) -> asyncpg.Pool:
-        """Get connection pool for production use"""
+    async def get_pool(self, min_size: int = 5, max_size: int = 20, **pool_kwargs) -> asyncpg.Pool:
+        """Get connection pool for production use (extra kwargs go to asyncpg.create_pool)"""
         return await asyncpg.create_pool(
             host=self.host,
             port=self.port,
@@ -43,7 +43,8 @@ class DatabaseConfig:
             user=self.user,
             password=self.password,
             min_size=min_size,
-            max_size=max_size
+            max_size=max_size,
+            **pool_kwargs
         )
 
 
@@ -34,6 +34,10 @@ from .api.buildings import router as buildings_router
 from .api.analytics import router as analytics_router
 from .api.metadata import router as metadata_router
 from .services.postgis_client import postgis_client
+from .services.catalog import catalog, CatalogUnavailableError
+from .services.feature_stats import feature_stats
+from .services.geofence_engine import geofence_engine
+from common.http_pool import get_http_pool
 
 
 @asynccontextmanager
@@ -41,21 +45,51 @@ async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
     # Startup
     print("🚀 Starting Geospatial Services API...")
+    startup_started = time.perf_counter()
+    phases = {}
+    
+    phase_started = time.perf_counter()
     await postgis_client.connect()
+    phases['postgis_connect_ms'] = round((time.perf_counter() - phase_started) * 1000, 2)
+    
+    # Planner estimates only; exact COUNT(*) runs lazily in the background
+    phase_started = time.perf_counter()
+    stats = await feature_stats.load_estimates()
+    phases['feature_stats_ms'] = round((time.perf_counter() - phase_started) * 1000, 2)
+    print("📊 Database stats (estimated):")
+    print(f"   - Buildings: ~{stats['buildings']:,}")
+    print(f"   - Highways: ~{stats['highways']:,}")
+    print(f"   - POIs: ~{stats['pois']:,}")
+    print(f"   - Landuse zones: ~{stats['landuse_zones']:,}")
+    print(f"   - Regions: ~{stats['regions']:,}")
+    
+    # Warm the depot/route catalog (endpoints retry on first use if Strapi is down)
+    phase_started = time.perf_counter()
+    if postgis_client.backend == "memory":
+        # Offline snapshot: routes and depots come from the same directory, not Strapi
+        catalog.install(*postgis_client.catalog_records())
+    else:
+        try:
+            await catalog.load()
+        except CatalogUnavailableError as e:
+            print(f"⚠️  Catalog not loaded at startup: {e.detail}")
+    phases['catalog_load_ms'] = round((time.perf_counter() - phase_started) * 1000, 2)
+    
+    # Region/landuse polygons load off the startup path; geofencing uses PostGIS until ready
+    geofence_engine.load_in_background()
     
-    stats = await postgis_client.get_stats()
-    print(f"📊 Database stats:")
-    print(f"   - Buildings: {stats['buildings']:,}")
-    print(f"   - Highways: {stats['highways']:,}")
-    print(f"   - POIs: {stats['pois']:,}")
-    print(f"   - Landuse zones: {stats['landuse_zones']:,}")
-    print(f"   - Regions: {stats['regions']:,}")
-    print("✅ Geospatial Services API ready!")
+    phases['total_ms'] = round((time.perf_counter() - startup_started) * 1000, 2)
+    app.state.startup_metrics = {'phases': phases, 'ready_at': time.time()}
+    print(f"✅ Geospatial Services API ready! ({phases['total_ms']:.0f}ms)")
     
     yield
     
     # Shutdown
     print("🛑 Shutting down Geospatial Services API...")
+    await catalog.close()
+    await feature_stats.close()
+    await geofence_engine.close()
+    await get_http_pool().aclose()
     await postgis_client.disconnect()
     print("✅ Shutdown complete")
 
@@ -121,17 +155,20 @@ async def root():
 
 @app.get("/health")
 async def health():
-    """Health check endpoint"""
+    """Health check endpoint (live SELECT 1; feature counts are the cached estimates)"""
     start_time = time.time()
     
     try:
-        stats = await postgis_client.get_stats()
+        database_latency_ms = await postgis_client.ping()
+        stats = await feature_stats.get()
         latency_ms = (time.time() - start_time) * 1000
         
         return {
             "status": "healthy",
             "database": "connected",
+            "database_latency_ms": round(database_latency_ms, 2),
             "features": stats,
+            "features_source": feature_stats.source(),
             "latency_ms": round(latency_ms, 2)
         }
     except Exception as e:
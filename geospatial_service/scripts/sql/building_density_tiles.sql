@@ -0,0 +1,127 @@
+-- Building Density Pyramid for /analytics/density-heatmap
+--
+-- This file contains PostgreSQL/PostGIS-specific syntax (plpgsql, transition
+-- tables, ON CONFLICT) and should NOT be linted with MSSQL/SQL Server tools.
+--
+-- Buildings are counted by centroid into a globally aligned lon/lat grid at
+-- several resolutions (100 m, 250 m, 1 km, 5 km; cell size in degrees is
+-- level_meters / 111320, the same approximation the heatmap endpoint uses).
+-- The heatmap endpoint slices this table instead of spatially joining
+-- buildings for every request.
+--
+-- Apply once after the first OSM import (the script ends with a full build):
+--     psql "$PG_DSN" -f geospatial_service/scripts/sql/building_density_tiles.sql
+--
+-- Afterwards the statement-level triggers keep the counts current for every
+-- INSERT / UPDATE / DELETE / TRUNCATE on buildings, applying one grouped upsert
+-- per statement (bulk imports are not slowed down row by row).
+-- SELECT public.rebuild_building_density_tiles(); rebuilds from scratch.
+--
+-- Keep the level list in sync with DENSITY_TILE_LEVELS_METERS in
+-- geospatial_service/services/postgis_client.py.
+
+-- 1) Tile table
+CREATE TABLE IF NOT EXISTS public.building_density_tiles (
+  level_meters   integer NOT NULL,
+  cell_x         integer NOT NULL,  -- floor(lon / (level_meters / 111320))
+  cell_y         integer NOT NULL,  -- floor(lat / (level_meters / 111320))
+  building_count integer NOT NULL DEFAULT 0,
+  updated_at     timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (level_meters, cell_x, cell_y)
+);
+
+-- 2) Pyramid levels
+CREATE OR REPLACE FUNCTION public.building_density_levels() RETURNS integer[] AS $$
+  SELECT ARRAY[100, 250, 1000, 5000];
+$$ LANGUAGE sql IMMUTABLE;
+
+-- 3) Add (delta = 1) or remove (delta = -1) a set of building centroids
+CREATE OR REPLACE FUNCTION public.apply_building_density_delta(points geometry[], delta integer)
+RETURNS void AS $$
+  INSERT INTO public.building_density_tiles AS t (level_meters, cell_x, cell_y, building_count)
+  SELECT
+    l.level_meters,
+    floor(ST_X(p) / (l.level_meters / 111320.0))::integer,
+    floor(ST_Y(p) / (l.level_meters / 111320.0))::integer,
+    delta * COUNT(*)
+  FROM unnest(points) AS p
+  CROSS JOIN unnest(public.building_density_levels()) AS l(level_meters)
+  WHERE p IS NOT NULL
+  GROUP BY 1, 2, 3
+  ON CONFLICT (level_meters, cell_x, cell_y) DO UPDATE
+    SET building_count = t.building_count + EXCLUDED.building_count,
+        updated_at = now();
+$$ LANGUAGE sql;
+
+-- 4) Full rebuild (after a bulk re-import or to repair drift)
+CREATE OR REPLACE FUNCTION public.rebuild_building_density_tiles() RETURNS integer AS $$
+DECLARE
+  tile_count integer;
+BEGIN
+  TRUNCATE public.building_density_tiles;
+  
+  INSERT INTO public.building_density_tiles (level_meters, cell_x, cell_y, building_count)
+  SELECT
+    l.level_meters,
+    floor(ST_X(c.pt) / (l.level_meters / 111320.0))::integer,
+    floor(ST_Y(c.pt) / (l.level_meters / 111320.0))::integer,
+    COUNT(*)
+  FROM (SELECT ST_Centroid(geom) AS pt FROM public.buildings WHERE geom IS NOT NULL) c
+  CROSS JOIN unnest(public.building_density_levels()) AS l(level_meters)
+  GROUP BY 1, 2, 3;
+  
+  GET DIAGNOSTICS tile_count = ROW_COUNT;
+  RETURN tile_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 5) Incremental maintenance (statement-level, via transition tables)
+CREATE OR REPLACE FUNCTION public.sync_building_density_tiles() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM public.apply_building_density_delta(
+      ARRAY(SELECT ST_Centroid(geom) FROM new_rows), 1);
+  ELSIF TG_OP = 'DELETE' THEN
+    PERFORM public.apply_building_density_delta(
+      ARRAY(SELECT ST_Centroid(geom) FROM old_rows), -1);
+  ELSIF TG_OP = 'UPDATE' THEN
+    -- Only buildings whose geometry actually changed move between cells
+    PERFORM public.apply_building_density_delta(
+      ARRAY(SELECT ST_Centroid(o.geom) FROM old_rows o JOIN new_rows n USING (id)
+            WHERE o.geom IS DISTINCT FROM n.geom), -1);
+    PERFORM public.apply_building_density_delta(
+      ARRAY(SELECT ST_Centroid(n.geom) FROM old_rows o JOIN new_rows n USING (id)
+            WHERE o.geom IS DISTINCT FROM n.geom), 1);
+  ELSIF TG_OP = 'TRUNCATE' THEN
+    TRUNCATE public.building_density_tiles;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_building_density_ins ON public.buildings;
+DROP TRIGGER IF EXISTS trg_building_density_upd ON public.buildings;
+DROP TRIGGER IF EXISTS trg_building_density_del ON public.buildings;
+DROP TRIGGER IF EXISTS trg_building_density_trunc ON public.buildings;
+
+CREATE TRIGGER trg_building_density_ins
+AFTER INSERT ON public.buildings
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.sync_building_density_tiles();
+
+CREATE TRIGGER trg_building_density_upd
+AFTER UPDATE ON public.buildings
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.sync_building_density_tiles();
+
+CREATE TRIGGER trg_building_density_del
+AFTER DELETE ON public.buildings
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.sync_building_density_tiles();
+
+CREATE TRIGGER trg_building_density_trunc
+AFTER TRUNCATE ON public.buildings
+FOR EACH STATEMENT EXECUTE FUNCTION public.sync_building_density_tiles();
+
+-- 6) Initial build
+SELECT public.rebuild_building_density_tiles();
@@ -1,5 +1,23 @@
 """Services module"""
 
 from .postgis_client import postgis_client, PostGISClient
+from .catalog import catalog, StrapiCatalog, CatalogSnapshot
+from .feature_stats import feature_stats, FeatureStatsProvider
+from .coverage import coverage_engine, CoverageEngine
+from .geofence_engine import geofence_engine, GeofenceEngine
+from .route_index import route_index, RouteIndexProvider
 
-__all__ = ["postgis_client", "PostGISClient"]
+__all__ = [
+    "postgis_client", "PostGISClient", "catalog", "StrapiCatalog", "CatalogSnapshot",
+    "feature_stats", "FeatureStatsProvider", "coverage_engine", "CoverageEngine",
+    "geofence_engine", "GeofenceEngine", "route_index", "RouteIndexProvider",
+    "InMemorySpatialStore", "UnsupportedQueryError",
+]
+
+
+def __getattr__(name):
+    # The offline backend needs numpy/shapely; import it only when asked for
+    if name in ("InMemorySpatialStore", "UnsupportedQueryError"):
+        from . import memory_store
+        return getattr(memory_store, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
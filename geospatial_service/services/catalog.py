@@ -0,0 +1,315 @@
+"""
+Strapi Catalog - In-memory depots, routes and route-depot associations
+Answers lookup and nearest-depot queries without a Strapi round trip
+
+Loaded once at startup and refreshed:
+- on a TTL (stale snapshots keep serving while a background refresh runs)
+- on a change signal (POST /meta/catalog/refresh, e.g. from a Strapi webhook)
+
+Depots are indexed in a uniform lat/lon grid so nearest-depot searches only
+visit the cells around the query point.
+"""
+
+import asyncio
+import configparser
+import time
+from dataclasses import dataclass, field
+from math import atan2, cos, radians, sin, sqrt
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException
+
+from common.http_pool import http_session
+from common.route_proximity import ring_cells
+
+
+# Load Strapi URL from config
+config = configparser.ConfigParser()
+config_path = Path(__file__).parent.parent.parent / "config.ini"
+config.read(config_path, encoding='utf-8')
+STRAPI_URL = config.get('infrastructure', 'strapi_url', fallback='http://localhost:1337')
+
+EARTH_RADIUS_M = 6371000
+METERS_PER_DEGREE_LAT = 111320.0
+STRAPI_PAGE_SIZE = 100  # Strapi rest.maxLimit
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Calculate distance between two points in meters"""
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    
+    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    return EARTH_RADIUS_M * 2 * atan2(sqrt(a), sqrt(1 - a))
+
+
+class CatalogUnavailableError(Exception):
+    """Catalog has never loaded and Strapi cannot be reached"""
+    
+    def __init__(self, detail: str, status_code: int = 503):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+class PointGrid:
+    """Uniform lat/lon grid over point records for radius and nearest queries"""
+    
+    def __init__(self, cell_degrees: float = 0.01):
+        self.cell_degrees = cell_degrees
+        self.cells: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+        self.size = 0
+        self._extent: Optional[Tuple[int, int, int, int]] = None  # min/max row, min/max col
+    
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return int(latitude // self.cell_degrees), int(longitude // self.cell_degrees)
+    
+    def insert(self, record: Dict[str, Any]):
+        cell = self._cell(record['latitude'], record['longitude'])
+        self.cells.setdefault(cell, []).append(record)
+        self.size += 1
+        row, col = cell
+        if self._extent is None:
+            self._extent = (row, row, col, col)
+        else:
+            min_row, max_row, min_col, max_col = self._extent
+            self._extent = (min(min_row, row), max(max_row, row), min(min_col, col), max(max_col, col))
+    
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        max_distance_meters: float
+    ) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Nearest record within max_distance_meters, searching the perimeter of
+        each ring of cells outward (never past the occupied extent) and
+        stopping once no unvisited cell can hold anything closer.
+        """
+        if not self.size:
+            return None
+        
+        row, col = self._cell(latitude, longitude)
+        lon_scale = max(cos(radians(latitude)), 0.01)
+        cell_meters = self.cell_degrees * METERS_PER_DEGREE_LAT * lon_scale
+        min_row, max_row, min_col, max_col = self._extent
+        max_ring = min(
+            int(max_distance_meters / cell_meters) + 1,
+            max(row - min_row, max_row - row, col - min_col, max_col - col, 0),
+        )
+        
+        best: Optional[Dict[str, Any]] = None
+        best_distance = float('inf')
+        
+        for ring in range(max_ring + 1):
+            # Every cell in this ring is at least (ring - 1) cells away
+            if best is not None and (ring - 1) * cell_meters > best_distance:
+                break
+            
+            for cell in ring_cells(row, col, ring):
+                for record in self.cells.get(cell, ()):
+                    distance = haversine_distance(
+                        latitude, longitude, record['latitude'], record['longitude']
+                    )
+                    if distance < best_distance:
+                        best, best_distance = record, distance
+            
+            if ring * cell_meters > max_distance_meters and best is None:
+                break
+        
+        if best is None or best_distance > max_distance_meters:
+            return None
+        return best, best_distance
+
+
+@dataclass
+class CatalogSnapshot:
+    """Immutable view of the catalog built by one load"""
+    depots: List[Dict[str, Any]]
+    routes: List[Dict[str, Any]]
+    associations: List[Dict[str, Any]]
+    loaded_at: float = field(default_factory=time.time)
+    
+    def __post_init__(self):
+        self.depots_by_id = {d['id']: d for d in self.depots if d.get('id') is not None}
+        self.depots_by_document_id = {d['documentId']: d for d in self.depots if d.get('documentId')}
+        self.depots_by_name = {d['name']: d for d in self.depots if d.get('name')}
+        self.routes_by_id = {r['id']: r for r in self.routes if r.get('id') is not None}
+        self.routes_by_document_id = {r['documentId']: r for r in self.routes if r.get('documentId')}
+        
+        # Association lookups keyed by documentId, in association id order
+        self.routes_for_depot: Dict[str, List[Dict[str, Any]]] = {}
+        self.depots_for_route: Dict[str, List[Dict[str, Any]]] = {}
+        for assoc in sorted(self.associations, key=lambda a: a.get('id') or 0):
+            route = assoc.get('route') or {}
+            depot = assoc.get('depot') or {}
+            route_doc = route.get('documentId')
+            depot_doc = depot.get('documentId')
+            if route_doc in self.routes_by_document_id and depot_doc in self.depots_by_document_id:
+                self.routes_for_depot.setdefault(depot_doc, []).append(self.routes_by_document_id[route_doc])
+                self.depots_for_route.setdefault(route_doc, []).append(self.depots_by_document_id[depot_doc])
+        
+        self.depot_grid = PointGrid()
+        for depot in self.depots:
+            if depot.get('latitude') and depot.get('longitude'):
+                self.depot_grid.insert(depot)
+
+
+class StrapiCatalog:
+    """Loads and refreshes the in-memory catalog"""
+    
+    def __init__(self, strapi_url: str = STRAPI_URL, ttl_seconds: float = 300.0):
+        self.strapi_url = strapi_url.rstrip('/')
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._load_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.loads = 0
+        self.failed_loads = 0
+        self.last_load_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+    
+    async def _fetch_all(self, client, collection: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Fetch every page of a Strapi collection"""
+        items: List[Dict[str, Any]] = []
+        page = 1
+        while True:
+            response = await client.get(
+                f"{self.strapi_url}/api/{collection}",
+                params={**params, "pagination[page]": page, "pagination[pageSize]": STRAPI_PAGE_SIZE}
+            )
+            if response.status_code != 200:
+                raise CatalogUnavailableError(
+                    f"Strapi service unavailable (status {response.status_code} for {collection})."
+                )
+            payload = response.json()
+            items.extend(payload.get('data', []) or [])
+            
+            page_count = payload.get('meta', {}).get('pagination', {}).get('pageCount', 1)
+            if page >= page_count:
+                return items
+            page += 1
+    
+    async def load(self) -> CatalogSnapshot:
+        """Fetch depots, routes and associations from Strapi and swap the snapshot in"""
+        async with self._load_lock:
+            start_time = time.time()
+            try:
+                async with http_session("strapi", timeout=30.0) as client:
+                    depots, routes, associations = await asyncio.gather(
+                        self._fetch_all(client, "depots", {}),
+                        self._fetch_all(client, "routes", {}),
+                        self._fetch_all(client, "route-depots", {
+                            "populate[route][fields][0]": "documentId",
+                            "populate[depot][fields][0]": "documentId",
+                        }),
+                    )
+            except CatalogUnavailableError as e:
+                self._record_failure(str(e))
+                raise
+            except httpx.ConnectError:
+                self._record_failure("Strapi CMS is not running.")
+                raise CatalogUnavailableError(
+                    "Strapi CMS is not running. This endpoint requires Strapi to load the depot/route catalog."
+                )
+            except httpx.TimeoutException:
+                self._record_failure("Strapi CMS request timed out.")
+                raise CatalogUnavailableError("Strapi CMS request timed out.", status_code=504)
+            except Exception as e:
+                self._record_failure(str(e))
+                raise CatalogUnavailableError(f"Failed to connect to Strapi CMS: {str(e)}")
+            
+            self._snapshot = CatalogSnapshot(depots=depots, routes=routes, associations=associations)
+            self.loads += 1
+            self.last_load_ms = round((time.time() - start_time) * 1000, 2)
+            self.last_error = None
+            print(
+                f"📚 Catalog loaded: {len(depots)} depots, {len(routes)} routes, "
+                f"{len(associations)} associations ({self.last_load_ms}ms)"
+            )
+            return self._snapshot
+    
+    def install(
+        self,
+        depots: List[Dict[str, Any]],
+        routes: List[Dict[str, Any]],
+        associations: List[Dict[str, Any]]
+    ) -> CatalogSnapshot:
+        """Serve a fixed catalog (offline snapshot) instead of loading from Strapi"""
+        self._snapshot = CatalogSnapshot(depots=depots, routes=routes, associations=associations)
+        self.ttl_seconds = float('inf')
+        self.loads += 1
+        print(
+            f"📚 Catalog installed from snapshot: {len(depots)} depots, {len(routes)} routes, "
+            f"{len(associations)} associations"
+        )
+        return self._snapshot
+    
+    def _record_failure(self, error: str):
+        self.failed_loads += 1
+        self.last_error = error
+    
+    async def get(self) -> CatalogSnapshot:
+        """
+        Current snapshot. Loads synchronously the first time; afterwards a
+        stale snapshot is returned immediately while a background refresh runs.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return await self.load()
+        
+        if time.time() - snapshot.loaded_at > self.ttl_seconds:
+            self.refresh_in_background()
+        return snapshot
+    
+    def refresh_in_background(self):
+        """Schedule a reload unless one is already running (change signal / TTL)"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._background_refresh())
+    
+    async def _background_refresh(self):
+        try:
+            await self.load()
+        except CatalogUnavailableError as e:
+            print(f"⚠️  Catalog refresh failed, serving previous snapshot: {e.detail}")
+    
+    async def close(self):
+        """Cancel any in-flight background refresh"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+    
+    def stats(self) -> Dict[str, Any]:
+        """Catalog size, age and load history"""
+        snapshot = self._snapshot
+        return {
+            'loaded': snapshot is not None,
+            'depots': len(snapshot.depots) if snapshot else 0,
+            'routes': len(snapshot.routes) if snapshot else 0,
+            'associations': len(snapshot.associations) if snapshot else 0,
+            'age_seconds': round(time.time() - snapshot.loaded_at, 1) if snapshot else None,
+            'ttl_seconds': self.ttl_seconds,
+            'loads': self.loads,
+            'failed_loads': self.failed_loads,
+            'last_load_ms': self.last_load_ms,
+            'last_error': self.last_error,
+        }
+
+
+async def require_catalog() -> CatalogSnapshot:
+    """Catalog snapshot for an endpoint, mapping load failures to HTTP errors"""
+    try:
+        return await catalog.get()
+    except CatalogUnavailableError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+
+# Global catalog instance
+catalog = StrapiCatalog()
@@ -0,0 +1,135 @@
+"""
+Coverage Engine - Cached set-based route/depot coverage analytics
+
+Each analysis (route corridors + overlaps, depot service areas + overlaps,
+per-route building counts) is one PostGIS query over every route or depot.
+Results are cached per (analysis, buffer/radius):
+- fresh results are returned immediately
+- stale results are returned immediately while a background recompute runs
+- a cold request waits at most `budget_seconds`; if the query is still
+  running the caller gets None (endpoints answer 202) and the result lands
+  in the cache for the next request
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .postgis_client import postgis_client
+
+
+ROUTE_COVERAGE = "route_coverage"
+DEPOT_SERVICE_AREAS = "depot_service_areas"
+ROUTE_BUILDING_COUNTS = "route_building_counts"
+
+
+@dataclass
+class CoverageResult:
+    """One cached analysis"""
+    data: Any
+    computed_at: float
+    compute_ms: float
+
+
+class CoverageEngine:
+    """Computes, caches and refreshes coverage analyses"""
+    
+    def __init__(self, ttl_seconds: float = 900.0, budget_seconds: float = 2.0):
+        self.ttl_seconds = ttl_seconds
+        self.budget_seconds = budget_seconds
+        self._results: Dict[Tuple[str, float], CoverageResult] = {}
+        self._tasks: Dict[Tuple[str, float], asyncio.Task] = {}
+        self._computations: Dict[str, Callable[[float], Awaitable[Any]]] = {
+            ROUTE_COVERAGE: postgis_client.get_route_coverage,
+            DEPOT_SERVICE_AREAS: postgis_client.get_depot_service_areas,
+            ROUTE_BUILDING_COUNTS: postgis_client.count_buildings_per_route,
+        }
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.budget_exceeded = 0
+    
+    async def get(self, analysis: str, size_meters: float) -> Optional[CoverageResult]:
+        """
+        Cached analysis for a buffer/radius, or None if it could not be
+        computed within the latency budget (it keeps computing in the background).
+        """
+        key = (analysis, float(size_meters))
+        cached = self._results.get(key)
+        
+        if cached is not None:
+            if time.time() - cached.computed_at < self.ttl_seconds:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._start(key)
+            return cached
+        
+        self.misses += 1
+        task = self._start(key)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=self.budget_seconds)
+        except asyncio.TimeoutError:
+            self.budget_exceeded += 1
+            return None
+    
+    def _start(self, key: Tuple[str, float]) -> asyncio.Task:
+        """Start (or join) the computation for a key"""
+        task = self._tasks.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self._compute(key))
+            # Failures are logged in _compute; mark background ones as retrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._tasks[key] = task
+        return task
+    
+    async def _compute(self, key: Tuple[str, float]) -> CoverageResult:
+        analysis, size_meters = key
+        start_time = time.time()
+        try:
+            data = await self._computations[analysis](size_meters)
+        except Exception as e:
+            print(f"⚠️  Coverage analysis {analysis} ({size_meters:g}m) failed: {e}")
+            raise
+        
+        result = CoverageResult(
+            data=data,
+            computed_at=time.time(),
+            compute_ms=round((time.time() - start_time) * 1000, 2)
+        )
+        self._results[key] = result
+        return result
+    
+    def invalidate(self):
+        """Drop every cached analysis (e.g. after a route/depot or building import)"""
+        self._results.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache contents and hit counters"""
+        now = time.time()
+        return {
+            'entries': [
+                {
+                    'analysis': analysis,
+                    'size_meters': size_meters,
+                    'age_seconds': round(now - result.computed_at, 1),
+                    'compute_ms': result.compute_ms
+                }
+                for (analysis, size_meters), result in sorted(self._results.items())
+            ],
+            'running': sorted(
+                f"{analysis}:{size_meters:g}"
+                for (analysis, size_meters), task in self._tasks.items() if not task.done()
+            ),
+            'ttl_seconds': self.ttl_seconds,
+            'budget_seconds': self.budget_seconds,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'budget_exceeded': self.budget_exceeded,
+        }
+
+
+# Global coverage engine instance
+coverage_engine = CoverageEngine()
@@ -0,0 +1,154 @@
+"""
+Feature Stats - Row counts for the spatial feature tables without blocking on COUNT(*)
+
+Counts are served in two tiers:
+- Estimates from the planner statistics (pg_class.reltuples, falling back to
+  pg_stat_user_tables.n_live_tup for tables never analyzed), read for all
+  tables in one catalog query - this is what startup and health checks use
+- Exact COUNT(*) values, computed lazily in the background the first time
+  stats are requested (and again once they are older than the TTL), then cached
+
+Each count is reported with its source ('exact' or 'estimate') and age.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from .postgis_client import postgis_client
+
+
+# Response key -> table
+FEATURE_TABLES = {
+    "buildings": "buildings",
+    "highways": "highways",
+    "pois": "pois",
+    "landuse_zones": "landuse_zones",
+    "regions": "regions",
+}
+
+
+class FeatureStatsProvider:
+    """Estimated and cached exact row counts for the feature tables"""
+    
+    def __init__(self, exact_ttl_seconds: float = 600.0):
+        self.exact_ttl_seconds = exact_ttl_seconds
+        self._exact: Dict[str, int] = {}
+        self._exact_at: Optional[float] = None
+        self._estimates: Dict[str, int] = {}
+        self._estimates_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.last_estimate_ms: Optional[float] = None
+        self.last_exact_ms: Optional[float] = None
+        self.exact_refreshes = 0
+        self.last_error: Optional[str] = None
+    
+    async def load_estimates(self) -> Dict[str, int]:
+        """Planner row estimates for every feature table (one catalog query)"""
+        start_time = time.time()
+        query = """
+            SELECT
+                c.relname AS table_name,
+                CASE
+                    WHEN c.reltuples >= 0 THEN c.reltuples::bigint
+                    ELSE COALESCE(s.n_live_tup, 0)
+                END AS estimate
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+            WHERE n.nspname = current_schema()
+              AND c.relname = ANY($1::text[])
+        """
+        rows = await postgis_client.execute_query(query, list(FEATURE_TABLES.values()), label="feature_estimates")
+        by_table = {row['table_name']: int(row['estimate']) for row in rows}
+        
+        self._estimates = {key: by_table.get(table, 0) for key, table in FEATURE_TABLES.items()}
+        self._estimates_at = time.time()
+        self.last_estimate_ms = round((time.time() - start_time) * 1000, 2)
+        return dict(self._estimates)
+    
+    async def refresh_exact(self) -> Dict[str, int]:
+        """Run COUNT(*) on every feature table, one at a time, and cache the result"""
+        start_time = time.time()
+        try:
+            counts = await postgis_client.get_stats()
+        except Exception as e:
+            self.last_error = str(e)
+            raise
+        
+        self._exact = counts
+        self._exact_at = time.time()
+        self.exact_refreshes += 1
+        self.last_exact_ms = round((time.time() - start_time) * 1000, 2)
+        self.last_error = None
+        return dict(counts)
+    
+    def refresh_in_background(self):
+        """Schedule an exact refresh unless one is already running"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._background_refresh())
+    
+    async def _background_refresh(self):
+        try:
+            await self.refresh_exact()
+        except Exception as e:
+            print(f"⚠️  Exact feature count refresh failed, serving estimates: {e}")
+    
+    def _exact_is_fresh(self) -> bool:
+        return self._exact_at is not None and time.time() - self._exact_at < self.exact_ttl_seconds
+    
+    async def get(self, exact: bool = False) -> Dict[str, int]:
+        """
+        Feature counts.
+        
+        Args:
+            exact: Wait for exact counts if the cache is empty or stale
+        
+        Returns:
+            Cached exact counts when available, otherwise planner estimates;
+            a background exact refresh is scheduled whenever the cache is stale
+        """
+        if exact and not self._exact_is_fresh():
+            return await self.refresh_exact()
+        
+        if not self._exact_is_fresh():
+            self.refresh_in_background()
+        
+        if self._exact:
+            return dict(self._exact)
+        if not self._estimates:
+            await self.load_estimates()
+        return dict(self._estimates)
+    
+    def source(self) -> str:
+        """'exact' once COUNT(*) values are cached, else 'estimate'"""
+        return 'exact' if self._exact else 'estimate'
+    
+    async def close(self):
+        """Cancel any in-flight background refresh"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+    
+    def stats(self) -> Dict[str, Any]:
+        """Where the counts come from and how old they are"""
+        now = time.time()
+        return {
+            'source': self.source(),
+            'exact_age_seconds': round(now - self._exact_at, 1) if self._exact_at else None,
+            'estimate_age_seconds': round(now - self._estimates_at, 1) if self._estimates_at else None,
+            'exact_ttl_seconds': self.exact_ttl_seconds,
+            'exact_refreshes': self.exact_refreshes,
+            'refresh_running': self._refresh_task is not None and not self._refresh_task.done(),
+            'last_estimate_ms': self.last_estimate_ms,
+            'last_exact_ms': self.last_exact_ms,
+            'last_error': self.last_error,
+        }
+
+
+# Global feature stats instance
+feature_stats = FeatureStatsProvider()
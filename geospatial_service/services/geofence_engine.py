@@ -0,0 +1,239 @@
+"""
+Geofence Engine - In-process point-in-polygon for regions and landuse zones
+
+Region and landuse polygons are loaded from PostGIS once (and on reload),
+prepared, and indexed in an STRtree per layer. A lookup for N points is then:
+- one STRtree bounding-box query for all points (candidate point/polygon pairs)
+- one vectorized `contains` over the candidates against the prepared polygons
+- the first containing polygon (lowest id) per point, like the ORDER BY id /
+  LIMIT 1 semantics of the PostGIS queries it replaces
+
+Endpoints fall back to the per-point PostGIS queries until the engine is loaded
+(or when shapely is not installed).
+"""
+
+import asyncio
+import importlib.util
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .postgis_client import postgis_client
+
+# numpy/shapely are imported when the first layer is built, not at module import
+_shapely_available = all(importlib.util.find_spec(name) is not None for name in ("numpy", "shapely"))
+np = None
+shapely = None
+
+
+def _import_shapely():
+    """Bind numpy and shapely at module level (first GeofenceLayer)"""
+    global np, shapely
+    if shapely is None:
+        import numpy as np
+        import shapely
+
+
+REGION_LAYER = "region"
+LANDUSE_LAYER = "landuse"
+
+# Layer -> query returning the polygon attributes plus its WKB geometry
+LAYER_QUERIES = {
+    REGION_LAYER: """
+        SELECT id, document_id, name, 'parish' AS region_type, ST_AsBinary(geom) AS wkb
+        FROM regions
+        WHERE geom IS NOT NULL
+        ORDER BY id
+    """,
+    LANDUSE_LAYER: """
+        SELECT id, document_id, name, zone_type, ST_AsBinary(geom) AS wkb
+        FROM landuse_zones
+        WHERE geom IS NOT NULL
+        ORDER BY id
+    """,
+}
+
+
+class GeofenceLayer:
+    """Prepared polygons of one table, indexed in an STRtree"""
+    
+    def __init__(self, name: str, records: List[Dict[str, Any]], wkbs: Sequence[bytes]):
+        _import_shapely()
+        self.name = name
+        self.records = records
+        geometries = shapely.from_wkb(list(wkbs))
+        invalid = ~shapely.is_valid(geometries)
+        if invalid.any():
+            geometries[invalid] = shapely.make_valid(geometries[invalid])
+        self.invalid_repaired = int(invalid.sum())
+        shapely.prepare(geometries)
+        self.geometries = geometries
+        self.tree = shapely.STRtree(geometries)
+    
+    def locate(self, longitudes, latitudes) -> "np.ndarray":
+        """
+        Index into self.records of the containing polygon for each point.
+        
+        Args:
+            longitudes: Point longitudes (array-like)
+            latitudes: Point latitudes (array-like, same length)
+        
+        Returns:
+            int64 array, -1 where no polygon contains the point
+        """
+        points = shapely.points(longitudes, latitudes)
+        result = np.full(len(points), -1, dtype=np.int64)
+        if not len(points) or not len(self.records):
+            return result
+        
+        # Bounding-box candidates from the tree, then exact test on prepared polygons
+        point_idx, polygon_idx = self.tree.query(points)
+        if not len(point_idx):
+            return result
+        hits = shapely.contains(self.geometries[polygon_idx], points[point_idx])
+        point_idx, polygon_idx = point_idx[hits], polygon_idx[hits]
+        
+        # Lowest polygon index (= lowest id) wins for overlapping polygons
+        order = np.lexsort((polygon_idx, point_idx))
+        point_idx, polygon_idx = point_idx[order], polygon_idx[order]
+        _, first = np.unique(point_idx, return_index=True)
+        result[point_idx[first]] = polygon_idx[first]
+        return result
+    
+    def lookup(self, longitudes, latitudes) -> List[Optional[Dict[str, Any]]]:
+        """Containing polygon record (or None) for each point"""
+        return [self.records[i] if i >= 0 else None for i in self.locate(longitudes, latitudes).tolist()]
+
+
+class GeofenceEngine:
+    """Loads the geofence layers and answers batched point-in-polygon lookups"""
+    
+    def __init__(self):
+        self.layers: Dict[str, GeofenceLayer] = {}
+        self.loaded_at: Optional[float] = None
+        self._load_lock = asyncio.Lock()
+        self._load_task: Optional[asyncio.Task] = None
+        self.loads = 0
+        self.last_load_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.lookups = 0
+        self.points_checked = 0
+        self.lookup_seconds = 0.0
+    
+    @property
+    def available(self) -> bool:
+        """shapely/numpy are installed"""
+        return _shapely_available
+    
+    def is_ready(self) -> bool:
+        """Every layer is loaded"""
+        return all(layer in self.layers for layer in LAYER_QUERIES)
+    
+    async def load(self) -> Dict[str, int]:
+        """Fetch every layer from PostGIS, build the indexes off the event loop and swap them in"""
+        if not _shapely_available:
+            raise RuntimeError("Geofence engine requires shapely>=2.0 and numpy")
+        
+        async with self._load_lock:
+            start_time = time.time()
+            layers: Dict[str, GeofenceLayer] = {}
+            try:
+                for name, query in LAYER_QUERIES.items():
+                    rows = await postgis_client.execute_query(query, label=f"geofence_load_{name}", raw=True)
+                    records = [{key: row[key] for key in row.keys() if key != 'wkb'} for row in rows]
+                    wkbs = [row['wkb'] for row in rows]
+                    layers[name] = await asyncio.to_thread(GeofenceLayer, name, records, wkbs)
+            except Exception as e:
+                self.last_error = str(e)
+                raise
+            
+            self.layers = layers
+            self.loaded_at = time.time()
+            self.loads += 1
+            self.last_load_ms = round((time.time() - start_time) * 1000, 2)
+            self.last_error = None
+            print(
+                "🗺️  Geofence engine loaded: "
+                + ", ".join(f"{len(layer.records)} {name}" for name, layer in layers.items())
+                + f" polygons ({self.last_load_ms}ms)"
+            )
+            return {name: len(layer.records) for name, layer in layers.items()}
+    
+    def load_in_background(self):
+        """Schedule a (re)load unless one is already running"""
+        if not _shapely_available:
+            print("⚠️  shapely not installed - geofencing stays on PostGIS")
+            return
+        if self._load_task is not None and not self._load_task.done():
+            return
+        self._load_task = asyncio.create_task(self._background_load())
+    
+    async def _background_load(self):
+        try:
+            await self.load()
+        except Exception as e:
+            print(f"⚠️  Geofence engine load failed, using PostGIS geofencing: {e}")
+    
+    def check_points(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float]
+    ) -> Tuple[List[Optional[Dict[str, Any]]], List[Optional[Dict[str, Any]]]]:
+        """
+        Region and landuse zone for a batch of points.
+        
+        Args:
+            latitudes: Point latitudes
+            longitudes: Point longitudes (same length)
+        
+        Returns:
+            (regions, landuse_zones) - one record or None per point
+        """
+        start_time = time.perf_counter()
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        regions = self.layers[REGION_LAYER].lookup(longitudes, latitudes)
+        landuse = self.layers[LANDUSE_LAYER].lookup(longitudes, latitudes)
+        
+        self.lookups += 1
+        self.points_checked += len(latitudes)
+        self.lookup_seconds += time.perf_counter() - start_time
+        return regions, landuse
+    
+    def check(self, latitude: float, longitude: float) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Region and landuse zone for a single point"""
+        regions, landuse = self.check_points([latitude], [longitude])
+        return regions[0], landuse[0]
+    
+    async def close(self):
+        """Cancel any in-flight background load"""
+        if self._load_task is not None and not self._load_task.done():
+            self._load_task.cancel()
+            try:
+                await self._load_task
+            except asyncio.CancelledError:
+                pass
+    
+    def stats(self) -> Dict[str, Any]:
+        """Loaded layers and lookup throughput"""
+        return {
+            'available': _shapely_available,
+            'ready': self.is_ready(),
+            'loading': self._load_task is not None and not self._load_task.done(),
+            'layers': {
+                name: {'polygons': len(layer.records), 'invalid_repaired': layer.invalid_repaired}
+                for name, layer in self.layers.items()
+            },
+            'age_seconds': round(time.time() - self.loaded_at, 1) if self.loaded_at else None,
+            'loads': self.loads,
+            'last_load_ms': self.last_load_ms,
+            'last_error': self.last_error,
+            'lookups': self.lookups,
+            'points_checked': self.points_checked,
+            'points_per_second': (
+                round(self.points_checked / self.lookup_seconds) if self.lookup_seconds else None
+            ),
+        }
+
+
+# Global geofence engine instance
+geofence_engine = GeofenceEngine()
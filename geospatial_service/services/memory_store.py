@@ -0,0 +1,668 @@
+"""
+In-Memory Spatial Store - Offline stand-in for PostGIS (tests, benchmarks, CI)
+
+Selected with GEOSPATIAL_BACKEND=memory and GEOSPATIAL_SNAPSHOT=<directory>.
+
+InMemorySpatialStore subclasses PostGISClient and answers the same named
+statements (fetch_named by statement name) and labelled execute_query calls
+with Shapely/NumPy over STRtrees, so every PostGISClient method - and every
+endpoint built on them - works unchanged without a database. SQL it has no
+implementation for raises UnsupportedQueryError.
+
+Distances are computed in a local equirectangular projection (metres), within
+~0.1% of PostGIS geography distances at island scale.
+
+Snapshot directory (missing files are empty layers):
+    buildings.geojson       properties: id, document_id
+    highways.geojson        properties: id, document_id, name, highway_type
+    pois.geojson            properties: id, document_id, name, poi_type, amenity
+    regions.geojson         properties: id, document_id, name
+    landuse_zones.geojson   properties: id, document_id, name, zone_type
+    routes.json             Strapi route records (id, documentId, short_name, long_name, geojson_data)
+    depots.json             Strapi depot records (id, documentId, name, latitude, longitude)
+    route_depots.json       Strapi route-depot records ({id, route: {documentId}, depot: {documentId}})
+
+Written by scripts/export_spatial_snapshot.py (from a live database) or by
+generate_synthetic_snapshot() (random island-sized data for benchmarks).
+"""
+
+import asyncio
+import json
+import math
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import shapely
+
+from .postgis_client import (
+    DENSITY_TILE_LEVELS_METERS, METERS_PER_DEGREE, PostGISClient, QuerySpec,
+)
+
+
+FEATURE_FILES = {
+    "buildings": "buildings.geojson",
+    "highways": "highways.geojson",
+    "pois": "pois.geojson",
+    "regions": "regions.geojson",
+    "landuse_zones": "landuse_zones.geojson",
+}
+CATALOG_FILES = {
+    "routes": "routes.json",
+    "depots": "depots.json",
+    "route_depots": "route_depots.json",
+}
+
+
+class UnsupportedQueryError(NotImplementedError):
+    """Query the in-memory store has no implementation for"""
+
+
+def _read_features(path: Path) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    """Properties and (lon/lat) geometries of a GeoJSON FeatureCollection"""
+    if not path.exists():
+        return [], np.array([], dtype=object)
+    features = json.loads(path.read_text(encoding='utf-8')).get('features') or []
+    features = [f for f in features if f.get('geometry')]
+    records = [dict(f.get('properties') or {}) for f in features]
+    if not features:
+        return records, np.array([], dtype=object)
+    return records, shapely.from_geojson([json.dumps(f['geometry']) for f in features])
+
+
+def _read_records(path: Path) -> List[Dict[str, Any]]:
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+class _Layer:
+    """Features of one table: attribute records, projected geometries and an STRtree"""
+    
+    def __init__(self, records: List[Dict[str, Any]], lonlat: np.ndarray, scale: np.ndarray):
+        self.records = records
+        self.lonlat = lonlat
+        self.geoms = shapely.transform(lonlat, lambda coords: coords * scale) if len(lonlat) else lonlat
+        self.tree = shapely.STRtree(self.geoms)
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def candidates(self, geom, distance: float) -> np.ndarray:
+        """Features whose bounding box is within `distance` of the geometry's bounding box"""
+        xmin, ymin, xmax, ymax = shapely.bounds(geom)
+        return self.tree.query(shapely.box(xmin - distance, ymin - distance, xmax + distance, ymax + distance))
+    
+    def within(self, geom, distance: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(indices, distances) of features within `distance` metres of a projected geometry"""
+        idx = self.candidates(geom, distance)
+        distances = shapely.distance(self.geoms[idx], geom)
+        keep = distances <= distance
+        return idx[keep], distances[keep]
+
+
+class InMemorySpatialStore(PostGISClient):
+    """PostGISClient answered from an in-memory snapshot instead of a database"""
+    
+    backend = "memory"
+    
+    def __init__(self, snapshot_dir: Optional[str] = None):
+        super().__init__()
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self.loaded_at: Optional[float] = None
+        self._density_levels: Dict[int, Dict[Tuple[int, int], int]] = {}
+        self._route_lines: Dict[str, Any] = {}
+        # Statement name (fetch_named) -> implementation taking the same positional args
+        self._named: Dict[str, Callable[..., List[Dict[str, Any]]]] = {
+            'nearest_highway': self._nearest_highway,
+            'nearest_poi': self._nearest_poi,
+            'geofence_region': self._geofence_region,
+            'geofence_landuse': self._geofence_landuse,
+            'buildings_near_highway': self._buildings_near_highway,
+            'buildings_near_linestring': self._buildings_near_linestring,
+            'buildings_near_depot': self._buildings_near_depot,
+            'count_buildings_near_route': self._count_buildings_near_route,
+            'count_buildings_near_depot': self._count_buildings_near_depot,
+            'buildings_in_polygon': self._buildings_in_polygon,
+            'spawn_area_counts': self._spawn_area_counts,
+            'route_coverage': self._route_coverage,
+            'depot_service_areas': self._depot_service_areas,
+            'route_building_counts': self._route_building_counts,
+            'density_tiles': self._density_tiles,
+            'route_geometry': self._route_geometry,
+        }
+        # execute_query label -> implementation
+        self._labelled: Dict[str, Callable[..., List[Dict[str, Any]]]] = {
+            'health_ping': lambda: [{'?column?': 1}],
+            'feature_estimates': self._feature_estimates,
+            'dataset_bounds': self._dataset_bounds,
+            'density_tile_stats': self._density_tile_stats,
+            'density_tile_rebuild': self._density_tile_rebuild,
+            'geofence_load_region': lambda: self._geofence_rows(self.regions, 'region_type'),
+            'geofence_load_landuse': lambda: self._geofence_rows(self.landuse, 'zone_type'),
+        }
+    
+    # ============================================================================
+    # LOADING
+    # ============================================================================
+    
+    async def connect(self):
+        """Load the snapshot (once)"""
+        if self.loaded_at is None:
+            if self.snapshot_dir is None:
+                raise RuntimeError("GEOSPATIAL_SNAPSHOT must point to a snapshot directory for the memory backend")
+            start_time = time.time()
+            await asyncio.to_thread(self.load, self.snapshot_dir)
+            print(
+                f"✅ In-memory spatial store loaded from {self.snapshot_dir} "
+                f"({len(self.buildings):,} buildings, {len(self.highways):,} highways, "
+                f"{len(self.routes)} routes, {(time.time() - start_time) * 1000:.0f}ms)"
+            )
+    
+    async def disconnect(self):
+        """Nothing to close"""
+    
+    def load(self, snapshot_dir: Path):
+        """Read every layer of a snapshot directory and build the indexes"""
+        # geofence_engine imports the global client, which may be this store being created
+        from .geofence_engine import GeofenceLayer
+        
+        snapshot_dir = Path(snapshot_dir)
+        features = {table: _read_features(snapshot_dir / name) for table, name in FEATURE_FILES.items()}
+        
+        building_records, building_geoms = features['buildings']
+        centroids = shapely.centroid(building_geoms) if len(building_geoms) else building_geoms
+        self.building_lons = shapely.get_x(centroids) if len(centroids) else np.array([])
+        self.building_lats = shapely.get_y(centroids) if len(centroids) else np.array([])
+        reference_latitude = float(np.mean(self.building_lats)) if len(self.building_lats) else 13.15
+        self.scale = np.array([METERS_PER_DEGREE * math.cos(math.radians(reference_latitude)), METERS_PER_DEGREE])
+        
+        self.buildings = _Layer(building_records, building_geoms, self.scale)
+        self.building_xs = self.building_lons * self.scale[0]
+        self.building_ys = self.building_lats * self.scale[1]
+        self.highways = _Layer(*features['highways'], self.scale)
+        self.highways_by_document_id = {
+            record.get('document_id'): i for i, record in enumerate(self.highways.records)
+        }
+        self.pois = _Layer(*features['pois'], self.scale)
+        
+        region_records, region_geoms = features['regions']
+        self.regions = GeofenceLayer(
+            'region',
+            [{**record, 'region_type': 'parish'} for record in region_records],
+            shapely.to_wkb(region_geoms).tolist() if len(region_geoms) else []
+        )
+        self.regions_lonlat = region_geoms
+        landuse_records, landuse_geoms = features['landuse_zones']
+        self.landuse = GeofenceLayer('landuse', landuse_records, shapely.to_wkb(landuse_geoms).tolist() if len(landuse_geoms) else [])
+        self.landuse_lonlat = landuse_geoms
+        
+        catalog = {key: _read_records(snapshot_dir / name) for key, name in CATALOG_FILES.items()}
+        self.routes = catalog['routes']
+        self.routes_by_document_id = {route.get('documentId'): route for route in self.routes}
+        self.depots = catalog['depots']
+        self.route_depots = catalog['route_depots']
+        
+        self._density_levels.clear()
+        self._route_lines.clear()
+        self.loaded_at = time.time()
+    
+    def catalog_records(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """(depots, routes, route-depot associations) in Strapi record shape, for the catalog"""
+        return self.depots, self.routes, self.route_depots
+    
+    # ============================================================================
+    # QUERY DISPATCH (same entry points as PostGISClient)
+    # ============================================================================
+    
+    async def execute_query(self, query: str, *args, label: str = "adhoc", raw: bool = False) -> List[Any]:
+        """Labelled queries only; arbitrary SQL needs PostGIS"""
+        if label.startswith('count_') and label[len('count_'):] in FEATURE_FILES:
+            handler = lambda: [{'count': self._table_size(label[len('count_'):])}]  # noqa: E731
+        else:
+            handler = self._labelled.get(label)
+        if handler is None:
+            raise UnsupportedQueryError(f"Ad-hoc SQL ({label}) is not supported by the in-memory spatial store")
+        return await self._run(label, handler, args)
+    
+    async def fetch_named(self, name: str, query: str, *args, raw: bool = False) -> List[Any]:
+        """Named statements are answered by the implementation registered under the same name"""
+        self.named_queries.setdefault(name, query)
+        handler = self._named.get(name)
+        if handler is None:
+            raise UnsupportedQueryError(f"Named query '{name}' is not supported by the in-memory spatial store")
+        return await self._run(name, handler, args)
+    
+    async def stream_spec(self, spec: QuerySpec, batch_size: int = 2000) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Batches of a QuerySpec's rows (computed at once, yielded in batches)"""
+        rows = await self._run(f"{spec.name}:stream", self._named[spec.name], spec.args)
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+    
+    async def _run(self, label: str, handler: Callable[..., List[Dict[str, Any]]], args: tuple) -> List[Any]:
+        if self.loaded_at is None:
+            await self.connect()
+        start_time = time.perf_counter()
+        try:
+            rows = handler(*args)
+        except Exception:
+            self.query_stats.record(label, (time.perf_counter() - start_time) * 1000, error=True)
+            raise
+        self.query_stats.record(label, (time.perf_counter() - start_time) * 1000)
+        return rows
+    
+    # ============================================================================
+    # IMPLEMENTATIONS
+    # ============================================================================
+    
+    def _point(self, latitude: float, longitude: float):
+        return shapely.points(longitude * self.scale[0], latitude * self.scale[1])
+    
+    def _project(self, geom):
+        return shapely.transform(geom, lambda coords: coords * self.scale)
+    
+    def _table_size(self, table: str) -> int:
+        return len({
+            'buildings': self.buildings, 'highways': self.highways, 'pois': self.pois,
+            'regions': self.regions.records, 'landuse_zones': self.landuse.records,
+        }[table])
+    
+    def _nearest(self, layer: _Layer, latitude: float, longitude: float, radius_meters: float) -> Optional[Tuple[int, float]]:
+        # Bounding-box prefilter then exact distance, like the PostGIS query
+        point = self._point(latitude, longitude)
+        idx = layer.candidates(point, radius_meters)
+        if not len(idx):
+            return None
+        distances = shapely.distance(layer.geoms[idx], point)
+        best = int(np.argmin(distances))
+        return int(idx[best]), float(distances[best])
+    
+    def _nearest_highway(self, latitude, longitude, radius_meters):
+        found = self._nearest(self.highways, latitude, longitude, radius_meters)
+        if found is None:
+            return []
+        record = self.highways.records[found[0]]
+        return [{'name': record.get('name'), 'highway_type': record.get('highway_type'), 'distance_meters': found[1]}]
+    
+    def _nearest_poi(self, latitude, longitude, radius_meters):
+        found = self._nearest(self.pois, latitude, longitude, radius_meters)
+        if found is None:
+            return []
+        record = self.pois.records[found[0]]
+        return [{
+            'name': record.get('name'),
+            'poi_type': record.get('poi_type'),
+            'amenity': record.get('amenity'),
+            'distance_meters': found[1]
+        }]
+    
+    def _geofence_region(self, latitude, longitude):
+        record = self.regions.lookup([longitude], [latitude])[0]
+        if record is None:
+            return []
+        return [{key: record.get(key) for key in ('id', 'document_id', 'name', 'region_type')}]
+    
+    def _geofence_landuse(self, latitude, longitude):
+        record = self.landuse.lookup([longitude], [latitude])[0]
+        if record is None:
+            return []
+        return [{key: record.get(key) for key in ('id', 'document_id', 'name', 'zone_type')}]
+    
+    def _geofence_rows(self, layer, type_key: str) -> List[Dict[str, Any]]:
+        lonlat = self.regions_lonlat if layer is self.regions else self.landuse_lonlat
+        wkbs = shapely.to_wkb(lonlat).tolist() if len(lonlat) else []
+        return [
+            {**{key: record.get(key) for key in ('id', 'document_id', 'name', type_key)}, 'wkb': wkb}
+            for record, wkb in zip(layer.records, wkbs)
+        ]
+    
+    def _building_rows(self, idx: np.ndarray, distances: Optional[np.ndarray] = None, limit: Optional[int] = None):
+        if distances is not None:
+            order = np.argsort(distances, kind='stable')
+            idx, distances = idx[order], distances[order]
+        else:
+            idx = np.sort(idx)
+        if limit is not None:
+            idx = idx[:limit]
+        rows = []
+        for n, i in enumerate(idx.tolist()):
+            record = self.buildings.records[i]
+            row = {
+                'building_id': record.get('id'),
+                'document_id': record.get('document_id'),
+                'latitude': float(self.building_lats[i]),
+                'longitude': float(self.building_lons[i]),
+            }
+            if distances is not None:
+                row['distance_meters'] = float(distances[n])
+            rows.append(row)
+        return rows
+    
+    def _buildings_near_highway(self, document_id, buffer_meters, limit):
+        i = self.highways_by_document_id.get(document_id)
+        if i is None:
+            return []
+        return self._building_rows(*self.buildings.within(self.highways.geoms[i], buffer_meters), limit=limit)
+    
+    def _buildings_near_linestring(self, linestring_wkt, buffer_meters, limit):
+        line = self._project(shapely.from_wkt(linestring_wkt))
+        return self._building_rows(*self.buildings.within(line, buffer_meters), limit=limit)
+    
+    def _depot_catchment(self, latitude, longitude, radius_meters) -> Tuple[np.ndarray, np.ndarray]:
+        """Buildings whose centroid is within radius (indices, distances)"""
+        idx = self.buildings.candidates(self._point(latitude, longitude), radius_meters)
+        distances = np.hypot(
+            self.building_xs[idx] - longitude * self.scale[0],
+            self.building_ys[idx] - latitude * self.scale[1]
+        )
+        keep = distances <= radius_meters
+        return idx[keep], distances[keep]
+    
+    def _buildings_near_depot(self, latitude, longitude, radius_meters, limit):
+        return self._building_rows(*self._depot_catchment(latitude, longitude, radius_meters), limit=limit)
+    
+    def _count_buildings_near_depot(self, latitude, longitude, radius_meters):
+        return [{'count': len(self._depot_catchment(latitude, longitude, radius_meters)[0])}]
+    
+    def _count_buildings_near_route(self, document_id, buffer_meters):
+        line = self._route_line(document_id)
+        if line is None:
+            return []  # unknown route or no geometry, like the corridor query
+        return [{'count': len(self.buildings.within(line, buffer_meters)[0])}]
+    
+    def _buildings_in_polygon(self, polygon_wkt, limit):
+        polygon = self._project(shapely.from_wkt(polygon_wkt))
+        return self._building_rows(self.buildings.tree.query(polygon, predicate='contains'), limit=limit)
+    
+    def _route_line(self, document_id: str):
+        """Projected MultiLineString of a route's features (None without geometry)"""
+        if document_id not in self._route_lines:
+            route = self.routes_by_document_id.get(document_id) or {}
+            geojson = route.get('geojson_data') or {}
+            if isinstance(geojson, str):
+                geojson = json.loads(geojson)
+            lines = [
+                shapely.from_geojson(json.dumps(feature['geometry']))
+                for feature in geojson.get('features') or []
+                if (feature.get('geometry') or {}).get('type') == 'LineString'
+            ]
+            self._route_lines[document_id] = self._project(shapely.multilinestrings(lines)) if lines else None
+        return self._route_lines[document_id]
+    
+    def _routes_with_geometry(self) -> List[Tuple[Dict[str, Any], Any]]:
+        routes = sorted(self.routes, key=lambda route: route.get('id') or 0)
+        return [(route, line) for route in routes if (line := self._route_line(route.get('documentId'))) is not None]
+    
+    def _spawn_area_counts(self, depot_ids, latitudes, longitudes, route_document_ids, depot_radius, route_buffer):
+        rows = [
+            {'kind': 'depot', 'key': str(depot_id),
+             'building_count': len(self._depot_catchment(lat, lon, depot_radius)[0])}
+            for depot_id, lat, lon in zip(depot_ids, latitudes, longitudes)
+        ]
+        for document_id in route_document_ids:
+            line = self._route_line(document_id)
+            if line is not None:
+                rows.append({
+                    'kind': 'route', 'key': document_id,
+                    'building_count': len(self.buildings.within(line, route_buffer)[0])
+                })
+        return rows
+    
+    def _route_building_counts(self, buffer_meters):
+        return [
+            {
+                'route_id': route.get('id'),
+                'document_id': route.get('documentId'),
+                'short_name': route.get('short_name'),
+                'long_name': route.get('long_name'),
+                'building_count': len(self.buildings.within(line, buffer_meters)[0])
+            }
+            for route, line in self._routes_with_geometry()
+        ]
+    
+    @staticmethod
+    def _overlaps(keys: List[Any], areas: np.ndarray, key_a: str, key_b: str) -> List[Dict[str, Any]]:
+        """Pairwise intersection areas (a < b), largest first"""
+        if not len(areas):
+            return []
+        left, right = shapely.STRtree(areas).query(areas, predicate='intersects')
+        pairs = []
+        for a, b in zip(left.tolist(), right.tolist()):
+            if keys[a] < keys[b]:
+                overlap = float(shapely.area(shapely.intersection(areas[a], areas[b])))
+                if overlap > 0:
+                    pairs.append({key_a: keys[a], key_b: keys[b], 'overlap_sq_meters': overlap})
+        return sorted(pairs, key=lambda pair: pair['overlap_sq_meters'], reverse=True)
+    
+    def _route_coverage(self, buffer_meters):
+        routes = self._routes_with_geometry()
+        corridors = shapely.buffer(np.array([line for _, line in routes], dtype=object), buffer_meters)
+        keys = [route.get('documentId') for route, _ in routes]
+        return [{
+            'routes': [
+                {
+                    'route_id': route.get('id'),
+                    'document_id': route.get('documentId'),
+                    'short_name': route.get('short_name'),
+                    'long_name': route.get('long_name'),
+                    'area_sq_meters': float(shapely.area(corridor))
+                }
+                for (route, _), corridor in zip(routes, corridors)
+            ],
+            'overlaps': self._overlaps(keys, corridors, 'route_a', 'route_b'),
+            'union_area_sq_meters': float(shapely.area(shapely.union_all(corridors))) if len(corridors) else 0.0
+        }]
+    
+    def _depot_service_areas(self, radius_meters):
+        depots = sorted(
+            (d for d in self.depots if d.get('latitude') is not None and d.get('longitude') is not None),
+            key=lambda depot: depot.get('id') or 0
+        )
+        points = np.array([self._point(d['latitude'], d['longitude']) for d in depots], dtype=object)
+        circles = shapely.buffer(points, radius_meters, quad_segs=8)
+        return [{
+            'depots': [
+                {
+                    'depot_id': depot.get('id'),
+                    'name': depot.get('name'),
+                    'latitude': depot['latitude'],
+                    'longitude': depot['longitude'],
+                    'area_sq_meters': float(shapely.area(circle)),
+                    'building_count': len(self._depot_catchment(depot['latitude'], depot['longitude'], radius_meters)[0])
+                }
+                for depot, circle in zip(depots, circles)
+            ],
+            'overlaps': self._overlaps([d.get('id') for d in depots], circles, 'depot_a', 'depot_b'),
+            'union_area_sq_meters': float(shapely.area(shapely.union_all(circles))) if len(circles) else 0.0
+        }]
+    
+    def _density_level(self, level_meters: int) -> Dict[Tuple[int, int], int]:
+        """Building counts per (cell_x, cell_y) of one pyramid level, like building_density_tiles"""
+        if level_meters not in self._density_levels:
+            level_deg = level_meters / METERS_PER_DEGREE
+            cells = np.stack([
+                np.floor(self.building_lons / level_deg),
+                np.floor(self.building_lats / level_deg)
+            ], axis=1).astype(np.int64)
+            keys, counts = np.unique(cells, axis=0, return_counts=True) if len(cells) else ([], [])
+            self._density_levels[level_meters] = {
+                (int(x), int(y)): int(n) for (x, y), n in zip(keys, counts)
+            }
+        return self._density_levels[level_meters]
+    
+    def _density_tiles(self, min_x, max_x, min_y, max_y, level_meters, ratio, limit):
+        grid: Dict[Tuple[int, int], int] = {}
+        for (x, y), count in self._density_level(level_meters).items():
+            if min_x <= x <= max_x and min_y <= y <= max_y:
+                key = (math.floor((x + 0.5) * ratio), math.floor((y + 0.5) * ratio))
+                grid[key] = grid.get(key, 0) + count
+        ranked = sorted(grid.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [{'gx': gx, 'gy': gy, 'building_count': count} for (gx, gy), count in ranked]
+    
+    def _density_tile_stats(self):
+        updated_at = datetime.fromtimestamp(self.loaded_at, tz=timezone.utc)
+        return [
+            {
+                'level_meters': level,
+                'tiles': len(self._density_level(level)),
+                'buildings': sum(self._density_level(level).values()),
+                'updated_at': updated_at
+            }
+            for level in DENSITY_TILE_LEVELS_METERS
+        ]
+    
+    def _density_tile_rebuild(self):
+        self._density_levels.clear()
+        return [{'tiles': sum(len(self._density_level(level)) for level in DENSITY_TILE_LEVELS_METERS)}]
+    
+    def _feature_estimates(self, tables):
+        return [{'table_name': table, 'estimate': self._table_size(table)} for table in tables if table in FEATURE_FILES]
+    
+    def _dataset_bounds(self):
+        if not len(self.buildings):
+            return [dict.fromkeys(('min_lon', 'max_lon', 'min_lat', 'max_lat', 'center_lon', 'center_lat'))]
+        min_lon, min_lat, max_lon, max_lat = (float(v) for v in shapely.total_bounds(self.buildings.lonlat))
+        return [{
+            'min_lon': min_lon, 'max_lon': max_lon, 'min_lat': min_lat, 'max_lat': max_lat,
+            'center_lon': (min_lon + max_lon) / 2, 'center_lat': (min_lat + max_lat) / 2
+        }]
+    
+    def _route_geometry(self, document_id):
+        route = self.routes_by_document_id.get(document_id)
+        if route is None:
+            return []
+        return [{
+            'document_id': document_id,
+            'short_name': route.get('short_name'),
+            'long_name': route.get('long_name'),
+            'geojson_data': route.get('geojson_data')
+        }]
+
+
+# ============================================================================
+# SYNTHETIC SNAPSHOTS (benchmarks and tests)
+# ============================================================================
+
+# Barbados bounding box
+SYNTHETIC_BOUNDS = (-59.65, 13.04, -59.42, 13.34)
+
+
+def _feature_collection(features: List[Tuple[Dict[str, Any], Any]]) -> Dict[str, Any]:
+    return {
+        'type': 'FeatureCollection',
+        'features': [
+            {'type': 'Feature', 'properties': properties, 'geometry': json.loads(shapely.to_geojson(geometry))}
+            for properties, geometry in features
+        ]
+    }
+
+
+def _random_walk(rng: random.Random, points: int, step_degrees: float) -> List[List[float]]:
+    min_lon, min_lat, max_lon, max_lat = SYNTHETIC_BOUNDS
+    lon, lat = rng.uniform(min_lon, max_lon), rng.uniform(min_lat, max_lat)
+    heading = rng.uniform(0, 2 * math.pi)
+    coords = []
+    for _ in range(points):
+        coords.append([round(lon, 6), round(lat, 6)])
+        heading += rng.uniform(-0.5, 0.5)
+        lon = min(max(lon + step_degrees * math.cos(heading), min_lon), max_lon)
+        lat = min(max(lat + step_degrees * math.sin(heading), min_lat), max_lat)
+    return coords
+
+
+def generate_synthetic_snapshot(
+    directory: str,
+    buildings: int = 20000,
+    highways: int = 300,
+    pois: int = 500,
+    routes: int = 10,
+    depots: int = 4,
+    seed: int = 0
+) -> Path:
+    """
+    Write a random island-sized snapshot for benchmarks and tests.
+    
+    Args:
+        directory: Output directory (created if missing)
+        buildings, highways, pois, routes, depots: Feature counts
+        seed: Random seed (same seed, same snapshot)
+    
+    Returns:
+        The snapshot directory
+    """
+    rng = random.Random(seed)
+    out = Path(directory)
+    out.mkdir(parents=True, exist_ok=True)
+    min_lon, min_lat, max_lon, max_lat = SYNTHETIC_BOUNDS
+    width, height = max_lon - min_lon, max_lat - min_lat
+    
+    def write(name: str, payload: Any):
+        (out / name).write_text(json.dumps(payload), encoding='utf-8')
+    
+    building_size = 0.0001  # ~11 m
+    write('buildings.geojson', _feature_collection([
+        ({'id': i + 1, 'document_id': f'bld-{i + 1}'},
+         shapely.box(lon, lat, lon + building_size, lat + building_size))
+        for i, (lon, lat) in enumerate(
+            (rng.uniform(min_lon, max_lon), rng.uniform(min_lat, max_lat)) for _ in range(buildings)
+        )
+    ]))
+    highway_types = ('primary', 'secondary', 'tertiary', 'residential')
+    write('highways.geojson', _feature_collection([
+        ({'id': i + 1, 'document_id': f'hwy-{i + 1}', 'name': f'Road {i + 1}',
+          'highway_type': highway_types[i % len(highway_types)]},
+         shapely.linestrings(_random_walk(rng, 20, 0.002)))
+        for i in range(highways)
+    ]))
+    amenities = ('school', 'clinic', 'market', 'church', 'bank')
+    write('pois.geojson', _feature_collection([
+        ({'id': i + 1, 'document_id': f'poi-{i + 1}', 'name': f'POI {i + 1}',
+          'poi_type': 'amenity', 'amenity': amenities[i % len(amenities)]},
+         shapely.points(rng.uniform(min_lon, max_lon), rng.uniform(min_lat, max_lat)))
+        for i in range(pois)
+    ]))
+    write('regions.geojson', _feature_collection([
+        ({'id': row * 3 + col + 1, 'document_id': f'reg-{row * 3 + col + 1}', 'name': f'Parish {row * 3 + col + 1}'},
+         shapely.box(min_lon + col * width / 3, min_lat + row * height / 4,
+                     min_lon + (col + 1) * width / 3, min_lat + (row + 1) * height / 4))
+        for row in range(4) for col in range(3)
+    ]))
+    zone_types = ('residential', 'commercial', 'industrial', 'farmland')
+    write('landuse_zones.geojson', _feature_collection([
+        ({'id': row * 20 + col + 1, 'document_id': f'lu-{row * 20 + col + 1}', 'name': f'Zone {row * 20 + col + 1}',
+          'zone_type': zone_types[(row + col) % len(zone_types)]},
+         shapely.box(min_lon + col * width / 20, min_lat + row * height / 20,
+                     min_lon + (col + 0.9) * width / 20, min_lat + (row + 0.9) * height / 20))
+        for row in range(20) for col in range(20)
+    ]))
+    
+    route_records = []
+    for i in range(routes):
+        coords = _random_walk(rng, 90, 0.0015)
+        features = []
+        for start in range(0, len(coords) - 1, 30):
+            segment = coords[start:start + 31]
+            features.append({
+                'type': 'Feature',
+                'properties': {'cost': round(shapely.length(shapely.linestrings(segment)) * METERS_PER_DEGREE, 1)},
+                'geometry': {'type': 'LineString', 'coordinates': segment}
+            })
+        route_records.append({
+            'id': i + 1, 'documentId': f'route-{i + 1}', 'short_name': str(i + 1),
+            'long_name': f'Synthetic Route {i + 1}',
+            'geojson_data': {'type': 'FeatureCollection', 'features': features}
+        })
+    write('routes.json', route_records)
+    write('depots.json', [
+        {'id': i + 1, 'documentId': f'depot-{i + 1}', 'name': f'Depot {i + 1}',
+         'latitude': round(rng.uniform(min_lat, max_lat), 6), 'longitude': round(rng.uniform(min_lon, max_lon), 6)}
+        for i in range(depots)
+    ])
+    write('route_depots.json', [
+        {'id': i + 1, 'route': {'documentId': f'route-{i + 1}'}, 'depot': {'documentId': f'depot-{i % depots + 1}'}}
+        for i in range(routes if depots else 0)
+    ])
+    return out
@@ -3,64 +3,291 @@ PostGIS Client - Direct spatial queries to PostgreSQL
 Optimized for performance with connection pooling
 """
 
+import asyncio
 import asyncpg
+import json
+import math
+import os
 import time
 import decimal
-from typing import List, Dict, Optional, Tuple, Any
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Set, Tuple
 from ..config.database import db_config
+from .query_stats import QueryStats
+
+
+# Pyramid levels built by scripts/sql/building_density_tiles.sql (keep in sync)
+DENSITY_TILE_LEVELS_METERS = (100, 250, 1000, 5000)
+METERS_PER_DEGREE = 111320.0
+
+
+def pick_density_level(grid_size_meters: int) -> int:
+    """
+    Coarsest pyramid level that can be rolled up into the requested grid.
+    
+    Prefers a level that divides the grid exactly (no cell straddles two
+    grid cells); otherwise the coarsest level not larger than the grid.
+    """
+    candidates = [lvl for lvl in DENSITY_TILE_LEVELS_METERS if lvl <= grid_size_meters]
+    if not candidates:
+        return DENSITY_TILE_LEVELS_METERS[0]
+    exact = [lvl for lvl in candidates if grid_size_meters % lvl == 0]
+    return max(exact) if exact else max(candidates)
+
+
+def _coverage_result(row, entity_key: str) -> Dict[str, Any]:
+    """Decode the jsonb aggregates of a coverage query row"""
+    def decode(value):
+        return json.loads(value) if isinstance(value, str) else (value or [])
+    
+    return {
+        entity_key: decode(row[entity_key]),
+        'overlaps': decode(row['overlaps']),
+        'union_area_sq_meters': float(row['union_area_sq_meters'] or 0)
+    }
+
+
+def route_corridors_sql(where: str, buffer_param: str) -> str:
+    """
+    CTEs `route_lines` and `corridors` building one buffered corridor per route
+    from the LineString features in routes.geojson_data.
+    
+    Columns: route_id, key (document_id), short_name, long_name, geom / buffered.
+    """
+    return f"""route_lines AS (
+                SELECT r.id AS route_id, r.document_id AS key, r.short_name, r.long_name,
+                       ST_Collect(ST_SetSRID(ST_GeomFromGeoJSON((f -> 'geometry')::text), 4326)) AS geom
+                FROM routes r
+                CROSS JOIN LATERAL jsonb_array_elements(r.geojson_data::jsonb -> 'features') AS f
+                WHERE {where}
+                  AND f -> 'geometry' IS NOT NULL
+                GROUP BY r.id, r.document_id, r.short_name, r.long_name
+            ), corridors AS (
+                SELECT route_id, key, short_name, long_name,
+                       ST_Buffer(geom::geography, {buffer_param})::geometry AS buffered
+                FROM route_lines
+            )"""
+
+
+class QuerySpec(NamedTuple):
+    """A named hot query with its bound arguments"""
+    name: str
+    query: str
+    args: Tuple[Any, ...]
+
+
+class NamedStatementConnection(asyncpg.Connection):
+    """Pool connection that keeps its own registry of named prepared statements"""
+    
+    __slots__ = ('named_statements',)
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.named_statements: Dict[str, asyncpg.prepared_stmt.PreparedStatement] = {}
+
+
+def _rows_to_dicts(rows) -> List[Dict[str, Any]]:
+    """Convert records to dicts, normalizing Decimal -> float for JSON/pydantic"""
+    result = []
+    for row in rows:
+        d = dict(row)
+        for k, v in d.items():
+            if isinstance(v, decimal.Decimal):
+                try:
+                    d[k] = float(v)
+                except Exception:
+                    d[k] = float(str(v))
+        result.append(d)
+    return result
 
 
 class PostGISClient:
     """PostGIS spatial query client with connection pooling"""
     
+    backend = "postgis"
+    
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
+        # Hot queries: name -> SQL, prepared once per pooled connection
+        self.named_queries: Dict[str, str] = {}
+        self.query_stats = QueryStats(
+            explain_sample_rate=float(os.getenv("GEOSPATIAL_EXPLAIN_SAMPLE_RATE", "0"))
+        )
+        self._explain_tasks: Set[asyncio.Task] = set()
+        self.prepare_counts: Dict[str, int] = {}
     
     async def connect(self):
         """Initialize connection pool"""
         if self.pool is None:
-            self.pool = await db_config.get_pool(min_size=5, max_size=20)
+            self.pool = await db_config.get_pool(
+                min_size=5, max_size=20, connection_class=NamedStatementConnection
+            )
             print("✅ PostGIS connection pool initialized (5-20 connections)")
     
     async def disconnect(self):
         """Close connection pool"""
+        for task in list(self._explain_tasks):
+            task.cancel()
         if self.pool:
             await self.pool.close()
             self.pool = None
             print("✅ PostGIS connection pool closed")
     
-    async def execute_query(self, query: str, *args) -> List[Dict[str, Any]]:
-        """Execute query and return results as list of dicts"""
+    async def execute_query(
+        self,
+        query: str,
+        *args,
+        label: str = "adhoc",
+        raw: bool = False
+    ) -> List[Any]:
+        """
+        Execute query and return results as list of dicts.
+        
+        Args:
+            label: Name the latency is recorded under in query_stats
+            raw: Return asyncpg Records (tuple-like, key access) without dict conversion
+        """
         if not self.pool:
             await self.connect()
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             async with self.pool.acquire() as conn:
                 rows = await conn.fetch(query, *args)
             
-            latency_ms = (time.time() - start_time) * 1000
-            
-            # Convert to list of dicts and normalize Decimal -> float for JSON/pydantic
-            result = []
-            for row in rows:
-                d = dict(row)
-                for k, v in d.items():
-                    if isinstance(v, decimal.Decimal):
-                        try:
-                            d[k] = float(v)
-                        except Exception:
-                            d[k] = float(str(v))
-                result.append(d)
-            
-            return result
+            self.query_stats.record(label, (time.perf_counter() - start_time) * 1000)
+            return rows if raw else _rows_to_dicts(rows)
         except Exception as e:
+            self.query_stats.record(label, (time.perf_counter() - start_time) * 1000, error=True)
             print(f"❌ SQL Error: {e}")
             print(f"Query: {query}")
             print(f"Args: {args}")
             raise
     
+    async def fetch_named(
+        self,
+        name: str,
+        query: str,
+        *args,
+        raw: bool = False
+    ) -> List[Any]:
+        """
+        Execute a hot query through a named prepared statement.
+        
+        The statement is parsed and prepared once per pooled connection and
+        re-used afterwards, so repeated calls only bind and execute.
+        
+        Args:
+            name: Registry name (also the query_stats label)
+            query: SQL text; must be the same for every call with this name
+            raw: Return asyncpg Records instead of dicts
+        """
+        registered = self.named_queries.setdefault(name, query)
+        if registered != query:
+            raise ValueError(f"Named query '{name}' is already registered with different SQL")
+        
+        if not self.pool:
+            await self.connect()
+        
+        start_time = time.perf_counter()
+        
+        try:
+            async with self.pool.acquire() as conn:
+                statement = conn.named_statements.get(name)
+                if statement is None:
+                    statement = await self._prepare(conn, name, query)
+                try:
+                    rows = await statement.fetch(*args)
+                except asyncpg.exceptions.InvalidCachedStatementError:
+                    # Schema changed under the prepared plan; re-prepare once
+                    statement = await self._prepare(conn, name, query)
+                    rows = await statement.fetch(*args)
+            
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            self.query_stats.record(name, latency_ms)
+        except Exception as e:
+            self.query_stats.record(name, (time.perf_counter() - start_time) * 1000, error=True)
+            print(f"❌ SQL Error ({name}): {e}")
+            print(f"Args: {args}")
+            raise
+        
+        if self.query_stats.should_explain():
+            self._explain_in_background(name, query, args, latency_ms)
+        
+        return rows if raw else _rows_to_dicts(rows)
+    
+    async def fetch_spec(self, spec: QuerySpec, raw: bool = False) -> List[Any]:
+        """Execute a QuerySpec through its named prepared statement"""
+        return await self.fetch_named(spec.name, spec.query, *spec.args, raw=raw)
+    
+    async def stream_spec(self, spec: QuerySpec, batch_size: int = 2000) -> AsyncIterator[List[asyncpg.Record]]:
+        """
+        Stream a QuerySpec's rows in batches from a server-side cursor.
+        
+        Holds one pooled connection (inside a read transaction) until the
+        generator is exhausted or closed, so rows never have to be
+        materialized all at once.
+        """
+        if not self.pool:
+            await self.connect()
+        
+        label = f"{spec.name}:stream"
+        start_time = time.perf_counter()
+        error = False
+        
+        try:
+            async with self.pool.acquire() as conn:
+                statement = conn.named_statements.get(spec.name)
+                if statement is None:
+                    statement = await self._prepare(conn, spec.name, self.named_queries.setdefault(spec.name, spec.query))
+                async with conn.transaction(readonly=True):
+                    cursor = await statement.cursor(*spec.args)
+                    while True:
+                        rows = await cursor.fetch(batch_size)
+                        if not rows:
+                            break
+                        yield rows
+        except Exception as e:
+            error = True
+            print(f"❌ SQL Error ({label}): {e}")
+            raise
+        finally:
+            self.query_stats.record(label, (time.perf_counter() - start_time) * 1000, error=error)
+    
+    async def _prepare(self, conn, name: str, query: str):
+        statement = await conn.prepare(query)
+        conn.named_statements[name] = statement
+        self.prepare_counts[name] = self.prepare_counts.get(name, 0) + 1
+        return statement
+    
+    def _explain_in_background(self, name: str, query: str, args: tuple, latency_ms: float):
+        """Capture EXPLAIN (ANALYZE, BUFFERS) for a sampled execution off the request path"""
+        task = asyncio.create_task(self._explain(name, query, args, latency_ms))
+        self._explain_tasks.add(task)
+        task.add_done_callback(self._explain_tasks.discard)
+    
+    async def _explain(self, name: str, query: str, args: tuple, latency_ms: float):
+        try:
+            async with self.pool.acquire() as conn:
+                plan = await conn.fetchval(
+                    f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", *args
+                )
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            self.query_stats.add_plan(name, latency_ms, plan)
+        except Exception as e:
+            self.query_stats.explain_failures += 1
+            print(f"⚠️  EXPLAIN capture failed for {name}: {e}")
+    
+    def diagnostics(self, include_plans: bool = True) -> Dict[str, Any]:
+        """Latency histograms, prepare counts and sampled plans"""
+        snapshot = self.query_stats.snapshot(include_plans=include_plans)
+        snapshot['prepared_statements'] = {
+            name: {'prepares': self.prepare_counts.get(name, 0)}
+            for name in sorted(self.named_queries)
+        }
+        return snapshot
+    
     # ============================================================================
     # REVERSE GEOCODING QUERIES
     # ============================================================================
@@ -99,7 +326,7 @@ class PostGISClient:
             LIMIT 1
         """
         
-        results = await self.execute_query(query, latitude, longitude, radius_meters)
+        results = await self.fetch_named('nearest_highway', query, latitude, longitude, radius_meters)
         return results[0] if results else None
     
     async def find_nearest_poi(
@@ -134,7 +361,7 @@ class PostGISClient:
             LIMIT 1
         """
         
-        results = await self.execute_query(query, latitude, longitude, radius_meters)
+        results = await self.fetch_named('nearest_poi', query, latitude, longitude, radius_meters)
         return results[0] if results else None
     
     # ============================================================================
@@ -164,7 +391,7 @@ class PostGISClient:
             LIMIT 1
         """
         
-        results = await self.execute_query(query, latitude, longitude)
+        results = await self.fetch_named('geofence_region', query, latitude, longitude)
         return results[0] if results else None
     
     async def check_geofence_landuse(
@@ -190,24 +417,20 @@ class PostGISClient:
             LIMIT 1
         """
         
-        results = await self.execute_query(query, latitude, longitude)
+        results = await self.fetch_named('geofence_landuse', query, latitude, longitude)
         return results[0] if results else None
     
     # ============================================================================
     # ROUTE BUILDINGS QUERY
     # ============================================================================
     
-    async def get_buildings_near_route(
+    def buildings_near_route_query(
         self, 
         route_id: str,
         buffer_meters: int = 500,
         limit: int = 1000
-    ) -> List[Dict[str, Any]]:
-        """
-        DEPRECATED: Use get_buildings_near_linestring instead.
-        Get buildings within buffer distance of a route (highway)
-        Returns: [{building_id, latitude, longitude, distance_meters}]
-        """
+    ) -> QuerySpec:
+        """Named query behind get_buildings_near_route() (fetch, stream or columnar)"""
         # Use highway geom bbox to prefilter buildings, then compute accurate distances
         query = """
             WITH highway_geom AS (
@@ -228,24 +451,51 @@ class PostGISClient:
             LIMIT $3
         """
         
-        return await self.execute_query(query, route_id, buffer_meters, limit)
+        return QuerySpec('buildings_near_highway', query, (route_id, buffer_meters, limit))
     
-    async def get_buildings_near_linestring(
-        self,
-        coordinates: List[tuple],
-        buffer_meters: int = 100,
-        limit: int = 5000
+    async def get_buildings_near_route(
+        self, 
+        route_id: str,
+        buffer_meters: int = 500,
+        limit: int = 1000
     ) -> List[Dict[str, Any]]:
         """
-        Get buildings within buffer distance of a LineString defined by coordinates.
+        DEPRECATED: Use get_buildings_near_linestring instead.
+        Get buildings within buffer distance of a route (highway)
+        Returns: [{building_id, latitude, longitude, distance_meters}]
+        """
+        return await self.fetch_spec(self.buildings_near_route_query(route_id, buffer_meters, limit))
+    
+    async def count_buildings_near_route(self, route_id: str, buffer_meters: int = 500) -> Optional[int]:
+        """
+        Count buildings in a route's corridor (routes.geojson_data buffered by
+        buffer_meters), without a row limit. Same corridor as count_buildings_per_route.
         
         Args:
-            coordinates: List of (lon, lat) tuples forming the route line
-            buffer_meters: Buffer distance in meters
-            limit: Maximum number of buildings to return
-            
-        Returns: [{building_id, document_id, latitude, longitude, distance_meters}]
+            route_id: Strapi route documentId
+        
+        Returns:
+            Building count, or None for an unknown route or one without geometry
+        """
+        query = """
+            WITH """ + route_corridors_sql("r.document_id = $1", "$2") + """
+            SELECT COUNT(b.id) AS count
+            FROM corridors c
+            LEFT JOIN buildings b
+              ON b.geom && c.buffered
+             AND ST_Intersects(b.geom, c.buffered)
+            GROUP BY c.route_id
         """
+        rows = await self.fetch_named('count_buildings_near_route', query, route_id, buffer_meters)
+        return int(rows[0]['count']) if rows else None
+    
+    def buildings_near_linestring_query(
+        self,
+        coordinates: List[tuple],
+        buffer_meters: int = 100,
+        limit: int = 5000
+    ) -> QuerySpec:
+        """Named query behind get_buildings_near_linestring() (fetch, stream or columnar)"""
         # Build WKT LineString from coordinates
         coords_str = ','.join([f'{lon} {lat}' for lon, lat in coordinates])
         linestring_wkt = f'LINESTRING({coords_str})'
@@ -271,24 +521,38 @@ class PostGISClient:
             LIMIT $3
         """
         
-        return await self.execute_query(query, linestring_wkt, buffer_meters, limit)
+        return QuerySpec('buildings_near_linestring', query, (linestring_wkt, buffer_meters, limit))
+    
+    async def get_buildings_near_linestring(
+        self,
+        coordinates: List[tuple],
+        buffer_meters: int = 100,
+        limit: int = 5000
+    ) -> List[Dict[str, Any]]:
+        """
+        Get buildings within buffer distance of a LineString defined by coordinates.
+        
+        Args:
+            coordinates: List of (lon, lat) tuples forming the route line
+            buffer_meters: Buffer distance in meters
+            limit: Maximum number of buildings to return
+        
+        Returns: [{building_id, document_id, latitude, longitude, distance_meters}]
+        """
+        return await self.fetch_spec(self.buildings_near_linestring_query(coordinates, buffer_meters, limit))
     
     # ============================================================================
     # DEPOT CATCHMENT QUERY
     # ============================================================================
     
-    async def get_buildings_near_depot(
+    def buildings_near_depot_query(
         self, 
         latitude: float,
         longitude: float,
         radius_meters: int = 1000,
         limit: int = 5000
-    ) -> List[Dict[str, Any]]:
-        """
-        Get all buildings within radius of depot point
-        Returns: [{building_id, latitude, longitude, distance_meters}]
-        Optimized: Uses geometry index for fast spatial query
-        """
+    ) -> QuerySpec:
+        """Named query behind get_buildings_near_depot() (fetch, stream or columnar)"""
         # Prefilter with bbox to use GiST index, then compute exact geography distance
         query = """
             WITH params AS (
@@ -313,7 +577,346 @@ class PostGISClient:
             LIMIT $4
         """
         
-        return await self.execute_query(query, latitude, longitude, radius_meters, limit)
+        return QuerySpec('buildings_near_depot', query, (latitude, longitude, radius_meters, limit))
+    
+    async def get_buildings_near_depot(
+        self, 
+        latitude: float,
+        longitude: float,
+        radius_meters: int = 1000,
+        limit: int = 5000
+    ) -> List[Dict[str, Any]]:
+        """
+        Get all buildings within radius of depot point
+        Returns: [{building_id, latitude, longitude, distance_meters}]
+        Optimized: Uses geometry index for fast spatial query
+        """
+        return await self.fetch_spec(self.buildings_near_depot_query(latitude, longitude, radius_meters, limit))
+    
+    async def count_buildings_near_depot(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_meters: int = 1000
+    ) -> int:
+        """
+        Count buildings within radius of a depot point, without a row limit.
+        Same catchment as get_buildings_near_depot (centroid distance).
+        """
+        query = """
+            WITH params AS (
+                SELECT
+                    ST_SetSRID(ST_MakePoint($2::double precision, $1::double precision), 4326)::geography AS origin,
+                    $3::double precision AS meters,
+                    ($3::double precision / 111320.0) AS deg_lat,
+                    ($3::double precision / (111320.0 * GREATEST(cos(radians($1::double precision)), 0.0001))) AS deg_lon
+            )
+            SELECT COUNT(*) AS count
+            FROM buildings b, params p
+            WHERE b.geom && ST_MakeEnvelope($2::double precision - p.deg_lon, $1::double precision - p.deg_lat,
+                                   $2::double precision + p.deg_lon, $1::double precision + p.deg_lat, 4326)
+              AND ST_Distance(ST_Centroid(b.geom)::geography, p.origin) <= p.meters
+        """
+        rows = await self.fetch_named('count_buildings_near_depot', query, latitude, longitude, radius_meters)
+        return int(rows[0]['count']) if rows else 0
+    
+    # ============================================================================
+    # POLYGON BUILDINGS QUERY
+    # ============================================================================
+    
+    def buildings_in_polygon_query(self, polygon_wkt: str, limit: int = 10000) -> QuerySpec:
+        """Named query behind get_buildings_in_polygon() (fetch, stream or columnar)"""
+        query = """
+            SELECT 
+                b.id as building_id,
+                b.document_id,
+                ST_Y(ST_Centroid(b.geom)) as latitude,
+                ST_X(ST_Centroid(b.geom)) as longitude
+            FROM buildings b
+            WHERE ST_Contains(
+                ST_GeomFromText($1, 4326),
+                b.geom
+            )
+            LIMIT $2
+        """
+        return QuerySpec('buildings_in_polygon', query, (polygon_wkt, limit))
+    
+    async def get_buildings_in_polygon(self, polygon_wkt: str, limit: int = 10000) -> List[Dict[str, Any]]:
+        """
+        Get buildings fully inside a polygon
+        Returns: [{building_id, document_id, latitude, longitude}]
+        """
+        return await self.fetch_spec(self.buildings_in_polygon_query(polygon_wkt, limit))
+    
+    # ============================================================================
+    # SET-BASED SPAWN AREA COUNTS
+    # ============================================================================
+    
+    async def count_buildings_in_spawn_areas(
+        self,
+        depots: List[Tuple[int, float, float]],
+        route_document_ids: List[str],
+        depot_radius_meters: float,
+        route_buffer_meters: float
+    ) -> Dict[str, Dict[Any, int]]:
+        """
+        Count buildings in every depot catchment and route corridor in one query.
+        
+        Depot catchments are circles around (latitude, longitude); route corridors
+        buffer the LineString features stored in routes.geojson_data. Both sets
+        are joined against buildings in a single pass, so cost no longer scales
+        with one round trip per depot/route.
+        
+        Args:
+            depots: (depot_id, latitude, longitude) for each depot
+            route_document_ids: Route documentIds to build corridors for
+            depot_radius_meters: Catchment radius around each depot
+            route_buffer_meters: Corridor half-width around each route
+        
+        Returns: {'depots': {depot_id: count}, 'routes': {document_id: count}}
+        Routes without usable geometry are absent from 'routes'.
+        """
+        query = """
+            WITH depot_points AS (
+                SELECT d.key, ST_SetSRID(ST_MakePoint(d.lon, d.lat), 4326) AS geom,
+                       $5::double precision / (111320.0 * GREATEST(cos(radians(d.lat)), 0.0001)) AS deg
+                FROM unnest($1::int[], $2::double precision[], $3::double precision[]) AS d(key, lat, lon)
+            ), depot_counts AS (
+                SELECT 'depot' AS kind, dp.key::text AS key, COUNT(b.id) AS building_count
+                FROM depot_points dp
+                LEFT JOIN buildings b
+                  ON b.geom && ST_Expand(dp.geom, dp.deg)
+                 AND ST_DWithin(ST_Centroid(b.geom)::geography, dp.geom::geography, $5)
+                GROUP BY dp.key
+            ), """ + route_corridors_sql("r.document_id = ANY($4::text[])", "$6") + """, route_counts AS (
+                SELECT 'route' AS kind, c.key, COUNT(b.id) AS building_count
+                FROM corridors c
+                LEFT JOIN buildings b
+                  ON b.geom && c.buffered
+                 AND ST_Intersects(b.geom, c.buffered)
+                GROUP BY c.key
+            )
+            SELECT kind, key, building_count FROM depot_counts
+            UNION ALL
+            SELECT kind, key, building_count FROM route_counts
+        """
+        
+        rows = await self.fetch_named(
+            'spawn_area_counts',
+            query,
+            [d[0] for d in depots],
+            [d[1] for d in depots],
+            [d[2] for d in depots],
+            list(route_document_ids),
+            depot_radius_meters,
+            route_buffer_meters,
+            raw=True
+        )
+        
+        counts: Dict[str, Dict[Any, int]] = {'depots': {}, 'routes': {}}
+        for row in rows:
+            if row['kind'] == 'depot':
+                counts['depots'][int(row['key'])] = row['building_count']
+            else:
+                counts['routes'][row['key']] = row['building_count']
+        return counts
+    
+    # ============================================================================
+    # COVERAGE QUERIES (all routes / depots in one statement)
+    # ============================================================================
+    
+    async def get_route_coverage(self, buffer_meters: float) -> Dict[str, Any]:
+        """
+        Corridor area of every route, the area of their union and the overlap
+        area of every intersecting pair of corridors, in one query.
+        
+        Returns: {'routes': [{route_id, document_id, short_name, long_name, area_sq_meters}],
+                  'overlaps': [{route_a, route_b, overlap_sq_meters}],
+                  'union_area_sq_meters': float}
+        """
+        query = """
+            WITH """ + route_corridors_sql("r.geojson_data IS NOT NULL", "$1") + """, pairs AS (
+                SELECT a.key AS route_a, b.key AS route_b,
+                       ST_Area(ST_Intersection(a.buffered, b.buffered)::geography) AS overlap
+                FROM corridors a
+                JOIN corridors b
+                  ON a.key < b.key
+                 AND a.buffered && b.buffered
+                 AND ST_Intersects(a.buffered, b.buffered)
+            )
+            SELECT
+                (SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                    'route_id', route_id, 'document_id', key,
+                    'short_name', short_name, 'long_name', long_name,
+                    'area_sq_meters', ST_Area(buffered::geography)) ORDER BY route_id), '[]'::jsonb)
+                 FROM corridors) AS routes,
+                (SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                    'route_a', route_a, 'route_b', route_b, 'overlap_sq_meters', overlap)
+                    ORDER BY overlap DESC), '[]'::jsonb)
+                 FROM pairs WHERE overlap > 0) AS overlaps,
+                (SELECT COALESCE(ST_Area(ST_Union(buffered)::geography), 0) FROM corridors) AS union_area_sq_meters
+        """
+        
+        rows = await self.fetch_named('route_coverage', query, buffer_meters, raw=True)
+        return _coverage_result(rows[0], 'routes')
+    
+    async def get_depot_service_areas(self, radius_meters: float) -> Dict[str, Any]:
+        """
+        Service circle of every depot with its building count, the union area
+        and pairwise overlap areas, in one query.
+        
+        Returns: {'depots': [{depot_id, name, latitude, longitude, area_sq_meters, building_count}],
+                  'overlaps': [{depot_a, depot_b, overlap_sq_meters}],
+                  'union_area_sq_meters': float}
+        """
+        query = """
+            WITH circles AS (
+                SELECT d.id, d.name, d.latitude, d.longitude,
+                       ST_SetSRID(ST_MakePoint(d.longitude, d.latitude), 4326) AS point,
+                       ST_Buffer(ST_SetSRID(ST_MakePoint(d.longitude, d.latitude), 4326)::geography, $1)::geometry AS area
+                FROM depots d
+                WHERE d.latitude IS NOT NULL AND d.longitude IS NOT NULL
+            ), counts AS (
+                SELECT c.id, COUNT(b.id) AS building_count
+                FROM circles c
+                LEFT JOIN buildings b
+                  ON b.geom && c.area
+                 AND ST_DWithin(ST_Centroid(b.geom)::geography, c.point::geography, $1)
+                GROUP BY c.id
+            ), pairs AS (
+                SELECT a.id AS depot_a, b.id AS depot_b,
+                       ST_Area(ST_Intersection(a.area, b.area)::geography) AS overlap
+                FROM circles a
+                JOIN circles b
+                  ON a.id < b.id
+                 AND a.area && b.area
+                 AND ST_Intersects(a.area, b.area)
+            )
+            SELECT
+                (SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                    'depot_id', c.id, 'name', c.name,
+                    'latitude', c.latitude, 'longitude', c.longitude,
+                    'area_sq_meters', ST_Area(c.area::geography),
+                    'building_count', n.building_count) ORDER BY c.id), '[]'::jsonb)
+                 FROM circles c JOIN counts n USING (id)) AS depots,
+                (SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                    'depot_a', depot_a, 'depot_b', depot_b, 'overlap_sq_meters', overlap)
+                    ORDER BY overlap DESC), '[]'::jsonb)
+                 FROM pairs WHERE overlap > 0) AS overlaps,
+                (SELECT COALESCE(ST_Area(ST_Union(area)::geography), 0) FROM circles) AS union_area_sq_meters
+        """
+        
+        rows = await self.fetch_named('depot_service_areas', query, radius_meters, raw=True)
+        return _coverage_result(rows[0], 'depots')
+    
+    async def count_buildings_per_route(self, buffer_meters: float) -> List[Dict[str, Any]]:
+        """
+        Building count in every route corridor, in one query.
+        
+        Returns: [{route_id, document_id, short_name, long_name, building_count}]
+        """
+        query = """
+            WITH """ + route_corridors_sql("r.geojson_data IS NOT NULL", "$1") + """
+            SELECT c.route_id, c.key AS document_id, c.short_name, c.long_name,
+                   COUNT(b.id) AS building_count
+            FROM corridors c
+            LEFT JOIN buildings b
+              ON b.geom && c.buffered
+             AND ST_Intersects(b.geom, c.buffered)
+            GROUP BY c.route_id, c.key, c.short_name, c.long_name
+            ORDER BY c.route_id
+        """
+        
+        return await self.fetch_named('route_building_counts', query, buffer_meters)
+    
+    # ============================================================================
+    # DENSITY TILE QUERIES (see scripts/sql/building_density_tiles.sql)
+    # ============================================================================
+    
+    async def get_density_tiles(
+        self,
+        min_lat: float,
+        max_lat: float,
+        min_lon: float,
+        max_lon: float,
+        grid_size_meters: int,
+        limit: int = 1000
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Building counts per grid cell, sliced from the precomputed density pyramid.
+        
+        Cells of the chosen pyramid level are rolled up into the requested grid
+        by their centre, which is exact when the grid is a multiple of the level.
+        
+        Returns:
+            (level_meters used, cells sorted by building_count descending)
+        
+        Raises:
+            asyncpg.exceptions.UndefinedTableError: pyramid has not been installed
+        """
+        level_meters = pick_density_level(grid_size_meters)
+        level_deg = level_meters / METERS_PER_DEGREE
+        grid_deg = grid_size_meters / METERS_PER_DEGREE
+        
+        query = """
+            SELECT gx, gy, SUM(building_count)::int AS building_count
+            FROM (
+                SELECT
+                    floor((cell_x + 0.5) * $6)::int AS gx,
+                    floor((cell_y + 0.5) * $6)::int AS gy,
+                    building_count
+                FROM building_density_tiles
+                WHERE level_meters = $5
+                  AND cell_x BETWEEN $1 AND $2
+                  AND cell_y BETWEEN $3 AND $4
+                  AND building_count > 0
+            ) cells
+            GROUP BY gx, gy
+            ORDER BY building_count DESC
+            LIMIT $7
+        """
+        
+        rows = await self.fetch_named(
+            'density_tiles',
+            query,
+            math.floor(min_lon / level_deg), math.floor(max_lon / level_deg),
+            math.floor(min_lat / level_deg), math.floor(max_lat / level_deg),
+            level_meters, level_meters / grid_size_meters, limit,
+            raw=True
+        )
+        
+        cells = [
+            {
+                'lat_start': row['gy'] * grid_deg,
+                'lat_end': (row['gy'] + 1) * grid_deg,
+                'lon_start': row['gx'] * grid_deg,
+                'lon_end': (row['gx'] + 1) * grid_deg,
+                'building_count': row['building_count']
+            }
+            for row in rows
+        ]
+        return level_meters, cells
+    
+    async def get_density_tile_stats(self) -> List[Dict[str, Any]]:
+        """Tile and building totals per pyramid level"""
+        query = """
+            SELECT
+                level_meters,
+                COUNT(*) FILTER (WHERE building_count > 0) AS tiles,
+                COALESCE(SUM(building_count), 0)::bigint AS buildings,
+                MAX(updated_at) AS updated_at
+            FROM building_density_tiles
+            GROUP BY level_meters
+            ORDER BY level_meters
+        """
+        return await self.execute_query(query, label='density_tile_stats')
+    
+    async def rebuild_density_tiles(self) -> int:
+        """Rebuild the whole density pyramid from buildings (returns tile rows written)"""
+        results = await self.execute_query(
+            "SELECT public.rebuild_building_density_tiles() AS tiles", label='density_tile_rebuild'
+        )
+        return results[0]['tiles']
     
     # ============================================================================
     # ROUTE GEOMETRY QUERIES
@@ -334,9 +937,6 @@ class PostGISClient:
         - num_points: total coordinate points
         - total_distance_meters: sum of all segment costs
         """
-        if not self.pool:
-            await self.connect()
-        
         query = """
             SELECT
                 document_id,
@@ -347,14 +947,12 @@ class PostGISClient:
             WHERE document_id = $1
         """
         
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(query, route_id)
-        
-        if not row:
+        rows = await self.fetch_named('route_geometry', query, route_id, raw=True)
+        if not rows:
             return None
+        row = rows[0]
         
         # IMPORTANT: geojson_data might be a string or dict depending on asyncpg version
-        import json
         geojson = row['geojson_data']
         if isinstance(geojson, str):
             geojson = json.loads(geojson)
@@ -397,6 +995,12 @@ class PostGISClient:
     # STATISTICS
     # ============================================================================
     
+    async def ping(self) -> float:
+        """Round trip of SELECT 1 on a pooled connection in ms (raises if the database is unreachable)"""
+        start_time = time.perf_counter()
+        await self.execute_query("SELECT 1", label="health_ping", raw=True)
+        return (time.perf_counter() - start_time) * 1000
+    
     async def get_stats(self) -> Dict[str, int]:
         """Get database statistics"""
         queries = {
@@ -409,11 +1013,28 @@ class PostGISClient:
         
         stats = {}
         for key, query in queries.items():
-            results = await self.execute_query(query)
+            results = await self.execute_query(query, label=f"count_{key}", raw=True)
             stats[key] = results[0]["count"] if results else 0
         
         return stats
 
 
+def create_spatial_client() -> PostGISClient:
+    """
+    Spatial client for the configured backend.
+    
+    GEOSPATIAL_BACKEND=postgis (default) uses the database; GEOSPATIAL_BACKEND=memory
+    answers the same queries from the snapshot directory in GEOSPATIAL_SNAPSHOT
+    (see services/memory_store.py) - for tests, benchmarks and offline runs.
+    """
+    backend = os.getenv("GEOSPATIAL_BACKEND", "postgis").lower()
+    if backend == "memory":
+        from .memory_store import InMemorySpatialStore
+        return InMemorySpatialStore(os.getenv("GEOSPATIAL_SNAPSHOT"))
+    if backend != "postgis":
+        raise ValueError(f"Unknown GEOSPATIAL_BACKEND '{backend}' (expected 'postgis' or 'memory')")
+    return PostGISClient()
+
+
 # Global instance
-postgis_client = PostGISClient()
+postgis_client = create_spatial_client()
@@ -0,0 +1,141 @@
+"""
+Query Stats - Per-query latency histograms and sampled query plans for PostGISClient
+
+- Every query is recorded under a label (the named statement, or a label passed
+  to execute_query; unlabelled ad-hoc SQL is grouped under 'adhoc')
+- Latencies go into fixed log-spaced buckets, so recording is O(buckets) and
+  memory does not grow with traffic; percentiles are read from the buckets
+- A configurable fraction of named-statement executions is re-run with
+  EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) off the request path, keeping the
+  most recent plans per query
+
+Exposed through GET /meta/diagnostics/queries.
+"""
+
+import random
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram"""
+    
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+    
+    def record(self, latency_ms: float, error: bool = False):
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+        if error:
+            self.errors += 1
+    
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bound of the bucket holding the p-th percentile (max_ms for the open bucket)"""
+        if not self.count:
+            return None
+        target = p * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= target:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return float(min(LATENCY_BUCKETS_MS[index], self.max_ms))
+                return self.max_ms
+        return self.max_ms
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'mean_ms': round(self.total_ms / self.count, 2) if self.count else None,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max_ms, 2),
+            'buckets_ms': {
+                **{f'le_{bound}': n for bound, n in zip(LATENCY_BUCKETS_MS, self.buckets)},
+                'gt_max': self.buckets[-1]
+            }
+        }
+
+
+def summarize_plan(plan_json: Any) -> Dict[str, Any]:
+    """Timing and buffer totals from an EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) result"""
+    if isinstance(plan_json, list):
+        plan_json = plan_json[0] if plan_json else {}
+    root = plan_json.get('Plan', {}) if isinstance(plan_json, dict) else {}
+    return {
+        'planning_ms': plan_json.get('Planning Time') if isinstance(plan_json, dict) else None,
+        'execution_ms': plan_json.get('Execution Time') if isinstance(plan_json, dict) else None,
+        'root_node': root.get('Node Type'),
+        'shared_hit_blocks': root.get('Shared Hit Blocks'),
+        'shared_read_blocks': root.get('Shared Read Blocks'),
+    }
+
+
+class QueryStats:
+    """Latency histograms and sampled plans keyed by query label"""
+    
+    def __init__(self, explain_sample_rate: float = 0.0, plans_per_query: int = 5):
+        self.explain_sample_rate = explain_sample_rate
+        self.plans_per_query = plans_per_query
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.plans: Dict[str, Deque[Dict[str, Any]]] = {}
+        self.explain_failures = 0
+        self.started_at = time.time()
+    
+    def record(self, label: str, latency_ms: float, error: bool = False):
+        histogram = self.histograms.get(label)
+        if histogram is None:
+            histogram = self.histograms[label] = LatencyHistogram()
+        histogram.record(latency_ms, error)
+    
+    def should_explain(self) -> bool:
+        return self.explain_sample_rate > 0 and random.random() < self.explain_sample_rate
+    
+    def add_plan(self, label: str, latency_ms: float, plan_json: Any):
+        samples = self.plans.get(label)
+        if samples is None:
+            samples = self.plans[label] = deque(maxlen=self.plans_per_query)
+        samples.append({
+            'captured_at': time.time(),
+            'query_latency_ms': round(latency_ms, 2),
+            **summarize_plan(plan_json),
+            'plan': plan_json
+        })
+    
+    def reset(self):
+        self.histograms.clear()
+        self.plans.clear()
+        self.explain_failures = 0
+        self.started_at = time.time()
+    
+    def snapshot(self, include_plans: bool = True) -> Dict[str, Any]:
+        plans: Dict[str, List[Dict[str, Any]]] = {}
+        if include_plans:
+            plans = {label: list(samples) for label, samples in self.plans.items()}
+        return {
+            'since': self.started_at,
+            'queries': {
+                label: histogram.summary()
+                for label, histogram in sorted(self.histograms.items())
+            },
+            'explain': {
+                'sample_rate': self.explain_sample_rate,
+                'failures': self.explain_failures,
+                'plans': plans
+            }
+        }
@@ -0,0 +1,62 @@
+"""
+Route Index - Route proximity index built from the in-memory catalog
+
+Wraps common.route_proximity.RouteProximityIndex (shared with the simulator's
+RouteBuffer) over every route's geojson_data, keyed by route documentId.
+The index is rebuilt lazily whenever the catalog snapshot changes.
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from common.route_proximity import RouteProximityIndex, geojson_lines
+
+from .catalog import CatalogSnapshot, require_catalog
+
+
+class RouteIndexProvider:
+    """Builds and caches the route proximity index for the current catalog snapshot"""
+    
+    def __init__(self, cell_meters: float = 250.0):
+        self.cell_meters = cell_meters
+        self._index: Optional[RouteProximityIndex] = None
+        self._built_for: Optional[float] = None
+        self.builds = 0
+        self.last_build_ms: Optional[float] = None
+        self.skipped_routes = 0
+    
+    def build(self, snapshot: CatalogSnapshot) -> RouteProximityIndex:
+        """Index every route with line geometry in the snapshot"""
+        start_time = time.time()
+        index = RouteProximityIndex(cell_meters=self.cell_meters)
+        skipped = 0
+        for route in snapshot.routes:
+            document_id = route.get('documentId')
+            if not document_id or not index.add_route(document_id, geojson_lines(route.get('geojson_data'))):
+                skipped += 1
+        
+        self._index = index
+        self._built_for = snapshot.loaded_at
+        self.builds += 1
+        self.skipped_routes = skipped
+        self.last_build_ms = round((time.time() - start_time) * 1000, 2)
+        return index
+    
+    async def get(self) -> Tuple[CatalogSnapshot, RouteProximityIndex]:
+        """Current catalog snapshot and its index (HTTP errors if the catalog is unavailable)"""
+        snapshot = await require_catalog()
+        if self._index is None or self._built_for != snapshot.loaded_at:
+            self.build(snapshot)
+        return snapshot, self._index
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **(self._index.stats() if self._index else {'routes': 0}),
+            'builds': self.builds,
+            'last_build_ms': self.last_build_ms,
+            'skipped_routes': self.skipped_routes,
+        }
+
+
+# Global route index instance
+route_index = RouteIndexProvider()
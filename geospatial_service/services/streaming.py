@@ -0,0 +1,135 @@
+"""
+Streaming Responses - Large building queries without materializing every row
+
+Formats (selected with `?format=` on the building endpoints):
+- json      the endpoint's regular response model (default)
+- ndjson    one JSON object per line, streamed from a server-side cursor
+- arrow     Arrow IPC stream, one record batch per cursor batch (needs pyarrow)
+- columnar  one JSON document with column arrays instead of row objects:
+            {"columns": {"building_id": [...], "latitude": [...], ...}, "count": n}
+            compact and cheap to parse for internal consumers (spawners)
+
+Rows come straight from asyncpg Records; no Pydantic models or per-row dicts
+are built for the streaming formats.
+"""
+
+import io
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Sequence
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from .postgis_client import postgis_client, QuerySpec
+
+try:
+    import pyarrow as pa
+    _arrow_available = True
+except ImportError:
+    pa = None
+    _arrow_available = False
+
+
+FORMAT_JSON = "json"
+FORMAT_NDJSON = "ndjson"
+FORMAT_ARROW = "arrow"
+FORMAT_COLUMNAR = "columnar"
+RESPONSE_FORMATS = (FORMAT_JSON, FORMAT_NDJSON, FORMAT_ARROW, FORMAT_COLUMNAR)
+FORMAT_PATTERN = "^(json|ndjson|arrow|columnar)$"
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+STREAM_BATCH_SIZE = 2000
+
+# Arrow types for the building columns; anything else is sent as a string
+_ARROW_TYPES = {
+    'building_id': 'int64',
+    'latitude': 'float64',
+    'longitude': 'float64',
+    'distance_meters': 'float64',
+}
+
+
+async def _ndjson_lines(batches: AsyncIterator[List[Any]]) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield "".join(json.dumps(dict(row), default=float) + "\n" for row in rows).encode()
+
+
+async def _arrow_batches(batches: AsyncIterator[List[Any]]) -> AsyncIterator[bytes]:
+    """Arrow IPC stream: schema from the first batch, one record batch per cursor fetch"""
+    sink = io.BytesIO()
+    writer = None
+    
+    async for rows in batches:
+        names = list(rows[0].keys())
+        columns = list(zip(*(row.values() for row in rows)))
+        if writer is None:
+            schema = pa.schema([
+                (name, pa.type_for_alias(_ARROW_TYPES.get(name, 'string'))) for name in names
+            ])
+            writer = pa.ipc.new_stream(sink, schema)
+        writer.write_batch(pa.record_batch(
+            [pa.array(column, type=writer.schema.field(i).type) for i, column in enumerate(columns)],
+            schema=writer.schema
+        ))
+        yield _drain(sink)
+    
+    if writer is not None:
+        writer.close()
+        yield _drain(sink)
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate(0)
+    return data
+
+
+def rows_to_columns(rows: Sequence[Any]) -> Dict[str, List[Any]]:
+    """Column arrays from asyncpg Records (or dicts)"""
+    if not rows:
+        return {}
+    names = list(rows[0].keys())
+    return {name: list(column) for name, column in zip(names, zip(*(row.values() for row in rows)))}
+
+
+async def building_query_response(
+    fmt: str,
+    spec: QuerySpec,
+    meta: Dict[str, Any]
+):
+    """
+    Response for a non-JSON building format.
+    
+    Args:
+        fmt: ndjson, arrow or columnar
+        spec: Named query to run
+        meta: Request parameters, echoed in the columnar body and in
+              X-Query-* headers for the streaming formats
+    """
+    if fmt == FORMAT_COLUMNAR:
+        start_time = time.time()
+        rows = await postgis_client.fetch_spec(spec, raw=True)
+        return JSONResponse({
+            **meta,
+            'columns': rows_to_columns(rows),
+            'count': len(rows),
+            'latency_ms': round((time.time() - start_time) * 1000, 2)
+        })
+    
+    headers = {f"X-Query-{key.replace('_', '-')}": str(value) for key, value in meta.items()}
+    
+    if fmt == FORMAT_NDJSON:
+        batches = postgis_client.stream_spec(spec, batch_size=STREAM_BATCH_SIZE)
+        return StreamingResponse(_ndjson_lines(batches), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+    
+    if fmt == FORMAT_ARROW:
+        if not _arrow_available:
+            raise HTTPException(status_code=406, detail="Arrow format requires pyarrow on the server")
+        batches = postgis_client.stream_spec(spec, batch_size=STREAM_BATCH_SIZE)
+        return StreamingResponse(_arrow_batches(batches), media_type=ARROW_MEDIA_TYPE, headers=headers)
+    
+    raise HTTPException(status_code=400, detail=f"Unsupported format '{fmt}' (use one of {RESPONSE_FORMATS})")
@@ -0,0 +1,86 @@
+"""
+Benchmark passenger inserts: per-row POSTs vs the Strapi bulk-create route.
+
+Spawns N synthetic passengers, writes them with both methods against a live
+Strapi instance, prints rows/sec for each, and deletes the rows afterwards.
+
+Usage:
+    python scripts/benchmark_bulk_insert.py --count 1000 --batch-size 500
+"""
+import argparse
+import asyncio
+import random
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from commuter_service.infrastructure.database import PassengerRepository
+
+
+def make_passengers(count: int, tag: str) -> list:
+    """Synthetic passengers scattered around Bridgetown."""
+    now = datetime.utcnow()
+    return [
+        {
+            "passenger_id": f"BENCH_{tag}_{i}_{uuid.uuid4().hex[:8]}",
+            "route_id": "BENCH",
+            "latitude": 13.10 + random.uniform(-0.02, 0.02),
+            "longitude": -59.61 + random.uniform(-0.02, 0.02),
+            "destination_lat": 13.10 + random.uniform(-0.02, 0.02),
+            "destination_lon": -59.61 + random.uniform(-0.02, 0.02),
+            "destination_name": "Benchmark",
+            "spawned_at": now,
+            "expires_minutes": 5,
+        }
+        for i in range(count)
+    ]
+
+
+async def cleanup(repo: PassengerRepository) -> None:
+    """Remove every benchmark passenger."""
+    while True:
+        async with repo.session.get(
+            f"{repo.strapi_url}/api/active-passengers",
+            params={"filters[route_id][$eq]": "BENCH", "pagination[pageSize]": 100},
+        ) as response:
+            rows = (await response.json()).get("data", [])
+        if not rows:
+            return
+        for row in rows:
+            async with repo.session.delete(
+                f"{repo.strapi_url}/api/active-passengers/{row['documentId']}"
+            ):
+                pass
+
+
+async def main(args) -> None:
+    repo = PassengerRepository(strapi_url=args.strapi_url, bulk_batch_size=args.batch_size)
+    await repo.connect()
+    try:
+        per_row = await repo.insert_passengers_individually(make_passengers(args.count, "row"))
+        bulk = await repo.bulk_insert_passengers_report(make_passengers(args.count, "bulk"))
+
+        print(f"\n{'method':<10} {'ok':>6} {'failed':>7} {'seconds':>9} {'rows/s':>9}")
+        for report in (per_row, bulk):
+            print(
+                f"{report.mode:<10} {report.successful:>6} {report.failed:>7} "
+                f"{report.elapsed_seconds:>9.2f} {report.rows_per_second:>9.0f}"
+            )
+        if per_row.rows_per_second > 0:
+            print(f"\nSpeedup: {bulk.rows_per_second / per_row.rows_per_second:.1f}x")
+    finally:
+        if not args.keep:
+            await cleanup(repo)
+        await repo.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1000, help="Passengers per method")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per bulk request")
+    parser.add_argument("--strapi-url", default="http://localhost:1337")
+    parser.add_argument("--keep", action="store_true", help="Keep inserted rows")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,109 @@
+"""
+Benchmark per-vehicle polling loops vs the discrete-event scheduler.
+
+Runs one simulated hour on a discrete SimClock for a fleet where a share of the
+vehicles is parked (engine off, waiting at a depot) and the rest drive a route
+with a waypoint every --waypoint-seconds. Compares:
+
+    polling     the previous behaviour: per vehicle a conductor monitoring loop
+                (--monitor-interval), a conductor position loop (2 s) and a
+                location broadcast loop (5 s), parked or not
+    events      common.event_scheduler: moving vehicles get a position event per
+                waypoint arrival and a broadcast every 5 s; parked vehicles get
+                nothing
+
+Reports callbacks run (vehicle work), wake-ups and wall time.
+
+Usage:
+    python scripts/benchmark_event_scheduler.py
+    python scripts/benchmark_event_scheduler.py --vehicles 500 --parked 0.5
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.event_scheduler import EventScheduler
+from common.sim_clock import SimClock
+
+START = datetime(2025, 11, 5, 6, 0, tzinfo=timezone.utc)
+
+
+def run_polling(args) -> dict:
+    clock = SimClock(start=START, discrete=True)
+    work = [0]
+
+    async def loop(interval: float, offset: float) -> None:
+        await clock.asleep(offset)
+        while True:
+            work[0] += 1
+            await clock.asleep(interval)
+
+    async def main() -> None:
+        clock.hold(asyncio.current_task())
+        tasks = []
+        for vehicle in range(args.vehicles):
+            for interval in (args.monitor_interval, 2.0, 5.0):
+                task = asyncio.create_task(loop(interval, vehicle % 10 / 10))
+                clock.hold(task)
+                tasks.append(task)
+        clock.start()
+        await clock.asleep(args.seconds)
+        clock.stop()
+        for task in tasks:
+            task.cancel()
+
+    wall = time.perf_counter()
+    asyncio.run(main())
+    return {"work": work[0], "wakeups": clock.advances, "wall": time.perf_counter() - wall}
+
+
+def run_events(args, moving: int) -> dict:
+    clock = SimClock(start=START, discrete=True)
+    scheduler = EventScheduler(clock)
+
+    def arrival(vehicle: int) -> None:
+        scheduler.schedule_in(args.waypoint_seconds, "position", arrival, vehicle, owner=vehicle)
+
+    def broadcast(vehicle: int) -> None:
+        scheduler.schedule_in(5.0, "broadcast", broadcast, vehicle, owner=vehicle)
+
+    async def main() -> None:
+        clock.hold(asyncio.current_task())
+        for vehicle in range(moving):
+            scheduler.schedule_in(vehicle % 10 / 10, "position", arrival, vehicle, owner=vehicle)
+            scheduler.schedule_in(vehicle % 10 / 10, "broadcast", broadcast, vehicle, owner=vehicle)
+        clock.start()
+        await clock.asleep(args.seconds)
+        clock.stop()
+        scheduler.close()
+
+    wall = time.perf_counter()
+    asyncio.run(main())
+    return {"work": scheduler.fired, "wakeups": scheduler.wakeups, "wall": time.perf_counter() - wall}
+
+
+def main(args) -> None:
+    moving = args.vehicles - int(args.vehicles * args.parked)
+    print(f"{args.vehicles} vehicles ({args.vehicles - moving} parked), {args.seconds:g} simulated seconds, "
+          f"waypoint every {args.waypoint_seconds:g} s")
+    results = {"polling": run_polling(args), "events": run_events(args, moving)}
+    for name, result in results.items():
+        print(f"   {name:<8} {result['work']:>10,} callbacks   {result['wakeups']:>7,} wake-ups   "
+              f"{result['wall']:>6.2f} s wall")
+    ratio = results["polling"]["work"] / max(1, results["events"]["work"])
+    print(f"   events do {ratio:.1f}x less vehicle work")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vehicles", type=int, default=200, help="Simulated vehicles")
+    parser.add_argument("--parked", type=float, default=0.5, help="Share of vehicles parked (engine off)")
+    parser.add_argument("--seconds", type=float, default=3600, help="Simulated seconds")
+    parser.add_argument("--monitor-interval", type=float, default=5.0, help="Conductor monitoring interval")
+    parser.add_argument("--waypoint-seconds", type=float, default=20.0, help="Driving time between waypoints")
+    main(parser.parse_args())
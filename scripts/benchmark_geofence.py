@@ -0,0 +1,117 @@
+"""
+Benchmark geofencing: per-point Shapely contains vs the geofence engine.
+
+Builds synthetic region and landuse layers over Barbados (or loads the real
+ones from PostGIS with --live), geofences random points with both methods and
+prints points/sec for each.
+
+Usage:
+    python scripts/benchmark_geofence.py --points 10000 --landuse 3000
+    python scripts/benchmark_geofence.py --points 10000 --live
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+import shapely
+from shapely.geometry import Point, box
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from geospatial_service.services.geofence_engine import (
+    GeofenceEngine, GeofenceLayer, LANDUSE_LAYER, REGION_LAYER,
+)
+
+# Barbados bounding box
+MIN_LON, MAX_LON = -59.65, -59.42
+MIN_LAT, MAX_LAT = 13.04, 13.34
+
+
+def synthetic_layer(name: str, count: int) -> GeofenceLayer:
+    """`count` jittered hexagon-ish polygons tiling the island bbox"""
+    side = max(1, int(count ** 0.5))
+    width = (MAX_LON - MIN_LON) / side
+    height = (MAX_LAT - MIN_LAT) / side
+    records, wkbs = [], []
+    for i in range(side * side):
+        lon = MIN_LON + (i % side) * width
+        lat = MIN_LAT + (i // side) * height
+        cell = box(lon, lat, lon + width, lat + height).buffer(width * 0.05, quad_segs=8)
+        records.append({'id': i + 1, 'document_id': f'{name}-{i + 1}', 'name': f'{name} {i + 1}'})
+        wkbs.append(shapely.to_wkb(cell))
+    return GeofenceLayer(name, records, wkbs)
+
+
+def random_points(count: int):
+    lats = [random.uniform(MIN_LAT, MAX_LAT) for _ in range(count)]
+    lons = [random.uniform(MIN_LON, MAX_LON) for _ in range(count)]
+    return lats, lons
+
+
+def per_point(engine: GeofenceEngine, lats, lons) -> float:
+    """The previous approach: unprepared polygons, one contains() per polygon per point"""
+    layers = [engine.layers[REGION_LAYER].geometries, engine.layers[LANDUSE_LAYER].geometries]
+    start = time.perf_counter()
+    for lat, lon in zip(lats, lons):
+        point = Point(lon, lat)
+        for geometries in layers:
+            for polygon in geometries:
+                if polygon.contains(point):
+                    break
+    return time.perf_counter() - start
+
+
+def engine_batch(engine: GeofenceEngine, lats, lons) -> float:
+    start = time.perf_counter()
+    engine.check_points(lats, lons)
+    return time.perf_counter() - start
+
+
+async def load_live(engine: GeofenceEngine):
+    from geospatial_service.services.postgis_client import postgis_client
+    await postgis_client.connect()
+    try:
+        await engine.load()
+    finally:
+        await postgis_client.disconnect()
+
+
+def main(args) -> None:
+    engine = GeofenceEngine()
+    if args.live:
+        asyncio.run(load_live(engine))
+    else:
+        engine.layers = {
+            REGION_LAYER: synthetic_layer(REGION_LAYER, args.regions),
+            LANDUSE_LAYER: synthetic_layer(LANDUSE_LAYER, args.landuse),
+        }
+    polygons = {name: len(layer.records) for name, layer in engine.layers.items()}
+    print(f"Layers: {polygons}, points: {args.points}")
+
+    lats, lons = random_points(args.points)
+    naive_points = min(args.points, args.naive_points)
+
+    timings = [
+        ("per-point", naive_points, per_point(engine, lats[:naive_points], lons[:naive_points])),
+        ("engine", args.points, engine_batch(engine, lats, lons)),
+    ]
+
+    print(f"\n{'method':<10} {'points':>8} {'seconds':>9} {'points/s':>12}")
+    for method, count, seconds in timings:
+        print(f"{method:<10} {count:>8} {seconds:>9.3f} {count / seconds:>12.0f}")
+    naive_rate = timings[0][1] / timings[0][2]
+    engine_rate = timings[1][1] / timings[1][2]
+    print(f"\nSpeedup: {engine_rate / naive_rate:.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=10000, help="Points per engine batch")
+    parser.add_argument("--naive-points", type=int, default=1000, help="Points for the per-point baseline")
+    parser.add_argument("--regions", type=int, default=11, help="Synthetic region polygons")
+    parser.add_argument("--landuse", type=int, default=3000, help="Synthetic landuse polygons")
+    parser.add_argument("--live", action="store_true", help="Load the real layers from PostGIS")
+    main(parser.parse_args())
@@ -0,0 +1,107 @@
+"""
+Benchmark the geospatial API in-process against the in-memory spatial backend.
+
+Generates a synthetic snapshot (or uses --snapshot), starts the FastAPI app
+with GEOSPATIAL_BACKEND=memory inside this process (no PostGIS, no Strapi, no
+network), fires concurrent requests at a set of endpoints and prints req/s
+with p50/p95 latency per endpoint. Useful for regression-checking handler and
+serialization overhead in CI.
+
+Usage:
+    python scripts/benchmark_geospatial_api.py --requests 500 --concurrency 20
+    python scripts/benchmark_geospatial_api.py --snapshot snapshots/barbados
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Barbados bounding box
+MIN_LON, MAX_LON = -59.65, -59.42
+MIN_LAT, MAX_LAT = 13.04, 13.34
+
+
+def random_point():
+    return random.uniform(MIN_LAT, MAX_LAT), random.uniform(MIN_LON, MAX_LON)
+
+
+def endpoints():
+    """(name, method, url factory, body factory) per benchmarked endpoint"""
+    def reverse_geocode():
+        lat, lon = random_point()
+        return f"/geocode/reverse?lat={lat}&lon={lon}"
+
+    def point_body():
+        lat, lon = random_point()
+        return {"latitude": lat, "longitude": lon}
+
+    return [
+        ("reverse geocode", "GET", reverse_geocode, None),
+        ("geofence check", "POST", lambda: "/geofence/check", point_body),
+        ("nearest route", "POST", lambda: "/routes/nearest", lambda: {**point_body(), "max_distance_meters": 2000}),
+        ("nearest depot", "POST", lambda: "/depots/nearest", point_body),
+        ("depot catchment", "GET", lambda: f"/depots/{random.randint(1, 4)}/catchment?radius_meters=1000", None),
+        ("route coverage", "GET", lambda: "/analytics/route-coverage?buffer_meters=300", None),
+        ("system overview", "GET", lambda: "/spawn/system-overview", None),
+    ]
+
+
+async def run(args) -> None:
+    import httpx
+    from geospatial_service.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            print(f"\n{'endpoint':<18} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+            for name, method, url, body in endpoints():
+                latencies, errors = [], 0
+                semaphore = asyncio.Semaphore(args.concurrency)
+
+                async def one():
+                    nonlocal errors
+                    async with semaphore:
+                        started = time.perf_counter()
+                        response = await client.request(method, url(), json=body() if body else None)
+                        latencies.append((time.perf_counter() - started) * 1000)
+                        if response.status_code >= 400:
+                            errors += 1
+
+                started = time.perf_counter()
+                await asyncio.gather(*(one() for _ in range(args.requests)))
+                elapsed = time.perf_counter() - started
+                p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+                print(
+                    f"{name:<18} {args.requests / elapsed:>9.0f} "
+                    f"{statistics.median(latencies):>8.2f} {p95:>8.2f} {errors:>7}"
+                )
+
+
+def main(args) -> None:
+    random.seed(args.seed)
+    snapshot = args.snapshot or tempfile.mkdtemp(prefix="geospatial-snapshot-")
+
+    # Must be set before geospatial_service (and its global spatial client) is imported
+    os.environ["GEOSPATIAL_BACKEND"] = "memory"
+    os.environ["GEOSPATIAL_SNAPSHOT"] = str(snapshot)
+    if args.snapshot is None:
+        from geospatial_service.services.memory_store import generate_synthetic_snapshot
+        generate_synthetic_snapshot(snapshot, buildings=args.buildings, seed=args.seed)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snapshot", help="Snapshot directory (default: generate a synthetic one)")
+    parser.add_argument("--buildings", type=int, default=20000, help="Synthetic building count")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent in-flight requests")
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
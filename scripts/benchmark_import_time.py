@@ -0,0 +1,113 @@
+"""
+Cold-import time benchmark for the simulator and service entry points.
+
+Each entry module is imported in a fresh interpreter with `python -X importtime`
+(best of --runs) and compared against its budget. Modules that must stay out of
+the import graph until first use (optional transports, pandas, shapely, crypto)
+are checked as well. Exits non-zero when any entry point is over budget or
+imports one of its deferred modules eagerly, so it can gate CI:
+
+Usage:
+    python scripts/benchmark_import_time.py
+    python scripts/benchmark_import_time.py --runs 5 --scale 2.0
+    IMPORT_BUDGET_SCALE=3 python -m pytest tests/test_import_budget.py
+
+The budgets are deliberately loose (slow CI runners); --scale / the
+IMPORT_BUDGET_SCALE environment variable multiplies all of them.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).parent.parent
+
+# Entry module -> (cold-import budget in ms, top-level modules it must not import)
+IMPORT_BUDGETS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "arknet_transit_simulator.__main__": (400, ("aiohttp", "socketio", "websockets", "dotenv", "shapely", "numpy")),
+    "arknet_transit_simulator.vehicle.driver.navigation.vehicle_driver": (400, ("socketio", "engineio", "aiohttp")),
+    "arknet_transit_simulator.vehicle.conductor": (400, ("socketio", "engineio")),
+    "arknet_transit_simulator.vehicle.gps_device.device": (400, ("websockets", "dotenv", "cryptography")),
+    "commuter_service.main": (2000, ("pandas", "numpy", "shapely", "socketio")),
+    "geospatial_service.main": (2500, ("pandas", "numpy", "shapely")),
+}
+
+_PROBE = (
+    "import json, sys; __import__(sys.argv[1]); "
+    "print(json.dumps(sorted({name.split('.')[0] for name in sys.modules})))"
+)
+
+
+def measure_import(module: str) -> Tuple[float, List[str]]:
+    """
+    Import a module in a fresh interpreter.
+
+    Args:
+        module: Dotted module name
+
+    Returns:
+        (cumulative import time of the module in ms, top-level packages loaded)
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE, module],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    cumulative_us: Optional[int] = None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            cumulative_us = int(fields[1])
+    if cumulative_us is None:
+        raise RuntimeError(f"{module} not found in -X importtime output (already imported by the probe?)")
+    return cumulative_us / 1000, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def check_budgets(runs: int = 3, scale: float = 1.0, modules: Optional[List[str]] = None) -> List[str]:
+    """
+    Measure every entry point and return the failures (empty when all pass).
+
+    Args:
+        runs: Fresh-interpreter imports per module; the fastest one is compared
+        scale: Multiplier applied to every budget
+        modules: Subset of IMPORT_BUDGETS to check (default: all)
+    """
+    failures = []
+    for module in modules or IMPORT_BUDGETS:
+        budget_ms, deferred = IMPORT_BUDGETS[module]
+        budget_ms *= scale
+        samples = [measure_import(module) for _ in range(max(1, runs))]
+        best_ms = min(ms for ms, _ in samples)
+        eager = sorted(set(deferred) & set(samples[0][1]))
+
+        status = "✅" if best_ms <= budget_ms and not eager else "❌"
+        print(f"{status} {module:<66} {best_ms:>8.1f}ms / {budget_ms:>6.0f}ms")
+        if best_ms > budget_ms:
+            failures.append(f"{module}: cold import {best_ms:.1f}ms exceeds budget {budget_ms:.0f}ms")
+        if eager:
+            failures.append(f"{module}: imports {', '.join(eager)} eagerly (must load on first use)")
+    return failures
+
+
+def main(args) -> int:
+    failures = check_budgets(runs=args.runs, scale=args.scale, modules=args.modules or None)
+    for failure in failures:
+        print(f"   {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", help="Entry modules to check (default: all budgeted modules)")
+    parser.add_argument("--runs", type=int, default=3, help="Imports per module (fastest is compared)")
+    parser.add_argument("--scale", type=float, default=float(os.getenv("IMPORT_BUDGET_SCALE", "1.0")),
+                        help="Budget multiplier (default: IMPORT_BUDGET_SCALE or 1.0)")
+    sys.exit(main(parser.parse_args()))
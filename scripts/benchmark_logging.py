@@ -0,0 +1,119 @@
+"""
+Benchmark tick-loop throughput with logging off vs the logging pipelines.
+
+Each simulated tick does a small amount of vehicle work (position interpolation)
+and emits the per-iteration lines the driver/conductor loops log. Lines go to a
+log file in a temporary directory, or with --sink slow to a handler that blocks
+for --write-us per line (a busy terminal or network log shipper). Compares:
+
+    off          logging disabled (baseline)
+    sync         f-strings, handlers on the tick thread (the previous behaviour)
+    sync-lazy    %-style arguments, handlers on the tick thread
+    async        %-style arguments, QueueHandler -> writer thread
+    async-rate   async plus RateLimitFilter (1 line/s per message and vehicle)
+
+Usage:
+    python scripts/benchmark_logging.py
+    python scripts/benchmark_logging.py --vehicles 200 --ticks 50
+    python scripts/benchmark_logging.py --sink slow --write-us 50
+"""
+import argparse
+import logging
+import math
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from arknet_transit_simulator.utils.logging_system import RateLimitFilter, start_queue_logging, stop_queue_logging
+
+FILE_FORMAT = '%(asctime)s | %(levelname)-8s | %(name)s:%(lineno)d | %(funcName)s() | %(message)s'
+
+
+class SlowHandler(logging.Handler):
+    """Formats each record and blocks for `write_seconds`, like a slow console"""
+
+    def __init__(self, write_seconds: float):
+        super().__init__()
+        self.write_seconds = write_seconds
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.format(record)
+        time.sleep(self.write_seconds)
+
+
+def vehicle_work(tick: int, index: int):
+    """Stand-in for a driver step: interpolate a position along a circle"""
+    angle = (tick * 0.01 + index) % (2 * math.pi)
+    return 13.1 + 0.05 * math.sin(angle), -59.6 + 0.05 * math.cos(angle)
+
+
+def run_ticks(logger: logging.Logger, vehicles: int, ticks: int, lazy: bool) -> float:
+    """Run vehicles x ticks iterations; returns elapsed seconds"""
+    names = [f"ZR{index:03d}" for index in range(vehicles)]
+    start = time.perf_counter()
+    for tick in range(ticks):
+        for index, vehicle_id in enumerate(names):
+            lat, lon = vehicle_work(tick, index)
+            if lazy:
+                extra = {"vehicle_id": vehicle_id}
+                logger.info("[%s] Checking for passengers at position (%.6f, %.6f)", vehicle_id, lat, lon, extra=extra)
+                logger.info("[%s] Loop iteration: state=%s, seats=%d/%d", vehicle_id, "ONBOARD", 12, 16, extra=extra)
+            else:
+                logger.info(f"[{vehicle_id}] Checking for passengers at position ({lat:.6f}, {lon:.6f})")
+                logger.info(f"[{vehicle_id}] Loop iteration: state={'ONBOARD'}, seats={12}/{16}")
+    return time.perf_counter() - start
+
+
+def measure(mode: str, args, log_dir: Path) -> float:
+    """Ticks per second for one logging mode"""
+    logger = logging.getLogger(f"benchmark.logging.{mode}")
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    if mode == "off":
+        logger.disabled = True
+    else:
+        if args.sink == "slow":
+            handler = SlowHandler(args.write_us / 1e6)
+        else:
+            handler = logging.FileHandler(log_dir / f"{mode}.log", encoding="utf-8")
+        handler.setFormatter(logging.Formatter(FILE_FORMAT))
+        logger.addHandler(handler)
+        if mode.startswith("async"):
+            start_queue_logging(logger, RateLimitFilter(rate=1.0) if mode == "async-rate" else None,
+                                max_queue_size=args.vehicles * args.ticks * 2 + 1)
+
+    elapsed = run_ticks(logger, args.vehicles, args.ticks, lazy=mode != "sync")
+    stop_queue_logging(logger)
+    for handler in list(logger.handlers):
+        handler.close()
+        logger.removeHandler(handler)
+    return args.vehicles * args.ticks / elapsed
+
+
+def main(args) -> None:
+    modes = ["off", "sync", "sync-lazy", "async", "async-rate"]
+    sink = f"slow handler ({args.write_us:g} us/line)" if args.sink == "slow" else "log file"
+    print(f"Tick loop: {args.vehicles} vehicles x {args.ticks} ticks, 2 INFO lines per vehicle tick -> {sink}")
+    with tempfile.TemporaryDirectory() as log_dir:
+        results = {}
+        for mode in modes:
+            results[mode] = max(measure(mode, args, Path(log_dir)) for _ in range(args.runs))
+        for mode in modes:
+            rate = results[mode]
+            print(f"   {mode:<11} {rate:>12,.0f} vehicle-ticks/s   {rate / results['off'] * 100:>6.1f}% of off"
+                  f"   {rate / results['sync']:>5.1f}x sync")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vehicles", type=int, default=100, help="Simulated vehicles")
+    parser.add_argument("--ticks", type=int, default=50, help="Ticks per vehicle")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per mode (best is reported)")
+    parser.add_argument("--sink", choices=["file", "slow"], default="file", help="Where log lines are written")
+    parser.add_argument("--write-us", type=float, default=50.0, help="Per-line write latency of the slow sink")
+    main(parser.parse_args())
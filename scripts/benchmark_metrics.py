@@ -0,0 +1,109 @@
+"""
+Benchmark the hot-path cost of the in-process metrics registry (common/metrics.py).
+
+Times each update operation over --ops calls (best of --runs) and compares the
+per-call cost of counter/gauge/histogram updates against the budget (1 µs by
+default); the per-tick TickTimer cost is reported alongside. Also times a full /metrics
+render for a registry with --series labelled series. Exits non-zero when any
+hot-path operation is over budget, so it can gate CI:
+
+Usage:
+    python scripts/benchmark_metrics.py
+    python scripts/benchmark_metrics.py --ops 1000000 --budget-ns 1000
+    METRICS_BUDGET_SCALE=3 python -m pytest tests/test_metrics.py
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.metrics import MetricsRegistry, TickTimer
+
+
+def time_per_call(operation: Callable[[], None], ops: int, runs: int) -> float:
+    """Best-of-runs cost of one call, in nanoseconds (loop overhead subtracted)"""
+    def empty() -> None:
+        pass
+
+    best = float("inf")
+    for _ in range(max(1, runs)):
+        start = time.perf_counter_ns()
+        for _ in range(ops):
+            operation()
+        elapsed = time.perf_counter_ns() - start
+
+        start = time.perf_counter_ns()
+        for _ in range(ops):
+            empty()
+        baseline = time.perf_counter_ns() - start
+        best = min(best, max(0.0, (elapsed - baseline) / ops))
+    return best
+
+
+def hot_path_operations(registry: MetricsRegistry) -> Dict[str, Tuple[Callable[[], None], bool]]:
+    packets = registry.counter("bench_packets_total", "Benchmark counter", ("result",)).labels("sent")
+    requests = registry.counter("bench_requests_total", "Unlabelled benchmark counter")
+    depth = registry.gauge("bench_queue_depth", "Benchmark gauge")
+    latency = registry.histogram("bench_latency_seconds", "Benchmark histogram", ("upstream",)).labels("strapi")
+    tick = TickTimer("bench", 0.0, registry)
+
+    def tick_timer() -> None:
+        with tick:
+            pass
+
+    # name -> (operation, gated by the per-call budget)
+    return {
+        "counter.inc (bound child)": (packets.inc, True),
+        "counter.inc (unlabelled)": (requests.inc, True),
+        "gauge.set": (lambda: depth.set(3), True),
+        "histogram.observe": (lambda: latency.observe(0.042), True),
+        # Once per loop tick (seconds apart), two observations: reported, not gated
+        "TickTimer (duration + lag)": (tick_timer, False),
+    }
+
+
+def time_render(series: int) -> float:
+    """Milliseconds to render a registry with `series` labelled counter/histogram series"""
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_events_total", "Events", ("vehicle",))
+    histogram = registry.histogram("bench_poll_seconds", "Polls", ("vehicle",))
+    for index in range(series):
+        counter.labels(f"ZR{index}").inc()
+        histogram.labels(f"ZR{index}").observe(index / series)
+    start = time.perf_counter()
+    registry.render()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(args) -> int:
+    budget_ns = args.budget_ns * args.scale
+    registry = MetricsRegistry()
+    failures: List[str] = []
+
+    print(f"Metrics hot path ({args.ops:,} calls, best of {args.runs}, budget {budget_ns:.0f} ns/call)")
+    for name, (operation, gated) in hot_path_operations(registry).items():
+        cost = time_per_call(operation, args.ops, args.runs)
+        status = "  " if not gated else "✅" if cost <= budget_ns else "❌"
+        print(f"{status} {name:<30} {cost:>8.1f} ns/call")
+        if gated and cost > budget_ns:
+            failures.append(f"{name}: {cost:.1f} ns/call exceeds {budget_ns:.0f} ns")
+
+    print(f"   render ({args.series:,} series x 2 metrics)  {time_render(args.series):>8.2f} ms")
+    for failure in failures:
+        print(f"   {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=200_000, help="Calls per operation and run")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per operation (fastest is compared)")
+    parser.add_argument("--budget-ns", type=float, default=1000.0, help="Per-call budget in nanoseconds")
+    parser.add_argument("--series", type=int, default=1000, help="Labelled series for the render benchmark")
+    parser.add_argument("--scale", type=float, default=float(os.getenv("METRICS_BUDGET_SCALE", "1.0")),
+                        help="Budget multiplier (default: METRICS_BUDGET_SCALE or 1.0)")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,159 @@
+"""
+Benchmark PassengerMonitor change detection: legacy polling vs cursor vs NOTIFY.
+
+Creates N synthetic passengers on a benchmark route, then for each mode boards
+them one at a time through Strapi and measures the time from the update
+returning to the monitor emitting the event. Prints latency percentiles and
+the number of Strapi queries each mode issued, then deletes the rows.
+
+NOTIFY mode needs PG_DSN and the trigger in
+commuter_service/scripts/sql/active_passengers_notify.sql; it is skipped otherwise.
+
+Usage:
+    python scripts/benchmark_passenger_monitor.py --count 50 --routes 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.http_pool import http_session
+from commuter_service.services.passenger_monitor import (
+    PassengerMonitor,
+    MODE_CURSOR,
+    MODE_NOTIFY,
+    MODE_POLL,
+)
+
+BENCH_ROUTE = "BENCH_MONITOR"
+
+
+class TimingMonitor(PassengerMonitor):
+    """Records when each passenger's event would reach WebSocket clients."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.delivered = {}
+
+    async def _deliver(self, route_id, events):
+        now = time.perf_counter()
+        for _, data in events:
+            self.delivered.setdefault(data["passenger_id"], now)
+
+
+def percentile(values: list, p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+async def create_passengers(strapi_url: str, count: int) -> list:
+    """Create waiting passengers, returning (passenger_id, documentId) pairs."""
+    created = []
+    async with http_session("strapi", timeout=10.0) as client:
+        for i in range(count):
+            passenger_id = f"BENCH_MON_{i}_{uuid.uuid4().hex[:8]}"
+            response = await client.post(
+                f"{strapi_url}/api/active-passengers",
+                json={"data": {
+                    "passenger_id": passenger_id,
+                    "route_id": BENCH_ROUTE,
+                    "latitude": 13.10 + random.uniform(-0.02, 0.02),
+                    "longitude": -59.61 + random.uniform(-0.02, 0.02),
+                    "destination_lat": 13.10,
+                    "destination_lon": -59.61,
+                    "destination_name": "Benchmark",
+                    "spawned_at": datetime.utcnow().isoformat() + "Z",
+                    "status": "WAITING",
+                }},
+            )
+            response.raise_for_status()
+            created.append((passenger_id, response.json()["data"]["documentId"]))
+    return created
+
+
+async def set_boarded(strapi_url: str, document_id: str, boarded: bool) -> None:
+    async with http_session("strapi", timeout=10.0) as client:
+        response = await client.put(
+            f"{strapi_url}/api/active-passengers/{document_id}",
+            json={"data": {"boarded_at": datetime.utcnow().isoformat() + "Z" if boarded else None}},
+        )
+        response.raise_for_status()
+
+
+async def cleanup(strapi_url: str, passengers: list) -> None:
+    async with http_session("strapi", timeout=10.0) as client:
+        for _, document_id in passengers:
+            await client.delete(f"{strapi_url}/api/active-passengers/{document_id}")
+
+
+async def run_mode(args, mode: str, passengers: list) -> dict:
+    monitor = TimingMonitor(strapi_url=args.strapi_url, poll_interval=args.poll_interval, mode=mode)
+    if monitor.mode != mode:
+        return {"mode": mode, "skipped": True}
+
+    # Decoy routes make the legacy mode pay its per-route query cost
+    for i in range(args.routes - 1):
+        monitor.add_monitored_route(f"BENCH_DECOY_{i}")
+    monitor.add_monitored_route(BENCH_ROUTE)
+
+    # Reset to waiting so every mode observes the same transition
+    for _, document_id in passengers:
+        await set_boarded(args.strapi_url, document_id, boarded=False)
+
+    await monitor.start()
+    await asyncio.sleep(args.poll_interval * 2)  # let the cache see every passenger
+
+    updated = {}
+    for passenger_id, document_id in passengers:
+        await set_boarded(args.strapi_url, document_id, boarded=True)
+        updated[passenger_id] = time.perf_counter()
+        await asyncio.sleep(random.uniform(0, args.poll_interval / 2))
+
+    deadline = time.perf_counter() + args.poll_interval * 5
+    while len(monitor.delivered) < len(updated) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    latencies = [
+        (monitor.delivered[pid] - started) * 1000
+        for pid, started in updated.items() if pid in monitor.delivered
+    ]
+    return {
+        "mode": mode,
+        "skipped": False,
+        "detected": len(latencies),
+        "p50": percentile(latencies, 0.50) if latencies else float("nan"),
+        "p95": percentile(latencies, 0.95) if latencies else float("nan"),
+        "queries": monitor.stats["strapi_queries"],
+    }
+
+
+async def main(args) -> None:
+    passengers = await create_passengers(args.strapi_url, args.count)
+    try:
+        results = [await run_mode(args, mode, passengers) for mode in (MODE_POLL, MODE_CURSOR, MODE_NOTIFY)]
+    finally:
+        await cleanup(args.strapi_url, passengers)
+
+    print(f"\n{'mode':<8} {'detected':>9} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8}")
+    for r in results:
+        if r["skipped"]:
+            print(f"{r['mode']:<8} {'skipped (set PG_DSN)':>37}")
+            continue
+        print(f"{r['mode']:<8} {r['detected']:>9} {r['p50']:>9.0f} {r['p95']:>9.0f} {r['queries']:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=50, help="Passengers to board per mode")
+    parser.add_argument("--routes", type=int, default=10, help="Monitored routes (incl. decoys)")
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    parser.add_argument("--strapi-url", default=os.getenv("STRAPI_URL", "http://localhost:1337"))
+    asyncio.run(main(parser.parse_args()))
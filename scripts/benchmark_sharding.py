@@ -0,0 +1,121 @@
+"""
+Benchmark fleet sharding: simulated vehicles per core for 1..N worker processes.
+
+Splits one fleet of synthetic vehicles (--routes routes) into P shards with
+partition_fleet(), the same route-based split --workers uses, and runs every
+shard in its own spawned process. Each process runs real VehicleDriver + Engine
+pairs (engine threads, driver worker threads, position events on the event
+scheduler; no Strapi, GPS or Socket.IO) on a discrete SimClock for --seconds
+simulated seconds. All processes start their clocks together.
+
+Reports per P:
+    throughput      vehicle-seconds simulated per wall second (whole fleet)
+    per core        throughput / min(P, CPU cores): vehicles one core keeps at 1x realtime
+    speedup         throughput relative to P = 1
+
+With more processes than cores the extra processes only time-share, so the
+speedup flattens at the core count.
+
+Usage:
+    python scripts/benchmark_sharding.py
+    python scripts/benchmark_sharding.py --vehicles 120 --max-workers 8 --seconds 120
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from arknet_transit_simulator.core.fleet_shards import partition_fleet
+
+START = datetime(2025, 11, 5, 6, 0, tzinfo=timezone.utc)
+
+# Waypoints ~111 m apart along a meridian
+ROUTE = [(-59.6, 13.1 + 0.001 * index) for index in range(200)]
+
+
+class CruiseModel:
+    def update(self):
+        return {"velocity_mps": 10.0}
+
+
+def run_shard(vehicle_ids, seconds, barrier, results) -> None:
+    """Worker process: drive `vehicle_ids` for `seconds` simulated seconds"""
+    logging.disable(logging.CRITICAL)
+    from common.sim_clock import DISCRETE_RESOLUTION, configure_sim_clock
+    from arknet_transit_simulator.vehicle.driver.navigation.vehicle_driver import VehicleDriver
+    from arknet_transit_simulator.vehicle.engine.engine_block import Engine
+    from arknet_transit_simulator.vehicle.engine.engine_buffer import EngineBuffer
+
+    clock = configure_sim_clock(start=START, discrete=True, resolution=DISCRETE_RESOLUTION)
+
+    async def main() -> float:
+        drivers = []
+        for vehicle_id in vehicle_ids:
+            driver = VehicleDriver(f"DRV-{vehicle_id}", f"Driver {vehicle_id}", vehicle_id, ROUTE, use_socketio=False)
+            await driver.start()
+            driver.set_vehicle_components(engine=Engine(vehicle_id, CruiseModel(), EngineBuffer(size=10), tick_time=0.1))
+            await driver.start_engine()
+            drivers.append(driver)
+        clock.hold(asyncio.current_task())
+        await asyncio.to_thread(barrier.wait)
+        wall = time.perf_counter()
+        clock.start()
+        await clock.asleep(seconds)
+        wall = time.perf_counter() - wall
+        for driver in drivers:
+            await driver.stop()
+        clock.stop()
+        return wall
+
+    results.put((len(vehicle_ids), asyncio.run(main())))
+
+
+def run(args, workers: int) -> dict:
+    pairs = [(SimpleNamespace(vehicle_id=f"ZR{index:03d}", route_id=f"R{index % args.routes}"), None)
+             for index in range(args.vehicles)]
+    shards = [[vehicle.vehicle_id for vehicle, _ in shard] for shard in partition_fleet(pairs, workers) if shard]
+
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(len(shards))
+    results = context.Queue()
+    processes = [context.Process(target=run_shard, args=(shard, args.seconds, barrier, results)) for shard in shards]
+    for process in processes:
+        process.start()
+    walls = [results.get()[1] for _ in processes]
+    for process in processes:
+        process.join()
+
+    wall = max(walls)  # the fleet is done when its slowest shard is
+    throughput = args.vehicles * args.seconds / wall
+    return {"processes": len(shards), "wall": wall, "throughput": throughput}
+
+
+def main(args) -> None:
+    cores = os.cpu_count() or 1
+    print(f"{args.vehicles} vehicles on {args.routes} routes, {args.seconds:g} simulated seconds, "
+          f"{cores} CPU core(s)")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        result = run(args, workers)
+        baseline = baseline or result["throughput"]
+        per_core = result["throughput"] / min(result["processes"], cores)
+        print(f"   {result['processes']} process(es)  {result['wall']:>7.2f} s wall  "
+              f"{result['throughput']:>9,.0f} vehicle-s/s  {per_core:>9,.0f} per core  "
+              f"{result['throughput'] / baseline:>5.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vehicles", type=int, default=60, help="Simulated vehicles")
+    parser.add_argument("--routes", type=int, default=12, help="Routes the vehicles are spread over")
+    parser.add_argument("--seconds", type=float, default=60, help="Simulated seconds")
+    parser.add_argument("--max-workers", type=int, default=4, help="Largest number of worker processes")
+    main(parser.parse_args())
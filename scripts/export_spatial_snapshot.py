@@ -0,0 +1,96 @@
+"""
+Export PostGIS feature tables and the Strapi depot/route catalog to a snapshot
+directory for the in-memory spatial backend (GEOSPATIAL_BACKEND=memory).
+
+Usage:
+    python scripts/export_spatial_snapshot.py --out snapshots/barbados
+    python scripts/export_spatial_snapshot.py --out snapshots/synthetic --synthetic --buildings 50000
+
+Then:
+    GEOSPATIAL_BACKEND=memory GEOSPATIAL_SNAPSHOT=snapshots/barbados python geospatial_service/main.py
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from geospatial_service.config.database import db_config
+from geospatial_service.services.memory_store import (
+    CATALOG_FILES, FEATURE_FILES, generate_synthetic_snapshot,
+)
+
+# Attribute columns exported per table (geometry is exported as GeoJSON)
+TABLE_COLUMNS = {
+    "buildings": ["id", "document_id"],
+    "highways": ["id", "document_id", "name", "highway_type"],
+    "pois": ["id", "document_id", "name", "poi_type", "amenity"],
+    "regions": ["id", "document_id", "name"],
+    "landuse_zones": ["id", "document_id", "name", "zone_type"],
+}
+
+
+async def export_tables(out: Path):
+    pool = await db_config.get_pool(min_size=1, max_size=2)
+    try:
+        async with pool.acquire() as conn:
+            for table, columns in TABLE_COLUMNS.items():
+                rows = await conn.fetch(
+                    f"SELECT {', '.join(columns)}, ST_AsGeoJSON(geom) AS geometry "
+                    f"FROM {table} WHERE geom IS NOT NULL ORDER BY id"
+                )
+                collection = {
+                    "type": "FeatureCollection",
+                    "features": [
+                        {
+                            "type": "Feature",
+                            "properties": {column: row[column] for column in columns},
+                            "geometry": json.loads(row["geometry"]),
+                        }
+                        for row in rows
+                    ],
+                }
+                (out / FEATURE_FILES[table]).write_text(json.dumps(collection), encoding="utf-8")
+                print(f"✅ {table}: {len(rows):,} features")
+    finally:
+        await pool.close()
+
+
+async def export_catalog(out: Path):
+    from geospatial_service.services.catalog import StrapiCatalog
+
+    snapshot = await StrapiCatalog().load()
+    for key, records in (
+        ("routes", snapshot.routes),
+        ("depots", snapshot.depots),
+        ("route_depots", snapshot.associations),
+    ):
+        (out / CATALOG_FILES[key]).write_text(json.dumps(records, default=str), encoding="utf-8")
+        print(f"✅ {key}: {len(records)} records")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="Snapshot directory")
+    parser.add_argument("--synthetic", action="store_true", help="Generate random data instead of exporting")
+    parser.add_argument("--buildings", type=int, default=20000, help="Synthetic building count")
+    parser.add_argument("--routes", type=int, default=10, help="Synthetic route count")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    if args.synthetic:
+        generate_synthetic_snapshot(out, buildings=args.buildings, routes=args.routes, seed=args.seed)
+        print(f"✅ Synthetic snapshot written to {out}")
+        return
+
+    out.mkdir(parents=True, exist_ok=True)
+    asyncio.run(export_tables(out))
+    asyncio.run(export_catalog(out))
+    print(f"✅ Snapshot written to {out}")
+
+
+if __name__ == "__main__":
+    main()
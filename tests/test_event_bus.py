@@ -0,0 +1,105 @@
+"""Tests for the coalescing, filtering event bus (arknet_transit_simulator/api/events/event_bus.py)."""
+
+import asyncio
+import json
+
+from arknet_transit_simulator.api.events.event_bus import EventBus
+from arknet_transit_simulator.api.events.event_types import EventType
+from arknet_transit_simulator.api.routes.websockets import events_websocket
+
+
+def test_position_updates_coalesce_per_vehicle_and_keep_other_events():
+    bus = EventBus()
+    subscription = bus.subscribe()
+
+    async def scenario():
+        for step in range(5):
+            await bus.emit(EventType.POSITION_UPDATE, {"vehicle_id": "ZR1", "lat": step})
+            await bus.emit(EventType.POSITION_UPDATE, {"vehicle_id": "ZR2", "lat": step})
+        await bus.emit(EventType.PASSENGER_BOARDED, {"vehicle_id": "ZR1", "passenger_id": "p1"})
+        await bus.emit(EventType.PASSENGER_BOARDED, {"vehicle_id": "ZR1", "passenger_id": "p2"})
+        return await subscription.get_batch()
+
+    events = asyncio.run(scenario())
+    assert [(e.event_type, e.data["vehicle_id"]) for e in events] == [
+        (EventType.POSITION_UPDATE, "ZR1"), (EventType.POSITION_UPDATE, "ZR2"),
+        (EventType.PASSENGER_BOARDED, "ZR1"), (EventType.PASSENGER_BOARDED, "ZR1"),
+    ]
+    assert events[0].data["lat"] == 4 and events[1].data["lat"] == 4  # latest position wins
+    stats = subscription.get_stats()
+    assert (stats["coalesced"], stats["dropped"], stats["delivered"], stats["pending"]) == (8, 0, 4, 0)
+
+
+def test_server_side_filters_by_type_vehicle_and_route():
+    bus = EventBus()
+    routes = {"ZR1": "1", "ZR2": "2"}
+    by_route = bus.subscribe(routes=["1"], route_resolver=routes.get)
+    by_vehicle = bus.subscribe(vehicle_ids=["ZR2"])
+    by_type = bus.subscribe(EventType.ENGINE_STARTED)
+
+    async def scenario():
+        await bus.emit(EventType.ENGINE_STARTED, {"vehicle_id": "ZR1"})
+        await bus.emit(EventType.ENGINE_STOPPED, {"vehicle_id": "ZR2"})
+        await bus.emit(EventType.BOARDING_ENABLED, {"vehicle_id": "ZR9", "route_id": "1"})
+        await bus.emit(EventType.FLEET_DELTA, {"seq": 1, "changed": {}, "removed": []})  # no vehicle: passes
+
+    asyncio.run(scenario())
+    drain = lambda s: [(e.event_type, e.data.get("vehicle_id")) for e in (s.get_nowait() for _ in range(s.qsize()))]
+    assert drain(by_route) == [(EventType.ENGINE_STARTED, "ZR1"), (EventType.BOARDING_ENABLED, "ZR9"),
+                               (EventType.FLEET_DELTA, None)]
+    assert drain(by_vehicle) == [(EventType.ENGINE_STOPPED, "ZR2"), (EventType.FLEET_DELTA, None)]
+    assert drain(by_type) == [(EventType.ENGINE_STARTED, "ZR1")]
+
+
+def test_full_queue_drops_oldest_and_rate_limits_warnings(caplog):
+    bus = EventBus(max_queue_size=3)
+    subscription = bus.subscribe(name="slow")
+    caplog.set_level("WARNING")
+
+    async def scenario():
+        for n in range(10):
+            await bus.emit(EventType.PASSENGER_BOARDED, {"vehicle_id": "ZR1", "passenger_id": n})
+
+    asyncio.run(scenario())
+    assert [subscription.get_nowait().data["passenger_id"] for _ in range(3)] == [7, 8, 9]
+    assert subscription.dropped == 7
+    assert len([r for r in caplog.records if "slow" in r.getMessage()]) == 1  # not one warning per event
+    assert bus.get_stats()["per_subscriber"][0]["dropped"] == 7
+
+
+def test_websocket_batches_ready_events_into_one_frame():
+    bus = EventBus()
+
+    class FakeWebSocket:
+        def __init__(self):
+            self.frames = []
+
+        async def accept(self):
+            pass
+
+        async def send_json(self, frame):
+            self.frames.append(json.loads(json.dumps(frame)))
+
+    async def scenario(batch):
+        websocket = FakeWebSocket()
+        stream = asyncio.create_task(events_websocket(websocket, routes=None, vehicles="ZR1", event_types=None,
+                                                      max_rate=None, batch=batch, event_bus=bus))
+        await asyncio.sleep(0)
+        for step in range(3):
+            await bus.emit(EventType.POSITION_UPDATE, {"vehicle_id": "ZR1", "lat": step})
+            await bus.emit(EventType.POSITION_UPDATE, {"vehicle_id": "ZR2", "lat": step})
+        await bus.emit(EventType.ENGINE_STARTED, {"vehicle_id": "ZR1"})
+        await asyncio.sleep(0.01)
+        stream.cancel()
+        await asyncio.gather(stream, return_exceptions=True)
+        return websocket.frames
+
+    frames = asyncio.run(scenario(batch=True))
+    assert len(frames) == 1 and isinstance(frames[0], list)
+    assert [(m["event_type"], m["vehicle_id"]) for m in frames[0]] == [("position_update", "ZR1"),
+                                                                        ("engine_started", "ZR1")]
+    assert frames[0][0]["data"]["lat"] == 2
+
+    frames = asyncio.run(scenario(batch=False))
+    assert [m["event_type"] for m in frames] == ["position_update", "engine_started"]
+    assert bus.get_stats()["subscribers"] == 0
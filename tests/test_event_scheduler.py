@@ -0,0 +1,115 @@
+"""Tests for the discrete-event scheduler (common/event_scheduler.py)."""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from common.event_scheduler import EventScheduler
+from common.sim_clock import SimClock
+from arknet_transit_simulator.vehicle.driver.navigation.vehicle_driver import (
+    STATIONARY_RECHECK_SECONDS, VehicleDriver,
+)
+
+START = datetime(2025, 11, 5, 6, 0, tzinfo=timezone.utc)
+
+
+def run_discrete(clock, scenario, seconds):
+    """Run `scenario(scheduler)` then `seconds` of simulated time on a discrete clock"""
+    scheduler = EventScheduler(clock)
+
+    async def main():
+        clock.hold(asyncio.current_task())
+        scenario(scheduler)
+        clock.start()
+        await clock.asleep(seconds)
+        clock.stop()
+        scheduler.close()
+
+    asyncio.run(main())
+    return scheduler
+
+
+def test_events_fire_in_time_order_and_owner_reschedules_replace():
+    clock = SimClock(start=START, discrete=True)
+    fired = []
+
+    def record(name):
+        fired.append((clock.elapsed(), name))
+
+    def scenario(scheduler):
+        scheduler.schedule_in(30, "dwell", record, "ZR1 dwell", owner="ZR1")
+        scheduler.schedule_in(10, "arrival", record, "ZR2 arrival", owner="ZR2")
+        scheduler.schedule_in(20, "arrival", record, "ZR1 arrival (stale)", owner="ZR1")
+        scheduler.schedule_in(25, "arrival", record, "ZR1 arrival", owner="ZR1")  # replaces the 20 s one
+        scheduler.schedule_in(40, "arrival", record, "ZR3 arrival", owner="ZR3")
+        assert scheduler.cancel("arrival", owner="ZR3")
+        assert not scheduler.cancel("arrival", owner="ZR3")
+
+    scheduler = run_discrete(clock, scenario, 60)
+    assert fired == [(10, "ZR2 arrival"), (25, "ZR1 arrival"), (30, "ZR1 dwell")]
+    assert scheduler.stats()["fired"] == 3 and scheduler.stats()["cancelled"] == 2
+
+
+def test_earlier_event_interrupts_the_runner_and_coroutines_run_as_tasks():
+    clock = SimClock(start=START, warp=100)  # 1 simulated second = 10 ms
+    fired = []
+    origin = []
+
+    def record(vehicle_id):
+        fired.append((vehicle_id, round(clock.elapsed() - origin[0])))
+
+    async def board(vehicle_id):
+        await clock.asleep(2.0)  # e.g. an HTTP call; must not hold up other events
+        record(vehicle_id)
+
+    async def main():
+        scheduler = EventScheduler(clock)
+        scheduler.schedule_in(3600, "depot", record, "late", owner="ZR1")
+        await asyncio.sleep(0.01)  # the runner is now asleep until the late event
+        origin.append(clock.elapsed())
+        scheduler.schedule_in(1, "monitor", board, "ZR1", owner="ZR1")
+        scheduler.schedule_in(2, "monitor", record, "ZR2", owner="ZR2")
+        await clock.asleep(5)
+        assert scheduler.pending == 1  # only the late event is left
+        scheduler.close()
+
+    asyncio.run(main())
+    assert fired == [("ZR2", 2), ("ZR1", 3)]
+
+
+def test_wakeups_track_event_times_not_vehicles():
+    clock = SimClock(start=START, discrete=True)
+    vehicles = 500
+    arrivals = [0] * vehicles
+
+    def arrive(vehicle, scheduler):
+        arrivals[vehicle] += 1
+        scheduler.schedule_in(60, "arrival", arrive, vehicle, scheduler, owner=vehicle)
+
+    def scenario(scheduler):
+        for vehicle in range(vehicles):
+            scheduler.schedule_in(vehicle % 60, "arrival", arrive, vehicle, scheduler, owner=vehicle)
+
+    wall = time.perf_counter()
+    scheduler = run_discrete(clock, scenario, 3600)
+    assert time.perf_counter() - wall < 30
+    assert all(count == 60 for count in arrivals)  # t = offset, offset + 60, ... < 3600
+    # One runner wake-up per distinct due second, however many vehicles share it
+    assert scheduler.wakeups <= 3600 + 1
+    assert scheduler.fired == vehicles * 60
+
+
+def test_driver_schedules_position_events_at_waypoint_arrivals():
+    # Waypoints ~111 m apart along a meridian
+    route = [(-59.6, 13.1 + 0.001 * index) for index in range(5)]
+    driver = VehicleDriver("DRV1", "Test Driver", "ZR1", route, use_socketio=False)
+
+    first_leg = driver.waypoint_distances[1]
+    assert abs(first_leg - 0.111) < 0.001
+    assert abs(driver._seconds_to_next_waypoint(0.0, 10.0) - first_leg * 100) < 1e-6
+    assert driver._seconds_to_next_waypoint(0.05, 0.0) == STATIONARY_RECHECK_SECONDS
+    assert driver._seconds_to_next_waypoint(driver.total_route_length, 10.0) is None  # end of route
+    assert driver._seconds_to_next_waypoint(0.0, 0.6) == 30.0  # capped look-ahead
+
+    asyncio.run(driver._announce_waypoints(first_leg * 2 + 0.001))
+    assert driver.visited_waypoints == {0, 1, 2}
@@ -0,0 +1,130 @@
+"""Tests for multi-process fleet sharding (arknet_transit_simulator/core/fleet_shards.py)."""
+
+import asyncio
+import threading
+from multiprocessing import Pipe
+from types import SimpleNamespace
+
+from arknet_transit_simulator.api.events.fleet_stream import vehicle_state
+from arknet_transit_simulator.core.fleet_shards import (
+    FleetShardCoordinator, ShardLink, _WorkerShard, partition_fleet,
+)
+from arknet_transit_simulator.core.states import DriverState
+from arknet_transit_simulator.vehicle.conductor import ConductorState
+
+
+def assignment(vehicle_id, route_id):
+    return SimpleNamespace(vehicle_id=vehicle_id, route_id=route_id), SimpleNamespace(driver_name=f"D-{vehicle_id}")
+
+
+class FakeConductor:
+    def __init__(self):
+        self.component_id = "COND-ZR1"
+        self.person_name = "Conductor One"
+        self.conductor_state = ConductorState.MONITORING
+        self.current_vehicle_position = (13.1, -59.6)
+        self.passengers_on_board = 3
+        self.capacity = 16
+        self.boarding_active = False
+        self.depot_boarding_active = True
+
+    def start_boarding(self):
+        self.boarding_active = True
+
+    def stop_boarding(self):
+        self.boarding_active = False
+
+    async def check_for_passengers(self, lat, lon, route_id):
+        return 2 if (lat, lon, route_id) == (13.1, -59.6, "1A") else 0
+
+
+class FakeDriver:
+    def __init__(self):
+        self.vehicle_id = "ZR1"
+        self.component_id = "DRV-ZR1"
+        self.person_name = "Driver One"
+        self.assigned_route_id = "1A"
+        self.current_state = DriverState.WAITING
+        self.engine = SimpleNamespace(running=False)
+        self.gps_device = object()
+        self.conductor = FakeConductor()
+
+    async def start_engine(self):
+        self.engine.running = True
+        self.current_state = DriverState.ONBOARD
+        return True
+
+
+def test_partition_keeps_routes_together_and_balances_load():
+    pairs = ([assignment(f"A{i}", "1A") for i in range(6)] + [assignment(f"B{i}", "2B") for i in range(4)]
+             + [assignment(f"C{i}", "3C") for i in range(3)] + [assignment("X1", None)])
+    shards = partition_fleet(pairs, 2)
+
+    routes = [{vehicle.route_id for vehicle, _ in shard} for shard in shards]
+    assert routes[0].isdisjoint(routes[1])
+    assert sorted(len(shard) for shard in shards) == [7, 7]
+    assert sum(shards, []) != pairs and sorted(map(id, sum(shards, []))) == sorted(map(id, pairs))
+    assert [len(shard) for shard in partition_fleet(pairs[:6], 3)] == [6, 0, 0]  # one route, one shard
+
+
+def test_coordinator_mirrors_worker_state_and_forwards_commands():
+    driver = FakeDriver()
+    stopped = threading.Event()
+    simulator = SimpleNamespace(active_drivers=[driver], idle_drivers=[SimpleNamespace(vehicle_id="ZR9")],
+                                stop=stopped.set, set_sim_time=lambda when: None)
+    coordinator_end, worker_end = Pipe()
+
+    async def scenario():
+        coordinator = FleetShardCoordinator(workers=1)
+        coordinator._loop = asyncio.get_running_loop()
+        shard = _WorkerShard(0, ["ZR1", "ZR9"], process=None)
+        shard.connection = coordinator_end
+        coordinator.shards.append(shard)
+        threading.Thread(target=coordinator._read_loop, args=(shard,), daemon=True).start()
+
+        link = ShardLink(0, simulator, worker_end, report_seconds=0.01)
+        await link.start()
+        while not coordinator.drivers:
+            await asyncio.sleep(0.01)
+        remote = coordinator.drivers[0]
+        assert vehicle_state(remote) == vehicle_state(driver)
+        assert remote.conductor.conductor_state is ConductorState.MONITORING
+        assert remote.conductor.depot_boarding_active and coordinator.idle_vehicle_ids == ["ZR9"]
+
+        assert await remote.start_engine() is True
+        assert await remote.conductor.check_for_passengers(13.1, -59.6, "1A") == 2
+        remote.conductor.start_boarding()
+        while not remote.engine.running or not driver.conductor.boarding_active:
+            await asyncio.sleep(0.01)
+        assert remote.current_state is DriverState.ONBOARD
+
+        shard.send({'type': 'shutdown'})
+        await asyncio.to_thread(stopped.wait, 5)
+        await link.stop()
+        await asyncio.wait_for(shard.finished.wait(), 5)
+        assert coordinator.drivers == [] and coordinator.idle_vehicle_ids == []
+        coordinator_end.close()
+
+    asyncio.run(scenario())
+    assert stopped.is_set()
+
+
+class DeadProcess:
+    pid = 4321
+    exitcode = 1
+
+    def is_alive(self):
+        return False
+
+
+def test_worker_that_exits_before_connecting_is_marked_finished():
+    async def scenario():
+        coordinator = FleetShardCoordinator(workers=1)
+        coordinator.shards.append(_WorkerShard(0, ["ZR1"], process=DeadProcess()))
+        assert coordinator.running
+
+        # Returns at once for a dead worker instead of waiting out the deadline
+        await asyncio.wait_for(coordinator._await_connect(coordinator.shards[0], float('inf')), 1)
+        assert not coordinator.running
+
+    asyncio.run(scenario())
@@ -0,0 +1,129 @@
+"""Tests for the delta-compressed fleet state stream (arknet_transit_simulator/api/events/fleet_stream.py)."""
+
+import asyncio
+from types import SimpleNamespace
+
+from arknet_transit_simulator.api.dependencies import set_fleet_publisher
+from arknet_transit_simulator.api.events.event_bus import EventBus
+from arknet_transit_simulator.api.events.event_types import EventType
+from arknet_transit_simulator.api.events.fleet_stream import FleetStatePublisher, FleetSubscription
+from arknet_transit_simulator.api.routes.websockets import events_websocket
+from clients.fleet.connector import FleetConnector
+
+
+def make_driver(vehicle_id, route_id, lat=13.1, lon=-59.6):
+    conductor = SimpleNamespace(current_vehicle_position=(lat, lon), passengers_on_board=0, capacity=16,
+                                boarding_active=False)
+    return SimpleNamespace(vehicle_id=vehicle_id, component_id=f"D-{vehicle_id}", person_name=f"Driver {vehicle_id}",
+                           assigned_route_id=route_id, current_state=SimpleNamespace(value="ONBOARD"),
+                           conductor=conductor, gps_device=object())
+
+
+def test_deltas_carry_only_changed_fields():
+    drivers = [make_driver("ZR1", "1"), make_driver("ZR2", "2")]
+    sim = SimpleNamespace(active_drivers=drivers)
+    bus = EventBus()
+    queue = bus.subscribe()
+    publisher = FleetStatePublisher(sim, bus)
+
+    async def scenario():
+        first = await publisher.tick()
+        assert set(first["changed"]) == {"ZR1", "ZR2"}  # new vehicles arrive in full
+        assert await publisher.tick() is None  # nothing changed, nothing emitted
+
+        drivers[0].conductor.current_vehicle_position = (13.2, -59.5)
+        drivers[0].conductor.passengers_on_board = 3
+        sim.active_drivers = drivers[:1]
+        delta = await publisher.tick()
+        assert delta["changed"] == {"ZR1": {"current_lat": 13.2, "current_lon": -59.5, "passenger_count": 3}}
+        assert delta["removed"] == ["ZR2"]
+        assert delta["seq"] == 2
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    events = asyncio.run(scenario())
+    assert [event.event_type for event in events] == [EventType.FLEET_DELTA, EventType.FLEET_DELTA]
+
+
+def test_subscription_filters_routes_and_coalesces_to_max_rate():
+    fleet = {
+        "ZR1": {"vehicle_id": "ZR1", "route_id": "1", "current_lat": 1.0},
+        "ZR2": {"vehicle_id": "ZR2", "route_id": "2", "current_lat": 2.0},
+    }
+    subscription = FleetSubscription(routes=["1"], max_rate=2)
+    snapshot = subscription.snapshot({"seq": 5, "vehicles": fleet})
+    assert list(snapshot["vehicles"]) == ["ZR1"]
+    now = subscription._last_sent
+
+    for seq, lat in ((6, 1.1), (7, 1.2)):
+        fleet["ZR1"]["current_lat"] = lat
+        assert subscription.add_delta({"seq": seq, "changed": {"ZR1": {"current_lat": lat}, "ZR2": {"current_lat": 9.0}},
+                                       "removed": []}, fleet)
+    assert subscription.flush(now + 0.1) is None  # rate limit: 0.5 s between messages
+    assert abs(subscription.seconds_until_due(now + 0.1) - 0.4) < 1e-6
+    assert subscription.flush(now + 0.5) == {"seq": 7, "changed": {"ZR1": {"current_lat": 1.2}}, "removed": []}
+
+    # ZR2 moves onto route 1: it arrives with all fields; ZR1 leaves the subset
+    fleet["ZR2"]["route_id"] = "1"
+    fleet["ZR1"]["route_id"] = "3"
+    subscription.add_delta({"seq": 8, "changed": {"ZR1": {"route_id": "3"}, "ZR2": {"route_id": "1"}}, "removed": []}, fleet)
+    message = subscription.flush(now + 1.0)
+    assert message["changed"] == {"ZR2": fleet["ZR2"]}
+    assert message["removed"] == ["ZR1"]
+
+    # A sequence gap means the client missed deltas and needs a new snapshot
+    assert subscription.add_delta({"seq": 10, "changed": {}, "removed": []}, fleet) is False
+
+
+def test_websocket_stream_keeps_client_mirror_in_sync():
+    drivers = [make_driver("ZR1", "1"), make_driver("ZR2", "2"), make_driver("ZR3", "1")]
+    sim = SimpleNamespace(active_drivers=drivers)
+    bus = EventBus()
+    publisher = FleetStatePublisher(sim, bus)
+
+    class FakeWebSocket:
+        def __init__(self):
+            self.sent = []
+
+        async def accept(self):
+            pass
+
+        async def send_json(self, frame):
+            self.sent.extend(frame if isinstance(frame, list) else [frame])
+
+    async def scenario():
+        await publisher.tick()
+        set_fleet_publisher(publisher)
+        websocket = FakeWebSocket()
+        stream = asyncio.create_task(events_websocket(websocket, routes="1", max_rate=None, event_bus=bus))
+        await asyncio.sleep(0)
+
+        for step in range(5):
+            drivers[0].conductor.current_vehicle_position = (13.1 + step * 0.01, -59.6)
+            drivers[1].conductor.passengers_on_board = step
+            await publisher.tick()
+            await asyncio.sleep(0)
+        sim.active_drivers = drivers[:2]
+        await publisher.tick()
+        await bus.emit(EventType.ENGINE_STARTED, {"vehicle_id": "ZR2"})
+        await bus.emit(EventType.ENGINE_STARTED, {"vehicle_id": "ZR1"})
+        await asyncio.sleep(0.01)
+
+        stream.cancel()
+        await asyncio.gather(stream, return_exceptions=True)
+        set_fleet_publisher(None)
+        return websocket.sent
+
+    sent = asyncio.run(scenario())
+    assert sent[0]["event_type"] == "fleet_snapshot"
+    assert set(sent[0]["data"]["vehicles"]) == {"ZR1", "ZR3"}
+    deltas = [message for message in sent if message["event_type"] == "fleet_delta"]
+    assert all(set(delta["data"]["changed"]) <= {"ZR1"} for delta in deltas)  # ZR2 is on route 2
+    assert [m["vehicle_id"] for m in sent if m["event_type"] == "engine_started"] == ["ZR1"]
+
+    connector = FleetConnector(base_url="http://fleet")
+    for message in sent:
+        connector._apply_fleet_message(message["event_type"], message["data"])
+    assert connector.fleet == {"ZR1": publisher.state["ZR1"]}
+    vehicle = connector.get_fleet_vehicle("ZR1")
+    assert vehicle.current_position.latitude == drivers[0].conductor.current_vehicle_position[0]
+    assert vehicle.route_id == "1"
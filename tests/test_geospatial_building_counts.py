@@ -0,0 +1,43 @@
+"""Tests for the building COUNT endpoints (geospatial_service/api/spatial.py)."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from geospatial_service.api import spatial
+from geospatial_service.services.postgis_client import postgis_client
+
+
+def test_counts_come_from_count_queries_not_capped_row_lists(monkeypatch):
+    queries = []
+
+    async def fake_fetch_named(name, query, *args, raw=False):
+        queries.append((name, args))
+        assert "COUNT(" in query and "LIMIT $" not in query
+        return [{"count": 123456}]  # more than any row limit
+
+    monkeypatch.setattr(postgis_client, "fetch_named", fake_fetch_named)
+
+    route = asyncio.run(spatial.count_route_buildings(
+        spatial.RouteBuildingCountRequest(route_id="route-doc", buffer_meters=500)))
+    depot = asyncio.run(spatial.count_depot_catchment(
+        spatial.DepotCatchmentCountRequest(latitude=13.1, longitude=-59.6, radius_meters=2000)))
+
+    assert route.count == 123456 and depot.count == 123456
+    assert queries == [
+        ("count_buildings_near_route", ("route-doc", 500)),
+        ("count_buildings_near_depot", (13.1, -59.6, 2000)),
+    ]
+
+
+def test_route_count_uses_the_route_corridor_and_404s_for_unknown_routes(monkeypatch):
+    async def fake_fetch_named(name, query, *args, raw=False):
+        assert "FROM routes r" in query and "highways" not in query
+        return []  # no corridor: unknown route or no geometry
+
+    monkeypatch.setattr(postgis_client, "fetch_named", fake_fetch_named)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(spatial.count_route_buildings(spatial.RouteBuildingCountRequest(route_id="missing")))
+    assert error.value.status_code == 404
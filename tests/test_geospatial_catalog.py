@@ -0,0 +1,71 @@
+"""Tests for the in-memory depot/route catalog (geospatial_service/services/catalog.py)."""
+
+import asyncio
+import random
+
+import pytest
+from fastapi import HTTPException
+
+from geospatial_service.api import depots as depots_api
+from geospatial_service.services.catalog import CatalogSnapshot, PointGrid, haversine_distance
+
+
+def _depot(i, lat, lon):
+    return {"id": i, "documentId": f"depot-{i}", "name": f"Depot {i}", "latitude": lat, "longitude": lon}
+
+
+def test_grid_nearest_matches_brute_force():
+    rng = random.Random(7)
+    depots = [_depot(i, 13.05 + rng.uniform(0, 0.25), -59.65 + rng.uniform(0, 0.2)) for i in range(200)]
+    grid = PointGrid()
+    for depot in depots:
+        grid.insert(depot)
+
+    for _ in range(200):
+        lat, lon = 13.0 + rng.uniform(0, 0.35), -59.7 + rng.uniform(0, 0.3)
+        max_distance = rng.choice([300, 1000, 5000])
+        distances = [(haversine_distance(lat, lon, d["latitude"], d["longitude"]), d) for d in depots]
+        expected = min(distances, key=lambda pair: pair[0])
+
+        match = grid.nearest(lat, lon, max_distance)
+        if expected[0] > max_distance:
+            assert match is None
+        else:
+            assert match is not None and match[0] is expected[1]
+
+
+
+def test_grid_nearest_with_a_wide_radius_stays_within_the_occupied_cells():
+    grid = PointGrid()
+    grid.insert(_depot(1, 13.1, -59.6))
+    grid.insert(_depot(2, 13.2, -59.5))
+
+    # ~275 rings requested; the scan stops at the farthest occupied cell (210 rings out)
+    match = grid.nearest(11.0, -61.0, 300_000)
+    assert match is not None and match[0]["id"] == 1
+    assert grid.nearest(11.0, -61.0, 1000) is None
+
+
+@pytest.mark.parametrize("max_distance", [0, -1, 50_001, "10km", None, False])
+def test_nearest_depot_endpoint_rejects_bad_search_radius(max_distance):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(depots_api.find_nearest_depot(
+            {"latitude": 13.1, "longitude": -59.6, "max_distance_meters": max_distance}
+        ))
+    assert error.value.status_code == 400
+
+def test_snapshot_links_routes_and_depots_through_associations():
+    snapshot = CatalogSnapshot(
+        depots=[_depot(1, 13.1, -59.6), _depot(2, 13.2, -59.5)],
+        routes=[{"id": 10, "documentId": "route-a"}, {"id": 11, "documentId": "route-b"}],
+        associations=[
+            {"id": 2, "route": {"documentId": "route-a"}, "depot": {"documentId": "depot-2"}},
+            {"id": 1, "route": {"documentId": "route-a"}, "depot": {"documentId": "depot-1"}},
+            {"id": 3, "route": {"documentId": "route-b"}, "depot": {"documentId": "missing"}},
+        ],
+    )
+
+    assert [d["id"] for d in snapshot.depots_for_route["route-a"]] == [1, 2]
+    assert [r["id"] for r in snapshot.routes_for_depot["depot-2"]] == [10]
+    assert "route-b" not in snapshot.depots_for_route
+    assert snapshot.depots_by_id[2]["name"] == "Depot 2"
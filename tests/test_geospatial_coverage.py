@@ -0,0 +1,53 @@
+"""Tests for the cached coverage engine (geospatial_service/services/coverage.py)."""
+
+import asyncio
+
+from geospatial_service.services.coverage import CoverageEngine, ROUTE_COVERAGE
+
+
+def test_cold_request_past_budget_returns_none_then_cached_result():
+    engine = CoverageEngine(budget_seconds=0.01)
+    calls = []
+
+    async def slow_coverage(buffer_meters):
+        calls.append(buffer_meters)
+        await asyncio.sleep(0.05)
+        return {"routes": [], "overlaps": [], "union_area_sq_meters": 0.0}
+
+    engine._computations[ROUTE_COVERAGE] = slow_coverage
+
+    async def scenario():
+        first = await engine.get(ROUTE_COVERAGE, 500)
+        second = await engine.get(ROUTE_COVERAGE, 500)  # joins the running computation
+        await asyncio.sleep(0.1)
+        third = await engine.get(ROUTE_COVERAGE, 500)
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+
+    assert first is None and second is None
+    assert third.data["union_area_sq_meters"] == 0.0
+    assert calls == [500.0]
+    stats = engine.stats()
+    assert (stats["misses"], stats["hits"], stats["budget_exceeded"]) == (2, 1, 2)
+
+
+def test_stale_result_is_served_while_refreshing():
+    engine = CoverageEngine(ttl_seconds=0.0)
+    calls = []
+
+    async def coverage(buffer_meters):
+        calls.append(buffer_meters)
+        return len(calls)
+
+    engine._computations[ROUTE_COVERAGE] = coverage
+
+    async def scenario():
+        first = await engine.get(ROUTE_COVERAGE, 100)
+        stale = await engine.get(ROUTE_COVERAGE, 100)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        fresh = await engine.get(ROUTE_COVERAGE, 100)
+        return first.data, stale.data, fresh.data
+
+    assert asyncio.run(scenario()) == (1, 1, 2)
@@ -0,0 +1,47 @@
+"""Tests for density pyramid level selection and cell bounds (geospatial_service/services/postgis_client.py)."""
+
+import asyncio
+
+from geospatial_service.services.postgis_client import (
+    METERS_PER_DEGREE,
+    PostGISClient,
+    pick_density_level,
+)
+
+
+def test_level_divides_grid_when_possible():
+    assert pick_density_level(100) == 100
+    assert pick_density_level(500) == 250
+    assert pick_density_level(2000) == 1000
+    assert pick_density_level(5000) == 5000
+    assert pick_density_level(300) == 100
+    assert pick_density_level(50) == 100
+
+
+def test_tiles_are_sliced_by_cell_index_and_rolled_up(monkeypatch):
+    client = PostGISClient()
+    calls = []
+
+    async def fake_fetch_named(name, query, *args, raw=False):
+        calls.append(args)
+        return [{"gx": -1192, "gy": 262, "building_count": 42}]
+
+    monkeypatch.setattr(client, "fetch_named", fake_fetch_named)
+    level, cells = asyncio.run(client.get_density_tiles(13.05, 13.1, -59.62, -59.58, 500))
+
+    level_deg = 250 / METERS_PER_DEGREE
+    assert level == 250
+    assert calls[0][:4] == (
+        int(-59.62 // level_deg), int(-59.58 // level_deg),
+        int(13.05 // level_deg), int(13.1 // level_deg),
+    )
+    assert calls[0][4:6] == (250, 0.5)
+
+    grid_deg = 500 / METERS_PER_DEGREE
+    assert cells == [{
+        "lat_start": 262 * grid_deg,
+        "lat_end": 263 * grid_deg,
+        "lon_start": -1192 * grid_deg,
+        "lon_end": -1191 * grid_deg,
+        "building_count": 42,
+    }]
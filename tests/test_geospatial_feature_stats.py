@@ -0,0 +1,68 @@
+"""Tests for estimated/exact feature counts (geospatial_service/services/feature_stats.py)."""
+
+import asyncio
+
+from geospatial_service.services.postgis_client import postgis_client
+from geospatial_service.services.feature_stats import FeatureStatsProvider
+
+
+def test_estimates_first_then_cached_exact_counts(monkeypatch):
+    calls = []
+
+    async def fake_execute(query, *args, label="adhoc"):
+        calls.append("estimate")
+        return [{"table_name": "buildings", "estimate": 120000}, {"table_name": "regions", "estimate": 11}]
+
+    async def fake_get_stats():
+        calls.append("count")
+        await asyncio.sleep(0)
+        return {"buildings": 120345, "highways": 900, "pois": 50, "landuse_zones": 7, "regions": 11}
+
+    monkeypatch.setattr(postgis_client, "execute_query", fake_execute)
+    monkeypatch.setattr(postgis_client, "get_stats", fake_get_stats)
+
+    async def scenario():
+        provider = FeatureStatsProvider()
+        first = await provider.get()
+        assert provider.source() == "estimate"
+        assert first["buildings"] == 120000 and first["highways"] == 0
+
+        await provider._refresh_task  # lazily scheduled by the first get()
+        second = await provider.get()
+        assert provider.source() == "exact"
+        assert second["buildings"] == 120345
+        return provider
+
+    provider = asyncio.run(scenario())
+    assert calls == ["estimate", "count"]
+    assert provider.stats()["exact_refreshes"] == 1
+
+
+def test_health_check_pings_the_database(monkeypatch):
+    from geospatial_service.api.metadata import health_check
+    from geospatial_service.services.feature_stats import feature_stats
+
+    queries = []
+
+    async def fake_execute(query, *args, label="adhoc", raw=False):
+        queries.append(query)
+        return [{"?column?": 1}]
+
+    async def cached_counts(exact=False):
+        return {"buildings": 120000}
+
+    monkeypatch.setattr(postgis_client, "execute_query", fake_execute)
+    monkeypatch.setattr(feature_stats, "get", cached_counts)
+
+    healthy = asyncio.run(health_check())
+    assert queries == ["SELECT 1"]
+    assert healthy["status"] == "healthy"
+    assert healthy["components"]["database"]["latency_ms"] is not None
+
+    async def unreachable(query, *args, label="adhoc", raw=False):
+        raise ConnectionRefusedError("connection refused")
+
+    monkeypatch.setattr(postgis_client, "execute_query", unreachable)
+    down = asyncio.run(health_check())
+    assert down["status"] == "unhealthy"
+    assert down["components"]["database"]["error"] == "connection refused"
@@ -0,0 +1,56 @@
+"""Tests for the in-process geofence engine (geospatial_service/services/geofence_engine.py)."""
+
+import asyncio
+
+import shapely
+from shapely.geometry import Polygon, box
+
+from geospatial_service.services.geofence_engine import (
+    GeofenceEngine, GeofenceLayer, LANDUSE_LAYER, REGION_LAYER,
+)
+from geospatial_service.services.postgis_client import postgis_client
+
+
+def make_layer(name, polygons):
+    records = [{"id": i + 1, "name": f"{name} {i + 1}"} for i in range(len(polygons))]
+    return GeofenceLayer(name, records, [shapely.to_wkb(p) for p in polygons])
+
+
+def test_locate_picks_lowest_id_and_excludes_boundary():
+    layer = make_layer("zone", [box(0, 0, 2, 2), box(1, 1, 3, 3), box(10, 10, 11, 11)])
+
+    # (lon, lat): overlap, second only, outside, on the boundary of the first only
+    lons = [1.5, 2.5, 5.0, 0.0]
+    lats = [1.5, 2.5, 5.0, 1.0]
+
+    assert layer.locate(lons, lats).tolist() == [0, 1, -1, -1]
+    assert [r and r["id"] for r in layer.lookup(lons, lats)] == [1, 2, None, None]
+
+
+def test_invalid_polygons_are_repaired():
+    bowtie = Polygon([(0, 0), (2, 2), (2, 0), (0, 2), (0, 0)])
+    layer = make_layer("zone", [bowtie])
+
+    assert layer.invalid_repaired == 1
+    assert layer.locate([1.8], [1.0]).tolist() == [0]
+
+
+def test_load_builds_layers_from_postgis(monkeypatch):
+    async def fake_execute_query(query, *args, label="adhoc", raw=False):
+        if label == f"geofence_load_{REGION_LAYER}":
+            return [{"id": 7, "name": "St. Michael", "wkb": shapely.to_wkb(box(-59.7, 13.0, -59.5, 13.2))}]
+        return [{"id": 3, "name": "Residential", "zone_type": "residential",
+                 "wkb": shapely.to_wkb(box(-59.61, 13.09, -59.59, 13.11))}]
+
+    monkeypatch.setattr(postgis_client, "execute_query", fake_execute_query)
+    engine = GeofenceEngine()
+
+    assert not engine.is_ready()
+    layers = asyncio.run(engine.load())
+
+    assert layers == {REGION_LAYER: 1, LANDUSE_LAYER: 1}
+    regions, landuse = engine.check_points([13.1, 13.15, 14.0], [-59.6, -59.6, -59.6])
+    assert [r and r["id"] for r in regions] == [7, 7, None]
+    assert [z and z["zone_type"] for z in landuse] == ["residential", None, None]
+    assert "wkb" not in regions[0]
+    assert engine.stats()["points_checked"] == 3
@@ -0,0 +1,111 @@
+"""Tests for the in-memory spatial backend (geospatial_service/services/memory_store.py)."""
+
+import asyncio
+import json
+import math
+
+import pytest
+import shapely
+
+from geospatial_service.services.memory_store import (
+    InMemorySpatialStore, UnsupportedQueryError, generate_synthetic_snapshot,
+)
+from geospatial_service.services.postgis_client import METERS_PER_DEGREE, PostGISClient
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    snapshot = generate_synthetic_snapshot(tmp_path_factory.mktemp("snapshot"), buildings=3000, seed=3)
+    store = InMemorySpatialStore(str(snapshot))
+    asyncio.run(store.connect())
+    return store
+
+
+def ground_distance(lat1, lon1, lat2, lon2, reference_latitude):
+    dx = (lon2 - lon1) * METERS_PER_DEGREE * math.cos(math.radians(reference_latitude))
+    dy = (lat2 - lat1) * METERS_PER_DEGREE
+    return math.hypot(dx, dy)
+
+
+def test_is_a_drop_in_postgis_client(store):
+    assert isinstance(store, PostGISClient)
+    assert store.backend == "memory" and PostGISClient.backend == "postgis"
+
+    stats = asyncio.run(store.get_stats())
+    assert stats == {"buildings": 3000, "highways": 300, "pois": 500, "landuse_zones": 400, "regions": 12}
+
+
+def test_depot_catchment_matches_brute_force(store):
+    lat, lon = 13.2, -59.55
+    rows = asyncio.run(store.get_buildings_near_depot(lat, lon, radius_meters=1500, limit=10000))
+
+    reference = float(store.building_lats.mean())
+    expected = sorted(
+        (ground_distance(lat, lon, b_lat, b_lon, reference), i)
+        for i, (b_lat, b_lon) in enumerate(zip(store.building_lats, store.building_lons))
+    )
+    expected = [i for distance, i in expected if distance <= 1500]
+
+    assert [row["building_id"] for row in rows] == [store.buildings.records[i]["id"] for i in expected]
+    assert rows == sorted(rows, key=lambda row: row["distance_meters"])
+
+
+def test_nearest_highway_and_geofence(store):
+    lat, lon = 13.15, -59.55
+    nearest = asyncio.run(store.find_nearest_highway(lat, lon, radius_meters=5000))
+
+    point = store._point(lat, lon)
+    distances = shapely.distance(store.highways.geoms, point)
+    assert nearest["name"] == store.highways.records[int(distances.argmin())]["name"]
+    assert nearest["distance_meters"] == pytest.approx(float(distances.min()))
+    assert asyncio.run(store.find_nearest_highway(lat, lon, radius_meters=0)) in (None, nearest)
+
+    region = asyncio.run(store.check_geofence_region(13.05, -59.64))
+    assert region["name"] == "Parish 1" and region["region_type"] == "parish"
+    assert asyncio.run(store.check_geofence_region(14.0, -59.5)) is None
+
+
+def test_route_queries_follow_snapshot_geometry(store):
+    geometry = asyncio.run(store.get_route_geometry("route-1"))
+    assert geometry["num_segments"] == 3
+    assert geometry["total_distance_meters"] > 0
+
+    counts = asyncio.run(store.count_buildings_in_spawn_areas(
+        [(1, 13.2, -59.55)], ["route-1", "missing"], depot_radius_meters=1500, route_buffer_meters=300
+    ))
+    line = store._route_line("route-1")
+    corridor = shapely.buffer(line, 300)
+    assert counts["routes"] == {"route-1": int(shapely.intersects(store.buildings.geoms, corridor).sum())}
+    assert counts["depots"][1] == len(asyncio.run(store.get_buildings_near_depot(13.2, -59.55, 1500, 10000)))
+
+    assert asyncio.run(store.count_buildings_near_route("route-1", 300)) == counts["routes"]["route-1"]
+    assert asyncio.run(store.count_buildings_near_route("missing", 300)) is None
+    assert asyncio.run(store.count_buildings_near_depot(13.2, -59.55, 1500)) == counts["depots"][1]
+
+    coverage = asyncio.run(store.get_route_coverage(300))
+    assert len(coverage["routes"]) == 10
+    assert coverage["union_area_sq_meters"] <= sum(r["area_sq_meters"] for r in coverage["routes"])
+
+
+def test_streaming_and_density_tiles(store):
+    coordinates = json.loads(shapely.to_geojson(shapely.linestrings([[-59.6, 13.1], [-59.5, 13.2]])))["coordinates"]
+    rows = asyncio.run(store.get_buildings_near_linestring(coordinates, buffer_meters=400, limit=10000))
+    spec = store.buildings_near_linestring_query(coordinates, 400, 10000)
+
+    async def collect():
+        return [batch async for batch in store.stream_spec(spec, batch_size=7)]
+
+    batches = asyncio.run(collect())
+    assert [row for batch in batches for row in batch] == rows
+    assert all(len(batch) <= 7 for batch in batches)
+
+    level, cells = asyncio.run(store.get_density_tiles(13.0, 13.4, -59.7, -59.4, 1000, limit=100000))
+    assert level == 1000
+    assert sum(cell["building_count"] for cell in cells) == 3000
+
+
+def test_unknown_sql_is_rejected(store):
+    with pytest.raises(UnsupportedQueryError):
+        asyncio.run(store.execute_query("SELECT 1"))
+    with pytest.raises(UnsupportedQueryError):
+        asyncio.run(store.fetch_named("not_a_query", "SELECT 1"))
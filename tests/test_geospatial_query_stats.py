@@ -0,0 +1,65 @@
+"""Tests for named prepared statements and query histograms (geospatial_service/services/postgis_client.py)."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from geospatial_service.services.postgis_client import PostGISClient
+from geospatial_service.services.query_stats import LatencyHistogram
+
+
+class FakeStatement:
+    def __init__(self, query):
+        self.query = query
+
+    async def fetch(self, *args):
+        return [{"value": args[0]}]
+
+
+class FakeConnection:
+    def __init__(self):
+        self.named_statements = {}
+        self.prepares = 0
+
+    async def prepare(self, query):
+        self.prepares += 1
+        return FakeStatement(query)
+
+
+class FakePool:
+    def __init__(self, connections):
+        self.connections = connections
+        self.next = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        conn = self.connections[self.next % len(self.connections)]
+        self.next += 1
+        yield conn
+
+
+def test_named_statement_prepared_once_per_connection():
+    conns = [FakeConnection(), FakeConnection()]
+    client = PostGISClient()
+    client.pool = FakePool(conns)
+
+    async def run():
+        return [await client.fetch_named("echo", "SELECT $1::int AS value", i) for i in range(6)]
+
+    results = asyncio.run(run())
+
+    assert [r[0]["value"] for r in results] == list(range(6))
+    assert [c.prepares for c in conns] == [1, 1]
+    diagnostics = client.diagnostics()
+    assert diagnostics["prepared_statements"] == {"echo": {"prepares": 2}}
+    assert diagnostics["queries"]["echo"]["count"] == 6
+
+
+def test_histogram_percentiles_come_from_buckets():
+    histogram = LatencyHistogram()
+    for latency in [0.5] * 90 + [30] * 9 + [7000]:
+        histogram.record(latency)
+
+    assert histogram.percentile(0.5) == 1
+    assert histogram.percentile(0.95) == 50
+    assert histogram.percentile(1.0) == 7000
+    assert histogram.summary()["buckets_ms"]["gt_max"] == 1
@@ -0,0 +1,89 @@
+"""Tests for set-based spawn analysis (geospatial_service/api/spawn.py)."""
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from geospatial_service.api import spawn
+from geospatial_service.services.catalog import CatalogSnapshot
+
+
+def _snapshot():
+    line = {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "geometry": {"type": "LineString", "coordinates": [[-59.6, 13.1], [-59.5, 13.2]]}},
+    ]}
+    return CatalogSnapshot(
+        depots=[{"id": 1, "documentId": "depot-1", "name": "Depot 1", "latitude": 13.1, "longitude": -59.6}],
+        routes=[
+            {"id": 10, "documentId": "route-a", "short_name": "1A", "geojson_data": line},
+            {"id": 11, "documentId": "route-b", "short_name": "1B", "geojson_data": line},
+            {"id": 12, "documentId": "route-c", "short_name": "1C"},
+        ],
+        associations=[
+            {"id": 1, "route": {"documentId": "route-a"}, "depot": {"documentId": "depot-1"}},
+            {"id": 2, "route": {"documentId": "route-b"}, "depot": {"documentId": "depot-1"}},
+        ],
+    )
+
+
+def test_compare_scaling_runs_one_building_query(monkeypatch):
+    snapshot = _snapshot()
+    calls = []
+
+    async def fake_counts(depots, route_document_ids, depot_radius_meters, route_buffer_meters):
+        calls.append((depots, sorted(route_document_ids)))
+        return {"depots": {1: 1000}, "routes": {"route-a": 300, "route-b": 100}}
+
+    async def fake_catalog():
+        return snapshot
+
+    spawn._spawn_counts_cache.clear()
+    monkeypatch.setattr(spawn.postgis_client, "count_buildings_in_spawn_areas", fake_counts)
+    monkeypatch.setattr(spawn, "require_catalog", fake_catalog)
+
+    result = asyncio.run(spawn.compare_scaling_factors(depot_radius=800, route_buffer=100))
+
+    assert len(calls) == 1
+    assert calls[0] == ([(1, 13.1, -59.6)], ["route-a", "route-b", "route-c"])
+    by_factor = {c["passengers_per_building"]: c for c in result["comparisons"]}
+    assert by_factor[0.05]["depot_spawn_per_hour"] == 50.0
+    assert by_factor[0.05]["route_spawn_per_hour"] == 20.0
+
+    depot = asyncio.run(spawn.get_depot_analysis(1, depot_radius=800, route_buffer=100, passengers_per_building=0.05))
+    assert len(calls) == 1  # served from the count cache
+    rates = {r["route_id"]: r["attractiveness"] for r in depot["routes"]["analyses"]}
+    assert rates == {10: 0.75, 11: 0.25}
+    assert depot["routes"]["analyses"][0]["geometry_points"] == 2
+
+    routes = asyncio.run(spawn.get_all_routes_analysis(route_buffer=100, passengers_per_building=0.05))
+    assert routes["routes"][2]["route"]["error"] == "Route has no geometry data"
+
+
+def test_count_cache_stays_bounded_and_drops_stale_entries(monkeypatch):
+    snapshot = _snapshot()
+
+    async def fake_counts(depots, route_document_ids, depot_radius_meters, route_buffer_meters):
+        return {"depots": {}, "routes": {}}
+
+    spawn._spawn_counts_cache.clear()
+    monkeypatch.setattr(spawn.postgis_client, "count_buildings_in_spawn_areas", fake_counts)
+    monkeypatch.setattr(spawn, "SPAWN_COUNTS_CACHE_SIZE", 4)
+
+    for radius in range(100, 110):
+        asyncio.run(spawn._get_spawn_counts(snapshot, radius, 100))
+    assert list(spawn._spawn_counts_cache) == [(106, 100), (107, 100), (108, 100), (109, 100)]
+
+    spawn._spawn_counts_cache[(106, 100)] = (snapshot.loaded_at, 0.0, {})  # expired
+    spawn._spawn_counts_cache[(107, 100)] = (snapshot.loaded_at - 1, spawn.time.time(), {})  # older catalog
+    asyncio.run(spawn._get_spawn_counts(snapshot, 200, 100))
+    assert list(spawn._spawn_counts_cache) == [(108, 100), (109, 100), (200, 100)]
+
+
+def test_radius_and_buffer_outside_the_config_bounds_are_rejected():
+    app = FastAPI()
+    app.include_router(spawn.router)
+    client = TestClient(app)
+
+    assert client.get("/spawn/compare-scaling", params={"depot_radius": 10**9}).status_code == 422
+    assert client.get("/spawn/all-routes", params={"route_buffer": 0}).status_code == 422
@@ -0,0 +1,68 @@
+"""Tests for streamed / columnar building responses (geospatial_service/services/streaming.py)."""
+
+import asyncio
+import json
+
+from geospatial_service.services import streaming
+from geospatial_service.services.postgis_client import QuerySpec, postgis_client
+
+
+ROWS = [
+    {"building_id": 1, "latitude": 13.1, "longitude": -59.6, "distance_meters": 12.5},
+    {"building_id": 2, "latitude": 13.2, "longitude": -59.5, "distance_meters": 40.0},
+    {"building_id": 3, "latitude": 13.3, "longitude": -59.4, "distance_meters": 88.1},
+]
+
+SPEC = QuerySpec("buildings_near_depot", "SELECT 1", (13.1, -59.6, 500, 10))
+
+
+def test_rows_to_columns():
+    columns = streaming.rows_to_columns(ROWS)
+
+    assert columns["building_id"] == [1, 2, 3]
+    assert columns["distance_meters"] == [12.5, 40.0, 88.1]
+    assert streaming.rows_to_columns([]) == {}
+
+
+def test_columnar_response_echoes_meta(monkeypatch):
+    async def fake_fetch_spec(spec, raw=False):
+        assert spec is SPEC and raw
+        return ROWS
+
+    monkeypatch.setattr(postgis_client, "fetch_spec", fake_fetch_spec)
+
+    response = asyncio.run(streaming.building_query_response(
+        streaming.FORMAT_COLUMNAR, SPEC, {"radius_meters": 500}
+    ))
+    body = json.loads(response.body)
+
+    assert body["radius_meters"] == 500
+    assert body["count"] == 3
+    assert body["columns"]["latitude"] == [13.1, 13.2, 13.3]
+
+
+def test_ndjson_streams_one_line_per_row(monkeypatch):
+    batch_sizes = []
+
+    async def fake_stream_spec(spec, batch_size=2000):
+        batch_sizes.append(batch_size)
+        yield ROWS[:2]
+        yield ROWS[2:]
+
+    monkeypatch.setattr(postgis_client, "stream_spec", fake_stream_spec)
+
+    async def scenario():
+        response = await streaming.building_query_response(
+            streaming.FORMAT_NDJSON, SPEC, {"radius_meters": 500}
+        )
+        chunks = [chunk async for chunk in response.body_iterator]
+        return response, chunks
+
+    response, chunks = asyncio.run(scenario())
+    lines = b"".join(chunks).decode().splitlines()
+
+    assert response.media_type == streaming.NDJSON_MEDIA_TYPE
+    assert response.headers["x-query-radius-meters"] == "500"
+    assert len(chunks) == 2
+    assert [json.loads(line)["building_id"] for line in lines] == [1, 2, 3]
+    assert batch_sizes == [streaming.STREAM_BATCH_SIZE]
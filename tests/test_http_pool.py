@@ -0,0 +1,116 @@
+"""Tests for the shared keep-alive HTTP client pool (common/http_pool.py)."""
+
+import asyncio
+
+import httpx
+
+from common.http_pool import HttpClientPool, PoolLimits
+
+
+def _mock_transport(status=200):
+    def handler(request):
+        return httpx.Response(status, json={"path": request.url.path})
+    return httpx.MockTransport(handler)
+
+
+def _pool_with_mock_transport(status=200):
+    pool = HttpClientPool(default=PoolLimits(max_connections=4, http2=False))
+    original = pool._client
+
+    def client(upstream):
+        c = original(upstream)
+        c._transport = _mock_transport(status)
+        return c
+
+    pool._client = client
+    return pool
+
+
+def test_session_reuses_one_client_per_upstream():
+    async def run():
+        pool = _pool_with_mock_transport()
+        async with pool.session("strapi", timeout=5.0) as first:
+            await first.get("http://localhost:1337/api/routes")
+        async with pool.session("strapi", timeout=5.0) as second:
+            await second.get("http://localhost:1337/api/depots")
+        clients = dict(pool._clients)
+        await pool.aclose()
+        return clients, pool.stats()
+
+    clients, stats = asyncio.run(run())
+    assert list(clients) == ["strapi"]
+    assert stats["strapi"]["requests"] == 2
+    assert stats["strapi"]["in_flight"] == 0
+    assert sum(stats["strapi"]["latency_histogram"].values()) == 2
+
+
+def test_requests_are_routed_by_host():
+    async def run():
+        pool = _pool_with_mock_transport()
+        pool.register("geospatial", "http://geo.internal:6000")
+        async with pool.session("strapi") as client:
+            await client.get("http://localhost:1337/api/routes")
+            await client.get("http://geo.internal:6000/spatial/route-geometry/1")
+        await pool.aclose()
+        return pool.stats()
+
+    stats = asyncio.run(run())
+    assert stats["strapi"]["requests"] == 1
+    assert stats["geospatial"]["requests"] == 1
+
+
+def test_server_errors_are_counted():
+    async def run():
+        pool = _pool_with_mock_transport(status=503)
+        async with pool.session("strapi") as client:
+            await client.get("http://localhost:1337/api/routes")
+        await pool.aclose()
+        return pool.stats()
+
+    stats = asyncio.run(run())
+    assert stats["strapi"]["errors"] == 1
+    assert stats["strapi"]["max_connections"] == 4
+
+
+def test_client_from_a_closed_event_loop_is_closed_when_replaced():
+    pool = _pool_with_mock_transport()
+
+    async def request():
+        async with pool.session("strapi") as client:
+            await client.get("http://localhost:1337/api/routes")
+        return pool._clients["strapi"][asyncio.get_running_loop()]
+
+    first = asyncio.run(request())
+    assert not first.is_closed
+
+    async def next_run():
+        second = await request()
+        await pool.aclose()
+        return second
+
+    second = asyncio.run(next_run())
+    assert second is not first
+    assert first.is_closed and second.is_closed
+
+
+def test_a_second_live_event_loop_gets_its_own_client():
+    pool = _pool_with_mock_transport()
+
+    async def request():
+        async with pool.session("strapi") as client:
+            await client.get("http://localhost:1337/api/routes")
+        return pool._clients["strapi"][asyncio.get_running_loop()]
+
+    async def run():
+        main = await request()
+        # A sync bridge: asyncio.run on a helper thread while this loop is running
+        helper = await asyncio.to_thread(asyncio.run, request())
+        assert helper is not main
+        assert not main.is_closed
+        await request()  # the main loop keeps its client (and its keep-alive connections)
+        assert pool._clients["strapi"][asyncio.get_running_loop()] is main
+        await pool.aclose()
+        return main, helper
+
+    main, helper = asyncio.run(run())
+    assert main.is_closed and helper.is_closed
@@ -0,0 +1,17 @@
+"""Cold-import budget for the simulator and service entry points (scripts/benchmark_import_time.py)."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_entry_points_import_within_budget_and_defer_heavy_dependencies():
+    result = subprocess.run(
+        [sys.executable, str(ROOT / "scripts" / "benchmark_import_time.py"), "--runs", "2",
+         "--scale", os.getenv("IMPORT_BUDGET_SCALE", "1.0")],
+        cwd=ROOT, capture_output=True, text=True, timeout=600
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
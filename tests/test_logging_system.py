@@ -0,0 +1,88 @@
+"""Tests for the queued, rate-limited logging pipeline (arknet_transit_simulator/utils/logging_system.py)."""
+
+import logging
+import threading
+
+from arknet_transit_simulator.utils.logging_system import RateLimitFilter, start_queue_logging, stop_queue_logging
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.threads = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+        self.threads.append(threading.current_thread())
+
+
+def make_logger(name):
+    logger = logging.getLogger(name)
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = ListHandler()
+    logger.addHandler(handler)
+    return logger, handler
+
+
+def test_rate_limit_is_per_vehicle_and_reports_suppressed_lines(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("arknet_transit_simulator.utils.logging_system.time.monotonic", lambda: clock[0])
+    logger, handler = make_logger("tests.logging.rate")
+    rate_limit = RateLimitFilter(rate=1.0)
+    handler.addFilter(rate_limit)
+
+    for _ in range(5):
+        logger.info("[%s] Checking for passengers", "ZR1", extra={"vehicle_id": "ZR1"})
+        logger.info("[%s] Checking for passengers", "ZR2", extra={"vehicle_id": "ZR2"})
+    logger.warning("[%s] Lost GPS fix", "ZR1", extra={"vehicle_id": "ZR1"})  # warnings are never limited
+    logger.warning("[%s] Lost GPS fix", "ZR1", extra={"vehicle_id": "ZR1"})
+    logger.info("GPS %s connecting", "ZR1-GPS", extra={"component_id": "ZR1-GPS"})
+    logger.info("GPS %s connecting", "ZR2-GPS", extra={"component_id": "ZR2-GPS"})
+    clock[0] += 1.5
+    logger.info("[%s] Checking for passengers", "ZR1", extra={"vehicle_id": "ZR1"})
+
+    assert handler.lines == [
+        "[ZR1] Checking for passengers",
+        "[ZR2] Checking for passengers",
+        "[ZR1] Lost GPS fix",
+        "[ZR1] Lost GPS fix",
+        "GPS ZR1-GPS connecting",
+        "GPS ZR2-GPS connecting",
+        "[ZR1] Checking for passengers [+4 similar suppressed]",
+    ]
+    assert rate_limit.total_suppressed == 8
+
+
+def test_rate_limit_key_ignores_positional_arguments():
+    first = logging.LogRecord("sim", logging.INFO, __file__, 1, "Fare %s collected", ("ZR1",), None)
+    second = logging.LogRecord("sim", logging.INFO, __file__, 1, "Fare %s collected", ("ZR2",), None)
+    assert RateLimitFilter.key_for(first) == RateLimitFilter.key_for(second)
+
+
+def test_component_rate_overrides_use_longest_prefix():
+    rate_limit = RateLimitFilter(rate=1.0, component_rates={"sim.vehicle": 0.2, "sim.vehicle.gps": 0})
+    assert rate_limit._rate_for("sim.vehicle.conductor") == 0.2
+    assert rate_limit._rate_for("sim.vehicle.gps.device") == 0
+    assert rate_limit._rate_for("sim.vehiclesomething") == 1.0
+
+
+def test_queue_logging_formats_on_writer_thread_and_restores_handlers():
+    logger, handler = make_logger("tests.logging.queue")
+    formatted_on = []
+
+    class Position:
+        def __str__(self):
+            formatted_on.append(threading.current_thread())
+            return "(13.1, -59.6)"
+
+    start_queue_logging(logger)
+    assert handler not in logger.handlers
+    logger.info("[%s] at %s", "ZR1", Position())
+    stop_queue_logging(logger)
+
+    assert handler.lines == ["[ZR1] at (13.1, -59.6)"]
+    assert formatted_on and formatted_on[0] is not threading.current_thread()  # lazy: formatted by the writer
+    assert logger.handlers == [handler]
@@ -0,0 +1,91 @@
+"""Tests for the in-process metrics registry (common/metrics.py) and the fleet API /metrics endpoint."""
+
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from common.http_pool import HttpClientPool, UpstreamStats
+from common.metrics import MetricsRegistry, TickTimer
+from arknet_transit_simulator.api.events.event_bus import EventBus
+from arknet_transit_simulator.api.events.event_types import EventType
+from arknet_transit_simulator.api.routes.metrics import metrics as metrics_endpoint
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_render_counters_gauges_and_cumulative_histograms():
+    registry = MetricsRegistry()
+    sent = registry.counter("packets_sent_total", "Packets sent")
+    dropped = registry.counter("packets_dropped_total", "Packets dropped", ("reason",))
+    depth = registry.gauge("queue_depth", "Queue depth")
+    latency = registry.histogram("poll_seconds", "Poll latency", buckets=(0.1, 1.0))
+
+    sent.inc()
+    sent.inc(2)
+    dropped.labels("buffer_full").inc()
+    depth.set_function(lambda: 7)
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value)
+    assert registry.counter("packets_sent_total", "Packets sent") is sent  # get-or-create
+
+    text = registry.render()
+    assert "# TYPE packets_sent_total counter\npackets_sent_total 3\n" in text
+    assert 'packets_dropped_total{reason="buffer_full"} 1' in text
+    assert "queue_depth 7" in text
+    assert 'poll_seconds_bucket{le="0.1"} 1\npoll_seconds_bucket{le="1.0"} 3\npoll_seconds_bucket{le="+Inf"} 4' in text
+    assert "poll_seconds_sum 4.05\npoll_seconds_count 4" in text
+
+
+def test_tick_timer_records_duration_and_lag():
+    registry = MetricsRegistry()
+    timer = TickTimer("fleet_state", interval=0.0, registry=registry)
+    for _ in range(3):
+        with timer:
+            pass
+
+    text = registry.render()
+    assert 'sim_tick_duration_seconds_count{loop="fleet_state"} 3' in text
+    assert 'sim_tick_lag_seconds_count{loop="fleet_state"} 2' in text  # no schedule before the first tick
+
+
+def test_collectors_export_http_latency_and_event_bus_depth():
+    pool = HttpClientPool()
+    stats = pool._stats.setdefault("commuter", UpstreamStats())
+    stats.observe(12.0, error=False)
+    stats.observe(700.0, error=True)
+
+    bus = EventBus(max_queue_size=2)
+    bus.subscribe(name="dashboard")
+
+    async def emit():
+        for n in range(4):
+            await bus.emit(EventType.PASSENGER_BOARDED, {"vehicle_id": "ZR1", "passenger_id": n})
+
+    asyncio.run(emit())
+
+    registry = MetricsRegistry()
+    registry.register_collector(pool.collect_metrics)
+    registry.register_collector(bus.collect_metrics)
+    text = registry.render()
+    assert 'http_client_request_duration_seconds_bucket{upstream="commuter",le="0.025"} 1' in text
+    assert 'http_client_request_duration_seconds_count{upstream="commuter"} 2' in text
+    assert 'http_client_errors_total{upstream="commuter"} 1' in text
+    assert 'event_bus_queue_depth{subscriber="dashboard"} 2' in text
+    assert 'event_bus_dropped_total{subscriber="dashboard"} 2' in text
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    response = asyncio.run(metrics_endpoint())
+    assert response.media_type.startswith("text/plain; version=0.0.4")
+    assert b"# TYPE event_bus_subscribers gauge" in response.body
+
+
+def test_hot_path_updates_stay_under_budget():
+    result = subprocess.run(
+        [sys.executable, str(ROOT / "scripts" / "benchmark_metrics.py"), "--ops", "50000", "--runs", "3",
+         "--scale", os.getenv("METRICS_BUDGET_SCALE", "1.0")],
+        cwd=ROOT, capture_output=True, text=True, timeout=300
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,135 @@
+"""Tests for the shared route proximity index (common/route_proximity.py)."""
+
+import asyncio
+import random
+
+import pytest
+from fastapi import HTTPException
+
+from arknet_transit_simulator.core.dispatcher import RouteBuffer
+from arknet_transit_simulator.core.interfaces import RouteInfo
+from common.route_proximity import METERS_PER_DEGREE, RouteProximityIndex, geojson_lines, ring_cells
+from geospatial_service.api import routes as routes_api
+
+# ~111 m per 0.001 degree of latitude
+STEP = 0.001
+STEP_M = STEP * METERS_PER_DEGREE
+
+
+def north_south(lon, lat0=13.0, n=10):
+    return [[lon, lat0 + i * STEP] for i in range(n)]
+
+
+def test_geojson_lines_accepts_feature_collections():
+    collection = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": {"type": "LineString", "coordinates": [[0, 0], [1, 1]]}},
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [0, 0]}},
+            {"type": "Feature", "geometry": {"type": "MultiLineString", "coordinates": [[[2, 2], [3, 3]]]}},
+        ],
+    }
+
+    assert geojson_lines(collection) == [[[0, 0], [1, 1]], [[2, 2], [3, 3]]]
+    assert geojson_lines(None) == []
+
+
+def test_nearest_returns_one_boarding_point_per_route_with_along_distance():
+    index = RouteProximityIndex(reference_latitude=0.0)
+    index.add_route("A", [north_south(0.0, lat0=0.0)])
+    index.add_route("B", [north_south(0.003, lat0=0.0)])
+
+    points = index.nearest(0.0045, 0.001, k=5, max_distance_meters=1000)
+
+    assert [p.route_id for p in points] == ["A", "B"]
+    assert points[0].distance_meters == pytest.approx(STEP_M, rel=1e-6)
+    assert points[0].along_route_meters == pytest.approx(4.5 * STEP_M, rel=1e-6)
+    assert points[0].latitude == pytest.approx(0.0045)
+    assert points[1].distance_meters == pytest.approx(2 * STEP_M, rel=1e-6)
+    assert index.nearest(0.0045, 0.001, k=1, max_distance_meters=150)[0].route_id == "A"
+    assert index.nearest(0.0045, 0.05, k=3, max_distance_meters=500) == []
+
+
+def test_multi_part_routes_continue_along_distance_without_bridging_gaps():
+    index = RouteProximityIndex(reference_latitude=0.0)
+    first, second = north_south(0.0, lat0=0.0, n=3), north_south(0.0, lat0=0.01, n=3)
+    index.add_route("A", [first, second])
+
+    # Halfway across the gap: closest real geometry is an endpoint, not a bridging segment
+    gap_point = index.project("A", 0.005, 0.0005)
+    assert gap_point.latitude == pytest.approx(0.002)
+    assert gap_point.along_route_meters == pytest.approx(2 * STEP_M, rel=1e-6)
+
+    on_second = index.project("A", 0.011, 0.0)
+    assert on_second.along_route_meters == pytest.approx(3 * STEP_M, rel=1e-6)
+    assert on_second.route_length_meters == pytest.approx(4 * STEP_M, rel=1e-6)
+
+
+def test_nearest_matches_brute_force():
+    random.seed(7)
+    index = RouteProximityIndex(cell_meters=200)
+    for r in range(20):
+        lat, lon = 13.05 + random.random() * 0.1, -59.6 + random.random() * 0.1
+        coords = []
+        for _ in range(200):
+            lat += random.uniform(-1, 1) * 0.0005
+            lon += random.uniform(-1, 1) * 0.0005
+            coords.append([lon, lat])
+        index.add_route(f"R{r}", [coords])
+
+    for _ in range(100):
+        lat, lon = 13.05 + random.random() * 0.1, -59.6 + random.random() * 0.1
+        found = [(p.route_id, round(p.distance_meters, 6)) for p in index.nearest(lat, lon, k=3, max_distance_meters=700)]
+        brute = sorted((index.project(route_id, lat, lon).distance_meters, route_id) for route_id in index.route_ids)
+        assert found == [(route_id, round(d, 6)) for d, route_id in brute if d <= 700][:3]
+
+
+
+def test_ring_cells_visit_each_perimeter_cell_once():
+    assert list(ring_cells(3, -2, 0)) == [(3, -2)]
+    for ring in (1, 2, 5):
+        cells = list(ring_cells(0, 0, ring))
+        assert len(cells) == len(set(cells)) == 8 * ring
+        assert all(max(abs(c), abs(r)) == ring for c, r in cells)
+
+
+def test_wide_radius_stops_at_the_indexed_extent():
+    index = RouteProximityIndex(cell_meters=250)
+    index.add_route("A", [[[0.0, 0.0], [0.0, 0.01]]])
+
+    # 10 000 rings requested, but nothing is indexed past the route's few cells
+    assert index._rings_to_extent(0, 0) < 10
+    assert index.nearest(0.005, 0.02, k=1, max_distance_meters=2_500_000)[0].route_id == "A"
+    assert index.nearest(0.005, 0.02, k=1, max_distance_meters=1000) == []
+
+
+@pytest.mark.parametrize("max_distance", [0, -5, 50_001, "far", None, True, float("nan")])
+def test_nearest_route_endpoint_rejects_bad_search_radius(max_distance):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(routes_api.find_nearest_route(
+            {"latitude": 13.1, "longitude": -59.6, "max_distance_meters": max_distance}
+        ))
+    assert error.value.status_code == 400
+
+def test_route_buffer_uses_proximity_index():
+    buffer = RouteBuffer()
+    route = RouteInfo(
+        route_id="1A",
+        route_name="Route 1A",
+        route_type="bus",
+        geometry={"type": "LineString", "coordinates": north_south(-59.6)},
+    )
+
+    async def scenario():
+        await buffer.add_route(route)
+        nearby = await buffer.get_routes_by_gps(13.004, -59.601, walking_distance_km=0.5)
+        far = await buffer.get_routes_by_gps(13.2, -59.601, walking_distance_km=0.5)
+        points = await buffer.get_boarding_points(13.004, -59.601)
+        stats = await buffer.get_stats()
+        return nearby, far, points, stats
+
+    nearby, far, points, stats = asyncio.run(scenario())
+
+    assert nearby == [route] and far == []
+    assert points[0].along_route_meters == pytest.approx(4 * STEP_M, rel=1e-3)
+    assert stats["total_gps_points"] == 10
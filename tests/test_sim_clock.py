@@ -0,0 +1,99 @@
+"""Tests for the shared simulation clock (common/sim_clock.py)."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+
+from common.sim_clock import SimClock, clock_from_env, configure_sim_clock, get_sim_clock
+from arknet_transit_simulator.vehicle.engine.engine_block import Engine
+from arknet_transit_simulator.vehicle.engine.engine_buffer import EngineBuffer
+
+START = datetime(2025, 11, 5, 6, 0, tzinfo=timezone.utc)
+
+
+def test_time_warp_scales_now_and_sleeps():
+    clock = SimClock(start=START, warp=600)
+    wall = time.perf_counter()
+    clock.sleep(30)  # 30 simulated seconds = 50 ms
+    asyncio.run(clock.asleep(30))
+    assert time.perf_counter() - wall < 1.0
+    assert 60 <= clock.elapsed() < 600
+    assert clock.now(timezone.utc) >= START.replace(minute=1)
+
+
+def test_discrete_clock_runs_an_hour_of_threads_and_tasks_in_order():
+    clock = SimClock(start=START, discrete=True)
+    ticks = {"engine": 0, "conductor": 0, "broadcast": 0}
+    order = []
+    finished = []
+    done = threading.Event()
+
+    def engine():
+        while not done.is_set():
+            ticks["engine"] += 1
+            clock.sleep(1.0)
+
+    async def loop(name, interval):
+        while True:
+            ticks[name] += 1
+            order.append((clock.elapsed(), name))
+            await clock.asleep(interval)
+
+    async def scenario():
+        threading.Thread(target=engine, daemon=True).start()
+        tasks = [asyncio.create_task(loop("conductor", 2.0)), asyncio.create_task(loop("broadcast", 5.0))]
+        await asyncio.sleep(0.05)
+        assert clock.elapsed() == 0  # nothing advances before start()
+        clock.hold(asyncio.current_task())
+        clock.start()
+        await clock.asleep(3600)
+        finished.append(clock.now(timezone.utc))
+        done.set()
+        for task in tasks:
+            task.cancel()
+        clock.stop()
+
+    wall = time.perf_counter()
+    asyncio.run(scenario())
+    assert time.perf_counter() - wall < 30
+    assert finished == [START.replace(hour=7)]
+    assert abs(ticks["conductor"] - 1800) <= 2 and abs(ticks["broadcast"] - 720) <= 2
+    assert abs(ticks["engine"] - 3600) <= 2
+    assert [elapsed for elapsed, _ in order] == sorted(elapsed for elapsed, _ in order)
+
+
+def test_set_time_and_environment_configuration(monkeypatch):
+    clock = SimClock(discrete=True)
+    clock.set_time(START)
+    assert clock.now(timezone.utc) == START and clock.elapsed() == 0
+
+    monkeypatch.setenv("SIM_CLOCK_START", "2025-11-05T06:00:00Z")
+    monkeypatch.setenv("SIM_CLOCK_WARP", "60")
+    from_env = clock_from_env()
+    assert from_env.warp == 60 and not from_env.is_realtime
+    assert abs((from_env.now(timezone.utc) - START).total_seconds()) < 5
+
+
+def test_engine_integrates_distance_on_the_discrete_clock():
+    class CruiseModel:
+        def update(self):
+            return {"velocity_mps": 10.0}
+
+    clock = configure_sim_clock(start=START, discrete=True, resolution=0.1)
+    try:
+        engine = Engine("ZR1", CruiseModel(), EngineBuffer(size=10), tick_time=0.1)
+
+        async def drive():
+            await engine.start()
+            clock.hold(asyncio.current_task())
+            clock.start()
+            await clock.asleep(600)  # ten simulated minutes
+            await engine.stop()
+
+        asyncio.run(drive())
+        assert abs(engine.total_time - 600) < 1.0
+        assert abs(engine.total_distance - 6.0) < 0.02  # 10 m/s for 600 s
+    finally:
+        configure_sim_clock()
+    assert get_sim_clock().is_realtime
@@ -0,0 +1,140 @@
+"""Tests for the startup pipeline and cold-start profiler (arknet_transit_simulator/core/startup_pipeline.py)."""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from arknet_transit_simulator.core.startup_pipeline import StartupError, StartupPipeline, gather_bounded
+from arknet_transit_simulator.simulator import CleanVehicleSimulator
+
+
+def test_independent_steps_overlap_and_dependents_wait():
+    order = []
+
+    def step(name, delay=0.05):
+        async def run():
+            order.append(f"{name}:start")
+            await asyncio.sleep(delay)
+            order.append(f"{name}:end")
+            return name
+        return run
+
+    pipeline = StartupPipeline()
+    pipeline.add("depot", step("depot"))
+    pipeline.add("api", step("api"))
+    pipeline.add("vehicles", step("vehicles", 0.0), depends_on=("depot", "api"))
+
+    started = time.perf_counter()
+    results = asyncio.run(pipeline.run())
+    elapsed = time.perf_counter() - started
+
+    assert results == {"depot": "depot", "api": "api", "vehicles": "vehicles"}
+    assert order.index("vehicles:start") > max(order.index("depot:end"), order.index("api:end"))
+    assert elapsed < 0.09  # depot and api ran concurrently
+    phases = {phase["name"]: phase for phase in pipeline.profiler.report()["phases"]}
+    assert phases["vehicles"]["start_ms"] >= phases["depot"]["duration_ms"]
+
+
+def test_failed_critical_step_skips_dependents_and_raises():
+    async def fail():
+        raise RuntimeError("strapi down")
+
+    async def never():
+        raise AssertionError("dependent step must not run")
+
+    async def optional():
+        return "ok"
+
+    pipeline = StartupPipeline()
+    pipeline.add("depot", fail)
+    pipeline.add("vehicles", never, depends_on=("depot",))
+    pipeline.add("api", optional)
+
+    with pytest.raises(StartupError, match="depot"):
+        asyncio.run(pipeline.run())
+    statuses = {phase["name"]: phase["status"] for phase in pipeline.profiler.report()["phases"]}
+    assert statuses == {"depot": "error", "vehicles": "skipped", "api": "ok"}
+
+
+def test_invalid_graphs_are_rejected():
+    async def noop():
+        return None
+
+    cyclic = StartupPipeline().add("a", noop, depends_on=("b",)).add("b", noop, depends_on=("a",))
+    with pytest.raises(StartupError, match="cycle"):
+        asyncio.run(cyclic.run())
+
+    with pytest.raises(StartupError, match="unknown"):
+        asyncio.run(StartupPipeline().add("a", noop, depends_on=("missing",)).run())
+
+
+def test_gather_bounded_limits_fanout_and_keeps_order():
+    in_flight = peak = 0
+
+    async def work(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return item * 2
+
+    assert asyncio.run(gather_bounded(range(10), work, limit=3)) == [i * 2 for i in range(10)]
+    assert peak == 3
+
+
+def test_simulator_brings_up_vehicles_concurrently_and_writes_profile(tmp_path):
+    vehicles = [
+        SimpleNamespace(vehicle_id=f"ZR{i}", route_id="1", vehicle_status="available" if i < 5 else "maintenance")
+        for i in range(6)
+    ]
+    drivers = [SimpleNamespace(driver_id=f"D{i}", driver_name=f"Driver {i}") for i in range(6)]
+    route_requests = []
+
+    async def get_vehicle_assignments():
+        return vehicles
+
+    async def get_driver_assignments():
+        return drivers
+
+    async def get_route_info(route_id):
+        route_requests.append(route_id)
+        return SimpleNamespace(geometry={"coordinates": []})
+
+    async def distribute_routes_to_operational_vehicles(active):
+        return True
+
+    sim = CleanVehicleSimulator(api_url="http://strapi", enable_api=False,
+                                profile_startup=str(tmp_path / "startup.json"), startup_fanout=5)
+    sim.dispatcher = SimpleNamespace(get_vehicle_assignments=get_vehicle_assignments,
+                                     get_driver_assignments=get_driver_assignments,
+                                     get_route_info=get_route_info)
+    sim.depot = SimpleNamespace(distribute_routes_to_operational_vehicles=distribute_routes_to_operational_vehicles)
+
+    async def create_and_start_driver(vehicle_assignment, driver_assignment):
+        async with sim.startup_profiler.span("driver_start", vehicle_id=vehicle_assignment.vehicle_id):
+            await asyncio.sleep(0.05)
+        return SimpleNamespace(person_name=driver_assignment.driver_name, vehicle_id=vehicle_assignment.vehicle_id)
+
+    async def create_idle_driver(driver_assignment, vehicle_assignment):
+        return SimpleNamespace(person_name=driver_assignment.driver_name, vehicle_id=vehicle_assignment.vehicle_id)
+
+    sim._create_and_start_driver = create_and_start_driver
+    sim._create_idle_driver = create_idle_driver
+
+    started = time.perf_counter()
+    asyncio.run(sim._start_vehicle_operations())
+    elapsed = time.perf_counter() - started
+
+    assert [d.vehicle_id for d in sim.active_drivers] == [f"ZR{i}" for i in range(5)]
+    assert [d.vehicle_id for d in sim.idle_drivers] == ["ZR5"]
+    assert route_requests == ["1"]
+    assert elapsed < 0.2  # five 50 ms bring-ups in parallel
+
+    report = json.loads((tmp_path / "startup.json").read_text())
+    assert {phase["name"] for phase in report["phases"]} >= {"assignments", "route_prefetch", "vehicles", "distribute_routes"}
+    assert report["vehicles"]["ZR0"]["phases"]["driver_start"] >= 50
+    assert set(report["vehicles"]) == {f"ZR{i}" for i in range(6)}
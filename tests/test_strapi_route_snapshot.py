@@ -0,0 +1,143 @@
+"""Tests for concurrent shape loading and the on-disk route snapshot in StrapiStrategy."""
+
+import asyncio
+from urllib.parse import parse_qs, urlparse
+
+from arknet_transit_simulator.core.dispatcher import Dispatcher, StrapiStrategy
+from arknet_transit_simulator.core.route_snapshot import RouteSnapshot
+
+
+class FakeResponse:
+    def __init__(self, payload, status=200):
+        self.payload = payload
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return self.payload
+
+
+class FakeStrapi:
+    """Answers the three Strapi collections StrapiStrategy reads, with a small delay per request"""
+
+    def __init__(self, shape_count=12, updated_at="2025-01-01"):
+        self.shape_count = shape_count
+        self.updated_at = updated_at
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get(self, url, timeout=None):
+        self.requests.append(url)
+        return self._respond(url)
+
+    def _respond(self, url):
+        strapi = self
+
+        class Pending(FakeResponse):
+            async def __aenter__(self):
+                strapi.in_flight += 1
+                strapi.max_in_flight = max(strapi.max_in_flight, strapi.in_flight)
+                await asyncio.sleep(0.01)
+                strapi.in_flight -= 1
+                return self
+
+        parsed = urlparse(url)
+        params = parse_qs(parsed.query)
+        if parsed.path.endswith("/api/routes"):
+            return Pending({"data": [{"documentId": "r1", "long_name": "Route One", "updatedAt": self.updated_at}]})
+        if parsed.path.endswith("/api/route-shapes"):
+            shapes = [{"shape_id": f"s{i}", "updatedAt": self.updated_at} for i in range(self.shape_count)]
+            return Pending({"data": shapes})
+        shape = int(params["filters[shape_id][$eq]"][0][1:])
+        points = [{"shape_pt_lon": -59.6 + shape * 0.01 + j * 0.001, "shape_pt_lat": 13.1} for j in range(3)]
+        return Pending({"data": points})
+
+    def shape_requests(self):
+        return [url for url in self.requests if "/api/shapes" in url]
+
+
+def make_strategy(strapi, snapshot_path, concurrency=4):
+    strategy = StrapiStrategy("http://strapi", route_snapshot=RouteSnapshot(snapshot_path), shape_concurrency=concurrency)
+    strategy.session = strapi
+    strategy.api_connected = True
+    return strategy
+
+
+def test_shapes_load_concurrently_in_route_shape_order(tmp_path):
+    strapi = FakeStrapi(shape_count=12)
+    strategy = make_strategy(strapi, tmp_path / "routes.json", concurrency=4)
+
+    route = asyncio.run(strategy.get_route_info("1"))
+
+    assert route.coordinate_count == 36
+    assert route.shape_id == ",".join(f"s{i}" for i in range(12))
+    lons = [lon for lon, _ in route.geometry["coordinates"]]
+    assert lons == sorted(lons)
+    assert 1 < strapi.max_in_flight <= 4
+
+
+def test_restart_serves_snapshot_and_revalidates_in_background(tmp_path):
+    path = tmp_path / "routes.json"
+    first = asyncio.run(make_strategy(FakeStrapi(), path).get_route_info("1"))
+    assert path.exists()
+
+    # Unchanged in Strapi: only the route and route-shapes are re-read
+    strapi = FakeStrapi()
+    strategy = make_strategy(strapi, path)
+
+    async def restart():
+        route = await strategy.get_route_info("1")
+        requests_before_revalidation = len(strapi.requests)
+        await asyncio.gather(*strategy._revalidation_tasks.values())
+        return route, requests_before_revalidation
+
+    route, immediate_requests = asyncio.run(restart())
+    assert route == first
+    assert immediate_requests == 0
+    assert strapi.shape_requests() == []
+
+    # Changed shape set: the snapshot is rebuilt for the next start
+    changed = FakeStrapi(shape_count=5, updated_at="2025-02-01")
+    strategy = make_strategy(changed, path)
+
+    async def revalidate():
+        await strategy.get_route_info("1")
+        await asyncio.gather(*strategy._revalidation_tasks.values())
+
+    asyncio.run(revalidate())
+    assert len(changed.shape_requests()) == 5
+    assert RouteSnapshot(path).get("1")[0].coordinate_count == 15
+
+
+def test_revalidated_route_reaches_the_route_buffer_and_fresh_routes_skip_revalidation(tmp_path):
+    path = tmp_path / "routes.json"
+
+    # Fetched from Strapi in this run: a later lookup does not revalidate it
+    strapi = FakeStrapi()
+    strategy = make_strategy(strapi, path)
+
+    async def prefetch_then_lookup():
+        await strategy.get_route_info("1")
+        await strategy.get_route_info("1")
+
+    asyncio.run(prefetch_then_lookup())
+    assert strategy._revalidation_tasks == {}
+    assert len(strapi.shape_requests()) == 12
+
+    # Changed after restart: the refreshed RouteInfo is pushed into the dispatcher's buffer
+    dispatcher = Dispatcher(api_strategy=make_strategy(FakeStrapi(shape_count=5, updated_at="2025-02-01"), path),
+                            api_base_url="http://strapi")
+
+    async def restart():
+        route = await dispatcher.api_strategy.get_route_info("1")
+        await dispatcher.route_buffer.add_route(route)
+        await asyncio.gather(*dispatcher.api_strategy._revalidation_tasks.values())
+        return await dispatcher.route_buffer.get_route_by_id("1")
+
+    assert asyncio.run(restart()).coordinate_count == 15